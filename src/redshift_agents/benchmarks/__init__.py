@@ -0,0 +1 @@
+"""Performance benchmarks (not packaged into the Lambda functions)."""
@@ -0,0 +1,94 @@
+"""
+Child process for ``benchmarks.cold_start``: one handler, one fresh interpreter.
+
+Run as ``python -X importtime _handler_child.py '<scenario json>'``.  Prints
+one JSON line with the timings; the importtime breakdown goes to stderr.
+"""
+import copy
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import time
+from importlib.abc import MetaPathFinder
+
+SCENARIO = json.loads(sys.argv[1])
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StubClient:
+    """Answers every API call with the scenario's canned response (or ``{}``)."""
+
+    def __init__(self, responses: dict):
+        self._responses = responses
+
+    def __getattr__(self, name):
+        response = self._responses.get(name, {})
+        return lambda *args, **kwargs: copy.deepcopy(response)
+
+
+class StubBoto3Client(MetaPathFinder):
+    """Swap ``boto3.client`` for stubs when boto3 is first imported.
+
+    Patching after the import would pull boto3 in before the handler and
+    hide its cost from the measurements.
+    """
+
+    def find_spec(self, name, path=None, target=None):
+        if name != "boto3":
+            return None
+        sys.meta_path.remove(self)
+        spec = importlib.util.find_spec(name)
+        exec_module = spec.loader.exec_module
+
+        def exec_and_stub(module):
+            exec_module(module)
+            module.client = lambda service, *args, **kwargs: StubClient(
+                SCENARIO["responses"].get(service, {})
+            )
+
+        spec.loader.exec_module = exec_and_stub
+        return spec
+
+
+def _event() -> dict:
+    return {
+        "messageVersion": "1.0",
+        "actionGroup": "benchmark",
+        "apiPath": SCENARIO["api_path"],
+        "httpMethod": "POST",
+        "parameters": [
+            {"name": k, "type": "string", "value": v} for k, v in SCENARIO["parameters"].items()
+        ],
+    }
+
+
+def main() -> None:
+    sys.meta_path.insert(0, StubBoto3Client())
+
+    started = time.perf_counter()
+    module = importlib.import_module(SCENARIO["module"])
+    import_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    response = module.handler(_event())
+    first_ms = (time.perf_counter() - started) * 1000
+    body = json.loads(response["response"]["responseBody"]["application/json"]["body"])
+
+    warm = []
+    for _ in range(SCENARIO["warm_runs"]):
+        started = time.perf_counter()
+        module.handler(_event())
+        warm.append((time.perf_counter() - started) * 1000)
+
+    print(json.dumps({
+        "import_ms": round(import_ms, 2),
+        "first_invocation_ms": round(first_ms, 2),
+        "warm_invocation_ms": round(statistics.median(warm), 3),
+        "error": body.get("error") if isinstance(body, dict) else None,
+    }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Cold-start and import-time benchmarks for the Lambda handlers.
+
+Every run starts a fresh interpreter with ``-X importtime`` that imports one
+handler module (the Lambda init phase), serves a first request (including
+the tool modules the router imports lazily) and then serves ``warm_runs``
+more requests.  ``boto3.client`` is stubbed with canned responses, so no
+AWS calls are made and the numbers are pure Python cost.
+
+The medians over ``--runs`` interpreters are compared with
+``baselines.json``.  A metric regresses when it exceeds its baseline by more
+than ``--tolerance`` (relative) *and* ``--slack-ms`` (absolute), so timer
+noise on fast paths does not trip the check.
+
+Usage, from ``src/redshift_agents``::
+
+    python -m benchmarks.cold_start              # compare with baselines, exit 1 on regression
+    python -m benchmarks.cold_start --update     # record the current numbers as baselines
+    python -m benchmarks.cold_start --top 15     # longer import breakdown
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+PACKAGE_ROOT = os.path.dirname(_HERE)
+CHILD = os.path.join(_HERE, "_handler_child.py")
+BASELINES_PATH = os.path.join(_HERE, "baselines.json")
+
+METRICS = ("import_ms", "first_invocation_ms", "warm_invocation_ms")
+
+_STS = {"get_caller_identity": {"Account": "123456789012"}}
+
+SCENARIOS: Dict[str, Dict] = {
+    "assessment_handler": {
+        "module": "lambdas.assessment_handler",
+        "api_path": "/analyzeRedshiftCluster",
+        "parameters": {"cluster_id": "bench-cluster", "user_id": "bench"},
+        "responses": {
+            "sts": _STS,
+            "redshift": {"describe_clusters": {"Clusters": [{
+                "ClusterIdentifier": "bench-cluster", "NodeType": "ra3.4xlarge",
+                "NumberOfNodes": 4, "ClusterStatus": "available",
+            }]}},
+        },
+    },
+    "execution_handler": {
+        "module": "lambdas.execution_handler",
+        "api_path": "/createClusterSnapshot",
+        "parameters": {
+            "cluster_id": "bench-cluster", "snapshot_identifier": "bench-snap",
+            "user_id": "bench", "fencing_token": "1",
+        },
+        "responses": {
+            "sts": _STS,
+            "dynamodb": {"get_item": {"Item": {
+                "cluster_id": {"S": "bench-cluster"}, "lock_holder": {"S": "bench"},
+                "fencing_token": {"N": "1"}, "lease_expires_at": {"N": "9999999999"},
+            }}},
+            "redshift": {"create_cluster_snapshot": {"Snapshot": {
+                "SnapshotIdentifier": "bench-snap", "ClusterIdentifier": "bench-cluster",
+                "Status": "creating", "SnapshotType": "manual",
+            }}},
+        },
+    },
+    "cluster_lock_handler": {
+        "module": "lambdas.cluster_lock_handler",
+        "api_path": "/acquireClusterLock",
+        "parameters": {"cluster_id": "bench-cluster", "user_id": "bench"},
+        "responses": {
+            "sts": _STS,
+            "dynamodb": {"update_item": {"Attributes": {"fencing_token": {"N": "1"}}}},
+        },
+    },
+}
+
+# "import time:  self [us] |  cumulative | imported package"
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(stderr: str) -> Dict[str, float]:
+    """Sum ``-X importtime`` self times per top-level package, in ms."""
+    totals: Dict[str, float] = defaultdict(float)
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            totals[match.group(4).split(".")[0]] += int(match.group(1)) / 1000.0
+    return dict(totals)
+
+
+def _child_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        "AWS_REGION": "us-east-2",
+        # Static credentials keep the client pool from probing the
+        # credential chain (instance metadata) during the benchmark
+        "AWS_ACCESS_KEY_ID": "benchmark",
+        "AWS_SECRET_ACCESS_KEY": "benchmark",
+        "AWS_SESSION_TOKEN": "benchmark",
+        "PYTHONDONTWRITEBYTECODE": "1",
+        # Warm runs must execute the tool, not replay its cached result
+        "RESULT_CACHE_BACKEND": "none",
+    })
+    env.pop("PYTHONPATH", None)
+    return env
+
+
+def run_once(scenario: Dict, warm_runs: int) -> Dict:
+    """Run *scenario* in a fresh interpreter; return timings and import breakdown."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", CHILD, json.dumps(dict(scenario, warm_runs=warm_runs))],
+        cwd=PACKAGE_ROOT,
+        env=_child_env(),
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"benchmark child failed:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["imports"] = parse_importtime(proc.stderr)
+    return result
+
+
+def run_scenario(scenario: Dict, runs: int, warm_runs: int) -> Dict:
+    """Median timings over *runs* fresh interpreters."""
+    samples = [run_once(scenario, warm_runs) for _ in range(runs)]
+    errors = {s["error"] for s in samples if s.get("error")}
+    if errors:
+        raise RuntimeError(f"{scenario['api_path']} returned an error: {errors.pop()}")
+    packages = {name for s in samples for name in s["imports"]}
+    return {
+        **{m: round(statistics.median(s[m] for s in samples), 2) for m in METRICS},
+        "imports": {
+            name: round(statistics.median(s["imports"].get(name, 0.0) for s in samples), 2)
+            for name in packages
+        },
+    }
+
+
+def find_regressions(
+    results: Dict[str, Dict],
+    baselines: Dict[str, Dict],
+    tolerance: float,
+    slack_ms: float,
+) -> List[str]:
+    """Describe every metric that exceeds its baseline by both margins."""
+    regressions = []
+    for handler, result in results.items():
+        for metric in METRICS:
+            baseline = baselines.get(handler, {}).get(metric)
+            if baseline is None:
+                continue
+            value = result[metric]
+            if value > baseline * (1 + tolerance) and value - baseline > slack_ms:
+                regressions.append(
+                    f"{handler}.{metric}: {value:.2f} ms vs baseline {baseline:.2f} ms "
+                    f"(+{(value / baseline - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def load_baselines(path: str = BASELINES_PATH) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _report(results: Dict[str, Dict], top: int) -> None:
+    for handler, result in results.items():
+        print(
+            f"{handler:<22} import {result['import_ms']:8.1f} ms   "
+            f"first {result['first_invocation_ms']:8.1f} ms   "
+            f"warm {result['warm_invocation_ms']:7.2f} ms"
+        )
+        heaviest = sorted(result["imports"].items(), key=lambda kv: kv[1], reverse=True)[:top]
+        print("    " + ", ".join(f"{name} {ms:.1f}" for name, ms in heaviest))
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per handler")
+    parser.add_argument("--warm-runs", type=int, default=20, help="warm invocations per interpreter")
+    parser.add_argument("--top", type=int, default=8, help="packages shown in the import breakdown")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--slack-ms", type=float, default=10.0, help="allowed absolute slowdown")
+    parser.add_argument("--handler", action="append", choices=sorted(SCENARIOS), help="limit to handler(s)")
+    parser.add_argument("--update", action="store_true", help="write results to baselines.json")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    names = args.handler or list(SCENARIOS)
+    results = {name: run_scenario(SCENARIOS[name], args.runs, args.warm_runs) for name in names}
+
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+    else:
+        _report(results, args.top)
+
+    stored = load_baselines()
+    if args.update:
+        handlers = stored.get("handlers", {})
+        handlers.update({name: {m: r[m] for m in METRICS} for name, r in results.items()})
+        with open(BASELINES_PATH, "w") as f:
+            json.dump({"python": platform.python_version(), "handlers": handlers}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baselines written to {BASELINES_PATH}")
+        return 0
+
+    if stored.get("python", "").rsplit(".", 1)[0] != platform.python_version().rsplit(".", 1)[0]:
+        print(f"Note: baselines were recorded on Python {stored.get('python', '?')}", file=sys.stderr)
+    regressions = find_regressions(results, stored.get("handlers", {}), args.tolerance, args.slack_ms)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,6 +23,7 @@ from aws_cdk import aws_cognito as cognito
 from aws_cdk import aws_dynamodb as dynamodb
 from aws_cdk import aws_iam as iam
 from aws_cdk import aws_lambda as _lambda
+from aws_cdk import aws_logs as logs
 from aws_cdk import aws_s3 as s3
 from aws_cdk import aws_s3_deployment as s3deploy
 from aws_cdk import aws_s3vectors as s3vectors
@@ -159,10 +160,22 @@ class RedshiftModernizationStack(Stack):
         # ----- Task 5.2: DynamoDB lock table -----
         lock_table = self._create_lock_table()
 
+        # Oversized action group results are offloaded here (tools/result_store.py)
+        result_bucket = self._create_result_bucket()
+
+        # Shared result cache tier, so execution-phase invalidations reach
+        # the assessment Lambda (tools/result_cache.py)
+        cache_table = self._create_result_cache_table()
+
+        # Batched audit sink target (tools/audit_sinks.py)
+        audit_log_group = self._create_audit_log_group()
+
         # ----- Task 5.3 + 5.4: Lambda functions with IAM roles -----
-        assessment_lambda = self._create_assessment_lambda()
-        execution_lambda = self._create_execution_lambda()
+        assessment_lambda = self._create_assessment_lambda(result_bucket, cache_table)
+        execution_lambda = self._create_execution_lambda(lock_table, result_bucket, cache_table)
         cluster_lock_lambda = self._create_cluster_lock_lambda(lock_table)
+        for fn in (assessment_lambda, execution_lambda, cluster_lock_lambda):
+            self._send_audit_events_to(fn, audit_log_group)
 
         # ----- Task 5.6: Bedrock Agent IAM roles -----
         assessment_agent_role = self._create_agent_role(
@@ -199,6 +212,7 @@ class RedshiftModernizationStack(Stack):
         # ----- Task 5.7 + 5.8: Cognito resources -----
         cognito_resources = self._create_cognito_resources(
             lock_table=lock_table,
+            cache_table=cache_table,
             orchestrator_agent_id=agents["orchestrator"].ref,
         )
 
@@ -222,10 +236,60 @@ class RedshiftModernizationStack(Stack):
             time_to_live_attribute="ttl",
         )
 
+    def _create_result_cache_table(self) -> dynamodb.Table:
+        """Create the shared tier of the assessment result cache."""
+        return dynamodb.Table(
+            self,
+            "ResultCacheTable",
+            table_name="redshift_modernization_result_cache",
+            partition_key=dynamodb.Attribute(name="pk", type=dynamodb.AttributeType.STRING),
+            sort_key=dynamodb.Attribute(name="sk", type=dynamodb.AttributeType.STRING),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=RemovalPolicy.DESTROY,
+            time_to_live_attribute="ttl",
+        )
+
+    @staticmethod
+    def _result_cache_environment(cache_table: dynamodb.Table) -> dict:
+        return {
+            "RESULT_CACHE_BACKEND": "dynamodb",
+            "RESULT_CACHE_TABLE": cache_table.table_name,
+        }
+
+    def _create_audit_log_group(self) -> logs.LogGroup:
+        """Create the log group the ``cloudwatch`` audit sink writes to."""
+        return logs.LogGroup(
+            self,
+            "AuditLogGroup",
+            log_group_name="/redshift-modernization/audit",
+            retention=logs.RetentionDays.ONE_YEAR,
+            removal_policy=RemovalPolicy.RETAIN,
+        )
+
+    @staticmethod
+    def _send_audit_events_to(fn: _lambda.Function, audit_log_group: logs.LogGroup) -> None:
+        """Batch *fn*'s audit events into *audit_log_group* (CreateLogStream, PutLogEvents)."""
+        fn.add_environment("AUDIT_SINKS", "cloudwatch")
+        fn.add_environment("AUDIT_LOG_GROUP", audit_log_group.log_group_name)
+        audit_log_group.grant_write(fn)
+
+    def _create_result_bucket(self) -> s3.Bucket:
+        """Create the bucket for offloaded action group results."""
+        return s3.Bucket(
+            self,
+            "ActionResultBucket",
+            removal_policy=RemovalPolicy.DESTROY,
+            auto_delete_objects=True,
+            enforce_ssl=True,
+            lifecycle_rules=[s3.LifecycleRule(expiration=Duration.days(1))],
+        )
+
     # -----------------------------------------------------------------------
     # Task 5.3 + 5.4: Lambda functions with least-privilege IAM
     # -----------------------------------------------------------------------
-    def _create_assessment_lambda(self) -> _lambda.Function:
+    def _create_assessment_lambda(
+        self, result_bucket: s3.Bucket, cache_table: dynamodb.Table
+    ) -> _lambda.Function:
         """Create the assessment-tools Lambda function."""
         role = iam.Role(
             self,
@@ -239,7 +303,7 @@ class RedshiftModernizationStack(Stack):
         )
         role.add_to_policy(
             iam.PolicyStatement(
-                actions=["redshift:DescribeClusters"],
+                actions=["redshift:DescribeClusters", "ec2:DescribeRegions"],
                 resources=["*"],
             )
         )
@@ -261,7 +325,7 @@ class RedshiftModernizationStack(Stack):
         )
         role.add_to_policy(
             iam.PolicyStatement(
-                actions=["cloudwatch:GetMetricStatistics"],
+                actions=["cloudwatch:GetMetricStatistics", "cloudwatch:GetMetricData"],
                 resources=["*"],
             )
         )
@@ -276,11 +340,22 @@ class RedshiftModernizationStack(Stack):
             memory_size=256,
             timeout=Duration.seconds(60),
             role=role,
+            environment={
+                "RESULT_STORE_BUCKET": result_bucket.bucket_name,
+                **self._result_cache_environment(cache_table),
+            },
         )
+        result_bucket.grant_read_write(fn)
+        cache_table.grant_read_write_data(fn)
         fn.grant_invoke(iam.ServicePrincipal("bedrock.amazonaws.com"))
         return fn
 
-    def _create_execution_lambda(self) -> _lambda.Function:
+    def _create_execution_lambda(
+        self,
+        lock_table: dynamodb.Table,
+        result_bucket: s3.Bucket,
+        cache_table: dynamodb.Table,
+    ) -> _lambda.Function:
         """Create the execution-tools Lambda function."""
         role = iam.Role(
             self,
@@ -302,6 +377,13 @@ class RedshiftModernizationStack(Stack):
                 resources=["*"],
             )
         )
+        # Fencing-token checks read the cluster lock before execution tools act
+        role.add_to_policy(
+            iam.PolicyStatement(
+                actions=["dynamodb:GetItem"],
+                resources=[lock_table.table_arn],
+            )
+        )
 
         fn = _lambda.Function(
             self,
@@ -313,7 +395,14 @@ class RedshiftModernizationStack(Stack):
             memory_size=256,
             timeout=Duration.seconds(120),
             role=role,
+            environment={
+                "DYNAMODB_LOCK_TABLE": lock_table.table_name,
+                "RESULT_STORE_BUCKET": result_bucket.bucket_name,
+                **self._result_cache_environment(cache_table),
+            },
         )
+        result_bucket.grant_read_write(fn)
+        cache_table.grant_read_write_data(fn)
         fn.grant_invoke(iam.ServicePrincipal("bedrock.amazonaws.com"))
         return fn
 
@@ -335,6 +424,7 @@ class RedshiftModernizationStack(Stack):
             iam.PolicyStatement(
                 actions=[
                     "dynamodb:PutItem",
+                    "dynamodb:UpdateItem",
                     "dynamodb:DeleteItem",
                     "dynamodb:GetItem",
                 ],
@@ -350,6 +440,7 @@ class RedshiftModernizationStack(Stack):
             handler="lambdas.cluster_lock_handler.handler",
             code=_lambda_code(),
             memory_size=128,
+            # Must exceed CLUSTER_LOCK_WAIT_MAX_SECONDS (acquireClusterLock waits)
             timeout=Duration.seconds(30),
             role=role,
             environment={
@@ -834,6 +925,7 @@ class RedshiftModernizationStack(Stack):
         self,
         *,
         lock_table: dynamodb.Table,
+        cache_table: dynamodb.Table,
         orchestrator_agent_id: str,
     ) -> dict:
         """Create Cognito User Pool, App Client, Identity Pool, and groups."""
@@ -913,6 +1005,17 @@ class RedshiftModernizationStack(Stack):
                     ],
                     resources=[lock_table.table_arn],
                 ),
+                # Result cache: subagent memos and invalidation after execution
+                iam.PolicyStatement(
+                    actions=[
+                        "dynamodb:GetItem",
+                        "dynamodb:PutItem",
+                        "dynamodb:UpdateItem",
+                        "dynamodb:DeleteItem",
+                        "dynamodb:Query",
+                    ],
+                    resources=[cache_table.table_arn],
+                ),
                 # Bedrock InvokeAgent
                 iam.PolicyStatement(
                     actions=["bedrock:InvokeAgent"],
@@ -3,7 +3,8 @@ Lambda action group handlers for Bedrock Agents.
 
 Each handler receives Bedrock Agent action group invocation events,
 dispatches to the appropriate tool function, and returns the structured
-response format expected by Bedrock Agents.
+response format expected by Bedrock Agents.  Dispatch is table-driven
+(``router.py``) and tool modules are imported on first use of a route.
 Public API is available via direct module imports:
   from lambdas.assessment_handler import handler
   from lambdas.execution_handler import handler
@@ -6,12 +6,14 @@ Receives Bedrock Agent action group invocation events and dispatches to:
 - analyzeRedshiftCluster
 - getClusterMetrics
 - getWlmConfiguration
+- getStatementResult
+- fetchResultPage
+- assessCluster
 
 Requirements: 1.1, 1.3, 1.4, 1.5, 6.1, 6.2, 6.3
 """
 from __future__ import annotations
 
-import json
 import os
 import sys
 
@@ -23,78 +25,46 @@ _package_root = os.path.dirname(_this_dir)  # parent of lambdas/
 if _package_root not in sys.path:
     sys.path.insert(0, _package_root)
 
-from tools.redshift_tools import (
-    analyze_redshift_cluster,
-    get_cluster_metrics,
-    get_wlm_configuration,
-    list_redshift_clusters,
-)
+from lambdas.router import Param, Route, Router, as_bool
 
+_TOOLS = "tools.redshift_tools"
 
-def _parse_parameters(event: dict) -> dict:
-    """Convert Bedrock Agent parameter list to a flat dict."""
-    return {p["name"]: p["value"] for p in event.get("parameters", [])}
+ROUTES = {
+    "/listRedshiftClusters": Route(
+        f"{_TOOLS}:list_redshift_clusters",
+        Param("region"), Param("user_id"), Param("regions"),
+    ),
+    "/analyzeRedshiftCluster": Route(
+        f"{_TOOLS}:analyze_redshift_cluster",
+        Param("cluster_id", required=True), Param("region"), Param("user_id"),
+    ),
+    "/getClusterMetrics": Route(
+        f"{_TOOLS}:get_cluster_metrics",
+        Param("cluster_id", required=True), Param("region"), Param("hours", int),
+        Param("user_id"), Param("period_seconds", int), Param("include_series", as_bool),
+    ),
+    "/getWlmConfiguration": Route(
+        f"{_TOOLS}:get_wlm_configuration",
+        Param("cluster_id", required=True), Param("region"), Param("user_id"),
+        wait_budget=True,
+    ),
+    "/getStatementResult": Route(
+        f"{_TOOLS}:get_statement_result",
+        Param("statement_id", required=True), Param("cluster_id"), Param("region"),
+        Param("result_format", default="wlm_queues"), Param("user_id"),
+        wait_budget=True,
+    ),
+    "/assessCluster": Route(
+        f"{_TOOLS}:assess_cluster",
+        Param("cluster_id", required=True), Param("region"), Param("user_id"),
+        Param("hours", int),
+        wait_budget=True,
+    ),
+    "/fetchResultPage": Route(
+        "tools.result_store:fetch_result_page",
+        Param("result_id", required=True), Param("page", int), Param("user_id"),
+        offload=False,
+    ),
+}
 
-
-def _build_response(event: dict, result: object) -> dict:
-    """Build the Bedrock Agent action group response format."""
-    # Ensure body is never empty — Bedrock rejects blank text blocks
-    if result is None:
-        result = {"status": "no data returned"}
-    body = json.dumps(result)
-    if not body or body == "null":
-        body = json.dumps({"status": "empty result"})
-    return {
-        "messageVersion": "1.0",
-        "response": {
-            "actionGroup": event.get("actionGroup", ""),
-            "apiPath": event.get("apiPath", ""),
-            "httpMethod": event.get("httpMethod", ""),
-            "httpStatusCode": 200,
-            "responseBody": {
-                "application/json": {
-                    "body": body,
-                }
-            },
-        },
-    }
-
-
-def handler(event: dict, context: object = None) -> dict:
-    """Bedrock Agent action group Lambda handler for assessment tools."""
-    try:
-        api_path = event.get("apiPath", "")
-        params = _parse_parameters(event)
-        user_id = params.get("user_id", "")
-
-        if api_path == "/listRedshiftClusters":
-            result = list_redshift_clusters(
-                region=params.get("region", ""),
-                user_id=user_id,
-            )
-        elif api_path == "/analyzeRedshiftCluster":
-            result = analyze_redshift_cluster(
-                cluster_id=params["cluster_id"],
-                region=params.get("region", ""),
-                user_id=user_id,
-            )
-        elif api_path == "/getClusterMetrics":
-            result = get_cluster_metrics(
-                cluster_id=params["cluster_id"],
-                region=params.get("region", ""),
-                hours=int(params.get("hours", "24")),
-                user_id=user_id,
-            )
-        elif api_path == "/getWlmConfiguration":
-            result = get_wlm_configuration(
-                cluster_id=params["cluster_id"],
-                region=params.get("region", ""),
-                user_id=user_id,
-            )
-        else:
-            result = {"error": f"Unknown apiPath: {api_path}"}
-
-        return _build_response(event, result)
-    except Exception as exc:
-        print(f"[assessment_handler] Unexpected error: {exc}", file=sys.stderr)
-        return _build_response(event, {"error": f"Unexpected: {str(exc)}"})
+handler = Router("assessment_handler", ROUTES)
@@ -3,13 +3,15 @@ Lambda handler for the Cluster Lock action group.
 
 Receives Bedrock Agent action group invocation events and dispatches to:
 - acquireClusterLock
+- acquireClusterLocks
+- renewClusterLock
 - releaseClusterLock
+- releaseClusterLocks
 
 Requirements: 1.1, 7.1, 7.2, 7.3, 7.5
 """
 from __future__ import annotations
 
-import json
 import os
 import sys
 
@@ -19,61 +21,33 @@ _package_root = os.path.dirname(_this_dir)
 if _package_root not in sys.path:
     sys.path.insert(0, _package_root)
 
-from tools.cluster_lock import acquire_lock, release_lock
-
-
-def _parse_parameters(event: dict) -> dict:
-    """Convert Bedrock Agent parameter list to a flat dict."""
-    return {p["name"]: p["value"] for p in event.get("parameters", [])}
-
-
-def _build_response(event: dict, result: object) -> dict:
-    """Build the Bedrock Agent action group response format."""
-    # Ensure body is never empty — Bedrock rejects blank text blocks
-    if result is None:
-        result = {"status": "no data returned"}
-    body = json.dumps(result)
-    if not body or body == "null":
-        body = json.dumps({"status": "empty result"})
-    return {
-        "messageVersion": "1.0",
-        "response": {
-            "actionGroup": event.get("actionGroup", ""),
-            "apiPath": event.get("apiPath", ""),
-            "httpMethod": event.get("httpMethod", ""),
-            "httpStatusCode": 200,
-            "responseBody": {
-                "application/json": {
-                    "body": body,
-                }
-            },
-        },
-    }
-
-
-def handler(event: dict, context: object = None) -> dict:
-    """Bedrock Agent action group Lambda handler for cluster lock operations."""
-    try:
-        api_path = event.get("apiPath", "")
-        params = _parse_parameters(event)
-        user_id = params.get("user_id", "")
-
-        if api_path == "/acquireClusterLock":
-            result = acquire_lock(
-                cluster_id=params["cluster_id"],
-                user_id=user_id,
-                region=params.get("region", ""),
-            )
-        elif api_path == "/releaseClusterLock":
-            result = release_lock(
-                cluster_id=params["cluster_id"],
-                user_id=user_id,
-                region=params.get("region", ""),
-            )
-        else:
-            result = {"error": f"Unknown apiPath: {api_path}"}
-
-        return _build_response(event, result)
-    except Exception as exc:
-        print(f"[cluster_lock_handler] Unexpected error: {exc}", file=sys.stderr)
-        return _build_response(event, {"error": f"Unexpected: {str(exc)}"})
+from lambdas.router import Param, Route, Router
+
+_LOCKS = "tools.cluster_lock"
+
+ROUTES = {
+    "/acquireClusterLock": Route(
+        f"{_LOCKS}:acquire_lock",
+        Param("cluster_id", required=True), Param("user_id", default=""), Param("region"),
+        Param("wait_seconds", float),
+    ),
+    "/acquireClusterLocks": Route(
+        f"{_LOCKS}:acquire_locks",
+        Param("cluster_ids", required=True), Param("user_id", default=""), Param("region"),
+    ),
+    "/renewClusterLock": Route(
+        f"{_LOCKS}:renew_lock",
+        Param("cluster_id", required=True), Param("user_id", default=""),
+        Param("fencing_token", int, required=True), Param("region"),
+    ),
+    "/releaseClusterLock": Route(
+        f"{_LOCKS}:release_lock",
+        Param("cluster_id", required=True), Param("user_id", default=""), Param("region"),
+    ),
+    "/releaseClusterLocks": Route(
+        f"{_LOCKS}:release_locks",
+        Param("cluster_ids", required=True), Param("user_id", default=""), Param("region"),
+    ),
+}
+
+handler = Router("cluster_lock_handler", ROUTES)
@@ -7,14 +7,17 @@ Receives Bedrock Agent action group invocation events and dispatches to:
 - createServerlessWorkgroup
 - restoreSnapshotToServerless
 - setupDataSharing
+- getStatementResult
+- fetchResultPage
 
 Includes STS AssumeRole with session tags for data-plane operations.
+Routes that change AWS resources are fenced: they require the source
+cluster's ``cluster_id`` and a current cluster-lock ``fencing_token``.
 
 Requirements: 1.1, 1.3, 1.4, 1.5, 6.1, 6.2, 6.3, 15.6
 """
 from __future__ import annotations
 
-import json
 import os
 import sys
 
@@ -24,48 +27,58 @@ _package_root = os.path.dirname(_this_dir)
 if _package_root not in sys.path:
     sys.path.insert(0, _package_root)
 
-import boto3
-
-from tools.redshift_tools import (
-    create_cluster_snapshot,
-    create_serverless_namespace,
-    create_serverless_workgroup,
-    execute_redshift_query,
-    restore_snapshot_to_serverless,
-    setup_data_sharing,
-)
+from lambdas.router import Param, Route, Router
 
 # Role ARN for data-plane operations (set via Lambda environment variable)
 DATA_PLANE_ROLE_ARN = os.getenv("DATA_PLANE_ROLE_ARN", "")
 
-
-def _parse_parameters(event: dict) -> dict:
-    """Convert Bedrock Agent parameter list to a flat dict."""
-    return {p["name"]: p["value"] for p in event.get("parameters", [])}
-
-
-def _build_response(event: dict, result: object) -> dict:
-    """Build the Bedrock Agent action group response format."""
-    # Ensure body is never empty — Bedrock rejects blank text blocks
-    if result is None:
-        result = {"status": "no data returned"}
-    body = json.dumps(result)
-    if not body or body == "null":
-        body = json.dumps({"status": "empty result"})
-    return {
-        "messageVersion": "1.0",
-        "response": {
-            "actionGroup": event.get("actionGroup", ""),
-            "apiPath": event.get("apiPath", ""),
-            "httpMethod": event.get("httpMethod", ""),
-            "httpStatusCode": 200,
-            "responseBody": {
-                "application/json": {
-                    "body": body,
-                }
-            },
-        },
-    }
+_TOOLS = "tools.redshift_tools"
+
+ROUTES = {
+    "/createClusterSnapshot": Route(
+        f"{_TOOLS}:create_cluster_snapshot",
+        Param("cluster_id", required=True), Param("snapshot_identifier"), Param("region"),
+        Param("user_id"), fenced=True,
+    ),
+    "/executeRedshiftQuery": Route(
+        f"{_TOOLS}:execute_redshift_query",
+        Param("cluster_id", required=True), Param("query", required=True), Param("region"),
+        Param("user_id"), Param("max_rows", int), Param("max_bytes", int), Param("result_format"),
+        wait_budget=True, fenced=True,
+    ),
+    "/getStatementResult": Route(
+        f"{_TOOLS}:get_statement_result",
+        Param("statement_id", required=True), Param("cluster_id"), Param("region"),
+        Param("result_format"), Param("user_id"), Param("max_rows", int), Param("max_bytes", int),
+        wait_budget=True,
+    ),
+    "/createServerlessNamespace": Route(
+        f"{_TOOLS}:create_serverless_namespace",
+        Param("namespace_name", required=True), Param("admin_username"), Param("db_name"),
+        Param("region"), Param("user_id"), fenced=True,
+    ),
+    "/createServerlessWorkgroup": Route(
+        f"{_TOOLS}:create_serverless_workgroup",
+        Param("workgroup_name", required=True), Param("namespace_name", required=True),
+        Param("base_rpu", int), Param("max_rpu", int), Param("region"), Param("user_id"), fenced=True,
+    ),
+    "/restoreSnapshotToServerless": Route(
+        f"{_TOOLS}:restore_snapshot_to_serverless",
+        Param("snapshot_identifier", required=True), Param("namespace_name", required=True),
+        Param("workgroup_name"), Param("region"), Param("user_id"), fenced=True,
+    ),
+    "/setupDataSharing": Route(
+        f"{_TOOLS}:setup_data_sharing",
+        Param("producer_namespace", required=True), Param("consumer_namespaces", required=True),
+        Param("datashare_name"), Param("region"), Param("user_id"),
+        wait_budget=True, fenced=True,
+    ),
+    "/fetchResultPage": Route(
+        "tools.result_store:fetch_result_page",
+        Param("result_id", required=True), Param("page", int), Param("user_id"),
+        offload=False,
+    ),
+}
 
 
 def _assume_role_with_session_tags(user_id: str) -> None:
@@ -78,6 +91,8 @@ def _assume_role_with_session_tags(user_id: str) -> None:
     if not DATA_PLANE_ROLE_ARN:
         return None
 
+    import boto3
+
     sts = boto3.client("sts")
     sts.assume_role(
         RoleArn=DATA_PLANE_ROLE_ARN,
@@ -86,73 +101,52 @@ def _assume_role_with_session_tags(user_id: str) -> None:
     )
 
 
-def handler(event: dict, context: object = None) -> dict:
-    """Bedrock Agent action group Lambda handler for execution tools."""
+def _before_tool(params: dict, context: object, route: Route) -> dict | None:
+    """Session tagging and lock fencing ahead of every execution tool."""
+    user_id = params.get("user_id", "")
+
+    # Attempt STS AssumeRole with session tags for data-plane ops
     try:
-        api_path = event.get("apiPath", "")
-        params = _parse_parameters(event)
-        user_id = params.get("user_id", "")
-
-        # Attempt STS AssumeRole with session tags for data-plane ops
-        try:
-            _assume_role_with_session_tags(user_id)
-        except Exception as exc:
-            print(
-                f"[execution_handler] STS AssumeRole failed: {exc}",
-                file=sys.stderr,
-            )
-
-        if api_path == "/createClusterSnapshot":
-            result = create_cluster_snapshot(
-                cluster_id=params["cluster_id"],
-                snapshot_identifier=params.get("snapshot_identifier", ""),
-                region=params.get("region", ""),
-                user_id=user_id,
-            )
-        elif api_path == "/executeRedshiftQuery":
-            result = execute_redshift_query(
-                cluster_id=params["cluster_id"],
-                query=params["query"],
-                region=params.get("region", ""),
-                user_id=user_id,
-            )
-        elif api_path == "/createServerlessNamespace":
-            result = create_serverless_namespace(
-                namespace_name=params["namespace_name"],
-                admin_username=params.get("admin_username", "admin"),
-                db_name=params.get("db_name", "dev"),
-                region=params.get("region", ""),
-                user_id=user_id,
-            )
-        elif api_path == "/createServerlessWorkgroup":
-            result = create_serverless_workgroup(
-                workgroup_name=params["workgroup_name"],
-                namespace_name=params["namespace_name"],
-                base_rpu=int(params.get("base_rpu", "32")),
-                max_rpu=int(params.get("max_rpu", "512")),
-                region=params.get("region", ""),
-                user_id=user_id,
-            )
-        elif api_path == "/restoreSnapshotToServerless":
-            result = restore_snapshot_to_serverless(
-                snapshot_identifier=params["snapshot_identifier"],
-                namespace_name=params["namespace_name"],
-                workgroup_name=params.get("workgroup_name", ""),
-                region=params.get("region", ""),
-                user_id=user_id,
-            )
-        elif api_path == "/setupDataSharing":
-            result = setup_data_sharing(
-                producer_namespace=params["producer_namespace"],
-                consumer_namespaces=params["consumer_namespaces"],
-                datashare_name=params.get("datashare_name", "default_share"),
-                region=params.get("region", ""),
-                user_id=user_id,
-            )
-        else:
-            result = {"error": f"Unknown apiPath: {api_path}"}
-
-        return _build_response(event, result)
+        _assume_role_with_session_tags(user_id)
     except Exception as exc:
-        print(f"[execution_handler] Unexpected error: {exc}", file=sys.stderr)
-        return _build_response(event, {"error": f"Unexpected: {str(exc)}"})
+        print(
+            f"[execution_handler] STS AssumeRole failed: {exc}",
+            file=sys.stderr,
+        )
+
+    if not route.fenced:
+        return None
+
+    # Reject callers without the lock, and stale holders (expired lease or
+    # lock re-acquired since).  Serverless routes name the target namespace
+    # or workgroup, so the caller passes the locked source cluster_id too.
+    cluster_id = params.get("cluster_id", "")
+    if not cluster_id or not params.get("fencing_token"):
+        return {
+            "valid": False,
+            "error": "cluster_id and fencing_token of the held cluster lock are required",
+            "cluster_id": cluster_id,
+        }
+    try:
+        fencing_token = int(params["fencing_token"])
+    except ValueError:
+        return {
+            "valid": False,
+            "error": f"Invalid fencing_token: {params['fencing_token']}",
+            "cluster_id": cluster_id,
+        }
+
+    from tools.cluster_lock import check_fencing_token
+
+    fence = check_fencing_token(
+        cluster_id,
+        fencing_token,
+        user_id=user_id,
+        region=params.get("region", ""),
+    )
+    if not fence["valid"]:
+        return fence
+    return None
+
+
+handler = Router("execution_handler", ROUTES, before=_before_tool)
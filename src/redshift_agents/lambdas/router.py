@@ -0,0 +1,211 @@
+"""
+Table-driven dispatch shared by the action group Lambda handlers.
+
+Each handler declares a route table mapping ``apiPath`` to the tool
+function that serves it and the parameters it takes::
+
+    handler = Router("assessment_handler", {
+        "/getClusterMetrics": Route(
+            "tools.redshift_tools:get_cluster_metrics",
+            Param("cluster_id", required=True), Param("region"),
+            Param("hours", int), Param("user_id"),
+        ),
+    })
+
+Tool modules are imported on the first request for one of their routes,
+not when the handler module loads, so the Lambda init phase only pays for
+this module.  Bedrock passes every parameter as a string; ``Param``
+converts it and parameters the request omits fall back to the tool's own
+default.
+
+Results that serialize to more than ``RESPONSE_MAX_BYTES`` are offloaded to
+the result store and replaced by a summary (``tools/result_store.py``);
+routes with ``offload=False`` are returned as they are.
+"""
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Bedrock Agents reject action group responses over 25 KB
+RESPONSE_MAX_BYTES = int(os.getenv("RESPONSE_MAX_BYTES", "20000"))
+
+_UNSET = object()
+
+
+class InvalidParameter(ValueError):
+    """A request parameter its converter could not parse."""
+
+    def __init__(self, name: str, value: object):
+        super().__init__(f"Invalid parameter {name}: {value!r}")
+        self.name = name
+        self.value = value
+
+
+def as_bool(value: str) -> bool:
+    """Parameter converter for ``"true"`` / ``"false"`` strings."""
+    return value.lower() == "true"
+
+
+@dataclass(frozen=True)
+class Param:
+    """One Bedrock Agent parameter of a route."""
+
+    name: str
+    convert: Callable[[str], Any] = str
+    required: bool = False
+    default: Any = _UNSET
+
+
+class Route:
+    """A tool function (``"module:function"``) and the parameters it takes.
+
+    With *wait_budget* the route also receives ``max_wait_seconds``: the
+    requested wait capped to the time left in the Lambda invocation.  With
+    *offload* False an oversized result is not offloaded.  *fenced* marks
+    routes that change AWS resources, for ``before`` hooks that guard them.
+    """
+
+    def __init__(
+        self,
+        target: str,
+        *params: Param,
+        wait_budget: bool = False,
+        offload: bool = True,
+        fenced: bool = False,
+    ):
+        self.target = target
+        self.params: Tuple[Param, ...] = params
+        self.wait_budget = wait_budget
+        self.offload = offload
+        self.fenced = fenced
+
+    def bind(self, params: Dict[str, str], context: object = None) -> Dict[str, Any]:
+        """Build the tool keyword arguments from the request parameters.
+
+        Raises:
+            KeyError: naming a required parameter the request omitted.
+            InvalidParameter: for a value its converter rejects.
+        """
+        kwargs: Dict[str, Any] = {}
+        for spec in self.params:
+            if spec.name in params:
+                kwargs[spec.name] = _convert(spec.name, spec.convert, params[spec.name])
+            elif spec.required:
+                raise KeyError(spec.name)
+            elif spec.default is not _UNSET:
+                kwargs[spec.name] = spec.default
+        if self.wait_budget:
+            from tools.data_api import DEFAULT_MAX_WAIT_SECONDS, remaining_budget_seconds
+
+            kwargs["max_wait_seconds"] = remaining_budget_seconds(
+                context, _convert("max_wait_seconds", float, params.get("max_wait_seconds", DEFAULT_MAX_WAIT_SECONDS)),
+            )
+        return kwargs
+
+
+def _convert(name: str, convert: Callable[[str], Any], value: Any) -> Any:
+    try:
+        return convert(value)
+    except (TypeError, ValueError) as exc:
+        raise InvalidParameter(name, value) from exc
+
+
+def parse_parameters(event: dict) -> dict:
+    """Convert Bedrock Agent parameter list to a flat dict."""
+    return {p["name"]: p["value"] for p in event.get("parameters", [])}
+
+
+def build_response(event: dict, result: object, offload: bool = True) -> dict:
+    """Build the Bedrock Agent action group response format.
+
+    With *offload*, a result over ``RESPONSE_MAX_BYTES`` is stored and
+    replaced by its summary.
+    """
+    # Audit events are written by a background thread; drain them before
+    # Lambda freezes the execution environment, and again on SIGTERM at
+    # shutdown.  Nothing can be queued if no tool module (and so no audit
+    # logger) has been loaded yet.
+    audit_logger = sys.modules.get("tools.audit_logger")
+    if audit_logger is not None:
+        audit_logger.install_sigterm_flush()
+        audit_logger.flush_audit_events()
+    # Ensure body is never empty — Bedrock rejects blank text blocks
+    if result is None:
+        result = {"status": "no data returned"}
+    body = json.dumps(result)
+    if offload and len(body.encode("utf-8")) > RESPONSE_MAX_BYTES:
+        from tools.result_store import offload_result
+
+        owner = parse_parameters(event).get("user_id", "")
+        body = json.dumps(offload_result(result, body.encode("utf-8"), owner, RESPONSE_MAX_BYTES))
+    if not body or body == "null":
+        body = json.dumps({"status": "empty result"})
+    return {
+        "messageVersion": "1.0",
+        "response": {
+            "actionGroup": event.get("actionGroup", ""),
+            "apiPath": event.get("apiPath", ""),
+            "httpMethod": event.get("httpMethod", ""),
+            "httpStatusCode": 200,
+            "responseBody": {
+                "application/json": {
+                    "body": body,
+                }
+            },
+        },
+    }
+
+
+@dataclass
+class Router:
+    """Bedrock Agent action group handler dispatching over a route table.
+
+    *before* runs after the route is found and before the tool is called,
+    with the parsed parameters, the Lambda context and the route; a
+    non-None return value is sent as the response instead of calling the
+    tool.
+    """
+
+    name: str
+    routes: Dict[str, Route]
+    before: Optional[Callable[[Dict[str, str], object, Route], Optional[dict]]] = None
+    _resolved: Dict[str, Callable] = field(default_factory=dict, repr=False)
+
+    def resolve(self, route: Route) -> Callable:
+        """Import (once) and return the tool function behind *route*."""
+        fn = self._resolved.get(route.target)
+        if fn is None:
+            module_name, _, attr = route.target.partition(":")
+            fn = getattr(importlib.import_module(module_name), attr)
+            self._resolved[route.target] = fn
+        return fn
+
+    def __call__(self, event: dict, context: object = None) -> dict:
+        try:
+            api_path = event.get("apiPath", "")
+            route = self.routes.get(api_path)
+            if route is None:
+                return build_response(event, {"error": f"Unknown apiPath: {api_path}"})
+
+            params = parse_parameters(event)
+            try:
+                kwargs = route.bind(params, context)
+            except KeyError as exc:
+                return build_response(event, {"error": f"Missing required parameter: {exc.args[0]}"})
+            except InvalidParameter as exc:
+                return build_response(event, {"error": str(exc)})
+
+            if self.before is not None:
+                early = self.before(params, context, route)
+                if early is not None:
+                    return build_response(event, early)
+
+            return build_response(event, self.resolve(route)(**kwargs), offload=route.offload)
+        except Exception as exc:
+            print(f"[{self.name}] Unexpected error: {exc}", file=sys.stderr)
+            return build_response(event, {"error": f"Unexpected: {str(exc)}"})
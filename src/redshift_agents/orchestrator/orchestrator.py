@@ -11,14 +11,24 @@ Requirements: FR-1.1, FR-1.2, FR-1.3, FR-1.4, FR-5.5, FR-6.1-FR-6.6,
 """
 from __future__ import annotations
 
+import codecs
 import json
 import os
-from typing import Dict
+import random
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import boto3
 
 from ..tools.audit_logger import emit_audit_event
-from ..tools.cluster_lock import acquire_lock, release_lock
+from ..tools.cluster_lock import (
+    LeaseHeartbeat, acquire_lock, acquire_locks, release_lock, release_locks, renew_lock,
+)
+from ..tools.redshift_tools import assess_cluster, get_statement_result
+from ..tools import result_cache
 
 # ---------------------------------------------------------------------------
 # Subagent IDs (set after CDK deployment)
@@ -34,6 +44,64 @@ EXECUTION_AGENT_ID = os.getenv(
     "EXECUTION_AGENT_ID", "redshift-execution-subagent"
 )
 
+# ---------------------------------------------------------------------------
+# Fleet assessment fan-out (assess_clusters)
+# ---------------------------------------------------------------------------
+
+FANOUT_MAX_WORKERS = int(os.getenv("ASSESSMENT_FANOUT_MAX_WORKERS", "8"))
+# InvokeAgent has a low per-account request quota; subagent calls are
+# started no faster than this, whatever the worker count
+SUBAGENT_INVOKES_PER_SECOND = float(os.getenv("SUBAGENT_INVOKES_PER_SECOND", "2"))
+# Long enough for a subagent assessment, so the lock does not need renewing
+FANOUT_LEASE_SECONDS = int(os.getenv("ASSESSMENT_FANOUT_LEASE_SECONDS", "900"))
+THROTTLE_MAX_ATTEMPTS = int(os.getenv("ASSESSMENT_FANOUT_MAX_ATTEMPTS", "4"))
+THROTTLE_BACKOFF_BASE_SECONDS = 1.0
+THROTTLE_BACKOFF_MAX_SECONDS = 20.0
+
+_THROTTLE_MARKERS = ("throttl", "too many requests", "rate exceeded", "toomanyrequests")
+
+
+def _collect_completion(
+    completion: Iterable[Dict],
+    started: float,
+    on_chunk: Optional[Callable[[str], None]] = None,
+) -> Tuple[str, Dict]:
+    """Assemble an InvokeAgent completion stream into text.
+
+    Chunk bytes are decoded incrementally, so a multi-byte UTF-8 character
+    split across two chunks is decoded intact, and the text pieces are
+    joined once at the end.  Returns ``(text, stats)`` where *stats* holds
+    the timing and size fields of the ``subagent_response`` audit event.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    parts = []
+    chunk_count = 0
+    response_bytes = 0
+    first_chunk_ms = None
+    for event in completion:
+        if "chunk" not in event:
+            continue
+        data = event["chunk"].get("bytes", b"")
+        if first_chunk_ms is None:
+            first_chunk_ms = round((time.perf_counter() - started) * 1000, 1)
+        chunk_count += 1
+        response_bytes += len(data)
+        text = decoder.decode(data)
+        if text:
+            parts.append(text)
+            if on_chunk is not None:
+                on_chunk(text)
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        parts.append(tail)
+        if on_chunk is not None:
+            on_chunk(tail)
+    return "".join(parts), {
+        "time_to_first_chunk_ms": first_chunk_ms,
+        "chunk_count": chunk_count,
+        "response_bytes": response_bytes,
+    }
+
 
 def _invoke_subagent(
     agent_id: str,
@@ -43,13 +111,60 @@ def _invoke_subagent(
     user_id: str,
     customer_account_id: str,
     region: str,
+    on_chunk: Optional[Callable[[str], None]] = None,
+    cacheable: bool = False,
+    force_refresh: bool = False,
+    cluster_id: str = "",
 ) -> Dict:
 
     """Invoke a subagent via Bedrock Agent Runtime InvokeAgent API.
 
     Emits an audit event for delegation logging (FR-5.5) and propagates
-    identity (NFR-7.1).
+    identity (NFR-7.1).  *on_chunk*, if given, is called with each piece
+    of response text as it arrives; the ``subagent_response`` audit event
+    records time to first chunk, total duration and byte counts.
+
+    With *cacheable*, and ``SUBAGENT_CACHE_TTL_SECONDS`` set, a successful
+    response is memoized under a hash of ``(agent_id, message, payload,
+    user_id, customer_account_id)`` -- the subagent runs as the user, so a
+    memo is never shared between users or accounts -- in the cluster's
+    result cache partition (*cluster_id*, defaulting to
+    ``payload["cluster_id"]``).  Without a cluster the response is not
+    memoized, since nothing could invalidate it.  An identical call within
+    the TTL returns it with ``"cached": True`` and a ``subagent_cache_hit``
+    audit event; *force_refresh* skips the lookup and replaces the entry.
     """
+    cluster_id = cluster_id or payload.get("cluster_id", "")
+    cache_key = None
+    if cacheable and cluster_id and result_cache.TOOL_TTLS["subagent_response"] > 0:
+        cache_key = result_cache.cache_key(
+            "subagent_response", cluster_id, region, user_id,
+            agent_id=agent_id, message=message, payload=payload,
+            customer_account_id=customer_account_id,
+        )
+        cached = None if force_refresh else result_cache.get_cached(cache_key)
+        if cached is not None:
+            # Delegation outcomes (this and subagent_response) are kept
+            # even when tool_invocation events are sampled
+            emit_audit_event(
+                event_type="tool_invocation",
+                agent_name="orchestrator",
+                customer_account_id=customer_account_id,
+                initiated_by=user_id,
+                cluster_id=cluster_id,
+                region=region,
+                details={
+                    "action": "subagent_cache_hit",
+                    "subagent_name": agent_name,
+                    "subagent_id": agent_id,
+                    "cache_key": cache_key[1],
+                },
+                sampled=False,
+            )
+            if on_chunk is not None and cached.get("response"):
+                on_chunk(cached["response"])
+            return {**cached, "cached": True}
+
     input_payload = {
         "message": message,
         "user_id": user_id,
@@ -63,7 +178,7 @@ def _invoke_subagent(
         agent_name="orchestrator",
         customer_account_id=customer_account_id,
         initiated_by=user_id,
-        cluster_id=payload.get("cluster_id", ""),
+        cluster_id=cluster_id,
         region=region,
         details={
             "action": "invoke_subagent",
@@ -73,20 +188,19 @@ def _invoke_subagent(
         },
     )
 
+    input_text = json.dumps(input_payload)
+    started = time.perf_counter()
     try:
         client = boto3.client("bedrock-agent-runtime", region_name=region)
         response = client.invoke_agent(
             agentId=agent_id,
-            inputText=json.dumps(input_payload),
+            inputText=input_text,
         )
 
-        result_text = ""
-        if "completion" in response:
-            for event in response["completion"]:
-                if "chunk" in event:
-                    result_text += event["chunk"].get("bytes", b"").decode(
-                        "utf-8", errors="replace"
-                    )
+        result_text, stream_stats = _collect_completion(
+            response.get("completion", ()), started, on_chunk,
+        )
+        duration_ms = round((time.perf_counter() - started) * 1000, 1)
 
         result_summary = result_text[:500] if result_text else "No response"
 
@@ -95,20 +209,27 @@ def _invoke_subagent(
             agent_name="orchestrator",
             customer_account_id=customer_account_id,
             initiated_by=user_id,
-            cluster_id=payload.get("cluster_id", ""),
+            cluster_id=cluster_id,
             region=region,
             details={
                 "action": "subagent_response",
                 "subagent_name": agent_name,
                 "result_summary": result_summary,
+                "duration_ms": duration_ms,
+                "request_bytes": len(input_text.encode("utf-8")),
+                **stream_stats,
             },
+            sampled=False,
         )
 
-        return {
+        result = {
             "subagent": agent_name,
             "response": result_text,
             "status": "success",
         }
+        if cache_key is not None:
+            result_cache.put_cached("subagent_response", cache_key, result)
+        return result
     except Exception as exc:
         error_msg = str(exc)
         emit_audit_event(
@@ -116,12 +237,13 @@ def _invoke_subagent(
             agent_name="orchestrator",
             customer_account_id=customer_account_id,
             initiated_by=user_id,
-            cluster_id=payload.get("cluster_id", ""),
+            cluster_id=cluster_id,
             region=region,
             details={
                 "action": "invoke_subagent",
                 "subagent_name": agent_name,
                 "error": error_msg,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
             },
         )
         return {
@@ -132,10 +254,17 @@ def _invoke_subagent(
 
 
 
+def invalidate_subagent_cache(cluster_id: str, region: str = "") -> None:
+    """Drop memoized subagent responses (and cached tool results) for *cluster_id*."""
+    result_cache.invalidate_cluster(cluster_id, region)
+
+
 def invoke_assessment(
     cluster_id: str, region: str, customer_account_id: str, user_id: str,
+    on_chunk: Optional[Callable[[str], None]] = None,
+    force_refresh: bool = False,
 ) -> Dict:
-    """Invoke the assessment subagent."""
+    """Invoke the assessment subagent (memoized, see ``_invoke_subagent``)."""
     return _invoke_subagent(
         agent_id=ASSESSMENT_AGENT_ID, agent_name="assessment",
         message=f"Analyze Redshift cluster {cluster_id} in {region}. "
@@ -143,41 +272,310 @@ def invoke_assessment(
         f"and identify contention problems.",
         payload={"cluster_id": cluster_id},
         user_id=user_id, customer_account_id=customer_account_id, region=region,
+        on_chunk=on_chunk, cacheable=True, force_refresh=force_refresh,
     )
 
 
 def invoke_architecture(
     assessment_results: str, region: str, customer_account_id: str, user_id: str,
+    on_chunk: Optional[Callable[[str], None]] = None,
+    force_refresh: bool = False,
+    cluster_id: str = "",
 ) -> Dict:
-    """Invoke the architecture subagent."""
+    """Invoke the architecture subagent (memoized, see ``_invoke_subagent``).
+
+    *cluster_id* only selects the cache partition, so the memo is dropped
+    when that cluster is invalidated; without it the call is not memoized.
+    """
     return _invoke_subagent(
         agent_id=ARCHITECTURE_AGENT_ID, agent_name="architecture",
         message="Design Serverless workgroup architecture based on assessment results. "
         "Propose workgroup split, RPU sizing (minimum 32), and architecture pattern.",
         payload={"assessment_results": assessment_results},
         user_id=user_id, customer_account_id=customer_account_id, region=region,
+        on_chunk=on_chunk, cacheable=True, force_refresh=force_refresh, cluster_id=cluster_id,
     )
 
 
 def invoke_execution(
     architecture_results: str, region: str, customer_account_id: str, user_id: str,
+    cluster_id: str, fencing_token: int,
+    on_chunk: Optional[Callable[[str], None]] = None,
 ) -> Dict:
-    """Invoke the execution subagent."""
-    return _invoke_subagent(
-        agent_id=EXECUTION_AGENT_ID, agent_name="execution",
-        message="Execute migration plan based on architecture design. "
-        "Create namespace/workgroups, restore snapshot, set up data sharing, "
-        "migrate users, and validate performance.",
-        payload={"architecture_results": architecture_results},
-        user_id=user_id, customer_account_id=customer_account_id, region=region,
+    """Invoke the execution subagent under the caller's cluster lock.
+
+    *fencing_token* goes to the subagent with the plan, for the fenced
+    execution tools; a ``LeaseHeartbeat`` keeps the lease alive while the
+    subagent runs, which can take longer than a lease.  If the lock is lost
+    meanwhile, the result carries ``"lock_lost": True``.
+
+    Never memoized.  Execution changes the source cluster, so memoized
+    assessment and architecture responses for *cluster_id* are dropped.
+    """
+    if not cluster_id:
+        return {"subagent": "execution", "error": "cluster_id is required", "status": "failed"}
+    with LeaseHeartbeat(cluster_id, user_id, fencing_token, region) as heartbeat:
+        result = _invoke_subagent(
+            agent_id=EXECUTION_AGENT_ID, agent_name="execution",
+            message="Execute migration plan based on architecture design. "
+            "Create namespace/workgroups, restore snapshot, set up data sharing, "
+            "migrate users, and validate performance.",
+            payload={
+                "architecture_results": architecture_results,
+                "cluster_id": cluster_id,
+                "fencing_token": int(fencing_token),
+            },
+            user_id=user_id, customer_account_id=customer_account_id, region=region,
+            on_chunk=on_chunk,
+        )
+    if heartbeat.lost.is_set():
+        result["lock_lost"] = True
+    invalidate_subagent_cache(cluster_id, region)
+    return result
+
+
+class _RateLimiter:
+    """Spaces calls at least ``1 / rate`` seconds apart across threads."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def _is_throttled(result: Dict) -> bool:
+    """True if *result* failed, wholly or in any section, on a throttle."""
+    messages = [result.get("error", "")]
+    messages.extend((result.get("errors") or {}).values())
+    return any(
+        marker in str(message).lower()
+        for message in messages if message
+        for marker in _THROTTLE_MARKERS
     )
 
 
+def _throttle_backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff before retry *attempt*."""
+    return random.uniform(0, min(THROTTLE_BACKOFF_MAX_SECONDS, THROTTLE_BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+def _assess_one(
+    cluster_id: str,
+    region: str,
+    customer_account_id: str,
+    user_id: str,
+    use_subagent: bool,
+    hours: int,
+    limiter: _RateLimiter,
+) -> Dict:
+    """Lock, assess and unlock one cluster of an ``assess_clusters`` run."""
+    started = time.perf_counter()
+    try:
+        outcome = _lock_and_assess(cluster_id, region, customer_account_id, user_id, use_subagent, hours, limiter)
+    except Exception as e:
+        # One cluster's failure must not end the rest of the fleet run
+        print(f"[orchestrator] Assessment of {cluster_id} failed: {e}", file=sys.stderr)
+        outcome = {"cluster_id": cluster_id, "status": "failed", "error": str(e)}
+    outcome["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return outcome
+
+
+def _lock_and_assess(
+    cluster_id: str,
+    region: str,
+    customer_account_id: str,
+    user_id: str,
+    use_subagent: bool,
+    hours: int,
+    limiter: _RateLimiter,
+) -> Dict:
+    lock = acquire_lock(cluster_id, user_id, region, lease_seconds=FANOUT_LEASE_SECONDS)
+    if not lock.get("acquired"):
+        return {
+            "cluster_id": cluster_id,
+            "status": "failed" if "error" in lock else "skipped",
+            "lock": lock,
+        }
+
+    try:
+        for attempt in range(max(1, THROTTLE_MAX_ATTEMPTS)):
+            if attempt:
+                time.sleep(_throttle_backoff(attempt))
+            if use_subagent:
+                limiter.wait()
+                result = invoke_assessment(cluster_id, region, customer_account_id, user_id)
+            else:
+                result = assess_cluster(cluster_id, region, user_id, hours=hours)
+            if not _is_throttled(result):
+                break
+        if "wlm_statement" in result:
+            _resume_wlm_section(result, cluster_id, region, user_id)
+    finally:
+        release_lock(cluster_id, user_id, region)
+
+    outcome = {
+        "cluster_id": cluster_id,
+        "status": "failed" if "error" in result else "success",
+        "attempts": attempt + 1,
+        "result": result,
+    }
+    if "wlm_statement" in result:
+        outcome["wlm_statement"] = result["wlm_statement"]
+    return outcome
+
+
+def _resume_wlm_section(result: Dict, cluster_id: str, region: str, user_id: str) -> None:
+    """Wait once more for the WLM query ``assess_cluster`` handed back unfinished.
+
+    Fills in ``wlm_queue_analysis`` (or ``errors``) in place; a query still
+    running after that leaves its new handle under ``wlm_statement``.
+    """
+    wlm = get_statement_result(
+        result.pop("wlm_statement")["statement_id"], cluster_id, region, "wlm_queues", user_id,
+    )
+    if wlm.get("resumable"):
+        result["wlm_statement"] = wlm
+    elif "error" in wlm:
+        result.setdefault("errors", {})["wlm_queue_analysis"] = wlm["error"]
+    else:
+        result["wlm_queue_analysis"] = wlm.get("wlm_queues", [])
+
+
+def iter_assess_clusters(
+    cluster_ids: Union[str, Iterable[str]],
+    region: str,
+    customer_account_id: str,
+    user_id: str,
+    use_subagent: bool = False,
+    hours: int = 24,
+    max_workers: int = FANOUT_MAX_WORKERS,
+) -> Iterator[Dict]:
+    """Assess many clusters concurrently, yielding each outcome as it completes.
+
+    Each cluster is locked for the duration of its own assessment and
+    released straight after, so a fleet review only holds as many locks as
+    it has workers.  A cluster someone else holds is reported as
+    ``"skipped"`` with the holder under ``lock`` rather than waited for (a
+    lock table error makes it ``"failed"``).
+
+    With *use_subagent* every cluster goes through the Assessment subagent
+    (``invoke_assessment``), started at most ``SUBAGENT_INVOKES_PER_SECOND``;
+    otherwise the ``assess_cluster`` tool bundle runs directly, one Data API
+    statement per worker.  Results that failed on a Bedrock or Data API
+    throttle are retried with jittered backoff, up to
+    ``THROTTLE_MAX_ATTEMPTS`` times.  A WLM query that outlives
+    ``assess_cluster``'s wait is resumed once before the lock is released.
+    An exception assessing one cluster is reported as its ``"failed"``
+    outcome and the rest of the fleet carries on.
+
+    Yields:
+        ``{"cluster_id", "status", "elapsed_ms", ...}`` where ``status`` is
+        ``"success"``, ``"failed"`` or ``"skipped"``; assessed clusters add
+        ``result`` and ``attempts``, clusters whose assessment raised add
+        ``error``, and a WLM query still running after the resume leaves
+        its resumable handle (see ``get_statement_result``) under
+        ``wlm_statement``.
+    """
+    if isinstance(cluster_ids, str):
+        cluster_ids = cluster_ids.split(",")
+    ids = list(dict.fromkeys(c.strip() for c in cluster_ids if c.strip()))
+    if not ids:
+        return
+
+    emit_audit_event(
+        event_type="tool_invocation",
+        agent_name="orchestrator",
+        customer_account_id=customer_account_id,
+        initiated_by=user_id,
+        region=region,
+        details={
+            "action": "assess_clusters",
+            "cluster_ids": ids,
+            "use_subagent": use_subagent,
+            "max_workers": max_workers,
+        },
+    )
+
+    limiter = _RateLimiter(SUBAGENT_INVOKES_PER_SECOND)
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(ids))))
+    pending = {
+        pool.submit(_assess_one, cluster_id, region, customer_account_id, user_id, use_subagent, hours, limiter)
+        for cluster_id in ids
+    }
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        # A consumer that stops early cancels clusters not yet started;
+        # running ones finish and release their locks
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=True)
+
+
+def assess_clusters(
+    cluster_ids: Union[str, Iterable[str]],
+    region: str,
+    customer_account_id: str,
+    user_id: str,
+    use_subagent: bool = False,
+    hours: int = 24,
+    max_workers: int = FANOUT_MAX_WORKERS,
+    on_result: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
+    """Assess a fleet of clusters and collect the outcomes.
+
+    Runs ``iter_assess_clusters``; *on_result*, if given, is called with
+    each cluster outcome as it completes.
+
+    Returns:
+        ``{"clusters": {cluster_id: outcome}, "succeeded", "failed",
+        "skipped", "elapsed_ms"}``.
+    """
+    started = time.perf_counter()
+    outcomes: Dict[str, Dict] = {}
+    for outcome in iter_assess_clusters(
+        cluster_ids, region, customer_account_id, user_id,
+        use_subagent=use_subagent, hours=hours, max_workers=max_workers,
+    ):
+        outcomes[outcome["cluster_id"]] = outcome
+        if on_result is not None:
+            on_result(outcome)
+
+    def with_status(status: str) -> List[str]:
+        return sorted(c for c, o in outcomes.items() if o["status"] == status)
+
+    return {
+        "clusters": outcomes,
+        "succeeded": with_status("success"),
+        "failed": with_status("failed"),
+        "skipped": with_status("skipped"),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
 def acquire_cluster_lock(
-    cluster_id: str, user_id: str, region: str = "",
+    cluster_id: str, user_id: str, region: str = "", wait_seconds: float = 0,
 ) -> Dict:
-    """Acquire a cluster-level lock before starting workflow."""
-    return acquire_lock(cluster_id, user_id, region)
+    """Acquire a cluster-level lock before starting workflow, optionally waiting in line."""
+    return acquire_lock(cluster_id, user_id, region, wait_seconds=wait_seconds)
+
+
+def renew_cluster_lock(
+    cluster_id: str, user_id: str, fencing_token: int, region: str = "",
+) -> Dict:
+    """Extend the cluster lock lease while the workflow is still running."""
+    return renew_lock(cluster_id, user_id, fencing_token, region)
 
 
 def release_cluster_lock(
@@ -187,6 +585,20 @@ def release_cluster_lock(
     return release_lock(cluster_id, user_id, region)
 
 
+def acquire_cluster_locks(
+    cluster_ids: str, user_id: str, region: str = "",
+) -> Dict:
+    """Atomically lock every source cluster of a consolidation migration."""
+    return acquire_locks(cluster_ids, user_id, region)
+
+
+def release_cluster_locks(
+    cluster_ids: str, user_id: str, region: str = "",
+) -> Dict:
+    """Release the locks taken with ``acquire_cluster_locks``."""
+    return release_locks(cluster_ids, user_id, region)
+
+
 
 # ---------------------------------------------------------------------------
 # System prompt -- covers all orchestrator responsibilities
@@ -213,6 +625,7 @@ Do NOT proceed with any workflow step without a valid `user_id`.
 3. Acquire a cluster lock using `acquire_cluster_lock(cluster_id, user_id, region)`.
    - If the lock is denied, inform the user who holds the lock and when it was acquired.
    - Do NOT proceed if the lock cannot be acquired.
+   - Remember the returned `fencing_token`.
 4. Invoke `invoke_assessment(cluster_id, region, customer_account_id, user_id)`.
 5. Present the assessment results (WLM queue analysis, contention findings) to the user.
 
@@ -225,7 +638,7 @@ Do NOT proceed with any workflow step without a valid `user_id`.
 - You MUST NOT invoke `invoke_architecture` without explicit user approval.
 
 ### Phase 2: Architecture Design
-1. Invoke `invoke_architecture(assessment_results, region, customer_account_id, user_id)`.
+1. Invoke `invoke_architecture(assessment_results, region, customer_account_id, user_id, cluster_id=cluster_id)`.
 2. Present the proposed architecture (workgroup split, RPU sizing, cost estimates) to the user.
 
 ### Gate 2: Architecture to Execution Approval
@@ -237,7 +650,9 @@ Do NOT proceed with any workflow step without a valid `user_id`.
 - You MUST NOT invoke `invoke_execution` without explicit user approval.
 
 ### Phase 3: Migration Execution
-1. Invoke `invoke_execution(architecture_results, region, customer_account_id, user_id)`.
+1. Invoke `invoke_execution(architecture_results, region, customer_account_id, user_id, cluster_id, fencing_token)`.
+   The lease is renewed automatically while execution runs; if the result reports `lock_lost`,
+   tell the user another workflow may have taken over the cluster.
 2. Present the execution results (migration status, validation results) to the user.
 3. Release the cluster lock using `release_cluster_lock(cluster_id, user_id, region)`.
 
@@ -248,7 +663,22 @@ Do NOT proceed with any workflow step without a valid `user_id`.
 - If lock acquisition fails, inform the user:
   "Cluster {cluster_id} is currently locked by {lock_holder} since {acquired_at}.
    Please wait for the other workflow to complete or contact {lock_holder}."
+- If the user wants to wait, call `acquire_cluster_lock` once with `wait_seconds` (up to 20)
+  instead of retrying it yourself. Waiters are queued in arrival order; if the wait runs
+  out, tell the user their `queue_position` of `queue_length` and offer to wait again.
 - On any error or workflow termination, release the lock before stopping.
+- The lock is a short lease (`lease_expires_at`), not a 24-hour hold. Renew it with
+  `renew_cluster_lock(cluster_id, user_id, fencing_token, region)` before each phase and
+  after every approval gate. If renewal reports the lock lost, stop and tell the user —
+  another workflow may now own the cluster.
+- Always pass the `fencing_token` to `invoke_execution`; execution tools reject calls made
+  under a stale token.
+- Consolidation migrations that touch several source clusters MUST lock them all at once
+  with `acquire_cluster_locks(cluster_ids, user_id, region)` (comma-separated IDs), never
+  one by one. Either every cluster is locked or none is; on contention report each entry
+  in `conflicts`. Each cluster gets its own `fencing_token` in `locks`; renew each lease
+  with `renew_cluster_lock` and release them together with
+  `release_cluster_locks(cluster_ids, user_id, region)`.
 
 ## Approval Gate Rules (FR-6.2, FR-6.4, FR-6.6)
 
@@ -20,9 +20,13 @@ a multi-warehouse Serverless architecture is needed.
 
 ### Step 1: Cluster Discovery (FR-2.1)
 - If no cluster is specified, call `list_redshift_clusters` to list all Provisioned clusters
-  in the customer's account and region.
+  in the customer's account and region. If the user does not know the region, pass
+  `regions="all"` to scan every enabled region and report any regions that failed.
 - Present the list and let the user select which cluster to assess.
 - If a cluster is already specified, proceed directly to analysis.
+- Prefer `assess_cluster`, which runs Steps 2–4 concurrently in one call and returns
+  `cluster_summary`, `cloudwatch_metrics` and `wlm_queue_analysis` together. Only call the
+  individual tools below to retry a section listed under `errors`.
 
 ### Step 2: Cluster Configuration Analysis (FR-2.2)
 - Call `analyze_redshift_cluster` with the selected cluster ID and region.
@@ -33,6 +37,8 @@ a multi-warehouse Serverless architecture is needed.
 - Call `get_cluster_metrics` with the cluster ID and region.
 - Retrieve metrics for: CPUUtilization, DatabaseConnections, NetworkReceiveThroughput,
   NetworkTransmitThroughput, PercentageDiskSpaceUsed, ReadLatency, WriteLatency.
+- Use the p95/p99 summaries and the `series` time series to spot sustained peaks
+  that a 24-hour average hides.
 - Summarize trends and highlight any metrics in warning or critical ranges.
 
 ### Step 4: WLM Queue Analysis (FR-2.4, FR-2.5)
@@ -92,10 +98,17 @@ a multi-warehouse Serverless architecture is needed.
 ```
 
 ## Guidelines
-- Always use all four tools to gather complete information before producing output.
+- Always gather cluster configuration, CloudWatch metrics and WLM data before producing output
+  (one `assess_cluster` call covers all three).
 - Be specific: cite actual metric values when describing contention.
 - Every finding should clearly connect to why Serverless migration is beneficial.
 - If a tool returns an error, report it and continue with available data.
+- If `get_wlm_configuration` returns `resumable: true` (or `assess_cluster` returns a
+  `wlm_statement`), the query is still running — call
+  `getStatementResult` with the returned `statement_id` and `result_format` to collect it.
+- If a tool returns `offloaded: true`, the full result was too large to return and was stored;
+  work from the summary and `preview`, and call `fetchResultPage` with the `result_id` and
+  `page` (1 to `page_count`) only for the pages you actually need.
 - Always propagate the user_id parameter to every tool call for audit traceability.
 
 ## Reference: Cluster Analysis Guide
@@ -18,6 +18,14 @@ Serverless infrastructure, restore data, configure data sharing, plan user migra
 performance, define rollback procedures at every step, and plan a minimal/zero downtime cutover.
 Your output is a structured JSON document matching the ExecutionResult schema.
 
+## Cluster Lock Fencing
+
+The orchestrator passes the cluster lock's `fencing_token` with the architecture results. Pass it
+as `fencing_token`, together with the source cluster's `cluster_id`, on every call that creates or
+changes resources: `createClusterSnapshot`, `executeRedshiftQuery`, `createServerlessNamespace`,
+`createServerlessWorkgroup`, `restoreSnapshotToServerless` and `setupDataSharing`. Calls without
+them are rejected. If a call is rejected as a stale cluster lock, stop immediately and report it.
+
 ## Workflow
 
 ### Step 1: Create Snapshot of Provisioned Cluster
@@ -48,6 +56,8 @@ Your output is a structured JSON document matching the ExecutionResult schema.
 ### Step 3: Set Up Data Sharing (FR-4.3)
 - If the architecture pattern is hub-and-spoke (data_sharing.enabled = true):
   - Call `setup_data_sharing` with the producer workgroup and consumer workgroups.
+  - Check that every entry in `statements` has status FINISHED; a failed statement rolls
+    back the whole transaction, so report its `error` and treat the step as failed.
   - Validate data sharing by running a test query from a consumer workgroup.
   - Record rollback procedure: "Revoke datashare grants, drop datashare".
 - If the architecture pattern is independent or hybrid without data sharing, skip this step.
@@ -148,6 +158,13 @@ Produce your final output as structured JSON matching the ExecutionResult schema
 - Every step must have a rollback procedure — no exceptions.
 - Be specific: cite actual resource names, RPU values, and query results.
 - If a tool returns an error, record the failure, execute rollback for that step, and report to the user.
+- If `execute_redshift_query` returns `resumable: true`, the query is still running — call
+  `getStatementResult` with the returned `statement_id` to collect the results. This is not a failure.
+- If a tool returns `offloaded: true`, the full result was too large to return and was stored;
+  work from the summary and `preview`, and call `fetchResultPage` with the `result_id` and
+  `page` (1 to `page_count`) only for the pages you actually need.
+- Pass `result_format="dicts"` to `execute_redshift_query` when you need to read values by
+  column name (e.g. validation counts); numeric columns come back as exact strings.
 - Always propagate the user_id parameter to every tool call for audit traceability.
 - If data sharing is not needed (independent/hybrid pattern), explicitly set `data_sharing_configured` to false.
 
@@ -3,19 +3,34 @@ Shared test configuration and helpers for Bedrock Agents Lambda handler tests.
 
 Provides ``build_action_group_event`` and ``parse_response_body`` helpers
 used across all test files to construct Bedrock Agent action group invocation
-events and parse Lambda handler responses.
+events and parse Lambda handler responses, and the ``held_lock`` fixture for
+calls to fenced execution routes.
 """
 from __future__ import annotations
 
 import json
 import os
 import sys
+from unittest.mock import patch
+
+import pytest
 
 # Add src/ to sys.path so the full ``redshift_agents`` package is importable
 _src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 if _src_dir not in sys.path:
     sys.path.insert(0, _src_dir)
 
+# Tests patch ``boto3.client`` with a fresh mock per case; a process-wide
+# client pool would hand back the mock from an earlier case.  Pool behaviour
+# itself is covered in test_client_pool.py.
+os.environ.setdefault("AWS_CLIENT_POOL_ENABLED", "false")
+# Likewise a result cache would replay results across cases that reuse a
+# cluster ID; it is covered in test_result_cache.py.
+os.environ.setdefault("RESULT_CACHE_BACKEND", "none")
+# Handler tests check full tool results; large-result offload is covered in
+# test_result_store.py.
+os.environ.setdefault("RESPONSE_MAX_BYTES", "100000000")
+
 
 def build_action_group_event(
     api_path: str,
@@ -65,3 +80,24 @@ def parse_response_body(response: dict):
     """
     body_str = response["response"]["responseBody"]["application/json"]["body"]
     return json.loads(body_str)
+
+
+# Fenced execution routes take the lock's token; ``held_lock`` accepts it.
+FENCING_TOKEN = 7
+
+
+def held_lock_patch():
+    """Patch the execution handler's fencing check to accept every token."""
+    return patch(
+        "tools.cluster_lock.check_fencing_token",
+        side_effect=lambda cluster_id, fencing_token, **kwargs: {
+            "valid": True, "cluster_id": cluster_id, "fencing_token": fencing_token,
+        },
+    )
+
+
+@pytest.fixture()
+def held_lock():
+    """The caller holds the cluster lock; fencing checks pass."""
+    with held_lock_patch() as check:
+        yield check
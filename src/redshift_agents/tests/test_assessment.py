@@ -5,6 +5,7 @@ Validates: Requirements 11.1, 11.5
 """
 from __future__ import annotations
 
+from datetime import datetime
 from unittest.mock import Mock, patch
 
 from redshift_agents.lambdas.assessment_handler import handler as assessment_handler
@@ -78,8 +79,10 @@ class TestAssessmentHandlerDispatch:
     @patch("boto3.client")
     def test_get_cluster_metrics(self, mock_boto3, mock_audit):
         mock_client = Mock()
-        mock_client.get_metric_statistics.return_value = {
-            "Datapoints": [{"Average": 50.0, "Maximum": 80.0, "Minimum": 20.0}]
+        mock_client.get_metric_data.return_value = {
+            "MetricDataResults": [
+                {"Id": "m0s0", "Timestamps": [datetime(2024, 1, 1)], "Values": [50.0]},
+            ]
         }
         mock_boto3.return_value = mock_client
 
@@ -92,7 +95,7 @@ class TestAssessmentHandlerDispatch:
         assert "metrics" in result
         assert result["cluster_id"] == "c1"
 
-    @patch("redshift_agents.tools.redshift_tools.time.sleep")
+    @patch("redshift_agents.tools.data_api.time.sleep")
     @patch("redshift_agents.tools.redshift_tools.emit_audit_event")
     @patch("boto3.client")
     def test_get_wlm_configuration(self, mock_boto3, mock_audit, mock_sleep):
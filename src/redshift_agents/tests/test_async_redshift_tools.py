@@ -0,0 +1,194 @@
+"""
+Tests for the asyncio counterparts of the Redshift tools.
+
+Validates: signatures matching the sync tools, the awaitable Data API poller,
+async pagination, resumable handles, concurrent fan-out that does not hold
+a thread per waiting query, and result shapes identical to the sync tools.
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+
+from redshift_agents.tools import async_redshift_tools as aio
+
+_sync = aio._sync
+
+_TOOLS = [
+    "analyze_redshift_cluster", "get_cluster_metrics", "list_redshift_clusters",
+    "get_wlm_configuration", "get_statement_result", "assess_cluster",
+    "create_cluster_snapshot", "create_serverless_namespace", "create_serverless_workgroup",
+    "execute_redshift_query", "setup_data_sharing", "restore_snapshot_to_serverless",
+]
+
+
+@pytest.fixture(autouse=True)
+def no_audit():
+    with patch.object(aio, "emit_audit_event"), patch.object(_sync, "emit_audit_event"):
+        yield
+
+
+def _wlm_client(statuses=("FINISHED",)):
+    client = Mock()
+    client.describe_clusters.return_value = {
+        'Clusters': [{
+            'ClusterIdentifier': 'c1', 'NodeType': 'ra3.4xlarge',
+            'NumberOfNodes': 2, 'ClusterStatus': 'available',
+        }]
+    }
+    client.get_metric_data.return_value = {
+        'MetricDataResults': [{'Id': 'm0s0', 'Timestamps': [datetime(2024, 1, 1)], 'Values': [40.0]}],
+    }
+    client.execute_statement.return_value = {'Id': 'stmt-1'}
+    client.describe_statement.side_effect = [{'Status': s} for s in statuses]
+    client.get_statement_result.return_value = {
+        'Records': [[
+            {'stringValue': 'etl'}, {'longValue': 6}, {'longValue': 5}, {'longValue': 0},
+            {'doubleValue': 1.0}, {'doubleValue': 2.0}, {'doubleValue': 0.5},
+            {'longValue': 0}, {'doubleValue': 0.0}, {'doubleValue': 10.0},
+        ]]
+    }
+    return client
+
+
+class TestSignatures:
+    @pytest.mark.parametrize("name", _TOOLS)
+    def test_every_tool_has_a_matching_coroutine(self, name):
+        tool = getattr(aio, name)
+
+        assert inspect.iscoroutinefunction(tool)
+        assert inspect.signature(tool) == inspect.signature(getattr(_sync, name))
+
+
+class TestPollerAndPagination:
+    def test_poller_awaits_until_terminal(self):
+        client = _wlm_client(("SUBMITTED", "STARTED", "FINISHED"))
+
+        desc = asyncio.run(aio.wait_for_statement_async(client, "stmt-1", 5, initial_interval=0.001))
+
+        assert desc == {'Status': 'FINISHED'}
+        assert client.describe_statement.call_count == 3
+
+    def test_pages_follow_tokens(self):
+        client = Mock()
+        client.describe_clusters.side_effect = [
+            {'Clusters': [1], 'Marker': 'm1'}, {'Clusters': [2]},
+        ]
+
+        async def collect():
+            return [p async for p in aio.aiter_pages(client.describe_clusters, "Marker", MaxRecords=100)]
+
+        pages = asyncio.run(collect())
+
+        assert [p['Clusters'] for p in pages] == [[1], [2]]
+        assert client.describe_clusters.call_args_list[1].kwargs == {'MaxRecords': 100, 'Marker': 'm1'}
+
+    def test_statement_records_span_pages(self):
+        client = Mock()
+        client.get_statement_result.side_effect = [
+            {'Records': [['a']], 'NextToken': 't'}, {'Records': [['b'], ['c']]},
+        ]
+
+        async def collect():
+            return [r async for r in aio.aiter_statement_records(client, "stmt-1")]
+
+        assert asyncio.run(collect()) == [['a'], ['b'], ['c']]
+
+
+class TestAsyncTools:
+    @patch('boto3.client')
+    def test_wlm_matches_sync_shape(self, mock_boto3):
+        mock_boto3.return_value = _wlm_client(("FINISHED", "FINISHED"))
+
+        result = asyncio.run(aio.get_wlm_configuration("c1", "us-east-2"))
+        expected = _sync.get_wlm_configuration("c1", "us-east-2")
+
+        assert result.pop("timestamp") and expected.pop("timestamp")
+        assert result == expected
+        assert result["wlm_queues"][0]["queue_name"] == "etl"
+
+    @patch('boto3.client')
+    def test_running_query_returns_resumable_handle(self, mock_boto3):
+        mock_boto3.return_value = _wlm_client(("STARTED",))
+
+        result = asyncio.run(aio.execute_redshift_query("c1", "SELECT 1", "us-east-2", max_wait_seconds=0))
+
+        assert result["resumable"] is True
+        assert result["statement_id"] == "stmt-1"
+
+    @patch('boto3.client')
+    def test_cache_and_client_calls_stay_off_the_event_loop(self, mock_boto3):
+        mock_boto3.return_value = _wlm_client(("FINISHED",))
+        loop_threads = set()
+        on_loop = []
+
+        def spy(fn):
+            def wrapper(*args, **kwargs):
+                on_loop.append(threading.get_ident() in loop_threads)
+                return fn(*args, **kwargs)
+            return wrapper
+
+        async def run():
+            loop_threads.add(threading.get_ident())
+            return await aio.get_wlm_configuration("c1", "us-east-2")
+
+        with patch.object(_sync, "get_client", spy(_sync.get_client)), \
+                patch.object(_sync, "get_cached", spy(_sync.get_cached)), \
+                patch.object(_sync, "put_cached", spy(_sync.put_cached)):
+            asyncio.run(run())
+
+        assert len(on_loop) == 3
+        assert not any(on_loop)
+
+    @patch('boto3.client')
+    def test_waiting_queries_do_not_hold_threads(self, mock_boto3):
+        # Each query needs several polls; with two threads, waits holding a
+        # thread would serialize them, so all 20 must overlap on the loop.
+        clients = [_wlm_client(("STARTED", "STARTED", "FINISHED")) for _ in range(20)]
+        clients_iter = iter(clients)
+        mock_boto3.side_effect = lambda *a, **k: next(clients_iter)
+
+        async def run_all():
+            return await asyncio.gather(*(
+                aio.execute_redshift_query(f"c{i}", "SELECT 1", "us-east-2", result_format="dicts")
+                for i in range(20)
+            ))
+
+        with patch.object(aio, "_executor", ThreadPoolExecutor(max_workers=2)):
+            results = asyncio.run(run_all())
+
+        assert all(r["returned_rows"] == 1 for r in results)
+        assert all(c.describe_statement.call_count == 3 for c in clients)
+
+    @patch('boto3.client')
+    def test_assess_cluster_runs_sections_concurrently(self, mock_boto3):
+        mock_boto3.return_value = _wlm_client(("FINISHED",))
+
+        result = asyncio.run(aio.assess_cluster("c1", "us-east-2"))
+
+        assert result["errors"] == {}
+        assert result["cluster_summary"]["node_type"] == "ra3.4xlarge"
+        assert result["wlm_queue_analysis"][0]["queue_name"] == "etl"
+        assert set(result["timings_ms"]) == {
+            "cluster_summary", "cloudwatch_metrics", "wlm_queue_analysis", "total",
+        }
+
+    @patch('boto3.client')
+    def test_multi_region_scan_reports_failures(self, mock_boto3):
+        def client_for(service, region_name=None, **kwargs):
+            client = _wlm_client()
+            if region_name == "eu-west-1":
+                client.describe_clusters.side_effect = Exception("AccessDenied")
+            return client
+        mock_boto3.side_effect = client_for
+
+        result = asyncio.run(aio.list_redshift_clusters("us-east-2", regions="us-east-2,eu-west-1"))
+
+        assert result["cluster_count"] == 1
+        assert result["failed_regions"] == ["eu-west-1"]
@@ -1,24 +1,41 @@
 """
 Tests for audit logger — emit_audit_event as standalone function.
 
+Also covers the memoized account ID lookup and the queue-backed emission
+path (``flush_audit_events``).
+
 Validates: Requirements 6.1, 6.4, 6.5, 14.1, 14.2, 14.5
 """
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import logging.handlers
 import os
+import subprocess
+import sys
+import threading
 from datetime import datetime, timezone
 from unittest.mock import patch, MagicMock
 
 import pytest
 from hypothesis import given, settings, strategies as st
 
+from redshift_agents.tools import audit_logger as audit_module
 from redshift_agents.tools.audit_logger import (
     VALID_EVENT_TYPES,
     emit_audit_event,
+    flush_audit_events,
 )
 
+@pytest.fixture(autouse=True)
+def _fresh_account_id():
+    audit_module._reset_account_id()
+    yield
+    audit_module._reset_account_id()
+
+
 # --- Strategies ---
 
 event_type_st = st.sampled_from(sorted(VALID_EVENT_TYPES))
@@ -228,3 +245,194 @@ def test_details_preserves_provided_dict(audit_capture):
         cluster_id="c", region="us-east-1", details=payload,
     )
     assert audit_capture.records[0].details == payload
+
+
+# --- Memoized account ID ---
+
+@patch.dict(os.environ, {}, clear=True)
+@patch("boto3.client")
+def test_account_id_is_resolved_once(mock_boto_client, audit_capture):
+    mock_boto_client.return_value.get_caller_identity.return_value = {"Account": "sts-acct-456"}
+
+    for _ in range(3):
+        emit_audit_event(event_type="tool_invocation", agent_name="a")
+
+    assert [r.customer_account_id for r in audit_capture.records] == ["sts-acct-456"] * 3
+    assert mock_boto_client.return_value.get_caller_identity.call_count == 1
+
+
+@patch.dict(os.environ, {}, clear=True)
+@patch("boto3.client")
+def test_failed_lookup_is_retried_after_backoff(mock_boto_client, audit_capture):
+    sts = mock_boto_client.return_value
+    sts.get_caller_identity.side_effect = [Exception("throttled"), {"Account": "sts-acct-456"}]
+
+    emit_audit_event(event_type="tool_invocation", agent_name="a")
+    emit_audit_event(event_type="tool_invocation", agent_name="a")
+    later = audit_module.time.monotonic() + audit_module.ACCOUNT_ID_RETRY_SECONDS + 1
+    with patch.object(audit_module.time, "monotonic", return_value=later):
+        emit_audit_event(event_type="tool_invocation", agent_name="a")
+
+    assert [r.customer_account_id for r in audit_capture.records] == [
+        "unknown", "unknown", "sts-acct-456",
+    ]
+    assert sts.get_caller_identity.call_count == 2
+
+
+# --- Queue-backed emission ---
+
+def test_events_are_written_by_background_listener():
+    audit_logger = logging.getLogger("redshift_modernization_audit")
+    queue_handlers = [h for h in audit_logger.handlers if isinstance(h, logging.handlers.QueueHandler)]
+    assert len(queue_handlers) == 1
+
+    written: list[logging.LogRecord] = []
+    writer_threads: set[str] = set()
+
+    class _Recorder(logging.Handler):
+        def emit(self, record):
+            written.append(record)
+            writer_threads.add(threading.current_thread().name)
+
+    listener = logging.handlers.QueueListener(queue_handlers[0].queue, _Recorder())
+    queue_handlers[0].listener.stop()
+    listener.start()
+    try:
+        emit_audit_event(event_type="agent_start", agent_name="a", customer_account_id="1")
+        assert flush_audit_events(timeout=5)
+    finally:
+        listener.stop()
+        queue_handlers[0].listener.start()
+
+    assert [r.event_type for r in written] == ["agent_start"]
+    assert threading.current_thread().name not in writer_threads
+
+
+def test_flush_times_out_when_listener_is_stuck():
+    audit_logger = logging.getLogger("redshift_modernization_audit")
+    (queue_handler,) = [h for h in audit_logger.handlers if isinstance(h, logging.handlers.QueueHandler)]
+    queue_handler.listener.stop()
+    try:
+        emit_audit_event(event_type="agent_start", agent_name="a", customer_account_id="1")
+        assert flush_audit_events(timeout=0.05) is False
+    finally:
+        queue_handler.listener.start()
+    assert flush_audit_events(timeout=5)
+
+
+# --- Bounded payloads ---
+
+def test_large_field_is_fingerprinted(audit_capture):
+    query = "SELECT " + ", ".join(f"col_{i}" for i in range(2000))
+
+    emit_audit_event(
+        event_type="tool_invocation", agent_name="execution",
+        customer_account_id="1", details={"tool": "execute_redshift_query", "query": query},
+    )
+
+    details = audit_capture.records[0].details
+    assert details["tool"] == "execute_redshift_query"
+    bounded = details["query"]
+    assert bounded["truncated"] is True
+    assert bounded["bytes"] == len(query)
+    assert bounded["sha256"] == hashlib.sha256(query.encode()).hexdigest()
+    assert query.startswith(bounded["preview"])
+    budget = audit_module.FIELD_BUDGETS["query"]
+    assert len(json.dumps(bounded).encode()) <= budget
+    assert len(bounded["preview"]) > budget - 200
+
+
+def test_structured_fields_are_measured_serialized(audit_capture):
+    payload = {"assessment": {"queues": [{"name": f"q{i}", "waits": list(range(50))} for i in range(20)]}}
+
+    emit_audit_event(
+        event_type="tool_invocation", agent_name="orchestrator",
+        customer_account_id="1", details={"input_payload": payload, "small": {"a": 1}},
+    )
+
+    details = audit_capture.records[0].details
+    assert details["small"] == {"a": 1}
+    serialized = json.dumps(payload, sort_keys=True).encode()
+    assert details["input_payload"]["sha256"] == hashlib.sha256(serialized).hexdigest()
+
+
+def test_per_field_budget_override(audit_capture):
+    with patch.dict(audit_module.FIELD_BUDGETS, {"note": 160}):
+        emit_audit_event(
+            event_type="phase_start", agent_name="a",
+            customer_account_id="1", details={"note": "é" * 100},
+        )
+
+    bounded = audit_capture.records[0].details["note"]
+    assert len(json.dumps(bounded).encode()) <= 160
+    # Truncation never splits a multi-byte character
+    assert bounded["preview"] and set(bounded["preview"]) == {"é"}
+
+
+def test_truncating_four_byte_characters_keeps_a_prefix(audit_capture):
+    with patch.dict(audit_module.FIELD_BUDGETS, {"note": 200}):
+        emit_audit_event(
+            event_type="phase_start", agent_name="a",
+            customer_account_id="1", details={"note": "\U0001F600" * 100},
+        )
+
+    bounded = audit_capture.records[0].details["note"]
+    assert len(json.dumps(bounded).encode()) <= 200
+    assert bounded["preview"] and set(bounded["preview"]) == {"\U0001F600"}
+
+
+def test_budget_smaller_than_fingerprint_keeps_no_preview(audit_capture):
+    with patch.dict(audit_module.FIELD_BUDGETS, {"note": 4}):
+        emit_audit_event(
+            event_type="phase_start", agent_name="a",
+            customer_account_id="1", details={"note": "ééé"},
+        )
+
+    assert audit_capture.records[0].details["note"]["preview"] == ""
+
+
+# --- Sampling ---
+
+def test_tool_invocations_are_sampled(audit_capture):
+    with patch.dict(audit_module.SAMPLE_RATES, {"tool_invocation": 0.25}), \
+            patch.object(audit_module.random, "random", side_effect=[0.1, 0.5, 0.2, 0.9]):
+        for _ in range(4):
+            emit_audit_event(event_type="tool_invocation", agent_name="a", customer_account_id="1")
+
+    assert len(audit_capture.records) == 2
+    assert all(r.details["sample_rate"] == 0.25 for r in audit_capture.records)
+
+
+def test_events_emitted_unsampled_are_always_kept(audit_capture):
+    with patch.dict(audit_module.SAMPLE_RATES, {"tool_invocation": 0.0}):
+        emit_audit_event(event_type="tool_invocation", agent_name="a", customer_account_id="1")
+        emit_audit_event(event_type="tool_invocation", agent_name="a", customer_account_id="1", sampled=False)
+
+    assert len(audit_capture.records) == 1
+    assert "sample_rate" not in audit_capture.records[0].details
+
+
+@pytest.mark.parametrize("event_type", ["workflow_start", "workflow_complete", "error"])
+def test_workflow_and_error_events_are_never_sampled(event_type, audit_capture):
+    with patch.dict(audit_module.SAMPLE_RATES, {event_type: 0.0}):
+        emit_audit_event(event_type=event_type, agent_name="a", customer_account_id="1")
+
+    assert len(audit_capture.records) == 1
+    assert "sample_rate" not in audit_capture.records[0].details
+
+
+def test_sigterm_flush_is_installed_by_lambda_entry_point_only():
+    code = (
+        "import signal, tools.audit_logger as audit; "
+        "print(signal.getsignal(signal.SIGTERM) is signal.SIG_DFL); "
+        "from lambdas.router import build_response; build_response({}, {}); "
+        "print(signal.getsignal(signal.SIGTERM) is signal.SIG_DFL); "
+        "audit._shutdown(); audit._shutdown()"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.dirname(audit_module.__file__)),
+        capture_output=True, text=True, check=True,
+    )
+
+    assert out.stdout.split() == ["True", "False"]
@@ -0,0 +1,211 @@
+"""
+Tests for the batched audit sinks.
+
+Validates: event-, byte- and time-based flush thresholds, CloudWatch Logs
+batching rules, S3 NDJSON objects, local file rotation, failing closed to
+stdout, and flushing of buffered events by ``flush_audit_events``.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import logging.handlers
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from redshift_agents.tools import audit_sinks
+from redshift_agents.tools.audit_logger import emit_audit_event, flush_audit_events
+from redshift_agents.tools.audit_sinks import (
+    BatchingHandler,
+    CloudWatchLogsSink,
+    RotatingFileSink,
+    S3NdjsonSink,
+    build_sinks,
+)
+
+
+class _RecordingSink(BatchingHandler):
+    def __init__(self, **thresholds):
+        thresholds.setdefault("flush_interval_ms", 60000)
+        super().__init__(**thresholds)
+        self.batches: list[list[str]] = []
+
+    def write_batch(self, events):
+        self.batches.append([message for _, message in events])
+
+
+def _record(message: str, created: float | None = None) -> logging.LogRecord:
+    record = logging.LogRecord("audit", logging.INFO, __file__, 0, message, None, None)
+    if created is not None:
+        record.created = created
+    return record
+
+
+@pytest.fixture()
+def sinks():
+    created: list[logging.Handler] = []
+    yield created
+    for sink in created:
+        sink.close()
+
+
+class TestFlushThresholds:
+    def test_flushes_when_event_count_is_reached(self, sinks):
+        sink = _RecordingSink(max_events=2)
+        sinks.append(sink)
+
+        for i in range(5):
+            sink.handle(_record(f"e{i}"))
+
+        assert sink.batches == [["e0", "e1"], ["e2", "e3"]]
+
+    def test_flushes_when_byte_budget_is_reached(self, sinks):
+        sink = _RecordingSink(max_events=100, max_bytes=10)
+        sinks.append(sink)
+
+        sink.handle(_record("12345"))
+        sink.handle(_record("67890"))
+
+        assert sink.batches == [["12345", "67890"]]
+
+    def test_flushes_after_interval(self, sinks):
+        sink = _RecordingSink(flush_interval_ms=20)
+        sinks.append(sink)
+
+        sink.handle(_record("late"))
+        deadline = time.monotonic() + 2
+        while not sink.batches and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert sink.batches == [["late"]]
+
+    def test_close_flushes_remaining_events(self):
+        sink = _RecordingSink()
+        sink.handle(_record("pending"))
+
+        sink.close()
+
+        assert sink.batches == [["pending"]]
+
+    def test_write_failure_falls_back_to_stdout(self, sinks, capsys):
+        sink = _RecordingSink()
+        sinks.append(sink)
+        sink.write_batch = MagicMock(side_effect=Exception("AccessDenied"))
+
+        sink.handle(_record("kept"))
+        sink.flush()
+
+        out, err = capsys.readouterr()
+        assert "failed (AccessDenied); writing 1 audit events to stdout" in err
+        assert out == "kept\n"
+
+    def test_write_batch_is_abstract(self):
+        with pytest.raises(TypeError):
+            BatchingHandler()
+
+
+class TestCloudWatchLogsSink:
+    def test_batches_are_sorted_and_split_by_limits(self, sinks):
+        logs = MagicMock()
+        logs.exceptions.ResourceAlreadyExistsException = type("Exists", (Exception,), {})
+        sink = CloudWatchLogsSink(log_group="/audit", log_stream="s1", flush_interval_ms=60000)
+        sinks.append(sink)
+
+        with patch.object(audit_sinks, "get_client", return_value=logs), \
+                patch.object(audit_sinks, "CLOUDWATCH_MAX_EVENTS", 2):
+            for i, created in enumerate((3.0, 1.0, 2.0)):
+                sink.handle(_record(f"e{i}", created))
+            sink.flush()
+            sink.handle(_record("e3", 4.0))
+            sink.flush()
+
+        logs.create_log_stream.assert_called_once_with(logGroupName="/audit", logStreamName="s1")
+        calls = [[e["message"] for e in c.kwargs["logEvents"]] for c in logs.put_log_events.call_args_list]
+        assert calls == [["e1", "e2"], ["e0"], ["e3"]]
+
+    def test_existing_stream_is_reused(self, sinks):
+        logs = MagicMock()
+        logs.exceptions.ResourceAlreadyExistsException = type("Exists", (Exception,), {})
+        logs.create_log_stream.side_effect = logs.exceptions.ResourceAlreadyExistsException()
+        sink = CloudWatchLogsSink(log_group="/audit", log_stream="s1")
+        sinks.append(sink)
+
+        with patch.object(audit_sinks, "get_client", return_value=logs):
+            sink.handle(_record("e0"))
+            sink.flush()
+
+        assert logs.put_log_events.call_count == 1
+
+
+class TestS3NdjsonSink:
+    def test_batch_is_one_ndjson_object(self, sinks):
+        s3 = MagicMock()
+        sink = S3NdjsonSink(bucket="audit-bucket", prefix="audit/")
+        sinks.append(sink)
+
+        with patch.object(audit_sinks, "get_client", return_value=s3):
+            sink.handle(_record('{"a": 1}', created=1704067200.0))
+            sink.handle(_record('{"a": 2}', created=1704067201.0))
+            sink.flush()
+
+        kwargs = s3.put_object.call_args.kwargs
+        assert kwargs["Bucket"] == "audit-bucket"
+        assert kwargs["Key"].startswith("audit/2024/01/01/20240101T000000-")
+        assert kwargs["Key"].endswith(".ndjson")
+        assert [json.loads(line) for line in kwargs["Body"].decode().splitlines()] == [{"a": 1}, {"a": 2}]
+
+
+class TestRotatingFileSink:
+    def test_file_rotates_at_size_limit(self, tmp_path, sinks):
+        path = tmp_path / "audit.log"
+        sink = RotatingFileSink(str(path), max_file_bytes=12, backup_count=2)
+        sinks.append(sink)
+
+        for i in range(4):
+            sink.handle(_record(f"event{i}"))
+            sink.flush()
+
+        assert path.read_text() == "event3\n"
+        assert (tmp_path / "audit.log.1").read_text() == "event2\n"
+        assert (tmp_path / "audit.log.2").read_text() == "event1\n"
+        assert not (tmp_path / "audit.log.3").exists()
+
+
+class TestSinkSelection:
+    def test_names_map_to_sinks(self, sinks):
+        with patch.object(audit_sinks, "AUDIT_S3_BUCKET", "audit-bucket"):
+            sinks.extend(build_sinks("stream, file, cloudwatch, s3"))
+
+        assert [type(s) for s in sinks] == [
+            logging.StreamHandler, RotatingFileSink, CloudWatchLogsSink, S3NdjsonSink,
+        ]
+
+    def test_s3_sink_without_bucket_falls_back_to_stream(self, capsys):
+        with patch.object(audit_sinks, "AUDIT_S3_BUCKET", ""):
+            assert [type(s) for s in build_sinks("s3")] == [logging.StreamHandler]
+        assert "needs AUDIT_S3_BUCKET" in capsys.readouterr().err
+
+    def test_unknown_or_empty_selection_falls_back_to_stream(self, capsys):
+        assert [type(s) for s in build_sinks("kafka")] == [logging.StreamHandler]
+        assert "Unknown audit sink: kafka" in capsys.readouterr().err
+
+
+def test_flush_audit_events_flushes_batched_sinks(sinks):
+    audit_logger = logging.getLogger("redshift_modernization_audit")
+    (queue_handler,) = [h for h in audit_logger.handlers if isinstance(h, logging.handlers.QueueHandler)]
+    listener = queue_handler.listener
+    original = listener.handlers
+    sink = _RecordingSink()
+    sink.setFormatter(original[0].formatter)
+    sinks.append(sink)
+    listener.handlers = original + (sink,)
+    try:
+        emit_audit_event(event_type="tool_invocation", agent_name="a", customer_account_id="1")
+        assert flush_audit_events(timeout=5)
+    finally:
+        listener.handlers = original
+
+    (batch,) = sink.batches
+    assert json.loads(batch[0])["event_type"] == "tool_invocation"
@@ -0,0 +1,156 @@
+"""
+Tests for the shared boto3 client pool.
+
+Validates: pooled reuse across calls and credential rotations, keying by
+region and session, the LRU cap, and stand-in client injection for tests
+and benchmarks.
+"""
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from redshift_agents.lambdas.assessment_handler import handler as assessment_handler
+from redshift_agents.tests.conftest import build_action_group_event, parse_response_body
+
+# Lambda handlers import tools via the package root, so that is the pool
+# instance the tool functions actually use.
+from tools import client_pool
+
+
+@pytest.fixture()
+def pool_enabled(monkeypatch):
+    monkeypatch.setattr(client_pool, "POOL_ENABLED", True)
+    client_pool.reset_pool()
+    yield
+    client_pool.reset_pool()
+
+
+class TestPooledClients:
+    @patch("boto3.client")
+    def test_same_service_and_region_reuses_client(self, mock_boto3, pool_enabled):
+        mock_boto3.side_effect = lambda *a, **kw: MagicMock()
+
+        first = client_pool.get_client("redshift", "us-east-2")
+        second = client_pool.get_client("redshift", "us-east-2")
+
+        assert first is second
+        assert mock_boto3.call_count == 1
+
+    @patch("boto3.client")
+    def test_clients_are_keyed_by_region(self, mock_boto3, pool_enabled):
+        mock_boto3.side_effect = lambda *a, **kw: MagicMock()
+
+        east = client_pool.get_client("redshift", "us-east-2")
+        west = client_pool.get_client("redshift", "us-west-2")
+
+        assert east is not west
+        regions = [c.kwargs["region_name"] for c in mock_boto3.call_args_list]
+        assert regions == ["us-east-2", "us-west-2"]
+
+    def test_clients_are_keyed_by_session(self, pool_enabled):
+        alice, bob = MagicMock(), MagicMock()
+
+        first = client_pool.get_client("dynamodb", "us-east-2", session=alice)
+        again = client_pool.get_client("dynamodb", "us-east-2", session=alice)
+        other = client_pool.get_client("dynamodb", "us-east-2", session=bob)
+
+        assert first is again is alice.client.return_value
+        assert other is bob.client.return_value
+
+    def test_credential_rotation_reuses_the_client(self, pool_enabled):
+        session = MagicMock()
+        session.get_credentials.side_effect = [MagicMock(access_key=f"ASIA{i}") for i in range(3)]
+
+        clients = {id(client_pool.get_client("sts", "us-east-2", session=session)) for _ in range(3)}
+
+        assert len(clients) == 1
+        assert session.client.call_count == 1
+
+    def test_pool_evicts_least_recently_used(self, monkeypatch, pool_enabled):
+        monkeypatch.setattr(client_pool, "MAX_POOLED_CLIENTS", 2)
+        sessions = [MagicMock() for _ in range(3)]
+
+        client_pool.get_client("sts", "us-east-2", session=sessions[0])
+        client_pool.get_client("sts", "us-east-2", session=sessions[1])
+        client_pool.get_client("sts", "us-east-2", session=sessions[0])
+        client_pool.get_client("sts", "us-east-2", session=sessions[2])
+        client_pool.get_client("sts", "us-east-2", session=sessions[1])
+
+        assert len(client_pool._clients) == 2
+        assert [s.client.call_count for s in sessions] == [1, 2, 1]
+
+    @patch("boto3.client")
+    def test_clients_use_tuned_config(self, mock_boto3, pool_enabled):
+        client_pool.get_client("redshift-data", "us-east-2")
+
+        config = mock_boto3.call_args.kwargs["config"]
+        assert config.max_pool_connections == client_pool.MAX_POOL_CONNECTIONS
+        assert config.tcp_keepalive is True
+        assert config.retries["mode"] == "adaptive"
+
+    @patch("boto3.client")
+    def test_session_clients_are_built_from_session(self, mock_boto3, pool_enabled):
+        session = MagicMock()
+
+        client = client_pool.get_client("redshift", "us-east-2", session=session)
+
+        assert client is session.client.return_value
+        mock_boto3.assert_not_called()
+
+    @patch("boto3.client")
+    def test_disabled_pool_creates_client_per_call(self, mock_boto3, monkeypatch, pool_enabled):
+        monkeypatch.setattr(client_pool, "POOL_ENABLED", False)
+        mock_boto3.side_effect = lambda *a, **kw: MagicMock()
+
+        client_pool.get_client("redshift", "us-east-2")
+        client_pool.get_client("redshift", "us-east-2")
+
+        assert mock_boto3.call_count == 2
+
+
+class TestClientOverrides:
+    @patch("boto3.client")
+    def test_override_applies_to_every_region(self, mock_boto3, pool_enabled):
+        stub = MagicMock()
+        client_pool.override_client("redshift", stub)
+
+        assert client_pool.get_client("redshift", "us-east-2") is stub
+        assert client_pool.get_client("redshift", "eu-west-1") is stub
+        mock_boto3.assert_not_called()
+
+    @patch("boto3.client")
+    def test_region_override_takes_precedence(self, mock_boto3, pool_enabled):
+        anywhere, west = MagicMock(), MagicMock()
+        client_pool.override_client("redshift", anywhere)
+        client_pool.override_client("redshift", west, region="us-west-2")
+
+        assert client_pool.get_client("redshift", "us-west-2") is west
+        assert client_pool.get_client("redshift", "us-east-2") is anywhere
+
+    @patch("boto3.client")
+    def test_context_manager_restores_previous_overrides(self, mock_boto3, pool_enabled):
+        outer, inner = MagicMock(), MagicMock()
+        client_pool.override_client("redshift", outer)
+
+        with client_pool.client_overrides({"redshift": inner}):
+            assert client_pool.get_client("redshift") is inner
+
+        assert client_pool.get_client("redshift") is outer
+
+    @patch("boto3.client")
+    def test_tool_uses_injected_client(self, mock_boto3, pool_enabled):
+        stub = MagicMock()
+        stub.describe_clusters.return_value = {"Clusters": []}
+
+        with client_pool.client_overrides({"redshift": stub}):
+            event = build_action_group_event(
+                "/listRedshiftClusters",
+                {"region": "us-east-2", "user_id": "jane.doe"},
+            )
+            result = parse_response_body(assessment_handler(event))
+
+        assert result == []
+        stub.describe_clusters.assert_called_once()
+        assert "redshift" not in [c.args[0] for c in mock_boto3.call_args_list]
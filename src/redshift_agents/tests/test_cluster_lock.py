@@ -1,10 +1,12 @@
 """
 Tests for cluster lock Lambda handler with action group events.
 
-Validates: Requirements 7.1, 7.2, 7.3, 11.1, 11.5
+Validates: Requirements 7.1, 7.2, 7.3, 11.1, 11.5, plus lease renewal and
+fencing-token checks.
 """
 from __future__ import annotations
 
+import time
 from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
@@ -13,8 +15,12 @@ from botocore.exceptions import ClientError
 from hypothesis import given, settings, strategies as st
 
 from redshift_agents.lambdas.cluster_lock_handler import handler as lock_handler
+from redshift_agents.lambdas.execution_handler import handler as execution_handler
 from redshift_agents.tests.conftest import build_action_group_event, parse_response_body
 
+# Lambda handlers import tools via the package root
+from tools import cluster_lock
+
 # ---------------------------------------------------------------------------
 # Strategies
 # ---------------------------------------------------------------------------
@@ -58,7 +64,7 @@ def test_cluster_lock_mutual_exclusion(cluster_id, user_a, user_b):
         }
     }
 
-    with patch("redshift_agents.tools.cluster_lock.boto3.client", return_value=mock_dynamodb):
+    with patch("boto3.client", return_value=mock_dynamodb):
         event_a = build_action_group_event(
             "/acquireClusterLock",
             {"cluster_id": cluster_id, "user_id": user_a, "region": "us-east-2"},
@@ -104,7 +110,7 @@ def test_lock_denial_includes_holder_identity(cluster_id, holder_user, requester
         }
     }
 
-    with patch("redshift_agents.tools.cluster_lock.boto3.client", return_value=mock_dynamodb):
+    with patch("boto3.client", return_value=mock_dynamodb):
         event = build_action_group_event(
             "/acquireClusterLock",
             {"cluster_id": cluster_id, "user_id": requester_user, "region": "us-east-2"},
@@ -123,7 +129,7 @@ def test_lock_denial_includes_holder_identity(cluster_id, holder_user, requester
 
 
 class TestAcquireLockSuccess:
-    @patch("redshift_agents.tools.cluster_lock.boto3.client")
+    @patch("boto3.client")
     def test_acquire_lock_success(self, mock_boto_client):
         mock_ddb = MagicMock()
         mock_ddb.put_item.return_value = {}
@@ -143,7 +149,7 @@ class TestAcquireLockSuccess:
 
 
 class TestAcquireLockContention:
-    @patch("redshift_agents.tools.cluster_lock.boto3.client")
+    @patch("boto3.client")
     def test_acquire_lock_contention(self, mock_boto_client):
         mock_ddb = MagicMock()
         mock_ddb.put_item.side_effect = _conditional_check_error()
@@ -168,7 +174,7 @@ class TestAcquireLockContention:
 
 
 class TestReleaseLock:
-    @patch("redshift_agents.tools.cluster_lock.boto3.client")
+    @patch("boto3.client")
     def test_release_lock_success(self, mock_boto_client):
         mock_ddb = MagicMock()
         mock_ddb.delete_item.return_value = {}
@@ -182,7 +188,7 @@ class TestReleaseLock:
         result = parse_response_body(resp)
         assert result["released"] is True
 
-    @patch("redshift_agents.tools.cluster_lock.boto3.client")
+    @patch("boto3.client")
     def test_release_lock_not_holder(self, mock_boto_client):
         mock_ddb = MagicMock()
         mock_ddb.delete_item.side_effect = _conditional_check_error()
@@ -197,7 +203,7 @@ class TestReleaseLock:
         assert result["released"] is False
         assert "error" in result
 
-    @patch("redshift_agents.tools.cluster_lock.boto3.client")
+    @patch("boto3.client")
     def test_release_lock_error_does_not_raise(self, mock_boto_client, capsys):
         mock_ddb = MagicMock()
         mock_ddb.delete_item.side_effect = Exception("DynamoDB timeout")
@@ -215,7 +221,7 @@ class TestReleaseLock:
 
 
 class TestAcquireLockDynamoDBError:
-    @patch("redshift_agents.tools.cluster_lock.boto3.client")
+    @patch("boto3.client")
     def test_acquire_lock_dynamodb_error(self, mock_boto_client):
         mock_ddb = MagicMock()
         mock_ddb.put_item.side_effect = ClientError(
@@ -232,3 +238,438 @@ class TestAcquireLockDynamoDBError:
         result = parse_response_body(resp)
         assert "error" in result
         assert "acquired" not in result
+
+
+# ---------------------------------------------------------------------------
+# Leases and fencing tokens
+# ---------------------------------------------------------------------------
+
+
+def _lock_item(holder="alice", token=7, expires_in=60.0):
+    return {
+        "cluster_id": {"S": "cluster-1"},
+        "lock_holder": {"S": holder},
+        "acquired_at": {"S": "2024-06-01T12:00:00+00:00"},
+        "fencing_token": {"N": str(token)},
+        "lease_expires_at": {"N": str(time.time() + expires_in)},
+    }
+
+
+class TestLeaseAcquire:
+    @patch("boto3.client")
+    def test_acquire_returns_fencing_token_and_lease(self, mock_boto_client):
+        mock_ddb = MagicMock()
+        mock_ddb.update_item.return_value = {"Attributes": {"fencing_token": {"N": "42"}}}
+        mock_boto_client.return_value = mock_ddb
+
+        result = parse_response_body(lock_handler(build_action_group_event(
+            "/acquireClusterLock", {"cluster_id": "cluster-1", "user_id": "alice"},
+        )))
+
+        assert result["fencing_token"] == 42
+        assert result["lease_seconds"] == cluster_lock.LEASE_SECONDS
+        expires = datetime.fromisoformat(result["lease_expires_at"])
+        assert 0 < (expires - datetime.now(timezone.utc)).total_seconds() <= cluster_lock.LEASE_SECONDS
+        # The counter lives in its own item so it survives release
+        assert mock_ddb.update_item.call_args.kwargs["Key"] == {"cluster_id": {"S": "cluster-1#fence"}}
+        item = mock_ddb.put_item.call_args.kwargs["Item"]
+        assert item["fencing_token"] == {"N": "42"}
+
+    @patch("boto3.client")
+    def test_expired_lease_can_be_taken_over(self, mock_boto_client):
+        mock_ddb = MagicMock()
+        mock_ddb.update_item.return_value = {"Attributes": {"fencing_token": {"N": "2"}}}
+        mock_boto_client.return_value = mock_ddb
+
+        cluster_lock.acquire_lock("cluster-1", "bob")
+
+        kwargs = mock_ddb.put_item.call_args.kwargs
+        assert kwargs["ConditionExpression"] == "attribute_not_exists(cluster_id) OR lease_expires_at < :now"
+        assert float(kwargs["ExpressionAttributeValues"][":now"]["N"]) == pytest.approx(time.time(), abs=5)
+
+    @patch("boto3.client")
+    def test_contention_reports_lease_expiry(self, mock_boto_client):
+        mock_ddb = MagicMock()
+        mock_ddb.update_item.return_value = {"Attributes": {"fencing_token": {"N": "3"}}}
+        mock_ddb.put_item.side_effect = _conditional_check_error()
+        mock_ddb.get_item.return_value = {"Item": _lock_item(holder="bob")}
+        mock_boto_client.return_value = mock_ddb
+
+        result = cluster_lock.acquire_lock("cluster-1", "alice")
+
+        assert result["acquired"] is False
+        assert result["lock_holder"] == "bob"
+        datetime.fromisoformat(result["lease_expires_at"])
+
+
+class TestRenewLock:
+    @patch("boto3.client")
+    def test_renew_extends_lease_for_current_holder(self, mock_boto_client):
+        mock_ddb = MagicMock()
+        mock_boto_client.return_value = mock_ddb
+
+        result = parse_response_body(lock_handler(build_action_group_event(
+            "/renewClusterLock", {"cluster_id": "cluster-1", "user_id": "alice", "fencing_token": "7"},
+        )))
+
+        assert result["renewed"] is True
+        assert result["fencing_token"] == 7
+        kwargs = mock_ddb.update_item.call_args.kwargs
+        assert kwargs["ConditionExpression"] == "lock_holder = :holder AND fencing_token = :token"
+        assert kwargs["ExpressionAttributeValues"][":token"] == {"N": "7"}
+
+    @patch("boto3.client")
+    def test_renew_after_takeover_reports_lock_lost(self, mock_boto_client):
+        mock_ddb = MagicMock()
+        mock_ddb.update_item.side_effect = _conditional_check_error()
+        mock_boto_client.return_value = mock_ddb
+
+        result = cluster_lock.renew_lock("cluster-1", "alice", 7)
+
+        assert result["renewed"] is False
+        assert result["error"].startswith("Lock lost")
+
+
+class TestFencingToken:
+    @pytest.mark.parametrize("item, valid, reason", [
+        (_lock_item(), True, None),
+        (None, False, "not locked"),
+        (_lock_item(token=8), False, "newer fencing token"),
+        (_lock_item(holder="bob"), False, "another user"),
+        (_lock_item(expires_in=-1), False, "lease expired"),
+    ])
+    @patch("boto3.client")
+    def test_check_fencing_token(self, mock_boto_client, item, valid, reason):
+        mock_ddb = MagicMock()
+        mock_ddb.get_item.return_value = {"Item": item} if item else {}
+        mock_boto_client.return_value = mock_ddb
+
+        result = cluster_lock.check_fencing_token("cluster-1", 7, user_id="alice")
+
+        assert result["valid"] is valid
+        if reason:
+            assert reason in result["error"]
+        assert mock_ddb.get_item.call_args.kwargs["ConsistentRead"] is True
+
+    @patch("tools.redshift_tools.emit_audit_event")
+    @patch("boto3.client")
+    def test_execution_tool_rejects_stale_holder(self, mock_boto_client, mock_audit):
+        mock_client = MagicMock()
+        mock_client.get_item.return_value = {"Item": _lock_item(token=8)}
+        mock_boto_client.return_value = mock_client
+
+        result = parse_response_body(execution_handler(build_action_group_event(
+            "/executeRedshiftQuery",
+            {"cluster_id": "cluster-1", "query": "DROP TABLE t", "fencing_token": "7", "user_id": "alice"},
+        )))
+
+        assert result["valid"] is False
+        assert "Stale cluster lock" in result["error"]
+        mock_client.execute_statement.assert_not_called()
+
+    @pytest.mark.parametrize("params", [
+        {"producer_namespace": "hub", "consumer_namespaces": "spoke", "user_id": "alice"},
+        {"producer_namespace": "hub", "consumer_namespaces": "spoke", "cluster_id": "cluster-1", "user_id": "alice"},
+        {"producer_namespace": "hub", "consumer_namespaces": "spoke", "fencing_token": "7", "user_id": "alice"},
+    ])
+    @patch("tools.redshift_tools.emit_audit_event")
+    @patch("boto3.client")
+    def test_mutating_tool_requires_the_lock(self, mock_boto_client, mock_audit, params):
+        mock_client = MagicMock()
+        mock_boto_client.return_value = mock_client
+
+        result = parse_response_body(execution_handler(build_action_group_event("/setupDataSharing", params)))
+
+        assert result["valid"] is False
+        assert "fencing_token" in result["error"]
+        mock_client.batch_execute_statement.assert_not_called()
+        mock_client.get_item.assert_not_called()
+
+    @patch("tools.redshift_tools.emit_audit_event")
+    @patch("boto3.client")
+    def test_serverless_tool_is_fenced_on_the_source_cluster(self, mock_boto_client, mock_audit):
+        mock_client = MagicMock()
+        mock_client.get_item.return_value = {"Item": _lock_item()}
+        mock_boto_client.return_value = mock_client
+
+        execution_handler(build_action_group_event(
+            "/createServerlessNamespace",
+            {"namespace_name": "ns1", "cluster_id": "cluster-1", "fencing_token": "7", "user_id": "alice"},
+        ))
+
+        assert mock_client.get_item.call_args.kwargs["Key"] == {"cluster_id": {"S": "cluster-1"}}
+        mock_client.create_namespace.assert_called_once()
+
+    @patch("boto3.client")
+    def test_read_only_tool_needs_no_token(self, mock_boto_client):
+        mock_client = MagicMock()
+        mock_client.describe_statement.return_value = {"Status": "FINISHED", "HasResultSet": True}
+        mock_client.get_statement_result.return_value = {"Records": []}
+        mock_boto_client.return_value = mock_client
+
+        with patch("tools.redshift_tools.emit_audit_event"):
+            result = parse_response_body(execution_handler(build_action_group_event(
+                "/getStatementResult", {"statement_id": "stmt-1", "user_id": "alice"},
+            )))
+
+        assert "valid" not in result
+        mock_client.get_item.assert_not_called()
+
+
+class TestLeaseHeartbeat:
+    @patch("boto3.client")
+    def test_heartbeat_renews_until_lock_is_lost(self, mock_boto_client):
+        mock_ddb = MagicMock()
+        mock_ddb.update_item.side_effect = [{}, _conditional_check_error()]
+        mock_boto_client.return_value = mock_ddb
+
+        with cluster_lock.LeaseHeartbeat("cluster-1", "alice", 7, lease_seconds=0.03) as heartbeat:
+            assert heartbeat.lost.wait(timeout=5)
+
+        assert mock_ddb.update_item.call_count == 2
+
+
+# ---------------------------------------------------------------------------
+# Multi-cluster locks
+# ---------------------------------------------------------------------------
+
+
+def _transaction_cancelled(*codes, holder="bob") -> ClientError:
+    reasons = [
+        {"Code": code, "Item": _lock_item(holder=holder)} if code == "ConditionalCheckFailed" else {"Code": code}
+        for code in codes
+    ]
+    return ClientError(
+        {"Error": {"Code": "TransactionCanceledException", "Message": "Transaction cancelled"},
+         "CancellationReasons": reasons},
+        "TransactWriteItems",
+    )
+
+
+def _counter_ddb():
+    tokens = iter(range(1, 1000))
+    mock_ddb = MagicMock()
+    mock_ddb.update_item.side_effect = lambda **kw: {"Attributes": {"fencing_token": {"N": str(next(tokens))}}}
+    return mock_ddb
+
+
+class TestAcquireLocks:
+    @patch("boto3.client")
+    def test_all_clusters_locked_in_one_transaction(self, mock_boto_client):
+        mock_ddb = _counter_ddb()
+        mock_boto_client.return_value = mock_ddb
+
+        result = parse_response_body(lock_handler(build_action_group_event(
+            "/acquireClusterLocks", {"cluster_ids": "c-b, c-a,c-b", "user_id": "alice"},
+        )))
+
+        assert result["acquired"] is True
+        assert result["cluster_ids"] == ["c-a", "c-b"]
+        assert result["locks"] == [
+            {"cluster_id": "c-a", "fencing_token": 1}, {"cluster_id": "c-b", "fencing_token": 2},
+        ]
+        (call,) = mock_ddb.transact_write_items.call_args_list
+        puts = [item["Put"] for item in call.kwargs["TransactItems"]]
+        assert [p["Item"]["cluster_id"]["S"] for p in puts] == ["c-a", "c-b"]
+        assert all(p["ConditionExpression"].startswith("attribute_not_exists") for p in puts)
+        mock_ddb.put_item.assert_not_called()
+
+    @patch("boto3.client")
+    def test_contention_locks_nothing_and_reports_holders(self, mock_boto_client):
+        mock_ddb = _counter_ddb()
+        mock_ddb.transact_write_items.side_effect = _transaction_cancelled("None", "ConditionalCheckFailed")
+        mock_boto_client.return_value = mock_ddb
+
+        result = cluster_lock.acquire_locks(["c-a", "c-b"], "alice")
+
+        assert result["acquired"] is False
+        assert result["locks"] == []
+        (conflict,) = result["conflicts"]
+        assert conflict["cluster_id"] == "c-b"
+        assert conflict["lock_holder"] == "bob"
+        mock_ddb.delete_item.assert_not_called()
+
+    @patch("boto3.client")
+    def test_large_sets_are_chunked_and_rolled_back(self, mock_boto_client):
+        mock_ddb = _counter_ddb()
+        mock_ddb.transact_write_items.side_effect = [None, _transaction_cancelled("ConditionalCheckFailed", "None")]
+        mock_boto_client.return_value = mock_ddb
+
+        with patch.object(cluster_lock, "MAX_TRANSACTION_ITEMS", 2):
+            result = cluster_lock.acquire_locks("c1,c2,c3,c4", "alice")
+
+        assert result["acquired"] is False
+        assert [c["cluster_id"] for c in result["conflicts"]] == ["c3"]
+        rolled_back = [c.kwargs["Key"]["cluster_id"]["S"] for c in mock_ddb.delete_item.call_args_list]
+        assert rolled_back == ["c1", "c2"]
+        assert mock_ddb.delete_item.call_args.kwargs["ExpressionAttributeValues"][":token"] == {"N": "2"}
+
+    @patch("boto3.client")
+    def test_chunks_are_kept_when_not_all_or_nothing(self, mock_boto_client):
+        mock_ddb = _counter_ddb()
+        mock_ddb.transact_write_items.side_effect = [_transaction_cancelled("ConditionalCheckFailed", "None"), None]
+        mock_boto_client.return_value = mock_ddb
+
+        with patch.object(cluster_lock, "MAX_TRANSACTION_ITEMS", 2):
+            result = cluster_lock.acquire_locks("c1,c2,c3,c4", "alice", all_or_nothing=False)
+
+        assert result["acquired"] is False
+        assert [lock["cluster_id"] for lock in result["locks"]] == ["c3", "c4"]
+        mock_ddb.delete_item.assert_not_called()
+
+    @patch("boto3.client")
+    def test_clusters_queued_for_by_others_are_not_taken(self, mock_boto_client):
+        mock_ddb = _counter_ddb()
+
+        def get_item(**kwargs):
+            key = kwargs["Key"]["cluster_id"]["S"]
+            if key == "c-b#queue":
+                return {"Item": _queue_item("carol")}
+            return {"Item": _lock_item(holder="bob", expires_in=-1)} if key == "c-b" else {}
+
+        mock_ddb.get_item.side_effect = get_item
+        mock_boto_client.return_value = mock_ddb
+
+        result = cluster_lock.acquire_locks(["c-a", "c-b"], "alice")
+        partial = cluster_lock.acquire_locks(["c-a", "c-b"], "alice", all_or_nothing=False)
+
+        assert result["acquired"] is False and result["locks"] == []
+        (conflict,) = result["conflicts"]
+        assert conflict["cluster_id"] == "c-b"
+        assert (conflict["queue_position"], conflict["queue_length"]) == (None, 1)
+        (call,) = mock_ddb.transact_write_items.call_args_list
+        assert [i["Put"]["Item"]["cluster_id"]["S"] for i in call.kwargs["TransactItems"]] == ["c-a"]
+        assert [lock["cluster_id"] for lock in partial["locks"]] == ["c-a"]
+
+
+class TestReleaseLocks:
+    @patch("boto3.client")
+    def test_each_lock_is_released_independently(self, mock_boto_client):
+        mock_ddb = MagicMock()
+        mock_ddb.delete_item.side_effect = [_conditional_check_error(), None]
+        mock_boto_client.return_value = mock_ddb
+
+        result = parse_response_body(lock_handler(build_action_group_event(
+            "/releaseClusterLocks", {"cluster_ids": "c-a,c-b", "user_id": "alice"},
+        )))
+
+        assert result["released"] is False
+        assert [r["released"] for r in result["results"]] == [False, True]
+
+
+# ---------------------------------------------------------------------------
+# Waiting for a lock
+# ---------------------------------------------------------------------------
+
+
+def _queue_item(*waiters, expires_in=60.0, lease_seconds=None):
+    now = time.time()
+    lease = {"lease_seconds": {"N": str(lease_seconds)}} if lease_seconds else {}
+    return {
+        "cluster_id": {"S": "cluster-1#queue"},
+        "waiters": {"M": {
+            waiter: {"M": {"enqueued_at": {"N": str(now + i)}, "expires_at": {"N": str(now + expires_in)}, **lease}}
+            for i, waiter in enumerate(waiters)
+        }},
+    }
+
+
+def _table_ddb(lock_items, queue=None):
+    """Mock client whose get_item serves the lock and queue items by key."""
+    locks = iter(lock_items)
+    mock_ddb = MagicMock()
+    mock_ddb.update_item.return_value = {"Attributes": {"fencing_token": {"N": "9"}}}
+    mock_ddb.put_item.side_effect = _conditional_check_error()
+
+    def get_item(**kwargs):
+        if kwargs["Key"]["cluster_id"]["S"].endswith("#queue"):
+            return {"Item": queue} if queue else {}
+        return {"Item": next(locks)}
+
+    mock_ddb.get_item.side_effect = get_item
+    return mock_ddb
+
+
+class TestWaitForLock:
+    @patch("boto3.client")
+    def test_waiter_receives_handed_over_lock(self, mock_boto_client):
+        mock_boto_client.return_value = _table_ddb([_lock_item(holder="bob"), _lock_item(holder="alice", token=9)])
+
+        with patch.object(cluster_lock.time, "sleep"):
+            result = parse_response_body(lock_handler(build_action_group_event(
+                "/acquireClusterLock", {"cluster_id": "cluster-1", "user_id": "alice", "wait_seconds": "5"},
+            )))
+
+        assert result["acquired"] is True
+        assert result["fencing_token"] == 9
+        assert "waited_seconds" in result
+        expressions = [c.kwargs["UpdateExpression"] for c in mock_boto_client.return_value.update_item.call_args_list]
+        assert "SET waiters.#waiter = :entry" in expressions
+        assert expressions[-1] == "REMOVE waiters.#waiter"
+
+    @patch("boto3.client")
+    def test_timeout_reports_queue_position_without_jumping_the_queue(self, mock_boto_client):
+        mock_ddb = _table_ddb(iter(lambda: _lock_item(holder="bob"), None), queue=_queue_item("carol", "alice"))
+        mock_boto_client.return_value = mock_ddb
+
+        result = cluster_lock.acquire_lock("cluster-1", "alice", wait_seconds=0.05)
+
+        assert result["acquired"] is False
+        assert result["lock_holder"] == "bob"
+        assert (result["queue_position"], result["queue_length"]) == (2, 2)
+        mock_ddb.put_item.assert_not_called()
+
+    @patch("boto3.client")
+    def test_non_waiting_caller_does_not_take_expired_lease_from_waiters(self, mock_boto_client):
+        mock_ddb = _table_ddb(iter(lambda: _lock_item(holder="bob", expires_in=-1), None), queue=_queue_item("carol"))
+        mock_ddb.put_item.side_effect = None
+        mock_boto_client.return_value = mock_ddb
+
+        result = cluster_lock.acquire_lock("cluster-1", "alice")
+
+        assert result["acquired"] is False
+        assert (result["queue_position"], result["queue_length"]) == (None, 1)
+        mock_ddb.put_item.assert_not_called()
+
+    def test_backoff_is_jittered_and_capped(self):
+        delays = [cluster_lock._backoff(attempt) for attempt in range(12) for _ in range(20)]
+
+        assert all(0 <= d <= cluster_lock.BACKOFF_MAX_SECONDS for d in delays)
+        assert len(set(delays)) > 1
+
+
+class TestReleaseHandOver:
+    @patch("boto3.client")
+    def test_release_grants_lock_to_oldest_waiter(self, mock_boto_client):
+        mock_ddb = _table_ddb([], queue=_queue_item("carol", "dave"))
+        mock_ddb.put_item.side_effect = None
+        mock_boto_client.return_value = mock_ddb
+
+        result = cluster_lock.release_lock("cluster-1", "bob")
+
+        assert result == {"released": True, "cluster_id": "cluster-1", "granted_to": "carol"}
+        kwargs = mock_ddb.put_item.call_args.kwargs
+        assert kwargs["Item"]["lock_holder"] == {"S": "carol"}
+        assert kwargs["ExpressionAttributeValues"] == {":holder": {"S": "bob"}}
+        mock_ddb.delete_item.assert_not_called()
+
+    @patch("boto3.client")
+    def test_hand_over_grants_the_waiters_lease(self, mock_boto_client):
+        mock_ddb = _table_ddb([], queue=_queue_item("carol", lease_seconds=900))
+        mock_ddb.put_item.side_effect = None
+        mock_boto_client.return_value = mock_ddb
+
+        cluster_lock.release_lock("cluster-1", "bob")
+
+        expires = float(mock_ddb.put_item.call_args.kwargs["Item"]["lease_expires_at"]["N"])
+        assert 890 < expires - time.time() <= 900
+
+    @patch("boto3.client")
+    def test_expired_waiters_are_skipped(self, mock_boto_client):
+        mock_ddb = _table_ddb([], queue=_queue_item("carol", expires_in=-1))
+        mock_boto_client.return_value = mock_ddb
+
+        result = cluster_lock.release_lock("cluster-1", "bob")
+
+        assert result == {"released": True, "cluster_id": "cluster-1"}
+        mock_ddb.delete_item.assert_called_once()
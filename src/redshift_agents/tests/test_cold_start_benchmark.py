@@ -0,0 +1,48 @@
+"""
+Tests for the Lambda cold-start benchmark suite.
+
+Validates: ``-X importtime`` parsing, regression detection against
+baselines, and one real fresh-interpreter run with stubbed AWS clients.
+"""
+from __future__ import annotations
+
+from redshift_agents.benchmarks import cold_start
+
+_IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:      1500 |       1500 |     botocore.compat
+import time:      2500 |       4000 |   botocore
+import time:       700 |       4700 | boto3
+import time:       300 |        300 | json
+"""
+
+
+def test_importtime_is_summed_per_top_level_package():
+    assert cold_start.parse_importtime(_IMPORTTIME) == {"botocore": 4.0, "boto3": 0.7, "json": 0.3}
+
+
+class TestRegressions:
+    baselines = {"assessment_handler": {"import_ms": 100.0, "first_invocation_ms": 200.0, "warm_invocation_ms": 0.2}}
+
+    def _result(self, **overrides):
+        return {"assessment_handler": dict(self.baselines["assessment_handler"], **overrides)}
+
+    def test_slowdown_past_both_margins_is_flagged(self):
+        regressions = cold_start.find_regressions(self._result(import_ms=140.0), self.baselines, 0.25, 10)
+
+        assert regressions == ["assessment_handler.import_ms: 140.00 ms vs baseline 100.00 ms (+40%)"]
+
+    def test_noise_on_fast_paths_is_tolerated(self):
+        # +150% but only 0.3 ms: below the absolute slack
+        assert cold_start.find_regressions(self._result(warm_invocation_ms=0.5), self.baselines, 0.25, 10) == []
+
+    def test_handlers_without_baseline_are_skipped(self):
+        assert cold_start.find_regressions({"new_handler": {"import_ms": 1e6}}, self.baselines, 0.25, 10) == []
+
+
+def test_fresh_interpreter_run_serves_first_and_warm_requests():
+    result = cold_start.run_once(cold_start.SCENARIOS["cluster_lock_handler"], warm_runs=2)
+
+    assert result["error"] is None
+    assert result["first_invocation_ms"] > 0 and result["warm_invocation_ms"] > 0
+    assert "botocore" in result["imports"]
@@ -0,0 +1,192 @@
+"""
+Tests for the shared Redshift Data API helpers.
+
+Validates: adaptive statement polling (backoff, cap, deadline), the
+Lambda time budget used to decide when to hand back a resumable handle,
+and paginated result fetching with row and byte caps.
+"""
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from redshift_agents.tools.data_api import (
+    fetch_statement_records,
+    iter_statement_records,
+    remaining_budget_seconds,
+    wait_for_statement,
+)
+
+
+class _FakeClock:
+    """Deterministic stand-in for time.monotonic / time.sleep."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture()
+def clock():
+    fake = _FakeClock()
+    with patch("redshift_agents.tools.data_api.time.monotonic", fake.monotonic), \
+         patch("redshift_agents.tools.data_api.time.sleep", fake.sleep):
+        yield fake
+
+
+def _client_with_statuses(*statuses: str) -> MagicMock:
+    client = MagicMock()
+    client.describe_statement.side_effect = [{"Status": s} for s in statuses]
+    return client
+
+
+class TestWaitForStatement:
+    def test_finished_on_first_poll_does_not_sleep(self, clock):
+        client = _client_with_statuses("FINISHED")
+
+        desc = wait_for_statement(client, "stmt-1")
+
+        assert desc["Status"] == "FINISHED"
+        assert clock.sleeps == []
+        client.describe_statement.assert_called_once_with(Id="stmt-1")
+
+    def test_intervals_back_off_exponentially_up_to_cap(self, clock):
+        client = _client_with_statuses(*(["STARTED"] * 7 + ["FINISHED"]))
+
+        wait_for_statement(client, "stmt-1", initial_interval=0.05, max_interval=1.0, backoff=2.0)
+
+        assert clock.sleeps == pytest.approx([0.05, 0.1, 0.2, 0.4, 0.8, 1.0, 1.0])
+
+    @pytest.mark.parametrize("status", ["FAILED", "ABORTED"])
+    def test_stops_on_failure_statuses(self, clock, status):
+        client = _client_with_statuses("SUBMITTED", status)
+
+        desc = wait_for_statement(client, "stmt-1")
+
+        assert desc["Status"] == status
+        assert client.describe_statement.call_count == 2
+
+    def test_deadline_returns_last_non_terminal_status(self, clock):
+        client = MagicMock()
+        client.describe_statement.return_value = {"Status": "STARTED"}
+
+        desc = wait_for_statement(client, "stmt-1", max_wait_seconds=3.0, max_interval=1.0)
+
+        assert desc["Status"] == "STARTED"
+        assert clock.now == pytest.approx(3.0)
+
+    def test_zero_budget_polls_once(self, clock):
+        client = MagicMock()
+        client.describe_statement.return_value = {"Status": "PICKED"}
+
+        desc = wait_for_statement(client, "stmt-1", max_wait_seconds=0)
+
+        assert desc["Status"] == "PICKED"
+        assert client.describe_statement.call_count == 1
+        assert clock.sleeps == []
+
+
+class TestRemainingBudget:
+    def test_without_context_returns_requested(self):
+        assert remaining_budget_seconds(None, 30.0) == 30.0
+
+    def test_caps_to_lambda_remaining_time_minus_reserve(self):
+        context = MagicMock()
+        context.get_remaining_time_in_millis.return_value = 20_000
+
+        assert remaining_budget_seconds(context, 30.0, reserve_seconds=5.0) == 15.0
+
+    def test_requested_below_budget_is_kept(self):
+        context = MagicMock()
+        context.get_remaining_time_in_millis.return_value = 100_000
+
+        assert remaining_budget_seconds(context, 10.0) == 10.0
+
+    def test_never_negative(self):
+        context = MagicMock()
+        context.get_remaining_time_in_millis.return_value = 1_000
+
+        assert remaining_budget_seconds(context, 30.0, reserve_seconds=5.0) == 0.0
+
+
+def _paged_client(pages: list[list[list[dict]]], total_rows: int | None = None) -> MagicMock:
+    """Client whose get_statement_result serves *pages* chained by NextToken."""
+    responses = []
+    for i, records in enumerate(pages):
+        page = {"Records": records, "ColumnMetadata": [{"name": "n", "typeName": "int4"}]}
+        if total_rows is not None:
+            page["TotalNumRows"] = total_rows
+        if i < len(pages) - 1:
+            page["NextToken"] = f"token-{i + 1}"
+        responses.append(page)
+    client = MagicMock()
+    client.get_statement_result.side_effect = responses
+    return client
+
+
+def _rows(start: int, count: int) -> list[list[dict]]:
+    return [[{"longValue": n}] for n in range(start, start + count)]
+
+
+class TestPaginatedFetch:
+    def test_iter_follows_next_token(self):
+        client = _paged_client([_rows(0, 2), _rows(2, 2), _rows(4, 1)])
+
+        rows = list(iter_statement_records(client, "stmt-1"))
+
+        assert [r[0]["longValue"] for r in rows] == [0, 1, 2, 3, 4]
+        tokens = [c.kwargs.get("NextToken") for c in client.get_statement_result.call_args_list]
+        assert tokens == [None, "token-1", "token-2"]
+
+    def test_fetch_without_caps_reads_everything(self):
+        client = _paged_client([_rows(0, 3), _rows(3, 3)], total_rows=6)
+
+        fetched = fetch_statement_records(client, "stmt-1")
+
+        assert len(fetched["records"]) == 6
+        assert fetched["total_rows"] == 6
+        assert fetched["truncated"] is False
+        assert fetched["column_metadata"] == [{"name": "n", "typeName": "int4"}]
+
+    def test_row_cap_within_page(self):
+        client = _paged_client([_rows(0, 5), _rows(5, 5)], total_rows=10)
+
+        fetched = fetch_statement_records(client, "stmt-1", max_rows=3)
+
+        assert len(fetched["records"]) == 3
+        assert fetched["total_rows"] == 10
+        assert fetched["truncated"] is True
+        assert client.get_statement_result.call_count == 1
+
+    def test_row_cap_at_page_boundary_skips_next_page(self):
+        client = _paged_client([_rows(0, 4), _rows(4, 4)], total_rows=8)
+
+        fetched = fetch_statement_records(client, "stmt-1", max_rows=4)
+
+        assert len(fetched["records"]) == 4
+        assert fetched["truncated"] is True
+        assert client.get_statement_result.call_count == 1
+
+    def test_row_cap_equal_to_result_size_is_not_truncated(self):
+        client = _paged_client([_rows(0, 4)], total_rows=4)
+
+        fetched = fetch_statement_records(client, "stmt-1", max_rows=4)
+
+        assert fetched["truncated"] is False
+
+    def test_byte_budget_stops_early(self):
+        client = _paged_client([[[{"stringValue": "x" * 100}]] * 10])
+
+        fetched = fetch_statement_records(client, "stmt-1", max_bytes=350)
+
+        assert 1 <= len(fetched["records"]) < 10
+        assert fetched["truncated"] is True
+        assert fetched["total_rows"] is None
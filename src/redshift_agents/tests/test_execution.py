@@ -9,8 +9,10 @@ from __future__ import annotations
 
 from unittest.mock import Mock, MagicMock, patch
 
+import pytest
+
 from redshift_agents.lambdas.execution_handler import handler as execution_handler
-from redshift_agents.tests.conftest import build_action_group_event, parse_response_body
+from redshift_agents.tests.conftest import FENCING_TOKEN, build_action_group_event, parse_response_body
 
 
 def _mock_sts_client():
@@ -25,10 +27,11 @@ def _mock_sts_client():
     return m
 
 
+@pytest.mark.usefixtures("held_lock")
 class TestExecutionHandlerDispatch:
     """Verify execution handler dispatches all 5 apiPaths correctly."""
 
-    @patch("redshift_agents.tools.redshift_tools.time.sleep")
+    @patch("redshift_agents.tools.data_api.time.sleep")
     @patch("redshift_agents.tools.redshift_tools.emit_audit_event")
     @patch("boto3.client")
     def test_execute_redshift_query(self, mock_boto3, mock_audit, mock_sleep):
@@ -44,7 +47,8 @@ class TestExecutionHandlerDispatch:
 
         event = build_action_group_event(
             "/executeRedshiftQuery",
-            {"cluster_id": "c1", "query": "SELECT 1", "region": "us-east-2", "user_id": "alice"},
+            {"cluster_id": "c1", "fencing_token": FENCING_TOKEN,
+             "query": "SELECT 1", "region": "us-east-2", "user_id": "alice"},
         )
         resp = execution_handler(event)
         assert resp["response"]["apiPath"] == "/executeRedshiftQuery"
@@ -74,7 +78,8 @@ class TestExecutionHandlerDispatch:
 
         event = build_action_group_event(
             "/createServerlessNamespace",
-            {"namespace_name": "ns1", "region": "us-east-2", "user_id": "alice"},
+            {"cluster_id": "c1", "fencing_token": FENCING_TOKEN,
+             "namespace_name": "ns1", "region": "us-east-2", "user_id": "alice"},
         )
         resp = execution_handler(event)
         result = parse_response_body(resp)
@@ -99,7 +104,8 @@ class TestExecutionHandlerDispatch:
 
         event = build_action_group_event(
             "/createServerlessWorkgroup",
-            {"workgroup_name": "wg1", "namespace_name": "ns1",
+            {"cluster_id": "c1", "fencing_token": FENCING_TOKEN,
+             "workgroup_name": "wg1", "namespace_name": "ns1",
              "base_rpu": "32", "max_rpu": "512", "region": "us-east-2", "user_id": "alice"},
         )
         resp = execution_handler(event)
@@ -124,23 +130,25 @@ class TestExecutionHandlerDispatch:
 
         event = build_action_group_event(
             "/restoreSnapshotToServerless",
-            {"snapshot_identifier": "snap1", "namespace_name": "ns1",
+            {"cluster_id": "c1", "fencing_token": FENCING_TOKEN,
+             "snapshot_identifier": "snap1", "namespace_name": "ns1",
              "region": "us-east-2", "user_id": "alice"},
         )
         resp = execution_handler(event)
         result = parse_response_body(resp)
         assert result["status"] == "RESTORING"
 
+    @patch("redshift_agents.tools.data_api.time.sleep")
     @patch("redshift_agents.tools.redshift_tools.emit_audit_event")
     @patch("boto3.client")
-    def test_setup_data_sharing(self, mock_boto3, mock_audit):
+    def test_setup_data_sharing(self, mock_boto3, mock_audit, mock_sleep):
         mock_serverless = Mock()
         mock_data = Mock()
-        mock_serverless.get_namespace.side_effect = [
-            {"namespace": {"namespaceName": "prod", "namespaceId": "ns-prod"}},
-            {"namespace": {"namespaceName": "cons", "namespaceId": "ns-cons"}},
-        ]
-        mock_data.execute_statement.return_value = {"Id": "stmt-1"}
+        mock_serverless.get_namespace.side_effect = lambda namespaceName: {
+            "namespace": {"namespaceName": namespaceName, "namespaceId": f"ns-{namespaceName}"},
+        }
+        mock_data.batch_execute_statement.return_value = {"Id": "batch-1"}
+        mock_data.describe_statement.return_value = {"Status": "FINISHED"}
         mock_serverless.assume_role.return_value = {
             "Credentials": {"AccessKeyId": "x", "SecretAccessKey": "y",
                             "SessionToken": "z", "Expiration": "2099-01-01"}
@@ -157,7 +165,8 @@ class TestExecutionHandlerDispatch:
 
         event = build_action_group_event(
             "/setupDataSharing",
-            {"producer_namespace": "prod", "consumer_namespaces": "cons",
+            {"cluster_id": "c1", "fencing_token": FENCING_TOKEN,
+             "producer_namespace": "prod", "consumer_namespaces": "cons",
              "region": "us-east-2", "user_id": "alice"},
         )
         resp = execution_handler(event)
@@ -182,7 +191,7 @@ class TestExecutionHandlerDispatch:
         assert "error" in result
 
     @patch("redshift_agents.lambdas.execution_handler.DATA_PLANE_ROLE_ARN", "arn:aws:iam::123:role/test")
-    @patch("redshift_agents.tools.redshift_tools.time.sleep")
+    @patch("redshift_agents.tools.data_api.time.sleep")
     @patch("redshift_agents.tools.redshift_tools.emit_audit_event")
     @patch("boto3.client")
     def test_sts_assume_role_with_session_tags(self, mock_boto3, mock_audit, mock_sleep):
@@ -200,7 +209,8 @@ class TestExecutionHandlerDispatch:
 
         event = build_action_group_event(
             "/executeRedshiftQuery",
-            {"cluster_id": "c1", "query": "SELECT 1", "region": "us-east-2", "user_id": "alice"},
+            {"cluster_id": "c1", "fencing_token": FENCING_TOKEN,
+             "query": "SELECT 1", "region": "us-east-2", "user_id": "alice"},
         )
         _eh.handler(event)
 
@@ -15,6 +15,8 @@ from unittest.mock import MagicMock, patch
 import pytest
 from hypothesis import given, settings, strategies as st
 
+from redshift_agents.tests.conftest import FENCING_TOKEN, held_lock_patch
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -72,9 +74,17 @@ _execution_paths = st.sampled_from([
 _lock_paths = st.sampled_from(["/acquireClusterLock", "/releaseClusterLock"])
 
 
+_FENCED_PATHS = frozenset({
+    "/executeRedshiftQuery", "/createServerlessNamespace", "/createServerlessWorkgroup",
+    "/restoreSnapshotToServerless", "/setupDataSharing",
+})
+
+
 def _params_for_path(api_path: str, user_id: str, region: str, cluster_id: str) -> dict:
     """Build a minimal valid parameter dict for a given apiPath."""
     base = {"user_id": user_id, "region": region}
+    if api_path in _FENCED_PATHS:
+        base = {**base, "cluster_id": cluster_id, "fencing_token": str(FENCING_TOKEN)}
     if api_path == "/listRedshiftClusters":
         return base
     if api_path in (
@@ -103,6 +113,19 @@ def _params_for_path(api_path: str, user_id: str, region: str, cluster_id: str)
 # Mock helpers — patch boto3.client to return canned responses
 # ---------------------------------------------------------------------------
 
+def _metric_data_response(values: list):
+    """GetMetricData side effect answering every query with *values* (hourly)."""
+    def _respond(**kwargs):
+        timestamps = [datetime(2024, 1, 1, hour) for hour in range(len(values))]
+        return {
+            "MetricDataResults": [
+                {"Id": q["Id"], "Timestamps": timestamps, "Values": list(values)}
+                for q in kwargs["MetricDataQueries"]
+            ],
+        }
+    return _respond
+
+
 def _mock_boto3_client_factory():
     """Return a side_effect function for ``boto3.client`` that returns
     pre-configured mocks for every AWS service the handlers touch."""
@@ -136,13 +159,10 @@ def _mock_boto3_client_factory():
                     }],
                 }
             elif service_name == "cloudwatch":
-                m.get_metric_statistics.return_value = {
-                    "Datapoints": [
-                        {"Average": 50.0, "Maximum": 80.0, "Minimum": 20.0},
-                    ],
-                }
+                m.get_metric_data.side_effect = _metric_data_response([50.0])
             elif service_name == "redshift-data":
                 m.execute_statement.return_value = {"Id": "stmt-1"}
+                m.batch_execute_statement.return_value = {"Id": "batch-1"}
                 m.describe_statement.return_value = {"Status": "FINISHED"}
                 m.get_statement_result.return_value = {"Records": []}
             elif service_name == "redshift-serverless":
@@ -254,7 +274,7 @@ def test_property1_execution_handler_response_format(
     params = _params_for_path(api_path, user_id, region, cluster_id)
     event = _build_event(api_path, params, action_group)
 
-    with patch("boto3.client", side_effect=factory):
+    with patch("boto3.client", side_effect=factory), held_lock_patch():
         from redshift_agents.lambdas.execution_handler import handler
         resp = handler(event)
 
@@ -314,7 +334,7 @@ def _error_boto3_factory():
         if service_name == "redshift":
             m.describe_clusters.side_effect = _boto3_error
         elif service_name == "cloudwatch":
-            m.get_metric_statistics.side_effect = _boto3_error
+            m.get_metric_data.side_effect = _boto3_error
         elif service_name == "redshift-data":
             m.execute_statement.side_effect = _boto3_error
         elif service_name == "redshift-serverless":
@@ -368,7 +388,7 @@ def test_property2_execution_error_response(api_path, user_id, region, cluster_i
     params = _params_for_path(api_path, user_id, region, cluster_id)
     event = _build_event(api_path, params)
 
-    with patch("boto3.client", side_effect=_error_boto3_factory()):
+    with patch("boto3.client", side_effect=_error_boto3_factory()), held_lock_patch():
         from redshift_agents.lambdas.execution_handler import handler
         resp = handler(event)
 
@@ -445,7 +465,7 @@ def test_property3_identity_propagation_execution(user_id, region, cluster_id):
     params = _params_for_path("/executeRedshiftQuery", user_id, region, cluster_id)
     event = _build_event("/executeRedshiftQuery", params)
 
-    with patch("boto3.client", side_effect=factory), \
+    with held_lock_patch(), patch("boto3.client", side_effect=factory), \
          patch("tools.redshift_tools.emit_audit_event") as mock_audit:
         from redshift_agents.lambdas.execution_handler import handler
         handler(event)
@@ -507,7 +527,7 @@ def test_property4_audit_emitted_execution(api_path, user_id, region, cluster_id
     params = _params_for_path(api_path, user_id, region, cluster_id)
     event = _build_event(api_path, params)
 
-    with patch("boto3.client", side_effect=factory), \
+    with held_lock_patch(), patch("boto3.client", side_effect=factory), \
          patch("tools.redshift_tools.emit_audit_event") as mock_audit:
         from redshift_agents.lambdas.execution_handler import handler
         handler(event)
@@ -639,7 +659,7 @@ def test_property6_audit_failure_resilience_execution(api_path, user_id, region,
     def _exploding_audit(*args, **kwargs):
         raise RuntimeError("audit system down")
 
-    with patch("boto3.client", side_effect=factory), \
+    with held_lock_patch(), patch("boto3.client", side_effect=factory), \
          patch("redshift_agents.tools.redshift_tools.emit_audit_event", side_effect=_exploding_audit):
         from redshift_agents.lambdas.execution_handler import handler
         resp = handler(event)
@@ -924,11 +944,7 @@ _REQUIRED_METRICS = [
     "ReadLatency", "WriteLatency",
 ]
 
-_datapoint_gen = st.fixed_dictionaries({
-    "Average": st.floats(min_value=0, max_value=100, allow_nan=False, allow_infinity=False),
-    "Maximum": st.floats(min_value=0, max_value=100, allow_nan=False, allow_infinity=False),
-    "Minimum": st.floats(min_value=0, max_value=100, allow_nan=False, allow_infinity=False),
-})
+_datapoint_gen = st.floats(min_value=0, max_value=100, allow_nan=False, allow_infinity=False)
 
 
 @settings(max_examples=100, deadline=None)
@@ -944,7 +960,7 @@ def test_property10_cloudwatch_metrics_all_categories(cluster_id, region, user_i
     # Feature: bedrock-agents-rewrite, Property 10: CloudWatch metrics output contains all required metric categories
     from unittest.mock import MagicMock as _MM
     cw = _MM()
-    cw.get_metric_statistics.return_value = {"Datapoints": datapoints}
+    cw.get_metric_data.side_effect = _metric_data_response(datapoints)
 
     factory, _ = _mock_boto3_client_factory()
 
@@ -965,6 +981,8 @@ def test_property10_cloudwatch_metrics_all_categories(cluster_id, region, user_i
     assert "metrics" in body
     for cat in _REQUIRED_METRICS:
         assert cat in body["metrics"], f"Missing metric: {cat}"
+        assert body["metrics"][cat]["datapoint_count"] == len(datapoints)
+    assert cw.get_metric_data.call_count == 1
 
 
 # ===========================================================================
@@ -1029,7 +1047,7 @@ def test_property11_wlm_per_queue_metrics_complete(wlm_records, cluster_id, regi
     event = _build_event("/getWlmConfiguration", params)
 
     with patch("boto3.client", side_effect=_custom), \
-         patch("redshift_agents.tools.redshift_tools.time.sleep"):
+         patch("redshift_agents.tools.data_api.time.sleep"):
         from redshift_agents.lambdas.assessment_handler import handler
         resp = handler(event)
 
@@ -1329,7 +1347,7 @@ def test_property20_cluster_lock_mutual_exclusion(cluster_id, user_a, user_b):
         }
     }
 
-    with patch("redshift_agents.tools.cluster_lock.boto3.client", return_value=mock_ddb):
+    with patch("boto3.client", return_value=mock_ddb):
         ev_a = _build_event("/acquireClusterLock",
                             {"cluster_id": cluster_id, "user_id": user_a, "region": "us-east-2"})
         ev_b = _build_event("/acquireClusterLock",
@@ -1365,7 +1383,7 @@ def test_property21_lock_denial_includes_holder_info(cluster_id, holder, request
         }
     }
 
-    with patch("redshift_agents.tools.cluster_lock.boto3.client", return_value=mock_ddb):
+    with patch("boto3.client", return_value=mock_ddb):
         ev = _build_event("/acquireClusterLock",
                           {"cluster_id": cluster_id, "user_id": requester, "region": "us-east-2"})
         from redshift_agents.lambdas.cluster_lock_handler import handler as lh
@@ -0,0 +1,94 @@
+"""
+Tests for the table-driven Lambda router.
+
+Validates: parameter conversion and tool defaults, missing- and
+invalid-parameter and unknown-path errors, the ``before`` hook, and lazy tool imports (handler
+modules load without importing any tool module).
+"""
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from redshift_agents.lambdas.router import Param, Route, Router, as_bool
+from redshift_agents.tests.conftest import build_action_group_event, parse_response_body
+
+_PACKAGE_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _echo(**kwargs):
+    return kwargs
+
+
+def _router(**kwargs):
+    return Router("test_handler", {
+        "/echo": Route(
+            f"{__name__}:_echo",
+            Param("cluster_id", required=True), Param("hours", int),
+            Param("include_series", as_bool), Param("result_format", default="records"),
+        ),
+    }, **kwargs)
+
+
+class TestDispatch:
+    def test_parameters_are_converted_and_omitted_ones_dropped(self):
+        result = parse_response_body(_router()(build_action_group_event(
+            "/echo", {"cluster_id": "c1", "hours": "48", "include_series": "False"},
+        )))
+
+        assert result == {"cluster_id": "c1", "hours": 48, "include_series": False, "result_format": "records"}
+
+    def test_missing_required_parameter_is_reported(self):
+        result = parse_response_body(_router()(build_action_group_event("/echo", {"hours": "1"})))
+
+        assert result == {"error": "Missing required parameter: cluster_id"}
+
+    @pytest.mark.parametrize("params", [
+        {"cluster_id": "c1", "hours": "abc"},
+        {"cluster_id": "c1", "hours": "1.5"},
+    ])
+    def test_unconvertible_parameter_is_reported(self, params):
+        result = parse_response_body(_router()(build_action_group_event("/echo", params)))
+
+        assert result == {"error": f"Invalid parameter hours: {params['hours']!r}"}
+
+    def test_unknown_path(self):
+        result = parse_response_body(_router()(build_action_group_event("/nope", {})))
+
+        assert result == {"error": "Unknown apiPath: /nope"}
+
+    def test_before_hook_can_short_circuit(self):
+        router = _router(before=lambda params, context, route: {"valid": False} if params["cluster_id"] == "c2" else None)
+
+        assert parse_response_body(router(build_action_group_event("/echo", {"cluster_id": "c2"}))) == {"valid": False}
+        assert parse_response_body(router(build_action_group_event("/echo", {"cluster_id": "c1"})))["cluster_id"] == "c1"
+
+    def test_wait_budget_is_capped_by_lambda_context(self):
+        class Context:
+            def get_remaining_time_in_millis(self):
+                return 10_000
+
+        route = Route(f"{__name__}:_echo", wait_budget=True)
+
+        kwargs = route.bind({"max_wait_seconds": "60"}, Context())
+
+        assert 0 < kwargs["max_wait_seconds"] < 10
+
+
+@pytest.mark.parametrize("module", [
+    "lambdas.assessment_handler", "lambdas.execution_handler", "lambdas.cluster_lock_handler",
+])
+def test_handler_import_does_not_load_tools(module):
+    code = (
+        f"import sys, {module}; "
+        "loaded = sorted(m for m in sys.modules if m.startswith('tools') or m.split('.')[0] in ('boto3', 'botocore')); "
+        "print(','.join(loaded))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=_PACKAGE_ROOT, capture_output=True, text=True, check=True,
+    )
+
+    assert out.stdout.strip() == ""
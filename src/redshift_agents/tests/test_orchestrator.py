@@ -6,14 +6,26 @@ Validates: Requirements FR-5.5, FR-6.2, FR-6.4, FR-6.6, 11.1, 11.4
 """
 from __future__ import annotations
 
+import json
+import threading
+import time
 from unittest.mock import Mock, patch
 
+import pytest
 from hypothesis import given, settings, strategies as st
 
+from redshift_agents.orchestrator import orchestrator
 from redshift_agents.orchestrator.orchestrator import (
     ORCHESTRATOR_SYSTEM_PROMPT,
     _invoke_subagent,
+    assess_clusters,
+    invalidate_subagent_cache,
+    invoke_architecture,
+    invoke_assessment,
+    invoke_execution,
+    iter_assess_clusters,
 )
+from redshift_agents.tools import result_cache
 
 
 # ---------------------------------------------------------------------------
@@ -93,6 +105,392 @@ def test_orchestrator_logs_every_subagent_delegation(
     assert agent_name in str(first_call[1]["details"])
 
 
+# ---------------------------------------------------------------------------
+# Completion stream assembly
+# ---------------------------------------------------------------------------
+
+def _invoke_with_chunks(mock_boto3, chunks, on_chunk=None):
+    mock_client = Mock()
+    mock_client.invoke_agent.return_value = {
+        "completion": [{"chunk": {"bytes": c}} for c in chunks] + [{"trace": {}}],
+    }
+    mock_boto3.return_value = mock_client
+    return _invoke_subagent(
+        agent_id="redshift-assessment-subagent",
+        agent_name="assessment",
+        message="test",
+        payload={"cluster_id": "c1"},
+        user_id="alice",
+        customer_account_id="123456789012",
+        region="us-east-2",
+        on_chunk=on_chunk,
+    )
+
+
+@patch("redshift_agents.orchestrator.orchestrator.emit_audit_event")
+@patch("redshift_agents.orchestrator.orchestrator.boto3.client")
+def test_multibyte_character_split_across_chunks(mock_boto3, mock_audit):
+    encoded = "Queue wait 5 µs — ok".encode("utf-8")
+    split = encoded.index("µ".encode("utf-8")) + 1
+    result = _invoke_with_chunks(mock_boto3, [encoded[:split], encoded[split:]])
+
+    assert result["response"] == "Queue wait 5 µs — ok"
+    assert "\ufffd" not in result["response"]
+
+
+@patch("redshift_agents.orchestrator.orchestrator.emit_audit_event")
+@patch("redshift_agents.orchestrator.orchestrator.boto3.client")
+def test_on_chunk_receives_text_as_it_arrives(mock_boto3, mock_audit):
+    received = []
+    encoded = "é".encode("utf-8")
+    result = _invoke_with_chunks(mock_boto3, [b"ab", encoded[:1], encoded[1:] + b"c"], received.append)
+
+    assert received == ["ab", "éc"]
+    assert "".join(received) == result["response"]
+
+
+@patch("redshift_agents.orchestrator.orchestrator.emit_audit_event")
+@patch("redshift_agents.orchestrator.orchestrator.boto3.client")
+def test_subagent_response_event_records_stream_stats(mock_boto3, mock_audit):
+    _invoke_with_chunks(mock_boto3, [b"hello ", b"world"])
+
+    details = mock_audit.call_args_list[-1][1]["details"]
+    assert details["action"] == "subagent_response"
+    assert mock_audit.call_args_list[-1][1]["sampled"] is False
+    assert details["chunk_count"] == 2
+    assert details["response_bytes"] == 11
+    assert details["request_bytes"] > 0
+    assert 0 <= details["time_to_first_chunk_ms"] <= details["duration_ms"]
+
+
+@patch("redshift_agents.orchestrator.orchestrator.emit_audit_event")
+@patch("redshift_agents.orchestrator.orchestrator.boto3.client")
+def test_empty_completion_has_no_first_chunk_time(mock_boto3, mock_audit):
+    result = _invoke_with_chunks(mock_boto3, [])
+
+    assert result["response"] == ""
+    details = mock_audit.call_args_list[-1][1]["details"]
+    assert details["time_to_first_chunk_ms"] is None
+    assert details["response_bytes"] == 0
+
+
+# ---------------------------------------------------------------------------
+# Fleet assessment fan-out
+# ---------------------------------------------------------------------------
+
+def _granted(cluster_id, user_id, region, lease_seconds=None):
+    return {"acquired": True, "cluster_id": cluster_id, "fencing_token": 1}
+
+
+@patch.object(orchestrator, "emit_audit_event")
+@patch.object(orchestrator, "release_lock")
+@patch.object(orchestrator, "acquire_lock", side_effect=_granted)
+def test_assess_clusters_bounds_parallelism_and_releases_locks(mock_acquire, mock_release, mock_audit):
+    active, peak = [0], [0]
+    guard = threading.Lock()
+
+    def fake_assess(cluster_id, region, user_id, hours=24):
+        with guard:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with guard:
+            active[0] -= 1
+        return {"cluster_summary": {"cluster_id": cluster_id}, "errors": {}}
+
+    ids = [f"c{i}" for i in range(10)]
+    with patch.object(orchestrator, "assess_cluster", side_effect=fake_assess):
+        report = assess_clusters(ids, "us-east-2", "123456789012", "alice", max_workers=3)
+
+    assert report["succeeded"] == sorted(ids)
+    assert 1 < peak[0] <= 3
+    assert sorted(c[0][0] for c in mock_release.call_args_list) == sorted(ids)
+    assert mock_acquire.call_args[1]["lease_seconds"] == orchestrator.FANOUT_LEASE_SECONDS
+
+
+@patch.object(orchestrator, "emit_audit_event")
+@patch.object(orchestrator, "release_lock")
+def test_locked_cluster_is_skipped(mock_release, mock_audit):
+    def acquire(cluster_id, user_id, region, lease_seconds=None):
+        if cluster_id == "busy":
+            return {"acquired": False, "cluster_id": cluster_id, "lock_holder": "bob"}
+        return _granted(cluster_id, user_id, region)
+
+    with patch.object(orchestrator, "acquire_lock", side_effect=acquire), \
+            patch.object(orchestrator, "assess_cluster", return_value={"errors": {}}) as mock_assess:
+        report = assess_clusters("free, busy", "us-east-2", "123456789012", "alice")
+
+    assert report["succeeded"] == ["free"]
+    assert report["skipped"] == ["busy"]
+    assert report["clusters"]["busy"]["lock"]["lock_holder"] == "bob"
+    assert mock_assess.call_count == 1
+    assert [c[0][0] for c in mock_release.call_args_list] == ["free"]
+
+
+@patch.object(orchestrator, "_throttle_backoff", return_value=0)
+@patch.object(orchestrator, "emit_audit_event")
+@patch.object(orchestrator, "release_lock")
+@patch.object(orchestrator, "acquire_lock", side_effect=_granted)
+def test_throttled_subagent_call_is_retried(mock_acquire, mock_release, mock_audit, mock_backoff):
+    responses = [
+        {"status": "failed", "error": "An error occurred (ThrottlingException) when calling InvokeAgent"},
+        {"status": "success", "response": "ok"},
+    ]
+    with patch.object(orchestrator, "invoke_assessment", side_effect=responses) as mock_invoke:
+        outcome = next(iter_assess_clusters(["c1"], "us-east-2", "123456789012", "alice", use_subagent=True))
+
+    assert outcome["status"] == "success"
+    assert outcome["attempts"] == 2
+    assert mock_invoke.call_count == 2
+
+
+@patch.object(orchestrator, "emit_audit_event")
+@patch.object(orchestrator, "release_lock")
+@patch.object(orchestrator, "acquire_lock", side_effect=_granted)
+def test_outcomes_stream_in_completion_order(mock_acquire, mock_release, mock_audit):
+    def fake_assess(cluster_id, region, user_id, hours=24):
+        time.sleep(0.15 if cluster_id == "slow" else 0)
+        return {"errors": {}}
+
+    with patch.object(orchestrator, "assess_cluster", side_effect=fake_assess):
+        order = [o["cluster_id"] for o in iter_assess_clusters(["slow", "fast"], "us-east-2", "1", "alice")]
+
+    assert order == ["fast", "slow"]
+
+
+@patch.object(orchestrator, "emit_audit_event")
+@patch.object(orchestrator, "release_lock")
+@patch.object(orchestrator, "acquire_lock", side_effect=_granted)
+def test_exception_fails_only_its_cluster(mock_acquire, mock_release, mock_audit):
+    def fake_assess(cluster_id, region, user_id, hours=24):
+        if cluster_id == "bad":
+            raise RuntimeError("boom")
+        return {"errors": {}}
+
+    with patch.object(orchestrator, "assess_cluster", side_effect=fake_assess):
+        report = assess_clusters("bad, good", "us-east-2", "1", "alice")
+
+    assert report["succeeded"] == ["good"]
+    assert report["failed"] == ["bad"]
+    assert report["clusters"]["bad"]["error"] == "boom"
+    assert "elapsed_ms" in report["clusters"]["bad"]
+    assert sorted(c[0][0] for c in mock_release.call_args_list) == ["bad", "good"]
+
+
+@pytest.mark.parametrize("resumed, expected", [
+    ({"wlm_queues": [{"queue": 1}]}, {"wlm_queue_analysis": [{"queue": 1}]}),
+    ({"error": "Statement failed"}, {"errors": {"wlm_queue_analysis": "Statement failed"}}),
+])
+@patch.object(orchestrator, "emit_audit_event")
+@patch.object(orchestrator, "release_lock")
+@patch.object(orchestrator, "acquire_lock", side_effect=_granted)
+def test_unfinished_wlm_query_is_resumed(mock_acquire, mock_release, mock_audit, resumed, expected):
+    handle = {"statement_id": "s-1", "resumable": True}
+    with patch.object(orchestrator, "assess_cluster", return_value={"errors": {}, "wlm_statement": handle}), \
+            patch.object(orchestrator, "get_statement_result", return_value=resumed) as mock_resume:
+        outcome = next(iter_assess_clusters(["c1"], "us-east-2", "1", "alice"))
+
+    mock_resume.assert_called_once_with("s-1", "c1", "us-east-2", "wlm_queues", "alice")
+    assert outcome["result"] == {"errors": {}, **expected}
+    assert "wlm_statement" not in outcome
+
+
+@patch.object(orchestrator, "emit_audit_event")
+@patch.object(orchestrator, "release_lock")
+@patch.object(orchestrator, "acquire_lock", side_effect=_granted)
+def test_wlm_query_still_running_surfaces_its_handle(mock_acquire, mock_release, mock_audit):
+    later = {"statement_id": "s-1", "resumable": True, "statement_status": "STARTED"}
+    with patch.object(orchestrator, "assess_cluster", return_value={"errors": {}, "wlm_statement": {"statement_id": "s-1"}}), \
+            patch.object(orchestrator, "get_statement_result", return_value=later):
+        outcome = next(iter_assess_clusters(["c1"], "us-east-2", "1", "alice"))
+
+    assert outcome["status"] == "success"
+    assert outcome["wlm_statement"] == later
+    assert outcome["result"]["wlm_statement"] == later
+
+
+def test_rate_limiter_spaces_calls():
+    limiter = orchestrator._RateLimiter(20)
+    started = time.monotonic()
+    for _ in range(3):
+        limiter.wait()
+    assert time.monotonic() - started >= 0.09
+
+
+# ---------------------------------------------------------------------------
+# Subagent memoization
+# ---------------------------------------------------------------------------
+
+@pytest.fixture()
+def subagent_cache():
+    result_cache.set_cache(result_cache.TieredCache(result_cache.MemoryCache()))
+    with patch.dict(result_cache.TOOL_TTLS, {"subagent_response": 600}):
+        yield
+    result_cache.set_cache(None)
+
+
+def _agent_client(mock_boto3, text="design"):
+    client = Mock()
+    client.invoke_agent.side_effect = lambda **_: {"completion": [{"chunk": {"bytes": text.encode()}}]}
+    mock_boto3.return_value = client
+    return client
+
+
+def _architecture(**kwargs):
+    return invoke_architecture("assessment json", "us-east-2", "123456789012", "alice", cluster_id="c1", **kwargs)
+
+
+@patch("redshift_agents.orchestrator.orchestrator.emit_audit_event")
+@patch("redshift_agents.orchestrator.orchestrator.boto3.client")
+def test_identical_architecture_call_is_served_from_cache(mock_boto3, mock_audit, subagent_cache):
+    client = _agent_client(mock_boto3)
+
+    first = _architecture()
+    received = []
+    second = _architecture(on_chunk=received.append)
+
+    assert client.invoke_agent.call_count == 1
+    assert "cached" not in first
+    assert second["cached"] is True
+    assert second["response"] == first["response"] == "design"
+    assert received == ["design"]
+    hit = mock_audit.call_args_list[-1][1]
+    assert hit["details"]["action"] == "subagent_cache_hit"
+    assert hit["sampled"] is False
+    assert hit["cluster_id"] == "c1"
+
+
+@patch("redshift_agents.orchestrator.orchestrator.emit_audit_event")
+@patch("redshift_agents.orchestrator.orchestrator.boto3.client")
+def test_changed_payload_force_refresh_and_invalidation_miss(mock_boto3, mock_audit, subagent_cache):
+    client = _agent_client(mock_boto3)
+
+    _architecture()
+    invoke_architecture("other assessment", "us-east-2", "123456789012", "alice", cluster_id="c1")
+    assert client.invoke_agent.call_count == 2
+
+    assert "cached" not in _architecture(force_refresh=True)
+    assert client.invoke_agent.call_count == 3
+
+    invalidate_subagent_cache("c1", "us-east-2")
+    _architecture()
+    assert client.invoke_agent.call_count == 4
+
+
+@patch("redshift_agents.orchestrator.orchestrator.emit_audit_event")
+@patch("redshift_agents.orchestrator.orchestrator.boto3.client")
+def test_memos_are_not_shared_between_users_or_accounts(mock_boto3, mock_audit, subagent_cache):
+    client = _agent_client(mock_boto3)
+
+    invoke_assessment("c1", "us-east-2", "123456789012", "alice")
+    bob = invoke_assessment("c1", "us-east-2", "123456789012", "bob")
+    other_account = invoke_assessment("c1", "us-east-2", "210987654321", "alice")
+
+    assert client.invoke_agent.call_count == 3
+    assert "cached" not in bob
+    assert "cached" not in other_account
+    assert invoke_assessment("c1", "us-east-2", "123456789012", "bob")["cached"] is True
+
+
+@patch("redshift_agents.orchestrator.orchestrator.emit_audit_event")
+@patch("redshift_agents.orchestrator.orchestrator.boto3.client")
+def test_architecture_without_cluster_is_not_memoized(mock_boto3, mock_audit, subagent_cache):
+    client = _agent_client(mock_boto3)
+
+    for _ in range(2):
+        invoke_architecture("assessment json", "us-east-2", "123456789012", "alice")
+
+    assert client.invoke_agent.call_count == 2
+
+
+@patch("redshift_agents.orchestrator.orchestrator.emit_audit_event")
+@patch("redshift_agents.orchestrator.orchestrator.boto3.client")
+def test_execution_requires_cluster_id(mock_boto3, mock_audit):
+    result = invoke_execution("plan", "us-east-2", "123456789012", "alice", "", 7)
+
+    assert result["status"] == "failed"
+    mock_boto3.assert_not_called()
+
+
+@patch("redshift_agents.orchestrator.orchestrator.emit_audit_event")
+@patch("redshift_agents.orchestrator.orchestrator.boto3.client")
+def test_execution_is_not_memoized_and_drops_cluster_memos(mock_boto3, mock_audit, subagent_cache):
+    client = _agent_client(mock_boto3)
+
+    invoke_assessment("c1", "us-east-2", "123456789012", "alice")
+    invoke_execution("plan", "us-east-2", "123456789012", "alice", "c1", 7)
+    invoke_execution("plan", "us-east-2", "123456789012", "alice", "c1", 7)
+    invoke_assessment("c1", "us-east-2", "123456789012", "alice")
+
+    assert client.invoke_agent.call_count == 4
+
+
+class _LockTable:
+    """Just enough of DynamoDB for ``renew_lock`` and ``check_fencing_token``."""
+
+    def __init__(self, lease_seconds):
+        self.item = {
+            "cluster_id": {"S": "c1"}, "lock_holder": {"S": "alice"}, "fencing_token": {"N": "7"},
+            "lease_expires_at": {"N": str(time.time() + lease_seconds)},
+        }
+
+    def get_item(self, **kwargs):
+        return {"Item": dict(self.item)}
+
+    def update_item(self, ExpressionAttributeValues, **kwargs):
+        self.item["lease_expires_at"] = ExpressionAttributeValues[":expires"]
+        return {}
+
+
+@patch("redshift_agents.orchestrator.orchestrator.emit_audit_event")
+@patch("redshift_agents.orchestrator.orchestrator.boto3.client")
+def test_execution_outliving_the_lease_keeps_fenced_calls_valid(mock_boto3, mock_audit):
+    from redshift_agents.tools.cluster_lock import LeaseHeartbeat, check_fencing_token
+
+    lease_seconds = 0.2
+    table = _LockTable(lease_seconds)
+    agent = Mock()
+    checks = []
+
+    def run_execution(inputText, **kwargs):
+        payload = json.loads(inputText)
+        # Fenced tool calls spread over three leases
+        for _ in range(3):
+            time.sleep(lease_seconds)
+            checks.append(check_fencing_token(payload["cluster_id"], payload["fencing_token"], "alice"))
+        return {"completion": [{"chunk": {"bytes": b"done"}}]}
+
+    agent.invoke_agent.side_effect = run_execution
+    mock_boto3.side_effect = lambda service, **kwargs: table if service == "dynamodb" else agent
+
+    heartbeat = lambda *args: LeaseHeartbeat(*args, lease_seconds=lease_seconds)
+    with patch.object(orchestrator, "LeaseHeartbeat", heartbeat):
+        result = invoke_execution("plan", "us-east-2", "123456789012", "alice", "c1", 7)
+
+    assert result["status"] == "success" and "lock_lost" not in result
+    assert [c["valid"] for c in checks] == [True, True, True]
+
+
+@patch("redshift_agents.orchestrator.orchestrator.emit_audit_event")
+@patch("redshift_agents.orchestrator.orchestrator.boto3.client")
+def test_failed_invocations_and_default_ttl_are_not_cached(mock_boto3, mock_audit):
+    result_cache.set_cache(result_cache.TieredCache(result_cache.MemoryCache()))
+    try:
+        client = _agent_client(mock_boto3)
+        _architecture()
+        _architecture()
+        assert client.invoke_agent.call_count == 2
+
+        with patch.dict(result_cache.TOOL_TTLS, {"subagent_response": 600}):
+            client.invoke_agent.side_effect = RuntimeError("boom")
+            assert _architecture()["status"] == "failed"
+            client.invoke_agent.side_effect = None
+            client.invoke_agent.return_value = {"completion": []}
+            assert "cached" not in _architecture()
+    finally:
+        result_cache.set_cache(None)
+
+
 # ---------------------------------------------------------------------------
 # Unit tests for orchestrator prompt content
 # ---------------------------------------------------------------------------
@@ -12,7 +12,7 @@ import pytest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
 
-from redshift_agents.tests.conftest import build_action_group_event, parse_response_body
+from redshift_agents.tests.conftest import FENCING_TOKEN, build_action_group_event, parse_response_body
 from redshift_agents.lambdas.assessment_handler import handler as assessment_handler
 from redshift_agents.lambdas.execution_handler import handler as execution_handler
 
@@ -94,16 +94,27 @@ class TestAnalyzeRedshiftCluster:
 class TestGetClusterMetrics:
     """Test getClusterMetrics via assessment Lambda handler."""
 
+    @staticmethod
+    def _metric_data(series_by_stat):
+        """GetMetricData side effect serving *series_by_stat* for every metric."""
+        timestamps = [datetime(2024, 1, 1, 12, 0, 0), datetime(2024, 1, 1, 13, 0, 0)]
+
+        def _respond(**kwargs):
+            results = []
+            for query in kwargs['MetricDataQueries']:
+                values = series_by_stat.get(query['MetricStat']['Stat'], [])
+                results.append({'Id': query['Id'], 'Timestamps': timestamps[:len(values)], 'Values': values})
+            return {'MetricDataResults': results}
+        return _respond
+
     @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
     @patch('boto3.client')
     def test_successful_metrics_retrieval(self, mock_boto3, mock_audit):
         mock_client = Mock()
-        mock_client.get_metric_statistics.return_value = {
-            'Datapoints': [
-                {'Timestamp': datetime(2024, 1, 1, 12, 0, 0), 'Average': 45.5, 'Maximum': 67.8, 'Minimum': 23.4},
-                {'Timestamp': datetime(2024, 1, 1, 13, 0, 0), 'Average': 52.3, 'Maximum': 71.2, 'Minimum': 31.5},
-            ]
-        }
+        mock_client.get_metric_data.side_effect = self._metric_data({
+            'Average': [45.5, 52.3], 'Maximum': [67.8, 71.2], 'Minimum': [23.4, 31.5],
+            'p50': [44.0, 50.0], 'p95': [60.0, 66.0], 'p99': [65.0, 70.0],
+        })
         mock_boto3.return_value = mock_client
 
         event = build_action_group_event(
@@ -117,13 +128,59 @@ class TestGetClusterMetrics:
         assert result['region'] == 'us-east-2'
         assert result['time_range_hours'] == 24
         assert 'metrics' in result
-        assert mock_client.get_metric_statistics.call_count == 7
+        # One batched request covers every metric and statistic
+        assert mock_client.get_metric_data.call_count == 1
+        queries = mock_client.get_metric_data.call_args.kwargs['MetricDataQueries']
+        assert len(queries) == 7 * 6
+
+        cpu = result['metrics']['CPUUtilization']
+        assert cpu['average'] == pytest.approx(48.9)
+        assert cpu['maximum'] == 71.2
+        assert cpu['minimum'] == 23.4
+        assert cpu['p95'] == 66.0
+        assert cpu['datapoint_count'] == 2
+        assert result['series']['CPUUtilization']['timestamps'] == [
+            '2024-01-01T12:00:00', '2024-01-01T13:00:00',
+        ]
+        assert result['series']['CPUUtilization']['average'] == [45.5, 52.3]
+
+    @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
+    @patch('boto3.client')
+    def test_paginated_results_are_merged(self, mock_boto3, mock_audit):
+        t1, t2 = datetime(2024, 1, 1, 12, 0, 0), datetime(2024, 1, 1, 13, 0, 0)
+
+        def _respond(**kwargs):
+            ids = [q['Id'] for q in kwargs['MetricDataQueries']]
+            if 'NextToken' not in kwargs:
+                return {
+                    'MetricDataResults': [{'Id': i, 'Timestamps': [t1], 'Values': [10.0]} for i in ids],
+                    'NextToken': 'page-2',
+                }
+            return {'MetricDataResults': [{'Id': i, 'Timestamps': [t2], 'Values': [30.0]} for i in ids]}
+
+        mock_client = Mock()
+        mock_client.get_metric_data.side_effect = _respond
+        mock_boto3.return_value = mock_client
+
+        event = build_action_group_event(
+            "/getClusterMetrics",
+            {"cluster_id": "test-cluster", "region": "us-east-2", "period_seconds": "300",
+             "include_series": "false", "user_id": "jane.doe"},
+        )
+        result = parse_response_body(assessment_handler(event))
+
+        assert mock_client.get_metric_data.call_count == 2
+        queries = mock_client.get_metric_data.call_args.kwargs['MetricDataQueries']
+        assert queries[0]['MetricStat']['Period'] == 300
+        assert result['metrics']['ReadLatency']['average'] == 20.0
+        assert result['metrics']['ReadLatency']['datapoint_count'] == 2
+        assert 'series' not in result
 
     @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
     @patch('boto3.client')
     def test_no_datapoints_available(self, mock_boto3, mock_audit):
         mock_client = Mock()
-        mock_client.get_metric_statistics.return_value = {'Datapoints': []}
+        mock_client.get_metric_data.return_value = {'MetricDataResults': []}
         mock_boto3.return_value = mock_client
 
         event = build_action_group_event(
@@ -204,11 +261,85 @@ class TestListRedshiftClusters:
         result = parse_response_body(resp)
         assert 'error' in result
 
+    @staticmethod
+    def _cluster(identifier):
+        return {
+            'ClusterIdentifier': identifier, 'NodeType': 'ra3.4xlarge',
+            'NumberOfNodes': 2, 'ClusterStatus': 'available',
+        }
+
+    @patch('boto3.client')
+    def test_list_follows_marker_pages(self, mock_boto3):
+        mock_client = Mock()
+        mock_client.describe_clusters.side_effect = [
+            {'Clusters': [self._cluster(f'c{i}') for i in range(100)], 'Marker': 'page-2'},
+            {'Clusters': [self._cluster('c100')]},
+        ]
+        mock_boto3.return_value = mock_client
+
+        event = build_action_group_event(
+            "/listRedshiftClusters",
+            {"region": "us-east-2", "user_id": "jane.doe"},
+        )
+        result = parse_response_body(assessment_handler(event))
+
+        assert len(result) == 101
+        markers = [c.kwargs.get('Marker') for c in mock_client.describe_clusters.call_args_list]
+        assert markers == [None, 'page-2']
+
+    @patch('boto3.client')
+    def test_all_regions_merges_results_and_reports_failures(self, mock_boto3):
+        ec2 = Mock()
+        ec2.describe_regions.return_value = {
+            'Regions': [{'RegionName': 'us-east-2'}, {'RegionName': 'us-west-2'}, {'RegionName': 'eu-west-1'}],
+        }
+
+        def _redshift(region):
+            client = Mock()
+            if region == 'eu-west-1':
+                client.describe_clusters.side_effect = Exception('AccessDenied')
+            else:
+                client.describe_clusters.return_value = {'Clusters': [self._cluster(f'{region}-c1')]}
+            return client
+
+        def _factory(service_name, region_name=None, **kwargs):
+            return ec2 if service_name == 'ec2' else _redshift(region_name)
+
+        mock_boto3.side_effect = _factory
+
+        event = build_action_group_event(
+            "/listRedshiftClusters",
+            {"region": "us-east-2", "regions": "all", "user_id": "jane.doe"},
+        )
+        result = parse_response_body(assessment_handler(event))
+
+        assert result['cluster_count'] == 2
+        assert {c['region'] for c in result['clusters']} == {'us-east-2', 'us-west-2'}
+        assert result['failed_regions'] == ['eu-west-1']
+        assert 'AccessDenied' in result['regions']['eu-west-1']['error']
+        assert result['regions']['us-west-2']['cluster_count'] == 1
+        assert 'elapsed_ms' in result['regions']['us-east-2']
+
+    @patch('boto3.client')
+    def test_explicit_region_list_skips_discovery(self, mock_boto3):
+        mock_client = Mock()
+        mock_client.describe_clusters.return_value = {'Clusters': []}
+        mock_boto3.return_value = mock_client
+
+        event = build_action_group_event(
+            "/listRedshiftClusters",
+            {"regions": "us-west-2, us-east-1", "user_id": "jane.doe"},
+        )
+        result = parse_response_body(assessment_handler(event))
+
+        assert sorted(result['regions']) == ['us-east-1', 'us-west-2']
+        mock_client.describe_regions.assert_not_called()
+
 
 class TestGetWlmConfiguration:
     """Test getWlmConfiguration via assessment Lambda handler."""
 
-    @patch('redshift_agents.tools.redshift_tools.time.sleep')
+    @patch('redshift_agents.tools.data_api.time.sleep')
     @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
     @patch('boto3.client')
     def test_successful_wlm_query(self, mock_boto3, mock_audit, mock_sleep):
@@ -246,7 +377,7 @@ class TestGetWlmConfiguration:
         call_kwargs = mock_client.execute_statement.call_args[1]
         assert call_kwargs['DbUser'] == 'jane.doe'
 
-    @patch('redshift_agents.tools.redshift_tools.time.sleep')
+    @patch('redshift_agents.tools.data_api.time.sleep')
     @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
     @patch('boto3.client')
     def test_query_failed(self, mock_boto3, mock_audit, mock_sleep):
@@ -278,7 +409,7 @@ class TestGetWlmConfiguration:
         result = parse_response_body(resp)
         assert 'error' in result
 
-    @patch('redshift_agents.tools.redshift_tools.time.sleep')
+    @patch('redshift_agents.tools.data_api.time.sleep')
     @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
     @patch('boto3.client')
     def test_empty_results(self, mock_boto3, mock_audit, mock_sleep):
@@ -297,10 +428,107 @@ class TestGetWlmConfiguration:
         assert result['wlm_queues'] == []
 
 
+class TestAssessCluster:
+    """Test assessCluster bundle via assessment Lambda handler."""
+
+    @staticmethod
+    def _client():
+        client = Mock()
+        client.describe_clusters.return_value = {
+            'Clusters': [{
+                'ClusterIdentifier': 'test-cluster', 'NodeType': 'ra3.4xlarge',
+                'NumberOfNodes': 4, 'ClusterStatus': 'available', 'ClusterVersion': '1.0',
+                'Encrypted': True, 'VpcId': 'vpc-123', 'EnhancedVpcRouting': True,
+            }]
+        }
+        client.get_metric_data.return_value = {
+            'MetricDataResults': [
+                {'Id': 'm0s0', 'Timestamps': [datetime(2024, 1, 1, 12)], 'Values': [40.0]},
+            ]
+        }
+        client.execute_statement.return_value = {'Id': 'stmt-wlm'}
+        client.describe_statement.return_value = {'Status': 'FINISHED'}
+        client.get_statement_result.return_value = {
+            'Records': [[
+                {'stringValue': 'etl_queue'}, {'longValue': 6}, {'longValue': 5},
+                {'longValue': 2}, {'doubleValue': 10.0}, {'doubleValue': 20.0},
+                {'doubleValue': 0.5}, {'longValue': 0}, {'doubleValue': 0.0}, {'doubleValue': 80.0},
+            ]]
+        }
+        return client
+
+    @patch('redshift_agents.tools.data_api.time.sleep')
+    @patch('tools.redshift_tools.emit_audit_event')
+    @patch('boto3.client')
+    def test_bundle_returns_all_sections(self, mock_boto3, mock_audit, mock_sleep):
+        mock_boto3.return_value = self._client()
+
+        event = build_action_group_event(
+            "/assessCluster",
+            {"cluster_id": "test-cluster", "region": "us-east-2", "user_id": "jane.doe"},
+        )
+        result = parse_response_body(assessment_handler(event))
+
+        assert result['errors'] == {}
+        assert result['cluster_summary']['cluster_id'] == 'test-cluster'
+        assert result['cluster_summary']['status'] == 'available'
+        assert result['cloudwatch_metrics']['CPUUtilization']['average'] == 40.0
+        assert result['wlm_queue_analysis'][0]['queue_name'] == 'etl_queue'
+        assert result['contention_narrative'] == ''
+        assert set(result['timings_ms']) == {
+            'cluster_summary', 'cloudwatch_metrics', 'wlm_queue_analysis', 'total',
+        }
+        tools_called = {c.kwargs['details']['tool'] for c in mock_audit.call_args_list}
+        assert tools_called == {
+            'assess_cluster', 'analyze_redshift_cluster', 'get_cluster_metrics', 'get_wlm_configuration',
+        }
+
+    @patch('redshift_agents.tools.data_api.time.sleep')
+    @patch('tools.redshift_tools.emit_audit_event')
+    @patch('boto3.client')
+    def test_failed_section_is_reported_without_failing_bundle(self, mock_boto3, mock_audit, mock_sleep):
+        client = self._client()
+        client.get_metric_data.side_effect = Exception('AccessDenied: cloudwatch:GetMetricData')
+        mock_boto3.return_value = client
+
+        event = build_action_group_event(
+            "/assessCluster",
+            {"cluster_id": "test-cluster", "region": "us-east-2", "user_id": "jane.doe"},
+        )
+        result = parse_response_body(assessment_handler(event))
+
+        assert list(result['errors']) == ['cloudwatch_metrics']
+        assert 'AccessDenied' in result['errors']['cloudwatch_metrics']
+        assert result['cloudwatch_metrics'] == {}
+        assert result['cluster_summary']['node_type'] == 'ra3.4xlarge'
+        assert len(result['wlm_queue_analysis']) == 1
+
+    @patch('redshift_agents.tools.data_api.time.sleep')
+    @patch('tools.redshift_tools.emit_audit_event')
+    @patch('boto3.client')
+    def test_running_wlm_query_returns_handle(self, mock_boto3, mock_audit, mock_sleep):
+        client = self._client()
+        client.describe_statement.return_value = {'Status': 'STARTED'}
+        mock_boto3.return_value = client
+
+        event = build_action_group_event(
+            "/assessCluster",
+            {"cluster_id": "test-cluster", "region": "us-east-2",
+             "max_wait_seconds": "0", "user_id": "jane.doe"},
+        )
+        result = parse_response_body(assessment_handler(event))
+
+        assert result['errors'] == {}
+        assert result['wlm_queue_analysis'] == []
+        assert result['wlm_statement']['statement_id'] == 'stmt-wlm'
+        assert result['wlm_statement']['resumable'] is True
+
+
+@pytest.mark.usefixtures("held_lock")
 class TestExecuteRedshiftQuery:
     """Test executeRedshiftQuery via execution Lambda handler."""
 
-    @patch('redshift_agents.tools.redshift_tools.time.sleep')
+    @patch('redshift_agents.tools.data_api.time.sleep')
     @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
     @patch('boto3.client')
     def test_successful_query_execution(self, mock_boto3, mock_audit, mock_sleep):
@@ -320,7 +548,7 @@ class TestExecuteRedshiftQuery:
 
         event = build_action_group_event(
             "/executeRedshiftQuery",
-            {"cluster_id": "test-cluster", "query": "SELECT * FROM my_table",
+            {"cluster_id": "test-cluster", "fencing_token": FENCING_TOKEN, "query": "SELECT * FROM my_table",
              "region": "us-east-2", "user_id": "jane.doe"},
         )
         resp = execution_handler(event)
@@ -330,7 +558,40 @@ class TestExecuteRedshiftQuery:
         assert result['cluster_id'] == 'test-cluster'
         assert len(result['records']) == 2
 
-    @patch('redshift_agents.tools.redshift_tools.time.sleep')
+    @patch('redshift_agents.tools.data_api.time.sleep')
+    @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
+    @patch('boto3.client')
+    def test_decoded_dict_rows(self, mock_boto3, mock_audit, mock_sleep):
+        mock_client = Mock()
+        mock_client.execute_statement.return_value = {'Id': 'stmt-exec-1'}
+        mock_client.describe_statement.return_value = {'Status': 'FINISHED'}
+        mock_client.get_statement_result.return_value = {
+            'ColumnMetadata': [
+                {'name': 'table_name', 'label': 'table_name', 'typeName': 'varchar'},
+                {'name': 'size_mb', 'label': 'size_mb', 'typeName': 'numeric'},
+                {'name': 'rows', 'label': 'rows', 'typeName': 'int8'},
+            ],
+            'Records': [
+                [{'stringValue': 'sales'}, {'stringValue': '1024.50'}, {'longValue': 42}],
+                [{'stringValue': 'events'}, {'isNull': True}, {'longValue': 7}],
+            ],
+        }
+        mock_boto3.return_value = mock_client
+
+        event = build_action_group_event(
+            "/executeRedshiftQuery",
+            {"cluster_id": "test-cluster", "fencing_token": FENCING_TOKEN, "query": "SELECT * FROM sizes",
+             "region": "us-east-2", "result_format": "dicts", "user_id": "jane.doe"},
+        )
+        result = parse_response_body(execution_handler(event))
+
+        assert result['columns'] == ['table_name', 'size_mb', 'rows']
+        assert result['records'] == [
+            {'table_name': 'sales', 'size_mb': '1024.50', 'rows': 42},
+            {'table_name': 'events', 'size_mb': None, 'rows': 7},
+        ]
+
+    @patch('redshift_agents.tools.data_api.time.sleep')
     @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
     @patch('boto3.client')
     def test_query_failure(self, mock_boto3, mock_audit, mock_sleep):
@@ -344,7 +605,7 @@ class TestExecuteRedshiftQuery:
 
         event = build_action_group_event(
             "/executeRedshiftQuery",
-            {"cluster_id": "test-cluster", "query": "INVALID SQL",
+            {"cluster_id": "test-cluster", "fencing_token": FENCING_TOKEN, "query": "INVALID SQL",
              "region": "us-east-2", "user_id": "jane.doe"},
         )
         resp = execution_handler(event)
@@ -363,7 +624,7 @@ class TestExecuteRedshiftQuery:
 
         event = build_action_group_event(
             "/executeRedshiftQuery",
-            {"cluster_id": "test-cluster", "query": "SELECT 1",
+            {"cluster_id": "test-cluster", "fencing_token": FENCING_TOKEN, "query": "SELECT 1",
              "region": "us-east-2", "user_id": "jane.doe"},
         )
         resp = execution_handler(event)
@@ -371,6 +632,161 @@ class TestExecuteRedshiftQuery:
         assert 'error' in result
 
 
+    @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
+    @patch('boto3.client')
+    def test_lambda_budget_exhausted_returns_resumable_handle(self, mock_boto3, mock_audit):
+        mock_client = Mock()
+        mock_client.execute_statement.return_value = {'Id': 'stmt-slow'}
+        mock_client.describe_statement.return_value = {'Status': 'STARTED'}
+        mock_boto3.return_value = mock_client
+        context = Mock()
+        context.get_remaining_time_in_millis.return_value = 2000
+
+        event = build_action_group_event(
+            "/executeRedshiftQuery",
+            {"cluster_id": "test-cluster", "fencing_token": FENCING_TOKEN, "query": "SELECT * FROM big_table",
+             "region": "us-east-2", "user_id": "jane.doe"},
+        )
+        resp = execution_handler(event, context)
+        result = parse_response_body(resp)
+
+        assert 'error' not in result
+        assert result['resumable'] is True
+        assert result['statement_id'] == 'stmt-slow'
+        assert result['statement_status'] == 'STARTED'
+        assert result['result_format'] == 'records'
+        mock_client.get_statement_result.assert_not_called()
+
+
+    @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
+    @patch('boto3.client')
+    def test_large_result_is_capped_and_flagged(self, mock_boto3, mock_audit):
+        mock_client = Mock()
+        mock_client.execute_statement.return_value = {'Id': 'stmt-big'}
+        mock_client.describe_statement.return_value = {'Status': 'FINISHED', 'HasResultSet': True}
+        mock_client.get_statement_result.side_effect = [
+            {'Records': [[{'longValue': n}] for n in range(3)], 'TotalNumRows': 6, 'NextToken': 't1'},
+            {'Records': [[{'longValue': n}] for n in range(3, 6)], 'TotalNumRows': 6},
+        ]
+        mock_boto3.return_value = mock_client
+
+        event = build_action_group_event(
+            "/executeRedshiftQuery",
+            {"cluster_id": "test-cluster", "fencing_token": FENCING_TOKEN, "query": "SELECT n FROM numbers",
+             "region": "us-east-2", "user_id": "jane.doe", "max_rows": "4"},
+        )
+        result = parse_response_body(execution_handler(event))
+
+        assert result['returned_rows'] == 4
+        assert result['total_rows'] == 6
+        assert result['truncated'] is True
+        assert mock_client.get_statement_result.call_count == 2
+
+
+class TestGetStatementResult:
+    """Test getStatementResult via both Lambda handlers."""
+
+    @patch('redshift_agents.tools.data_api.time.sleep')
+    @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
+    @patch('boto3.client')
+    def test_resume_query_records(self, mock_boto3, mock_audit, mock_sleep):
+        mock_client = Mock()
+        mock_client.describe_statement.side_effect = [
+            {'Status': 'STARTED'},
+            {'Status': 'FINISHED', 'HasResultSet': True},
+        ]
+        mock_client.get_statement_result.return_value = {
+            'Records': [[{'longValue': 1}]],
+        }
+        mock_boto3.return_value = mock_client
+
+        event = build_action_group_event(
+            "/getStatementResult",
+            {"statement_id": "stmt-slow", "cluster_id": "test-cluster",
+             "region": "us-east-2", "user_id": "jane.doe"},
+        )
+        resp = execution_handler(event)
+        result = parse_response_body(resp)
+
+        assert result['records'] == [[{'longValue': 1}]]
+        mock_client.execute_statement.assert_not_called()
+        mock_client.get_statement_result.assert_called_once_with(Id='stmt-slow')
+
+    @patch('redshift_agents.tools.data_api.time.sleep')
+    @patch('tools.redshift_tools.emit_audit_event')
+    @patch('boto3.client')
+    def test_resume_wlm_queues(self, mock_boto3, mock_audit, mock_sleep):
+        mock_client = Mock()
+        mock_client.describe_statement.return_value = {'Status': 'FINISHED'}
+        mock_client.get_statement_result.return_value = {
+            'Records': [[
+                {'stringValue': 'etl_queue'}, {'longValue': 6}, {'longValue': 5},
+                {'longValue': 2}, {'longValue': 10}, {'longValue': 20},
+                {'doubleValue': 0.5}, {'longValue': 1}, {'doubleValue': 12.5}, {'doubleValue': 40.0},
+            ]],
+        }
+        mock_boto3.return_value = mock_client
+
+        event = build_action_group_event(
+            "/getStatementResult",
+            {"statement_id": "stmt-wlm", "cluster_id": "test-cluster",
+             "region": "us-east-2", "user_id": "jane.doe"},
+        )
+        resp = assessment_handler(event)
+        result = parse_response_body(resp)
+
+        assert result['cluster_id'] == 'test-cluster'
+        assert result['wlm_queues'][0]['queue_name'] == 'etl_queue'
+        assert result['wlm_queues'][0]['saturation_pct'] == 40.0
+        assert mock_audit.call_args[0][1] == 'assessment'
+
+    @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
+    @patch('boto3.client')
+    def test_statement_without_result_set(self, mock_boto3, mock_audit):
+        mock_client = Mock()
+        mock_client.describe_statement.return_value = {'Status': 'FINISHED', 'HasResultSet': False}
+        mock_boto3.return_value = mock_client
+
+        event = build_action_group_event(
+            "/getStatementResult",
+            {"statement_id": "stmt-ddl", "region": "us-east-2", "user_id": "jane.doe"},
+        )
+        result = parse_response_body(execution_handler(event))
+
+        assert result['records'] == []
+        mock_client.get_statement_result.assert_not_called()
+
+    @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
+    @patch('boto3.client')
+    def test_aborted_statement_returns_error(self, mock_boto3, mock_audit):
+        mock_client = Mock()
+        mock_client.describe_statement.return_value = {'Status': 'ABORTED'}
+        mock_boto3.return_value = mock_client
+
+        event = build_action_group_event(
+            "/getStatementResult",
+            {"statement_id": "stmt-x", "region": "us-east-2", "user_id": "jane.doe"},
+        )
+        result = parse_response_body(execution_handler(event))
+
+        assert result['error'] == 'Query aborted'
+
+    @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
+    @patch('boto3.client')
+    def test_unknown_result_format(self, mock_boto3, mock_audit):
+        mock_boto3.return_value = Mock()
+
+        event = build_action_group_event(
+            "/getStatementResult",
+            {"statement_id": "stmt-x", "result_format": "csv",
+             "region": "us-east-2", "user_id": "jane.doe"},
+        )
+        result = parse_response_body(execution_handler(event))
+
+        assert 'error' in result
+
+
+@pytest.mark.usefixtures("held_lock")
 class TestCreateServerlessNamespace:
     """Test createServerlessNamespace via execution Lambda handler."""
 
@@ -392,7 +808,8 @@ class TestCreateServerlessNamespace:
 
         event = build_action_group_event(
             "/createServerlessNamespace",
-            {"namespace_name": "my-namespace", "admin_username": "admin",
+            {"cluster_id": "c1", "fencing_token": FENCING_TOKEN,
+             "namespace_name": "my-namespace", "admin_username": "admin",
              "db_name": "dev", "region": "us-east-2", "user_id": "jane.doe"},
         )
         resp = execution_handler(event)
@@ -414,13 +831,15 @@ class TestCreateServerlessNamespace:
 
         event = build_action_group_event(
             "/createServerlessNamespace",
-            {"namespace_name": "my-namespace", "region": "us-east-2", "user_id": "jane.doe"},
+            {"cluster_id": "c1", "fencing_token": FENCING_TOKEN,
+             "namespace_name": "my-namespace", "region": "us-east-2", "user_id": "jane.doe"},
         )
         resp = execution_handler(event)
         result = parse_response_body(resp)
         assert 'error' in result
 
 
+@pytest.mark.usefixtures("held_lock")
 class TestCreateServerlessWorkgroup:
     """Test createServerlessWorkgroup via execution Lambda handler."""
 
@@ -443,7 +862,8 @@ class TestCreateServerlessWorkgroup:
 
         event = build_action_group_event(
             "/createServerlessWorkgroup",
-            {"workgroup_name": "my-workgroup", "namespace_name": "my-namespace",
+            {"cluster_id": "c1", "fencing_token": FENCING_TOKEN,
+             "workgroup_name": "my-workgroup", "namespace_name": "my-namespace",
              "base_rpu": "32", "max_rpu": "512", "region": "us-east-2", "user_id": "jane.doe"},
         )
         resp = execution_handler(event)
@@ -465,7 +885,8 @@ class TestCreateServerlessWorkgroup:
 
         event = build_action_group_event(
             "/createServerlessWorkgroup",
-            {"workgroup_name": "my-workgroup", "namespace_name": "my-namespace",
+            {"cluster_id": "c1", "fencing_token": FENCING_TOKEN,
+             "workgroup_name": "my-workgroup", "namespace_name": "my-namespace",
              "region": "us-east-2", "user_id": "jane.doe"},
         )
         resp = execution_handler(event)
@@ -473,6 +894,7 @@ class TestCreateServerlessWorkgroup:
         assert 'error' in result
 
 
+@pytest.mark.usefixtures("held_lock")
 class TestRestoreSnapshotToServerless:
     """Test restoreSnapshotToServerless via execution Lambda handler."""
 
@@ -494,7 +916,8 @@ class TestRestoreSnapshotToServerless:
 
         event = build_action_group_event(
             "/restoreSnapshotToServerless",
-            {"snapshot_identifier": "my-snapshot", "namespace_name": "my-namespace",
+            {"cluster_id": "c1", "fencing_token": FENCING_TOKEN,
+             "snapshot_identifier": "my-snapshot", "namespace_name": "my-namespace",
              "region": "us-east-2", "user_id": "jane.doe"},
         )
         resp = execution_handler(event)
@@ -516,7 +939,8 @@ class TestRestoreSnapshotToServerless:
 
         event = build_action_group_event(
             "/restoreSnapshotToServerless",
-            {"snapshot_identifier": "bad-snapshot", "namespace_name": "my-namespace",
+            {"cluster_id": "c1", "fencing_token": FENCING_TOKEN,
+             "snapshot_identifier": "bad-snapshot", "namespace_name": "my-namespace",
              "region": "us-east-2", "user_id": "jane.doe"},
         )
         resp = execution_handler(event)
@@ -524,21 +948,22 @@ class TestRestoreSnapshotToServerless:
         assert 'error' in result
 
 
+@pytest.mark.usefixtures("held_lock")
 class TestSetupDataSharing:
     """Test setupDataSharing via execution Lambda handler."""
 
-    @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
-    @patch('boto3.client')
-    def test_successful_data_sharing_setup(self, mock_boto3, mock_audit):
+    @staticmethod
+    def _clients(describe):
         mock_serverless = Mock()
         mock_data = Mock()
 
-        mock_serverless.get_namespace.side_effect = [
-            {'namespace': {'namespaceName': 'producer-ns', 'namespaceId': 'ns-prod-001'}},
-            {'namespace': {'namespaceName': 'consumer-ns-1', 'namespaceId': 'ns-con-001'}},
-            {'namespace': {'namespaceName': 'consumer-ns-2', 'namespaceId': 'ns-con-002'}},
-        ]
-        mock_data.execute_statement.return_value = {'Id': 'stmt-ds-1'}
+        # Namespaces are resolved concurrently, so answer by name
+        namespace_ids = {'producer-ns': 'ns-prod-001', 'consumer-ns-1': 'ns-con-001', 'consumer-ns-2': 'ns-con-002'}
+        mock_serverless.get_namespace.side_effect = lambda namespaceName: {
+            'namespace': {'namespaceName': namespaceName, 'namespaceId': namespace_ids[namespaceName]},
+        }
+        mock_data.batch_execute_statement.return_value = {'Id': 'batch-ds-1'}
+        mock_data.describe_statement.side_effect = describe
         mock_serverless.assume_role.return_value = {
             'Credentials': {'AccessKeyId': 'x', 'SecretAccessKey': 'y', 'SessionToken': 'z', 'Expiration': '2099-01-01'}
         }
@@ -550,21 +975,141 @@ class TestSetupDataSharing:
                 return mock_serverless
             return mock_data
 
-        mock_boto3.side_effect = route_client
-
-        event = build_action_group_event(
+        return mock_data, route_client
+
+    @staticmethod
+    def _sub_statements(statuses, error=None):
+        subs = []
+        for i, status in enumerate(statuses):
+            sub = {'Id': f'batch-ds-1:{i + 1}', 'Status': status, 'QueryString': f'SQL {i + 1}',
+                   'Duration': 2_500_000 if status == 'FINISHED' else -1}
+            if status == 'FAILED' and error:
+                sub['Error'] = error
+            subs.append(sub)
+        return subs
+
+    def _event(self):
+        return build_action_group_event(
             "/setupDataSharing",
-            {"producer_namespace": "producer-ns", "consumer_namespaces": "consumer-ns-1, consumer-ns-2",
+            {"cluster_id": "c1", "fencing_token": FENCING_TOKEN,
+             "producer_namespace": "producer-ns", "consumer_namespaces": "consumer-ns-1, consumer-ns-2",
              "datashare_name": "my_share", "region": "us-east-2", "user_id": "jane.doe"},
         )
-        resp = execution_handler(event)
-        result = parse_response_body(resp)
+
+    @patch('redshift_agents.tools.data_api.time.sleep')
+    @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
+    @patch('boto3.client')
+    def test_successful_data_sharing_setup(self, mock_boto3, mock_audit, mock_sleep):
+        mock_data, route_client = self._clients([
+            {'Status': 'STARTED'},
+            {'Status': 'FINISHED', 'SubStatements': self._sub_statements(['FINISHED'] * 5)},
+        ])
+        mock_boto3.side_effect = route_client
+
+        result = parse_response_body(execution_handler(self._event()))
 
         assert 'error' not in result
         assert result['datashare_name'] == 'my_share'
         assert result['producer_namespace'] == 'producer-ns'
         assert len(result['consumer_namespaces']) == 2
 
+        # One batched transaction instead of one call per statement
+        mock_data.execute_statement.assert_not_called()
+        sqls = mock_data.batch_execute_statement.call_args.kwargs['Sqls']
+        assert sqls[0] == 'CREATE DATASHARE my_share'
+        assert sqls[-1] == "GRANT USAGE ON DATASHARE my_share TO NAMESPACE 'ns-con-002'"
+        assert result['statement_id'] == 'batch-ds-1'
+        assert result['statement_status'] == 'FINISHED'
+        assert [s['status'] for s in result['statements']] == ['FINISHED'] * 5
+        assert result['statements'][0]['duration_ms'] == 2.5
+        assert result['statements_executed'] == 5
+
+    @patch('redshift_agents.tools.data_api.time.sleep')
+    @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
+    @patch('boto3.client')
+    def test_failed_statement_is_reported(self, mock_boto3, mock_audit, mock_sleep):
+        _, route_client = self._clients([{
+            'Status': 'FAILED',
+            'Error': 'Sub-statement 4 failed',
+            'SubStatements': self._sub_statements(
+                ['FINISHED', 'FINISHED', 'FINISHED', 'FAILED', 'ABORTED'],
+                error='namespace ns-con-001 not found',
+            ),
+        }])
+        mock_boto3.side_effect = route_client
+
+        result = parse_response_body(execution_handler(self._event()))
+
+        assert result['error'] == 'Sub-statement 4 failed'
+        assert result['statements'][3]['error'] == 'namespace ns-con-001 not found'
+        assert result['statements'][4]['duration_ms'] is None
+        # The transaction rolled back, so nothing counts as executed
+        assert 'statements_executed' not in result
+
+    @patch('redshift_agents.tools.data_api.time.sleep')
+    @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
+    @patch('boto3.client')
+    def test_resume_running_batch(self, mock_boto3, mock_audit, mock_sleep):
+        _, route_client = self._clients(lambda **kw: {'Status': 'STARTED'})
+        mock_boto3.side_effect = route_client
+
+        event = self._event()
+        event['parameters'].append({'name': 'max_wait_seconds', 'type': 'string', 'value': '0'})
+        result = parse_response_body(execution_handler(event))
+
+        assert result['resumable'] is True
+        assert result['statement_id'] == 'batch-ds-1'
+        assert result['result_format'] == 'statements'
+
+    @patch('redshift_agents.tools.data_api.time.sleep')
+    @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
+    @patch('boto3.client')
+    def test_large_fan_out_uses_one_list_namespaces_pass(self, mock_boto3, mock_audit, mock_sleep):
+        mock_data, route_client = self._clients([{'Status': 'FINISHED'}])
+        mock_serverless = route_client('redshift-serverless')
+        consumers = [f'spoke-{i}' for i in range(15)]
+        namespaces = [{'namespaceName': n, 'namespaceId': f'id-{n}'} for n in ['hub'] + consumers]
+        mock_serverless.list_namespaces.side_effect = [
+            {'namespaces': namespaces[:10], 'nextToken': 'page-2'},
+            {'namespaces': namespaces[10:]},
+        ]
+        mock_boto3.side_effect = route_client
+
+        event = build_action_group_event(
+            "/setupDataSharing",
+            {"cluster_id": "c1", "fencing_token": FENCING_TOKEN,
+             "producer_namespace": "hub", "consumer_namespaces": ",".join(consumers),
+             "region": "us-east-2", "user_id": "jane.doe"},
+        )
+        result = parse_response_body(execution_handler(event))
+
+        assert result['producer_namespace_id'] == 'id-hub'
+        assert [c['namespace_id'] for c in result['consumer_namespaces']] == [f'id-{n}' for n in consumers]
+        assert mock_serverless.list_namespaces.call_count == 2
+        mock_serverless.get_namespace.assert_not_called()
+
+    @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
+    @patch('boto3.client')
+    def test_large_fan_out_reports_unknown_namespaces(self, mock_boto3, mock_audit):
+        mock_data, route_client = self._clients([{'Status': 'FINISHED'}])
+        mock_serverless = route_client('redshift-serverless')
+        consumers = [f'spoke-{i}' for i in range(12)]
+        mock_serverless.list_namespaces.return_value = {
+            'namespaces': [{'namespaceName': n, 'namespaceId': f'id-{n}'} for n in ['hub'] + consumers[:-1]],
+        }
+        mock_boto3.side_effect = route_client
+
+        event = build_action_group_event(
+            "/setupDataSharing",
+            {"cluster_id": "c1", "fencing_token": FENCING_TOKEN,
+             "producer_namespace": "hub", "consumer_namespaces": ",".join(consumers),
+             "region": "us-east-2", "user_id": "jane.doe"},
+        )
+        result = parse_response_body(execution_handler(event))
+
+        assert result['error'] == 'Namespace(s) not found: spoke-11'
+        mock_data.batch_execute_statement.assert_not_called()
+
     @patch('redshift_agents.tools.redshift_tools.emit_audit_event')
     @patch('boto3.client')
     def test_data_sharing_error_handling(self, mock_boto3, mock_audit):
@@ -577,7 +1122,8 @@ class TestSetupDataSharing:
 
         event = build_action_group_event(
             "/setupDataSharing",
-            {"producer_namespace": "producer-ns", "consumer_namespaces": "consumer-ns-1",
+            {"cluster_id": "c1", "fencing_token": FENCING_TOKEN,
+             "producer_namespace": "producer-ns", "consumer_namespaces": "consumer-ns-1",
              "region": "us-east-2", "user_id": "jane.doe"},
         )
         resp = execution_handler(event)
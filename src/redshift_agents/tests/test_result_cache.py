@@ -0,0 +1,333 @@
+"""
+Tests for the assessment tool result cache.
+
+Validates: repeat tool calls served from cache, keying by cluster, region
+and arguments, per-tool TTL expiry, LRU eviction, invalidation after
+execution-phase queries (mutating SQL only), and the shared DynamoDB /
+local SQLite tiers, whose generation counter retires other processes'
+in-memory entries on invalidation.
+"""
+from __future__ import annotations
+
+import time
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from redshift_agents.lambdas.assessment_handler import handler as assessment_handler
+from redshift_agents.lambdas.execution_handler import handler as execution_handler
+from redshift_agents.tests.conftest import FENCING_TOKEN, build_action_group_event, parse_response_body
+
+# Lambda handlers import tools via the package root, so that is the cache
+# instance the tool functions actually use.
+from tools import result_cache
+from tools.client_pool import client_overrides
+
+
+@pytest.fixture()
+def memory_cache():
+    cache = result_cache.TieredCache(result_cache.MemoryCache())
+    result_cache.set_cache(cache)
+    yield cache
+    result_cache.set_cache(None)
+
+
+def _redshift_client():
+    client = Mock()
+    client.describe_clusters.return_value = {
+        "Clusters": [{
+            "ClusterIdentifier": "c1", "NodeType": "ra3.4xlarge",
+            "NumberOfNodes": 4, "ClusterStatus": "available",
+        }]
+    }
+    return client
+
+
+def _analyze(region="us-east-2"):
+    event = build_action_group_event(
+        "/analyzeRedshiftCluster",
+        {"cluster_id": "c1", "region": region, "user_id": "alice"},
+    )
+    return parse_response_body(assessment_handler(event))
+
+
+@pytest.mark.usefixtures("held_lock")
+class TestToolCaching:
+    @patch("tools.redshift_tools.emit_audit_event")
+    @patch("boto3.client")
+    def test_repeat_call_is_served_from_cache(self, mock_boto3, mock_audit, memory_cache):
+        mock_boto3.return_value = _redshift_client()
+
+        first = _analyze()
+        second = _analyze()
+
+        assert first == second
+        assert mock_boto3.return_value.describe_clusters.call_count == 1
+        cached_flags = [c.kwargs["details"]["cached"] for c in mock_audit.call_args_list]
+        assert cached_flags == [False, True]
+
+    @patch("tools.redshift_tools.emit_audit_event")
+    @patch("boto3.client")
+    def test_cache_is_keyed_by_region(self, mock_boto3, mock_audit, memory_cache):
+        mock_boto3.return_value = _redshift_client()
+
+        _analyze("us-east-2")
+        _analyze("us-west-2")
+
+        assert mock_boto3.return_value.describe_clusters.call_count == 2
+
+    @patch("tools.redshift_tools.emit_audit_event")
+    @patch("boto3.client")
+    def test_metrics_are_keyed_by_window(self, mock_boto3, mock_audit, memory_cache):
+        mock_boto3.return_value.get_metric_data.return_value = {"MetricDataResults": []}
+
+        for hours in ("24", "24", "168"):
+            event = build_action_group_event(
+                "/getClusterMetrics",
+                {"cluster_id": "c1", "region": "us-east-2", "hours": hours, "user_id": "alice"},
+            )
+            assessment_handler(event)
+
+        assert mock_boto3.return_value.get_metric_data.call_count == 2
+
+    @patch("tools.redshift_tools.emit_audit_event")
+    @patch("boto3.client")
+    def test_errors_are_not_cached(self, mock_boto3, mock_audit, memory_cache):
+        mock_boto3.return_value.describe_clusters.side_effect = Exception("Throttling")
+
+        _analyze()
+        _analyze()
+
+        assert mock_boto3.return_value.describe_clusters.call_count == 2
+
+    @patch("redshift_agents.tools.data_api.time.sleep")
+    @patch("tools.redshift_tools.emit_audit_event")
+    @patch("boto3.client")
+    def test_execution_query_invalidates_cluster(self, mock_boto3, mock_audit, mock_sleep, memory_cache):
+        client = _redshift_client()
+        client.execute_statement.return_value = {"Id": "stmt-1"}
+        client.describe_statement.return_value = {"Status": "FINISHED", "HasResultSet": False}
+        mock_boto3.return_value = client
+
+        _analyze()
+        execution_handler(build_action_group_event(
+            "/executeRedshiftQuery",
+            {"cluster_id": "c1", "fencing_token": FENCING_TOKEN,
+             "query": "ALTER TABLE t ALTER DISTSTYLE AUTO",
+             "region": "us-east-2", "user_id": "alice"},
+        ))
+        _analyze()
+
+        assert client.describe_clusters.call_count == 2
+
+    @patch("redshift_agents.tools.data_api.time.sleep")
+    @patch("tools.redshift_tools.emit_audit_event")
+    @patch("boto3.client")
+    def test_read_only_query_keeps_cache(self, mock_boto3, mock_audit, mock_sleep, memory_cache):
+        client = _redshift_client()
+        client.execute_statement.return_value = {"Id": "stmt-1"}
+        client.describe_statement.return_value = {"Status": "FINISHED", "HasResultSet": True}
+        client.get_statement_result.return_value = {"Records": []}
+        mock_boto3.return_value = client
+
+        _analyze()
+        execution_handler(build_action_group_event(
+            "/executeRedshiftQuery",
+            {"cluster_id": "c1", "fencing_token": FENCING_TOKEN,
+             "query": "-- row count\nSELECT COUNT(*) FROM t;",
+             "region": "us-east-2", "user_id": "alice"},
+        ))
+        _analyze()
+
+        assert client.describe_clusters.call_count == 1
+
+
+@pytest.mark.parametrize("query, read_only", [
+    ("select * from t;", True),
+    ("WITH a AS (SELECT 1) SELECT * FROM a", True),
+    ("/* plan */ EXPLAIN SELECT 1", True),
+    ("SELECT * INTO t2 FROM t", False),
+    ("SELECT 1; DROP TABLE t", False),
+    ("INSERT INTO t SELECT 1", False),
+    ("VACUUM t", False),
+])
+def test_read_only_sql_detection(query, read_only):
+    from tools.redshift_tools import _is_read_only_sql
+
+    assert _is_read_only_sql(query) is read_only
+
+
+class TestCallerScopedCaching:
+    @patch("redshift_agents.tools.data_api.time.sleep")
+    @patch("tools.redshift_tools.emit_audit_event")
+    @patch("boto3.client")
+    def test_wlm_results_are_not_shared_between_users(self, mock_boto3, mock_audit, mock_sleep, memory_cache):
+        client = Mock()
+        client.execute_statement.return_value = {"Id": "stmt-1"}
+        client.describe_statement.return_value = {"Status": "FINISHED", "HasResultSet": True}
+        client.get_statement_result.return_value = {"Records": [], "ColumnMetadata": []}
+        mock_boto3.return_value = client
+
+        for user in ("alice", "bob", "alice"):
+            assessment_handler(build_action_group_event(
+                "/getWlmConfiguration", {"cluster_id": "c1", "region": "us-east-2", "user_id": user},
+            ))
+
+        assert [c.kwargs["DbUser"] for c in client.execute_statement.call_args_list] == ["alice", "bob"]
+
+    def test_user_id_only_scopes_caller_scoped_tools(self):
+        wlm = result_cache.cache_key
+        assert wlm("get_wlm_configuration", "c1", "r", "alice") != wlm("get_wlm_configuration", "c1", "r", "bob")
+        assert wlm("analyze_redshift_cluster", "c1", "r", "alice") == wlm("analyze_redshift_cluster", "c1", "r", "bob")
+
+
+@pytest.mark.usefixtures("held_lock")
+class TestNamespaceIdCache:
+    @patch("redshift_agents.tools.data_api.time.sleep")
+    @patch("tools.redshift_tools.emit_audit_event")
+    @patch("boto3.client")
+    def test_namespace_ids_are_reused_until_recreated(self, mock_boto3, mock_audit, mock_sleep, memory_cache):
+        client = Mock()
+        client.get_namespace.side_effect = lambda namespaceName: {
+            "namespace": {"namespaceName": namespaceName, "namespaceId": f"id-{namespaceName}"},
+        }
+        client.create_namespace.return_value = {"namespace": {"namespaceName": "spoke"}}
+        client.batch_execute_statement.return_value = {"Id": "batch-1"}
+        client.describe_statement.return_value = {"Status": "FINISHED"}
+        mock_boto3.return_value = client
+        share = build_action_group_event(
+            "/setupDataSharing",
+            {"cluster_id": "c1", "fencing_token": FENCING_TOKEN,
+             "producer_namespace": "hub", "consumer_namespaces": "spoke",
+             "region": "us-east-2", "user_id": "alice"},
+        )
+
+        execution_handler(share)
+        execution_handler(share)
+        assert client.get_namespace.call_count == 2
+
+        execution_handler(build_action_group_event(
+            "/createServerlessNamespace",
+            {"cluster_id": "c1", "fencing_token": FENCING_TOKEN,
+             "namespace_name": "spoke", "region": "us-east-2", "user_id": "alice"},
+        ))
+        execution_handler(share)
+        assert [c.kwargs["namespaceName"] for c in client.get_namespace.call_args_list][2:] == ["spoke"]
+
+
+class TestMemoryCache:
+    def test_entries_expire_after_ttl(self, memory_cache):
+        key = result_cache.cache_key("get_wlm_configuration", "c1", "us-east-2")
+        result_cache.put_cached("get_wlm_configuration", key, {"wlm_queues": []})
+
+        assert result_cache.get_cached(key) == {"wlm_queues": []}
+        ttl = result_cache.TOOL_TTLS["get_wlm_configuration"]
+        with patch.object(result_cache.time, "time", return_value=time.time() + ttl + 1):
+            assert result_cache.get_cached(key) is None
+
+    def test_callers_get_copies(self, memory_cache):
+        key = result_cache.cache_key("analyze_redshift_cluster", "c1", "us-east-2")
+        result = {"node_type": "ra3.4xlarge", "tags": []}
+        result_cache.put_cached("analyze_redshift_cluster", key, result)
+        result["tags"].append("mutated after put")
+
+        result_cache.get_cached(key)["tags"].append("mutated after get")
+
+        assert result_cache.get_cached(key) == {"node_type": "ra3.4xlarge", "tags": []}
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = result_cache.MemoryCache(max_entries=2)
+        expires_at = time.time() + 60
+        cache.put(("p", "a"), {"v": "a"}, expires_at)
+        cache.put(("p", "b"), {"v": "b"}, expires_at)
+        cache.get(("p", "a"))
+        cache.put(("p", "c"), {"v": "c"}, expires_at)
+
+        assert cache.get(("p", "b")) is None
+        assert cache.get(("p", "a")) is not None
+
+    def test_resumable_handles_are_not_cached(self, memory_cache):
+        key = result_cache.cache_key("get_wlm_configuration", "c1", "us-east-2")
+        result_cache.put_cached("get_wlm_configuration", key, {"statement_id": "s", "resumable": True})
+
+        assert result_cache.get_cached(key) is None
+
+
+class TestSharedTiers:
+    def test_local_tier_is_shared_between_processes(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        writer = result_cache.TieredCache(result_cache.MemoryCache(), result_cache.LocalSharedCache(path))
+        reader = result_cache.TieredCache(result_cache.MemoryCache(), result_cache.LocalSharedCache(path))
+        key = result_cache.cache_key("analyze_redshift_cluster", "c1", "us-east-2")
+
+        writer.put(key, {"node_type": "ra3.4xlarge"}, 60)
+
+        assert reader.get(key) == {"node_type": "ra3.4xlarge"}
+        writer.invalidate(key[0])
+        reader.local.clear()
+        assert reader.get(key) is None
+
+    def test_invalidation_retires_other_processes_memory_entries(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        execution = result_cache.TieredCache(result_cache.MemoryCache(), result_cache.LocalSharedCache(path))
+        assessment = result_cache.TieredCache(result_cache.MemoryCache(), result_cache.LocalSharedCache(path))
+        key = result_cache.cache_key("analyze_redshift_cluster", "c1", "us-east-2")
+        assessment.put(key, {"node_type": "ra3.4xlarge"}, 60)
+        assert assessment.get(key) == {"node_type": "ra3.4xlarge"}
+
+        execution.invalidate(key[0])
+        execution.invalidate(key[0])
+
+        assert assessment.get(key) is None
+        assessment.put(key, {"node_type": "ra3.16xlarge"}, 60)
+        assert execution.get(key) == {"node_type": "ra3.16xlarge"}
+
+    def test_dynamodb_tier_round_trip(self):
+        dynamodb = MagicMock()
+        tier = result_cache.DynamoDBCache(table="cache")
+        key = ("us-east-2#c1", "analyze_redshift_cluster#abc")
+
+        with client_overrides({"dynamodb": dynamodb}):
+            tier.put(key, {"node_type": "ra3.4xlarge"}, time.time() + 60)
+            dynamodb.get_item.return_value = {"Item": dynamodb.put_item.call_args.kwargs["Item"]}
+            entry = tier.get(key)
+
+        assert entry[1] == {"node_type": "ra3.4xlarge"}
+        assert dynamodb.get_item.call_args.kwargs["Key"] == {
+            "pk": {"S": "us-east-2#c1"}, "sk": {"S": "analyze_redshift_cluster#abc"},
+        }
+
+    def test_dynamodb_invalidate_deletes_every_page(self):
+        dynamodb = MagicMock()
+        dynamodb.query.side_effect = [
+            {"Items": [{"pk": {"S": "p"}, "sk": {"S": "a"}}], "LastEvaluatedKey": {"pk": {"S": "p"}}},
+            {"Items": [{"pk": {"S": "p"}, "sk": {"S": "b"}}]},
+        ]
+
+        with client_overrides({"dynamodb": dynamodb}):
+            result_cache.DynamoDBCache(table="cache").invalidate("p")
+
+        deleted = [c.kwargs["Key"]["sk"]["S"] for c in dynamodb.delete_item.call_args_list]
+        assert deleted == ["a", "b"]
+        assert dynamodb.update_item.call_args.kwargs["Key"] == {
+            "pk": {"S": "p"}, "sk": {"S": result_cache.GENERATION_SK},
+        }
+
+    def test_dynamodb_generation_defaults_to_zero(self):
+        dynamodb = MagicMock()
+        dynamodb.get_item.side_effect = [{}, {"Item": {"generation": {"N": "3"}}}]
+
+        with client_overrides({"dynamodb": dynamodb}):
+            tier = result_cache.DynamoDBCache(table="cache")
+            assert [tier.generation("p"), tier.generation("p")] == [0, 3]
+
+    def test_shared_tier_failures_fall_back_to_local(self):
+        shared = MagicMock()
+        shared.get.side_effect = Exception("ResourceNotFoundException")
+        shared.put.side_effect = Exception("ResourceNotFoundException")
+        cache = result_cache.TieredCache(result_cache.MemoryCache(), shared)
+
+        cache.put(("p", "a"), {"v": 1}, 60)
+
+        assert cache.get(("p", "a")) == {"v": 1}
+        assert cache.get(("p", "missing")) is None
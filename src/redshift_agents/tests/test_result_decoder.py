@@ -0,0 +1,112 @@
+"""
+Tests for the ColumnMetadata-driven Data API record decoder.
+
+Validates: typed conversion per Redshift column type, NULL and decimal
+handling, dict/tuple/dataclass shapes, and the untyped fallback used when
+no column metadata is available.
+"""
+from __future__ import annotations
+
+from decimal import Decimal
+
+from redshift_agents.models import WLMQueueMetrics
+from redshift_agents.tools.result_decoder import RecordDecoder
+
+
+def _columns(*specs: tuple[str, str]) -> list[dict]:
+    return [{"name": name, "label": name, "typeName": type_name} for name, type_name in specs]
+
+
+class TestTypedDecoding:
+    def test_values_follow_column_types(self):
+        decoder = RecordDecoder(_columns(
+            ("id", "int8"), ("ratio", "float8"), ("amount", "numeric"),
+            ("active", "bool"), ("name", "varchar"),
+        ))
+
+        row = decoder.to_tuple([
+            {"longValue": 7}, {"doubleValue": 0.5}, {"stringValue": "12.50"},
+            {"booleanValue": True}, {"stringValue": "etl"},
+        ])
+
+        assert row == (7, 0.5, Decimal("12.50"), True, "etl")
+
+    def test_nulls_decode_to_none(self):
+        decoder = RecordDecoder(_columns(("id", "int4"), ("amount", "numeric"), ("name", "varchar")))
+
+        row = decoder.to_tuple([{"isNull": True}] * 3)
+
+        assert row == (None, None, None)
+
+    def test_decimal_keeps_precision(self):
+        decoder = RecordDecoder(_columns(("amount", "numeric")))
+
+        (value,) = decoder.to_tuple([{"stringValue": "12345678901234567890.123456789"}])
+
+        assert value == Decimal("12345678901234567890.123456789")
+
+    def test_decimal_factory_str_is_json_safe(self):
+        decoder = RecordDecoder(_columns(("amount", "numeric")), decimal_factory=str)
+
+        assert decoder.to_tuple([{"stringValue": "0.10"}]) == ("0.10",)
+
+    def test_numeric_strings_in_integer_columns_are_converted(self):
+        decoder = RecordDecoder(_columns(("n", "int4")))
+
+        assert decoder.to_tuple([{"stringValue": "42"}]) == (42,)
+
+    def test_dicts_use_column_labels(self):
+        decoder = RecordDecoder(_columns(("queue_name", "varchar"), ("service_class", "int4")))
+
+        rows = decoder.dicts([[{"stringValue": "etl"}, {"longValue": 6}]])
+
+        assert rows == [{"queue_name": "etl", "service_class": 6}]
+
+
+class TestUntypedFallback:
+    def test_without_metadata_fields_decode_by_value_key(self):
+        decoder = RecordDecoder()
+
+        row = decoder.to_tuple([{"longValue": 1}, {"stringValue": "a"}, {"isNull": True}])
+
+        assert row == (1, "a", None)
+        assert decoder.to_dict([{"longValue": 1}]) == {"col0": 1}
+
+
+_WLM_COLUMNS = _columns(
+    ("queue_name", "varchar"), ("service_class", "int4"), ("concurrency", "int4"),
+    ("queries_waiting", "int8"), ("avg_wait_time_ms", "numeric"), ("avg_exec_time_ms", "numeric"),
+    ("wait_to_exec_ratio", "numeric"), ("queries_spilling_to_disk", "int8"),
+    ("disk_spill_mb", "numeric"), ("saturation_pct", "numeric"),
+)
+
+
+class TestModelDecoding:
+    def test_wlm_queue_metrics_are_typed(self):
+        record = [
+            {"stringValue": "etl"}, {"longValue": 6}, {"longValue": 5}, {"longValue": 2},
+            {"stringValue": "150.25"}, {"stringValue": "300.50"}, {"stringValue": "0.50"},
+            {"isNull": True}, {"stringValue": "1024.00"}, {"stringValue": "80.0"},
+        ]
+
+        (queue,) = RecordDecoder(_WLM_COLUMNS).models([record], WLMQueueMetrics)
+
+        assert queue == WLMQueueMetrics(
+            queue_name="etl", service_class=6, concurrency=5, queries_waiting=2,
+            avg_wait_time_ms=150.25, avg_exec_time_ms=300.5, wait_to_exec_ratio=0.5,
+            queries_spilling_to_disk=0, disk_spill_mb=1024.0, saturation_pct=80.0,
+        )
+        assert isinstance(queue.avg_wait_time_ms, float)
+
+    def test_columns_are_matched_by_name_not_position(self):
+        columns = list(reversed(_WLM_COLUMNS))
+        record = list(reversed([
+            {"stringValue": "etl"}, {"longValue": 6}, {"longValue": 5}, {"longValue": 0},
+            {"stringValue": "1"}, {"stringValue": "2"}, {"stringValue": "0.5"},
+            {"longValue": 0}, {"stringValue": "0"}, {"stringValue": "10"},
+        ]))
+
+        (queue,) = RecordDecoder(columns).models([record], WLMQueueMetrics)
+
+        assert queue.queue_name == "etl"
+        assert queue.saturation_pct == 10.0
@@ -0,0 +1,180 @@
+"""
+Tests for large-result offload and paged follow-ups.
+
+Validates: the response-size governor in the Lambda router, compact
+summaries with previews and a hard size cap, byte-bounded pages via
+``/fetchResultPage`` for the owning user only, the S3 and local stores, and
+fallback to the full result when the store fails.
+"""
+from __future__ import annotations
+
+import io
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from redshift_agents.lambdas.assessment_handler import handler as assessment_handler
+from redshift_agents.lambdas.execution_handler import handler as execution_handler
+from redshift_agents.tests.conftest import build_action_group_event, parse_response_body
+
+# Lambda handlers import the router and tools via the package root
+from lambdas import router
+from tools import result_store
+from tools.client_pool import client_overrides
+
+
+@pytest.fixture()
+def local_store(tmp_path):
+    store = result_store.LocalResultStore(str(tmp_path))
+    result_store.set_store(store)
+    with patch.object(router, "RESPONSE_MAX_BYTES", 2000), \
+            patch.object(result_store, "RESPONSE_PAGE_BYTES", 1000), \
+            patch.object(result_store, "SUMMARY_PREVIEW_BYTES", 300), \
+            patch.object(result_store, "emit_audit_event"):
+        yield store
+    result_store.set_store(None)
+
+
+def _big_query_result():
+    return {
+        "cluster_id": "c1",
+        "statement_id": "stmt-1",
+        "records": [[{"longValue": i}, {"stringValue": "x" * 40}] for i in range(100)],
+        "returned_rows": 100,
+        "total_rows": 100,
+        "truncated": False,
+    }
+
+
+def _fetch(result_id, page, user_id="alice"):
+    return parse_response_body(execution_handler(build_action_group_event(
+        "/fetchResultPage", {"result_id": result_id, "page": page, "user_id": user_id},
+    )))
+
+
+class TestGovernor:
+    def test_small_results_pass_through(self, local_store):
+        event = build_action_group_event("/fetchResultPage", {"result_id": "0" * 32})
+        body = router.build_response(event, {"rows": [1, 2, 3]})
+
+        assert parse_response_body(body) == {"rows": [1, 2, 3]}
+
+    def test_large_result_is_offloaded_with_summary(self, local_store):
+        event = build_action_group_event("/executeRedshiftQuery", {})
+
+        response = router.build_response(event, _big_query_result())
+        summary = parse_response_body(response)
+
+        assert len(response["response"]["responseBody"]["application/json"]["body"]) <= 2000
+        assert summary["offloaded"] is True
+        assert summary["paged_field"] == "records"
+        assert summary["total_items"] == 100
+        assert summary["total_rows"] == 100 and summary["statement_id"] == "stmt-1"
+        assert 0 < len(summary["preview"]) < 100
+        assert "fetchResultPage" in summary["message"]
+
+    def test_pages_reassemble_the_full_result(self, local_store):
+        event = build_action_group_event("/executeRedshiftQuery", {})
+        summary = parse_response_body(router.build_response(event, _big_query_result()))
+
+        items, page = [], 1
+        while page is not None:
+            fetched = _fetch(summary["result_id"], page)
+            assert len(json.dumps(fetched["items"])) <= 1000
+            assert fetched["item_offset"] == len(items)
+            items.extend(fetched["items"])
+            page = fetched["next_page"]
+
+        assert items == _big_query_result()["records"]
+        assert fetched["page"] == summary["page_count"]
+
+    def test_large_scalar_fields_are_cut(self, local_store):
+        event = build_action_group_event("/executeRedshiftQuery", {})
+
+        response = router.build_response(event, {"cluster_id": "c", "text": "x" * 50000})
+        summary = parse_response_body(response)
+
+        assert len(response["response"]["responseBody"]["application/json"]["body"]) <= 2000
+        assert summary["truncated_fields"] == ["text"]
+        assert summary["text"] == "x" * result_store.SUMMARY_FIELD_MAX_BYTES
+        assert summary["cluster_id"] == "c"
+
+    def test_oversized_summary_falls_back_to_a_stub(self, local_store):
+        event = build_action_group_event("/executeRedshiftQuery", {})
+        result = {f"field_{i}": "é" * 400 for i in range(10)}
+
+        response = router.build_response(event, result)
+        summary = parse_response_body(response)
+
+        assert len(response["response"]["responseBody"]["application/json"]["body"]) <= 2000
+        assert set(summary) == {"offloaded", "result_id", "location", "total_bytes", "page_count", "message"}
+
+    @patch("tools.redshift_tools.emit_audit_event")
+    @patch("boto3.client")
+    def test_handlers_offload_large_tool_results(self, mock_boto3, mock_audit, local_store):
+        mock_boto3.return_value.describe_clusters.return_value = {"Clusters": [
+            {"ClusterIdentifier": f"cluster-{i}", "NodeType": "ra3.4xlarge",
+             "NumberOfNodes": 2, "ClusterStatus": "available"}
+            for i in range(50)
+        ]}
+
+        summary = parse_response_body(assessment_handler(build_action_group_event(
+            "/listRedshiftClusters", {"region": "us-east-2", "user_id": "alice"},
+        )))
+
+        assert summary["paged_field"] is None
+        assert summary["total_items"] == 50
+
+    def test_store_failure_returns_full_result(self, local_store, capsys):
+        result_store.set_store(MagicMock(put=MagicMock(side_effect=Exception("AccessDenied"))))
+        event = build_action_group_event("/executeRedshiftQuery", {})
+
+        result = parse_response_body(router.build_response(event, _big_query_result()))
+
+        assert result == _big_query_result()
+        assert "AccessDenied" in capsys.readouterr().err
+
+
+class TestFetchResultPage:
+    def test_unknown_and_invalid_ids(self, local_store):
+        assert "not found" in _fetch("f" * 32, 1)["error"]
+        assert "Invalid result_id" in _fetch("../../etc/passwd", 1)["error"]
+
+    def test_only_the_owner_can_read_a_result(self, local_store):
+        event = build_action_group_event("/executeRedshiftQuery", {"user_id": "alice"})
+        summary = parse_response_body(router.build_response(event, _big_query_result()))
+
+        assert _fetch(summary["result_id"], 1)["page"] == 1
+        assert _fetch(summary["result_id"], 1, user_id="mallory")["error"].endswith("belongs to another user")
+        assert result_store.emit_audit_event.call_args.args[0] == "error"
+
+    def test_page_out_of_range(self, local_store):
+        local_store.put("a" * 32, json.dumps({"records": [1, 2]}).encode())
+
+        assert _fetch("a" * 32, 2)["error"] == "page must be between 1 and 1"
+
+    def test_result_without_list_is_paged_as_text(self, local_store):
+        body = json.dumps({"text": "y" * 2500}).encode()
+        local_store.put("b" * 32, body)
+
+        pages = [_fetch("b" * 32, p)["text"] for p in (1, 2, 3)]
+
+        assert "".join(pages).encode() == body
+
+
+def test_s3_store_round_trip():
+    s3 = MagicMock()
+    s3.exceptions.NoSuchKey = type("NoSuchKey", (Exception,), {})
+    store = result_store.S3ResultStore(bucket="results", prefix="action-results/")
+
+    with client_overrides({"s3": s3}):
+        store.put("c" * 32, b"{}", owner="alice")
+        s3.get_object.return_value = {"Body": io.BytesIO(b"{}"), "Metadata": {"owner": "alice"}}
+        assert store.get("c" * 32) == (b"{}", "alice")
+        s3.get_object.side_effect = s3.exceptions.NoSuchKey()
+        assert store.get("d" * 32) is None
+
+    assert s3.put_object.call_args.kwargs["Key"] == f"action-results/{'c' * 32}.json"
+    assert s3.put_object.call_args.kwargs["Metadata"] == {"owner": "alice"}
+    assert store.location("c" * 32) == f"s3://results/action-results/{'c' * 32}.json"
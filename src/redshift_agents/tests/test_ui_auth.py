@@ -0,0 +1,139 @@
+"""
+Tests for the UI's expiry-aware Identity Pool sessions (ui/auth.py).
+"""
+from __future__ import annotations
+
+import base64
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from redshift_agents.ui import auth
+
+
+def _jwt(exp_in: float) -> str:
+    payload = base64.urlsafe_b64encode(
+        json.dumps({"email": "alice@example.com", "exp": time.time() + exp_in}).encode()
+    ).decode().rstrip("=")
+    return f"header.{payload}.sig"
+
+
+class _Credentials:
+    """Fake ``get_identity_pool_credentials`` with a scripted lifetime per call."""
+
+    def __init__(self, *lifetimes: float):
+        self.lifetimes = list(lifetimes)
+        self.id_tokens = []
+
+    def __call__(self, id_token):
+        self.id_tokens.append(id_token)
+        n = len(self.id_tokens)
+        lifetime = self.lifetimes[min(n, len(self.lifetimes)) - 1]
+        return {
+            "AccessKeyId": f"AKIA{n}",
+            "SecretKey": f"secret{n}",
+            "SessionToken": f"token{n}",
+            "Expiration": datetime.now(timezone.utc) + timedelta(seconds=lifetime),
+        }
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture()
+def identities():
+    created = []
+    yield created
+    for identity in created:
+        identity.stop()
+
+
+def test_session_signs_with_identity_pool_credentials(identities):
+    fake = _Credentials(3600)
+    with patch.object(auth, "get_identity_pool_credentials", side_effect=fake):
+        identity = auth.IdentityPoolSession(_jwt(3600), refresh_token="r")
+        identities.append(identity)
+
+        frozen = identity.credentials.get_frozen_credentials()
+        client = identity.session.client("sts", region_name="us-east-2")
+
+    assert frozen.access_key == "AKIA1"
+    assert client._request_signer._credentials is identity.credentials
+    assert 3500 < identity.seconds_until_expiry() <= 3600
+    assert len(fake.id_tokens) == 1
+
+
+def test_credentials_refresh_in_background_before_expiry(identities):
+    # Expires inside the refresh lead, so the refresh thread acts after ~1s
+    fake = _Credentials(auth.CREDENTIAL_REFRESH_LEAD_SECONDS - 1, 3600)
+    with patch.object(auth, "get_identity_pool_credentials", side_effect=fake):
+        identity = auth.IdentityPoolSession(_jwt(3600))
+        identities.append(identity)
+
+        assert _wait_for(lambda: len(fake.id_tokens) == 2)
+
+    assert identity.seconds_until_expiry() > 3500
+    assert identity.credentials.get_frozen_credentials().access_key == "AKIA2"
+
+
+def test_expiring_id_token_is_renewed_before_fetching_credentials(identities):
+    fake = _Credentials(3600)
+    fresh = _jwt(3600)
+    with patch.object(auth, "get_identity_pool_credentials", side_effect=fake), \
+            patch.object(auth, "refresh_tokens", return_value={"id_token": fresh, "access_token": "a2"}) as renew:
+        identity = auth.IdentityPoolSession(_jwt(60), refresh_token="r")
+        identities.append(identity)
+
+    renew.assert_called_once_with("r")
+    assert fake.id_tokens == [fresh]
+    assert identity.id_token == fresh
+    assert identity.access_token == "a2"
+
+
+def test_refresh_forces_new_tokens_and_credentials(identities):
+    fake = _Credentials(3600)
+    fresh = _jwt(3600)
+    with patch.object(auth, "get_identity_pool_credentials", side_effect=fake), \
+            patch.object(auth, "refresh_tokens", return_value={"id_token": fresh, "access_token": "a2"}):
+        identity = auth.IdentityPoolSession(_jwt(3600), refresh_token="r")
+        identities.append(identity)
+        identity.refresh()
+
+    assert fake.id_tokens[-1] == fresh
+    assert identity.credentials.get_frozen_credentials().access_key == "AKIA2"
+
+
+def test_stop_ends_refresh_thread(identities):
+    with patch.object(auth, "get_identity_pool_credentials", side_effect=_Credentials(3600)):
+        identity = auth.IdentityPoolSession(_jwt(3600))
+
+    identity.stop()
+    identity._thread.join(timeout=2)
+    assert not identity._thread.is_alive()
+
+
+def test_idle_refresh_thread_exits_and_restarts_on_use(identities):
+    fake = _Credentials(auth.CREDENTIAL_REFRESH_LEAD_SECONDS - 1)
+    with patch.object(auth, "get_identity_pool_credentials", side_effect=fake), \
+            patch.object(auth, "CREDENTIAL_IDLE_REFRESH_CYCLES", 1):
+        identity = auth.IdentityPoolSession(_jwt(3600))
+        identities.append(identity)
+        idle_thread = identity._thread
+
+        assert _wait_for(lambda: not idle_thread.is_alive())
+        assert len(fake.id_tokens) == 1
+
+        # The next signed request refreshes lazily and restarts the thread
+        identity.credentials.get_frozen_credentials()
+
+    assert len(fake.id_tokens) == 2
+    assert identity._thread is not idle_thread and identity._thread.is_alive()
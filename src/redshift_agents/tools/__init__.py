@@ -4,6 +4,11 @@ Tools for Redshift cluster analysis and management.
 These tools use boto3 to interact with AWS Redshift and CloudWatch services.
 Public API is available via direct module imports:
   from tools.redshift_tools import analyze_redshift_cluster, ...
-  from tools.cluster_lock import acquire_lock, release_lock
+  from tools import async_redshift_tools  # awaitable versions of the same tools
+  from tools.cluster_lock import acquire_lock, renew_lock, release_lock, check_fencing_token
   from tools.audit_logger import emit_audit_event
+  from tools.client_pool import get_client, client_overrides
+  from tools.result_decoder import RecordDecoder
+  from tools.result_cache import invalidate_cluster
+  from tools.result_store import offload_result, fetch_result_page
 """
@@ -0,0 +1,365 @@
+"""
+asyncio counterparts of the Redshift tools.
+
+Every tool in ``tools.redshift_tools`` has an ``async def`` twin here with
+the same name, signature and return shape, so the orchestrator, UI and batch
+runners can drive hundreds of concurrent tool calls from one event loop::
+
+    from tools import async_redshift_tools as aio
+
+    results = await asyncio.gather(*(aio.assess_cluster(c, region) for c in ids))
+
+boto3 has no asyncio transport, so each AWS call runs on a bounded thread
+pool (``ASYNC_TOOLS_MAX_THREADS``) against the same pooled clients the sync
+tools use.  What makes the difference at scale is that nothing holds a thread
+while *waiting*: Data API statements are polled with ``asyncio.sleep``
+between ``describe_statement`` calls (same backoff as ``wait_for_statement``)
+and paginated APIs are walked one page per thread hop with ``aiter_pages``.
+A thousand long-running WLM queries cost a thousand coroutines, not a
+thousand blocked threads.
+
+Tools that are a single AWS call (or a single short paginated call) simply
+run the sync tool on the pool.  Data API tools run the sync tool's blocking
+start and finish steps (audit, cache lookup, submission, caching,
+invalidation) on the pool and await only the statement itself, so caching,
+audit events and error dicts are identical between the two APIs.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+try:
+    from tools import redshift_tools as _sync
+    from tools.audit_logger import emit_audit_event
+    from tools.data_api import (
+        DEFAULT_MAX_RESULT_BYTES,
+        DEFAULT_MAX_ROWS,
+        DEFAULT_MAX_WAIT_SECONDS,
+        INITIAL_POLL_INTERVAL,
+        MAX_POLL_INTERVAL,
+        POLL_BACKOFF,
+        TERMINAL_STATUSES,
+    )
+except ImportError:
+    from . import redshift_tools as _sync
+    from .audit_logger import emit_audit_event
+    from .data_api import (
+        DEFAULT_MAX_RESULT_BYTES,
+        DEFAULT_MAX_ROWS,
+        DEFAULT_MAX_WAIT_SECONDS,
+        INITIAL_POLL_INTERVAL,
+        MAX_POLL_INTERVAL,
+        POLL_BACKOFF,
+        TERMINAL_STATUSES,
+    )
+
+# Threads available for blocking boto3 calls.  Waits never hold a thread, so
+# this bounds in-flight HTTP requests, not concurrent tool calls.
+MAX_THREADS = int(os.getenv("ASYNC_TOOLS_MAX_THREADS", "32"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=MAX_THREADS, thread_name_prefix="redshift-tools-async",
+                )
+    return _executor
+
+
+async def run_blocking(fn: Callable, *args, **kwargs):
+    """Run the blocking callable *fn* on the tool thread pool and await it.
+
+    Context variables are copied into the worker thread, as with
+    ``asyncio.to_thread``.
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+    return await loop.run_in_executor(_get_executor(), call)
+
+
+# ---------------------------------------------------------------------------
+# Data API poller and pagination
+# ---------------------------------------------------------------------------
+
+
+async def wait_for_statement_async(
+    client,
+    statement_id: str,
+    max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+    initial_interval: float = INITIAL_POLL_INTERVAL,
+    max_interval: float = MAX_POLL_INTERVAL,
+    backoff: float = POLL_BACKOFF,
+) -> Dict:
+    """Awaitable ``data_api.wait_for_statement``: same schedule, no blocked thread."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_wait_seconds
+    interval = initial_interval
+    while True:
+        desc = await run_blocking(client.describe_statement, Id=statement_id)
+        if desc.get("Status") in TERMINAL_STATUSES:
+            return desc
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return desc
+        await asyncio.sleep(min(interval, remaining))
+        interval = min(interval * backoff, max_interval)
+
+
+async def aiter_pages(
+    method: Callable,
+    token_key: str,
+    request_key: str = "",
+    **kwargs,
+) -> AsyncIterator[Dict]:
+    """Yield pages of a paginated boto3 *method*, following *token_key*.
+
+    Args:
+        method: Bound client method, e.g. ``redshift.describe_clusters``.
+        token_key: Response field holding the next-page token
+            (``Marker``, ``NextToken``, ``nextToken``).
+        request_key: Request parameter that takes the token (defaults to
+            *token_key*).
+        **kwargs: Arguments of the first request.
+
+    Pages are requested lazily, one at a time on the tool thread pool.
+    """
+    request_key = request_key or token_key
+    while True:
+        page = await run_blocking(method, **kwargs)
+        yield page
+        token = page.get(token_key)
+        if not token:
+            return
+        kwargs[request_key] = token
+
+
+async def aiter_result_pages(client, statement_id: str) -> AsyncIterator[Dict]:
+    """Awaitable ``data_api.iter_result_pages``."""
+    async for page in aiter_pages(client.get_statement_result, "NextToken", Id=statement_id):
+        yield page
+
+
+async def aiter_statement_records(client, statement_id: str) -> AsyncIterator[List[Dict]]:
+    """Yield every result row of a finished statement across all pages."""
+    async for page in aiter_result_pages(client, statement_id):
+        for record in page.get("Records", []):
+            yield record
+
+
+async def _collect_statement_result(
+    redshift_data,
+    statement_id: str,
+    result_format: str,
+    cluster_id: str,
+    region: str,
+    max_wait_seconds: float,
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> Dict:
+    """Await the statement, then shape it exactly like the sync tools do."""
+    desc = await wait_for_statement_async(redshift_data, statement_id, max_wait_seconds)
+    return await run_blocking(
+        _sync._shape_statement_result,
+        redshift_data, statement_id, desc, result_format, cluster_id, region, max_rows, max_bytes,
+    )
+
+
+async def _run_pending(pending: Dict, max_wait_seconds: float, finish: Callable[[Dict, Dict], Dict]) -> Dict:
+    """Async ``redshift_tools._run_pending``: await the wait, finish on the pool."""
+    try:
+        result = await _collect_statement_result(
+            pending["client"],
+            pending["statement_id"],
+            pending["result_format"],
+            pending["cluster_id"],
+            pending["region"],
+            max_wait_seconds,
+            pending["max_rows"],
+            pending["max_bytes"],
+        )
+        return await run_blocking(finish, pending, result)
+    except Exception as e:
+        return {"error": str(e), **pending["error_context"]}
+
+
+async def _audit(**kwargs) -> None:
+    # Account ID resolution may call STS, so keep it off the event loop
+    await run_blocking(emit_audit_event, **kwargs)
+
+
+# ---------------------------------------------------------------------------
+# Tools run whole on the thread pool
+# ---------------------------------------------------------------------------
+
+
+def _offloaded(tool: Callable) -> Callable:
+    @functools.wraps(tool)
+    async def wrapper(*args, **kwargs):
+        return await run_blocking(tool, *args, **kwargs)
+    return wrapper
+
+
+analyze_redshift_cluster = _offloaded(_sync.analyze_redshift_cluster)
+get_cluster_metrics = _offloaded(_sync.get_cluster_metrics)
+create_cluster_snapshot = _offloaded(_sync.create_cluster_snapshot)
+create_serverless_namespace = _offloaded(_sync.create_serverless_namespace)
+create_serverless_workgroup = _offloaded(_sync.create_serverless_workgroup)
+restore_snapshot_to_serverless = _offloaded(_sync.restore_snapshot_to_serverless)
+
+
+# ---------------------------------------------------------------------------
+# Tools with native async waits or fan-out
+# ---------------------------------------------------------------------------
+
+
+async def list_redshift_clusters(region: str = "", user_id: str = "", regions: str = "") -> List[Dict] | Dict:
+    """Async ``list_redshift_clusters``; regions are scanned concurrently."""
+    if not regions:
+        return await run_blocking(_sync.list_redshift_clusters, region, user_id)
+
+    region = _sync._resolve_region(region)
+
+    await _audit(
+        event_type="tool_invocation",
+        agent_name="assessment",
+        initiated_by=user_id,
+        region=region,
+        details={"tool": "list_redshift_clusters", "regions": regions},
+    )
+
+    try:
+        targets = await run_blocking(_sync._scan_targets, region, regions)
+    except Exception as e:
+        return {
+            "error": str(e),
+            "region": region
+        }
+
+    started = time.perf_counter()
+    scans = await asyncio.gather(*(run_blocking(_sync._scan_region, name) for name in targets))
+    return _sync._region_scan_report(dict(zip(targets, scans)), started)
+
+
+async def get_wlm_configuration(
+    cluster_id: str,
+    region: str = "",
+    user_id: str = "",
+    max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+) -> Dict:
+    """Async ``get_wlm_configuration``; the WLM query is awaited without a thread."""
+    started, pending = await run_blocking(_sync._start_wlm_configuration, cluster_id, region, user_id)
+    if pending is None:
+        return started
+    return await _run_pending(pending, max_wait_seconds, _sync._finish_wlm_configuration)
+
+
+async def get_statement_result(
+    statement_id: str,
+    cluster_id: str = "",
+    region: str = "",
+    result_format: str = "records",
+    user_id: str = "",
+    max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+    max_rows: int = DEFAULT_MAX_ROWS,
+    max_bytes: int = DEFAULT_MAX_RESULT_BYTES,
+) -> Dict:
+    """Async ``get_statement_result``."""
+    started, pending = await run_blocking(
+        _sync._start_statement_result,
+        statement_id, cluster_id, region, result_format, user_id, max_rows, max_bytes,
+    )
+    if pending is None:
+        return started
+    return await _run_pending(pending, max_wait_seconds, _sync._finish_statement_result)
+
+
+async def _timed(tool: Callable, **kwargs) -> tuple:
+    started = time.perf_counter()
+    try:
+        result = await tool(**kwargs)
+    except Exception as e:
+        result = {"error": str(e)}
+    return result, round((time.perf_counter() - started) * 1000, 1)
+
+
+async def assess_cluster(
+    cluster_id: str,
+    region: str = "",
+    user_id: str = "",
+    hours: int = 24,
+    max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+) -> Dict:
+    """Async ``assess_cluster``; the three sections run as concurrent tasks."""
+    region = _sync._resolve_region(region)
+
+    await _audit(
+        event_type="tool_invocation",
+        agent_name="assessment",
+        initiated_by=user_id,
+        cluster_id=cluster_id,
+        region=region,
+        details={"tool": "assess_cluster", "hours": hours},
+    )
+
+    sections = _sync._assessment_sections(cluster_id, region, user_id, hours, max_wait_seconds)
+    tools = {
+        "cluster_summary": analyze_redshift_cluster,
+        "cloudwatch_metrics": get_cluster_metrics,
+        "wlm_queue_analysis": get_wlm_configuration,
+    }
+
+    started = time.perf_counter()
+    timed = await asyncio.gather(*(_timed(tools[name], **kwargs) for name, kwargs in sections.items()))
+    return _sync._bundle_assessment(cluster_id, region, dict(zip(sections, timed)), started)
+
+
+async def execute_redshift_query(
+    cluster_id: str,
+    query: str,
+    region: str = "",
+    user_id: str = "",
+    max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+    max_rows: int = DEFAULT_MAX_ROWS,
+    max_bytes: int = DEFAULT_MAX_RESULT_BYTES,
+    result_format: str = "records",
+) -> Dict:
+    """Async ``execute_redshift_query``; the query is awaited without a thread."""
+    started, pending = await run_blocking(
+        _sync._start_redshift_query,
+        cluster_id, query, region, user_id, max_rows, max_bytes, result_format,
+    )
+    if pending is None:
+        return started
+    return await _run_pending(pending, max_wait_seconds, _sync._finish_redshift_query)
+
+
+async def setup_data_sharing(
+    producer_namespace: str,
+    consumer_namespaces: str,
+    datashare_name: str = "default_share",
+    region: str = "",
+    user_id: str = "",
+    max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+) -> Dict:
+    """Async ``setup_data_sharing``; the DDL batch is awaited without a thread."""
+    started, pending = await run_blocking(
+        _sync._start_data_sharing,
+        producer_namespace, consumer_namespaces, datashare_name, region, user_id,
+    )
+    if pending is None:
+        return started
+    return await _run_pending(pending, max_wait_seconds, _sync._finish_data_sharing)
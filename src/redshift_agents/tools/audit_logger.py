@@ -15,15 +15,43 @@ Example CloudWatch Logs Insights query::
     | stats count() by customer_account_id
     | sort count desc
 
+Events are handed to a ``QueueHandler`` and written by a background
+``QueueListener``, so emitting costs a queue put rather than I/O on the
+caller's thread.  The listener feeds the sinks selected by ``AUDIT_SINKS``
+(stdout by default; batched CloudWatch Logs, S3 and rotating-file sinks in
+``tools.audit_sinks``).  Lambda handlers call ``flush_audit_events`` before
+returning so nothing is left queued or buffered when the execution
+environment freezes, and the sinks are flushed again at exit, or on SIGTERM
+once an entry point has called ``install_sigterm_flush``.  The caller's account ID is resolved once per process.
+
+Payloads are bounded: each ``details`` field larger than its byte budget
+(``AUDIT_FIELD_MAX_BYTES``, overridable per field via
+``AUDIT_FIELD_BUDGETS``) is replaced by a preview plus the SHA-256 and size
+of the full value, sized so the serialized replacement stays within the
+budget, so identical queries or payloads can still be matched.
+``AUDIT_SAMPLE_RATES`` thins high-frequency event types such as
+``tool_invocation``; ``workflow_*`` and ``error`` events, and events emitted
+with ``sampled=False``, are always kept.
+
 Requirements: FR-5.4, NFR-6.1, NFR-6.2, NFR-6.6, NFR-7.2
 """
 from __future__ import annotations
 
+import atexit
+import hashlib
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import random
+import signal
 import sys
+import threading
+import time
 from dataclasses import asdict
 from datetime import datetime, timezone
+from typing import Dict
 
 try:
     # python-json-logger v4+
@@ -39,6 +67,13 @@ try:
 except ImportError:
     from ..models import AuditEvent
 
+try:
+    from tools.audit_sinks import build_sinks
+    from tools.client_pool import get_client
+except ImportError:
+    from .audit_sinks import build_sinks
+    from .client_pool import get_client
+
 # Valid event types per NFR-6.6
 VALID_EVENT_TYPES = frozenset(
     {
@@ -52,28 +87,189 @@ VALID_EVENT_TYPES = frozenset(
     }
 )
 
+
+def _parse_mapping(raw: str, cast) -> Dict:
+    """Parse ``"a=1,b=2"`` into ``{"a": cast("1"), "b": cast("2")}``."""
+    mapping = {}
+    for item in raw.split(","):
+        name, sep, value = item.partition("=")
+        if sep and name.strip():
+            mapping[name.strip()] = cast(value.strip())
+    return mapping
+
+
+# Byte budget for each ``details`` field; larger values are fingerprinted
+FIELD_MAX_BYTES = int(os.getenv("AUDIT_FIELD_MAX_BYTES", "2048"))
+FIELD_BUDGETS: Dict[str, int] = {
+    "query": 4096,
+    "input_payload": 1024,
+    **_parse_mapping(os.getenv("AUDIT_FIELD_BUDGETS", ""), int),
+}
+
+# Fraction of events kept per event type (default 1.0).  Protected types
+# are always kept whatever the configuration says.
+SAMPLE_RATES: Dict[str, float] = _parse_mapping(os.getenv("AUDIT_SAMPLE_RATES", ""), float)
+UNSAMPLED_EVENT_TYPES = frozenset({"workflow_start", "workflow_complete", "error"})
+
 # ---------------------------------------------------------------------------
-# Logger setup — dedicated logger with JSON formatter
+# Logger setup — dedicated logger, JSON formatter behind a queue
 # ---------------------------------------------------------------------------
 
 _logger = logging.getLogger("redshift_modernization_audit")
 
-if not _logger.handlers:
-    _handler = logging.StreamHandler()
-    _formatter = JsonFormatter(
+class _AuditListener(logging.handlers.QueueListener):
+    """``QueueListener`` that records whether it is running."""
+
+    running = False
+
+    def start(self) -> None:
+        super().start()
+        self.running = True
+
+    def stop(self) -> None:
+        self.running = False
+        super().stop()
+
+
+def _install_handlers() -> logging.handlers.QueueHandler:
+    formatter = JsonFormatter(
         fmt="%(timestamp)s %(event_type)s %(agent_name)s %(customer_account_id)s "
         "%(initiated_by)s %(cluster_id)s %(region)s",
         timestamp=False,  # we supply our own ISO 8601 timestamp
     )
-    _handler.setFormatter(_formatter)
-    _logger.addHandler(_handler)
+    sinks = build_sinks()
+    for sink in sinks:
+        sink.setFormatter(formatter)
+    queue_handler = logging.handlers.QueueHandler(queue.Queue())
+    # Kept on the handler so a second import of this module finds it
+    queue_handler.listener = _AuditListener(
+        queue_handler.queue, *sinks, respect_handler_level=True,
+    )
+    queue_handler.listener.start()
+    _logger.addHandler(queue_handler)
     _logger.setLevel(logging.INFO)
+    atexit.register(_shutdown)
+    return queue_handler
+
+
+def _queue_handlers() -> list:
+    return [h for h in _logger.handlers if isinstance(h, logging.handlers.QueueHandler)]
+
+
+def _shutdown() -> None:
+    """Drain the queue, then flush and close every sink."""
+    for handler in _queue_handlers():
+        listener = handler.listener
+        if listener.running:
+            listener.stop()
+        for sink in listener.handlers:
+            sink.close()
+
+
+_sigterm_flush_installed = False
+
+
+def install_sigterm_flush() -> None:
+    """Flush sinks when Lambda (or a container runtime) sends SIGTERM.
+
+    Lambda sends SIGTERM before shutting an execution environment down
+    when an extension is registered; the previous handler still runs.
+    Importing this module leaves signal handling alone — only process
+    entry points (the Lambda router) call this.  Idempotent.
+    """
+    global _sigterm_flush_installed
+    if _sigterm_flush_installed or threading.current_thread() is not threading.main_thread():
+        return
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def _on_sigterm(signum, frame):
+        _shutdown()
+        if callable(previous):
+            previous(signum, frame)
+        elif previous == signal.SIG_DFL:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            os.kill(os.getpid(), signal.SIGTERM)
+
+    try:
+        signal.signal(signal.SIGTERM, _on_sigterm)
+        _sigterm_flush_installed = True
+    except ValueError:
+        pass
+
+
+if not _logger.handlers:
+    _install_handlers()
+
+
+def flush_audit_events(timeout: float = 2.0) -> bool:
+    """Wait until queued audit events have been written, then flush the sinks.
+
+    Batched sinks write their buffer here instead of waiting for a size or
+    time threshold, so one Lambda invocation costs at most one write per
+    sink.
+
+    Args:
+        timeout: Longest time to wait for the queue, in seconds.
+
+    Returns:
+        ``True`` if the queue drained, ``False`` if the timeout was hit.
+    """
+    deadline = time.monotonic() + timeout
+    # The handler may have been installed by another import of this module
+    # (``tools.audit_logger`` vs ``redshift_agents.tools.audit_logger``)
+    for handler in _queue_handlers():
+        pending = handler.queue
+        with pending.all_tasks_done:
+            while pending.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                pending.all_tasks_done.wait(remaining)
+        for sink in handler.listener.handlers:
+            sink.flush()
+    return True
 
 
 # ---------------------------------------------------------------------------
-# Account ID resolution (best-effort)
+# Account ID resolution (best-effort, memoized)
 # ---------------------------------------------------------------------------
 
+# After a failed STS lookup, report "unknown" for this long before retrying
+ACCOUNT_ID_RETRY_SECONDS = 300.0
+
+_account_id = ""
+_account_id_retry_at = 0.0
+_account_id_lock = threading.Lock()
+
+
+def _caller_account_id() -> str:
+    """Account ID from STS, looked up once per process."""
+    global _account_id, _account_id_retry_at
+    if _account_id:
+        return _account_id
+    with _account_id_lock:
+        if _account_id:
+            return _account_id
+        if time.monotonic() < _account_id_retry_at:
+            return "unknown"
+        try:
+            _account_id = get_client("sts").get_caller_identity()["Account"]
+            return _account_id
+        except Exception:
+            _account_id_retry_at = time.monotonic() + ACCOUNT_ID_RETRY_SECONDS
+            logging.getLogger(__name__).warning(
+                "Could not resolve AWS account ID — set AWS_ACCOUNT_ID env var for accurate audit logs"
+            )
+            return "unknown"
+
+
+def _reset_account_id() -> None:
+    """Forget the memoized account ID (tests, credential changes)."""
+    global _account_id, _account_id_retry_at
+    with _account_id_lock:
+        _account_id = ""
+        _account_id_retry_at = 0.0
+
 
 def _resolve_account_id(provided: str) -> str:
     """Return *provided* if non-empty, else env var, else STS, else 'unknown'."""
@@ -84,15 +280,54 @@ def _resolve_account_id(provided: str) -> str:
     if env_val:
         return env_val
 
-    try:
-        import boto3
+    return _caller_account_id()
 
-        return boto3.client("sts").get_caller_identity()["Account"]
-    except Exception:
-        logging.getLogger(__name__).warning(
-            "Could not resolve AWS account ID — set AWS_ACCOUNT_ID env var for accurate audit logs"
-        )
-        return "unknown"
+
+# ---------------------------------------------------------------------------
+# Payload bounds and sampling
+# ---------------------------------------------------------------------------
+
+
+def _bound_field(name: str, value: object) -> object:
+    """Return *value*, or a fingerprint of it if it exceeds the field's budget."""
+    budget = FIELD_BUDGETS.get(name, FIELD_MAX_BYTES)
+    if isinstance(value, (bool, int, float)) or value is None:
+        return value
+    text = value if isinstance(value, str) else json.dumps(value, sort_keys=True, default=str)
+    encoded = text.encode("utf-8")
+    if len(encoded) <= budget:
+        return value
+    bounded = {
+        "truncated": True,
+        "preview": "",
+        "sha256": hashlib.sha256(encoded).hexdigest(),
+        "bytes": len(encoded),
+    }
+    # The wrapper counts against the budget too, and escaping can grow the
+    # preview once serialized, so trim it until the whole field fits. Cuts
+    # land on UTF-8 bytes, not characters, so a wide character costs only
+    # what it encodes to and the preview keeps whatever prefix still fits
+    cut = max(0, budget - len(json.dumps(bounded)))
+    preview = encoded[:cut].decode("utf-8", "ignore")
+    while preview:
+        excess = len(json.dumps({**bounded, "preview": preview})) - budget
+        if excess <= 0:
+            break
+        # Escaping grows a UTF-8 byte to at most 6 serialized bytes
+        cut = len(preview.encode("utf-8")) - max(1, excess // 6)
+        preview = encoded[:cut].decode("utf-8", "ignore")
+    bounded["preview"] = preview
+    return bounded
+
+
+def _bound_details(details: dict) -> dict:
+    return {name: _bound_field(name, value) for name, value in details.items()}
+
+
+def _sample_rate(event_type: str, sampled: bool = True) -> float:
+    if not sampled or event_type in UNSAMPLED_EVENT_TYPES:
+        return 1.0
+    return min(1.0, max(0.0, SAMPLE_RATES.get(event_type, 1.0)))
 
 
 # ---------------------------------------------------------------------------
@@ -108,11 +343,15 @@ def emit_audit_event(
     cluster_id: str = "",
     region: str = "",
     details: dict | None = None,
+    sampled: bool = True,
 ) -> None:
     """Emit a structured JSON audit event.
 
     Failures are caught and logged to *stderr* so they never block the main
-    workflow (NFR-6.1).
+    workflow (NFR-6.1).  Oversized ``details`` fields are replaced by a
+    preview and SHA-256 fingerprint, and sampled-out events are dropped
+    before any work is done; kept events of a sampled type carry
+    ``details.sample_rate``.
 
     Args:
         event_type: One of ``VALID_EVENT_TYPES``.
@@ -122,8 +361,17 @@ def emit_audit_event(
         cluster_id: Target Redshift cluster identifier.
         region: AWS region of the target cluster.
         details: Arbitrary event-specific payload.
+        sampled: False keeps the event whatever ``AUDIT_SAMPLE_RATES`` says,
+            for events of a sampled type that must stay in the audit trail.
     """
     try:
+        rate = _sample_rate(event_type, sampled)
+        if rate < 1.0 and random.random() >= rate:
+            return
+        details = _bound_details(details or {})
+        if rate < 1.0:
+            details["sample_rate"] = rate
+
         event = AuditEvent(
             timestamp=datetime.now(timezone.utc).isoformat(),
             event_type=event_type,
@@ -132,7 +380,7 @@ def emit_audit_event(
             initiated_by=initiated_by,
             cluster_id=cluster_id,
             region=region or os.getenv("AWS_REGION", "us-east-2"),
-            details=details or {},
+            details=details,
         )
 
         _logger.info("audit_event", extra=asdict(event))
@@ -0,0 +1,274 @@
+"""
+Batched audit sinks.
+
+The audit logger writes every event to stdout by default.  At fleet scale
+that is one synchronous write per event, so the sinks here buffer formatted
+events and write them in batches:
+
+- ``cloudwatch``: ``PutLogEvents`` to ``AUDIT_LOG_GROUP`` (one stream per
+  process, created on first write).
+- ``s3``: one NDJSON object per batch under ``s3://AUDIT_S3_BUCKET/AUDIT_S3_PREFIX``.
+- ``file``: a local file rotated at ``AUDIT_FILE_MAX_BYTES``.
+
+A batch is written when it reaches ``AUDIT_FLUSH_MAX_EVENTS`` events or
+``AUDIT_FLUSH_MAX_BYTES`` bytes, or when its oldest event is
+``AUDIT_FLUSH_INTERVAL_MS`` old.  ``flush()`` writes whatever is buffered;
+the audit logger calls it at the end of every Lambda invocation and at
+shutdown, so buffered events are never left behind.
+
+Sinks are selected with ``AUDIT_SINKS`` (comma-separated, default
+``stream``).  Sinks fail closed to stdout: a batch that cannot be written
+is printed there with a warning on stderr, and never raised.
+"""
+from __future__ import annotations
+
+import abc
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+try:
+    from tools.client_pool import get_client
+except ImportError:
+    from .client_pool import get_client
+
+AUDIT_SINKS = os.getenv("AUDIT_SINKS", "stream")
+FLUSH_MAX_EVENTS = int(os.getenv("AUDIT_FLUSH_MAX_EVENTS", "500"))
+FLUSH_MAX_BYTES = int(os.getenv("AUDIT_FLUSH_MAX_BYTES", "512000"))
+FLUSH_INTERVAL_MS = int(os.getenv("AUDIT_FLUSH_INTERVAL_MS", "5000"))
+
+AUDIT_LOG_GROUP = os.getenv("AUDIT_LOG_GROUP", "/redshift-modernization/audit")
+AUDIT_S3_BUCKET = os.getenv("AUDIT_S3_BUCKET", "")
+AUDIT_S3_PREFIX = os.getenv("AUDIT_S3_PREFIX", "audit")
+AUDIT_FILE_PATH = os.getenv("AUDIT_FILE_PATH", "/tmp/redshift_modernization_audit.log")
+AUDIT_FILE_MAX_BYTES = int(os.getenv("AUDIT_FILE_MAX_BYTES", "10485760"))
+AUDIT_FILE_BACKUP_COUNT = int(os.getenv("AUDIT_FILE_BACKUP_COUNT", "5"))
+
+# PutLogEvents limits: 10,000 events and 1,048,576 bytes per call, where
+# every event counts its UTF-8 message size plus 26 bytes
+CLOUDWATCH_MAX_EVENTS = 10000
+CLOUDWATCH_MAX_BYTES = 1048576
+CLOUDWATCH_EVENT_OVERHEAD = 26
+
+
+class BatchingHandler(logging.Handler, abc.ABC):
+    """Logging handler that buffers formatted events and writes them in batches.
+
+    Subclasses implement ``write_batch``.  A daemon thread flushes batches
+    that have been waiting longer than *flush_interval_ms*.
+    """
+
+    def __init__(
+        self,
+        max_events: int = FLUSH_MAX_EVENTS,
+        max_bytes: int = FLUSH_MAX_BYTES,
+        flush_interval_ms: int = FLUSH_INTERVAL_MS,
+    ):
+        super().__init__()
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval_ms / 1000.0
+        self._buffer: List[Tuple[int, str]] = []
+        self._buffer_bytes = 0
+        self._oldest: Optional[float] = None
+        self._buffer_lock = threading.Lock()
+        # Serializes writes so batches reach the sink in order
+        self._write_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._timer = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._timer.start()
+
+    @abc.abstractmethod
+    def write_batch(self, events: List[Tuple[int, str]]) -> None:
+        """Write ``(timestamp_ms, message)`` pairs to the sink."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        size = len(message.encode("utf-8"))
+        with self._buffer_lock:
+            self._buffer.append((int(record.created * 1000), message))
+            self._buffer_bytes += size
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            full = len(self._buffer) >= self.max_events or self._buffer_bytes >= self.max_bytes
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._write_lock:
+            with self._buffer_lock:
+                events, self._buffer = self._buffer, []
+                self._buffer_bytes = 0
+                self._oldest = None
+            if not events:
+                return
+            try:
+                self.write_batch(events)
+            except Exception as e:
+                # Audit failures must never block the main workflow (NFR-6.1),
+                # nor lose events: fall back to stdout
+                print(
+                    f"[audit_sinks] WARNING: {type(self).__name__} failed ({e}); "
+                    f"writing {len(events)} audit events to stdout instead",
+                    file=sys.stderr,
+                )
+                try:
+                    sys.stdout.write("".join(message + "\n" for _, message in events))
+                    sys.stdout.flush()
+                except Exception:
+                    pass
+
+    def _flush_periodically(self) -> None:
+        while not self._closed.wait(self.flush_interval / 2 or 0.05):
+            oldest = self._oldest
+            if oldest is not None and time.monotonic() - oldest >= self.flush_interval:
+                self.flush()
+
+    def close(self) -> None:
+        self._closed.set()
+        self.flush()
+        super().close()
+
+
+class CloudWatchLogsSink(BatchingHandler):
+    """Batches audit events into CloudWatch Logs ``PutLogEvents`` calls."""
+
+    def __init__(self, log_group: str = AUDIT_LOG_GROUP, log_stream: str = "", region: str = "", **thresholds):
+        super().__init__(**thresholds)
+        self.log_group = log_group
+        self.log_stream = log_stream or (
+            f"{datetime.now(timezone.utc):%Y/%m/%d}/{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        )
+        self.region = region
+        self._stream_ready = False
+
+    def _ensure_stream(self, logs) -> None:
+        if self._stream_ready:
+            return
+        try:
+            logs.create_log_stream(logGroupName=self.log_group, logStreamName=self.log_stream)
+        except logs.exceptions.ResourceAlreadyExistsException:
+            pass
+        self._stream_ready = True
+
+    def write_batch(self, events: List[Tuple[int, str]]) -> None:
+        logs = get_client("logs", self.region)
+        self._ensure_stream(logs)
+        # Events in one call must be in chronological order
+        events = sorted(events, key=lambda e: e[0])
+        chunk: List[dict] = []
+        chunk_bytes = 0
+        for timestamp, message in events:
+            size = len(message.encode("utf-8")) + CLOUDWATCH_EVENT_OVERHEAD
+            if chunk and (len(chunk) >= CLOUDWATCH_MAX_EVENTS or chunk_bytes + size > CLOUDWATCH_MAX_BYTES):
+                self._put(logs, chunk)
+                chunk, chunk_bytes = [], 0
+            chunk.append({"timestamp": timestamp, "message": message})
+            chunk_bytes += size
+        if chunk:
+            self._put(logs, chunk)
+
+    def _put(self, logs, chunk: List[dict]) -> None:
+        logs.put_log_events(logGroupName=self.log_group, logStreamName=self.log_stream, logEvents=chunk)
+
+
+class S3NdjsonSink(BatchingHandler):
+    """Writes each batch of audit events as one NDJSON object in S3."""
+
+    def __init__(self, bucket: str = AUDIT_S3_BUCKET, prefix: str = AUDIT_S3_PREFIX, region: str = "", **thresholds):
+        super().__init__(**thresholds)
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.region = region
+
+    def object_key(self, events: List[Tuple[int, str]]) -> str:
+        first = datetime.fromtimestamp(events[0][0] / 1000.0, tz=timezone.utc)
+        name = f"{first:%Y%m%dT%H%M%S}-{uuid.uuid4().hex}.ndjson"
+        return "/".join(p for p in (self.prefix, f"{first:%Y/%m/%d}", name) if p)
+
+    def write_batch(self, events: List[Tuple[int, str]]) -> None:
+        body = "".join(message + "\n" for _, message in events).encode("utf-8")
+        get_client("s3", self.region).put_object(
+            Bucket=self.bucket,
+            Key=self.object_key(events),
+            Body=body,
+            ContentType="application/x-ndjson",
+        )
+
+
+class RotatingFileSink(BatchingHandler):
+    """Appends batches of audit events to a local file, rotating it by size.
+
+    Rotation follows ``RotatingFileHandler`` naming: ``audit.log`` is renamed
+    to ``audit.log.1``, ``audit.log.1`` to ``audit.log.2`` and so on, keeping
+    *backup_count* old files.
+    """
+
+    def __init__(
+        self,
+        path: str = AUDIT_FILE_PATH,
+        max_file_bytes: int = AUDIT_FILE_MAX_BYTES,
+        backup_count: int = AUDIT_FILE_BACKUP_COUNT,
+        **thresholds,
+    ):
+        super().__init__(**thresholds)
+        self.path = path
+        self.max_file_bytes = max_file_bytes
+        self.backup_count = backup_count
+
+    def _rotate(self) -> None:
+        if self.backup_count <= 0:
+            os.remove(self.path)
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def write_batch(self, events: List[Tuple[int, str]]) -> None:
+        data = "".join(message + "\n" for _, message in events).encode("utf-8")
+        if (
+            self.max_file_bytes > 0
+            and os.path.exists(self.path)
+            and os.path.getsize(self.path) + len(data) > self.max_file_bytes
+        ):
+            self._rotate()
+        with open(self.path, "ab") as f:
+            f.write(data)
+
+
+def build_sinks(names: str = AUDIT_SINKS) -> List[logging.Handler]:
+    """Create the handlers named in *names* (see module docstring).
+
+    Unknown names are reported on stderr and skipped, as is ``s3`` without
+    ``AUDIT_S3_BUCKET``; an empty selection falls back to ``stream`` so audit
+    events are never silently dropped.
+    """
+    sinks: List[logging.Handler] = []
+    for name in (n.strip().lower() for n in names.split(",")):
+        if not name:
+            continue
+        if name == "stream":
+            sinks.append(logging.StreamHandler())
+        elif name == "cloudwatch":
+            sinks.append(CloudWatchLogsSink())
+        elif name == "s3":
+            if AUDIT_S3_BUCKET:
+                sinks.append(S3NdjsonSink())
+            else:
+                print("[audit_sinks] WARNING: s3 audit sink needs AUDIT_S3_BUCKET; skipped", file=sys.stderr)
+        elif name == "file":
+            sinks.append(RotatingFileSink())
+        else:
+            print(f"[audit_sinks] Unknown audit sink: {name}", file=sys.stderr)
+    return sinks or [logging.StreamHandler()]
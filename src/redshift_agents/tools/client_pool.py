@@ -0,0 +1,157 @@
+"""
+Process-wide boto3 client pool for Redshift Modernization Agents.
+
+Building a fresh ``boto3.client(...)`` on every tool call repeats credential
+resolution, endpoint resolution and the TLS handshake on each Bedrock action
+group invocation.  boto3 clients are thread-safe, so a single client per
+``(service, region, session)`` is created lazily and reused for the
+lifetime of the process — including across warm Lambda invocations.
+Refreshable (e.g. assumed-role) credentials are refreshed by botocore inside
+the pooled client, so rotation does not create new clients; the pool is an
+LRU capped at ``AWS_CLIENT_POOL_MAX_CLIENTS`` for callers that build many
+sessions.
+
+All pooled clients share a tuned ``botocore.config.Config`` (larger
+connection pool, TCP keep-alive, adaptive retries).
+
+Tests and benchmarks can inject stand-in clients without patching boto3::
+
+    with client_overrides({"redshift": fake_redshift}):
+        analyze_redshift_cluster("my-cluster")
+
+Set ``AWS_CLIENT_POOL_ENABLED=false`` to fall back to one client per call.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+POOL_ENABLED = os.getenv("AWS_CLIENT_POOL_ENABLED", "true").lower() not in ("0", "false", "no")
+MAX_POOL_CONNECTIONS = int(os.getenv("AWS_CLIENT_MAX_POOL_CONNECTIONS", "32"))
+MAX_ATTEMPTS = int(os.getenv("AWS_CLIENT_MAX_ATTEMPTS", "5"))
+MAX_POOLED_CLIENTS = int(os.getenv("AWS_CLIENT_POOL_MAX_CLIENTS", "64"))
+
+CLIENT_CONFIG = Config(
+    max_pool_connections=MAX_POOL_CONNECTIONS,
+    tcp_keepalive=True,
+    connect_timeout=5,
+    read_timeout=60,
+    retries={"mode": "adaptive", "max_attempts": MAX_ATTEMPTS},
+)
+
+# Region wildcard for overrides that apply to every region
+ANY_REGION = "*"
+
+# (service, region, id(session)) -> (client, session); holding the session
+# keeps its id from being reused while the entry is pooled
+_clients: "OrderedDict[Tuple[str, str, int], Tuple[object, boto3.session.Session]]" = OrderedDict()
+_overrides: Dict[Tuple[str, str], object] = {}
+_lock = threading.Lock()
+
+
+def _resolve_region(region: str) -> str:
+    """Resolve region from parameter, env var, or default."""
+    return region or os.getenv("AWS_REGION", "us-east-2")
+
+
+def _signing_session(session: Optional[boto3.session.Session]) -> boto3.session.Session:
+    """Return the session a client for *session* signs with (the default one for ``None``)."""
+    if session is not None:
+        return session
+    if boto3.DEFAULT_SESSION is None:
+        with _lock:
+            if boto3.DEFAULT_SESSION is None:
+                boto3.setup_default_session()
+    return boto3.DEFAULT_SESSION
+
+
+def _create_client(
+    service_name: str,
+    region: str,
+    session: Optional[boto3.session.Session],
+):
+    factory = session.client if session is not None else boto3.client
+    return factory(service_name, region_name=region, config=CLIENT_CONFIG)
+
+
+def get_client(
+    service_name: str,
+    region: str = "",
+    session: Optional[boto3.session.Session] = None,
+):
+    """Return a shared boto3 client for *service_name* in *region*.
+
+    Args:
+        service_name: boto3 service name (e.g. ``"redshift-data"``).
+        region: AWS region (defaults to AWS_REGION env var).
+        session: Optional boto3 session, e.g. one built from assumed-role
+            credentials.  Clients are keyed by session, so different
+            identities never share a client.
+
+    Returns:
+        A boto3 client, or the stand-in registered via ``override_client``.
+    """
+    region = _resolve_region(region)
+
+    override = _overrides.get((service_name, region), _overrides.get((service_name, ANY_REGION)))
+    if override is not None:
+        return override
+
+    if not POOL_ENABLED:
+        return _create_client(service_name, region, session)
+
+    signing_session = _signing_session(session)
+    key = (service_name, region, id(signing_session))
+    # Session objects are not thread-safe — serialize client creation
+    with _lock:
+        entry = _clients.get(key)
+        if entry is not None:
+            _clients.move_to_end(key)
+            return entry[0]
+        client = _create_client(service_name, region, session)
+        _clients[key] = (client, signing_session)
+        while len(_clients) > MAX_POOLED_CLIENTS:
+            _clients.popitem(last=False)
+    return client
+
+
+def override_client(service_name: str, client: object, region: str = ANY_REGION) -> None:
+    """Register a stand-in *client* returned by ``get_client`` for *service_name*.
+
+    Args:
+        service_name: boto3 service name to override.
+        client: Object to hand out instead of a real boto3 client.
+        region: Restrict the override to one region (default: all regions).
+    """
+    _overrides[(service_name, region)] = client
+
+
+def clear_overrides() -> None:
+    """Remove every stand-in client registered via ``override_client``."""
+    _overrides.clear()
+
+
+def reset_pool() -> None:
+    """Drop all pooled clients and overrides (next call creates new clients)."""
+    with _lock:
+        _clients.clear()
+    _overrides.clear()
+
+
+@contextmanager
+def client_overrides(clients: Dict[str, object]) -> Iterator[None]:
+    """Temporarily override clients by service name for the enclosed block."""
+    previous = dict(_overrides)
+    for service_name, client in clients.items():
+        override_client(service_name, client)
+    try:
+        yield
+    finally:
+        _overrides.clear()
+        _overrides.update(previous)
@@ -3,25 +3,62 @@ DynamoDB-based cluster-level locking for Redshift Modernization Agents.
 
 Prevents two users in the same account from working on the same Redshift
 cluster simultaneously.  Lock acquisition uses a DynamoDB conditional write
-(``attribute_not_exists``) for atomicity.  A 24-hour TTL provides a safety
-net so stale locks are automatically cleaned up even if the orchestrator
-crashes without releasing.
+for atomicity.
+
+Locks are leases: a lock is held for ``CLUSTER_LOCK_LEASE_SECONDS`` (5
+minutes by default) and kept alive with ``renew_lock`` heartbeats.  If the
+orchestrator crashes the lease simply runs out and the cluster is free again
+within minutes, instead of waiting for a 24-hour TTL.
+
+Every successful acquire returns a fencing token that increases
+monotonically per cluster (a counter item ``<cluster_id>#fence`` in the same
+table).  Execution tools pass the token back and ``check_fencing_token``
+rejects holders whose lease expired or was taken over, so a paused or
+partitioned holder cannot act on a cluster that someone else now owns.
+
+Consolidation migrations lock several source clusters at once with
+``acquire_locks``.  The lock items are written in one ``TransactWriteItems``
+call, so either every cluster is locked or none is: a caller never holds
+some clusters while waiting for others, which rules out deadlock between
+two users whose cluster sets overlap.
+
+``acquire_lock`` can also wait for a held cluster (``wait_seconds``).  A
+waiter polls with jittered exponential backoff until its deadline and is
+recorded in a FIFO queue (item ``<cluster_id>#queue``).  ``release_lock``
+hands the lock straight to the oldest live waiter instead of freeing it, so
+waiters are served in arrival order and the next one holds the lock as soon
+as the previous holder lets go.  Contention results report
+``queue_position`` / ``queue_length`` for display.
 
 Requirements: NFR-2.2, NFR-2.3
 """
 from __future__ import annotations
 
 import os
+import random
 import sys
+import threading
 import time
 from datetime import datetime, timezone
-from typing import Dict
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
-import boto3
 from botocore.exceptions import ClientError
 
+try:
+    from tools.client_pool import get_client
+except ImportError:
+    from .client_pool import get_client
+
 LOCK_TABLE = os.getenv("DYNAMODB_LOCK_TABLE", "redshift_modernization_locks")
-TTL_SECONDS = 24 * 60 * 60  # 24 hours
+LEASE_SECONDS = int(os.getenv("CLUSTER_LOCK_LEASE_SECONDS", "300"))
+FENCE_SUFFIX = "#fence"
+QUEUE_SUFFIX = "#queue"
+# Upper bound for acquire_lock(wait_seconds=...); keep below the Lambda timeout
+WAIT_MAX_SECONDS = float(os.getenv("CLUSTER_LOCK_WAIT_MAX_SECONDS", "20"))
+BACKOFF_BASE_SECONDS = 0.25
+BACKOFF_MAX_SECONDS = float(os.getenv("CLUSTER_LOCK_BACKOFF_MAX_SECONDS", "2"))
+# TransactWriteItems accepts at most 100 actions per call
+MAX_TRANSACTION_ITEMS = 100
 
 
 def _resolve_region(region: str) -> str:
@@ -29,57 +66,67 @@ def _resolve_region(region: str) -> str:
     return region or os.getenv("AWS_REGION", "us-east-2")
 
 
-def acquire_lock(
-    cluster_id: str,
-    user_id: str,
-    region: str = "",
-) -> Dict:
-    """Attempt to acquire a cluster-level lock.
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat()
 
-    Uses a DynamoDB conditional put (``attribute_not_exists(cluster_id)``) so
-    that exactly one caller wins when two requests race for the same cluster.
-
-    Args:
-        cluster_id: Redshift cluster identifier (DynamoDB partition key).
-        user_id: Identity of the user requesting the lock.
-        region: AWS region where the DynamoDB lock table resides.
 
-    Returns:
-        On success::
+def _next_fencing_token(dynamodb, cluster_id: str) -> int:
+    """Atomically increment and return the cluster's fencing counter."""
+    resp = dynamodb.update_item(
+        TableName=LOCK_TABLE,
+        Key={"cluster_id": {"S": cluster_id + FENCE_SUFFIX}},
+        UpdateExpression="ADD fencing_token :one",
+        ExpressionAttributeValues={":one": {"N": "1"}},
+        ReturnValues="UPDATED_NEW",
+    )
+    return int(resp["Attributes"]["fencing_token"]["N"])
 
-            {"acquired": True, "cluster_id": ..., "lock_holder": ..., "acquired_at": ...}
 
-        On contention (cluster already locked)::
+def _lock_item(cluster_id: str, user_id: str, acquired_at: str, fencing_token: int, lease_expires: float) -> Dict:
+    return {
+        "cluster_id": {"S": cluster_id},
+        "lock_holder": {"S": user_id},
+        "acquired_at": {"S": acquired_at},
+        "fencing_token": {"N": str(fencing_token)},
+        "lease_expires_at": {"N": str(lease_expires)},
+        # Lets DynamoDB TTL sweep abandoned leases eventually
+        "ttl": {"N": str(int(lease_expires))},
+    }
 
-            {"acquired": False, "cluster_id": ..., "lock_holder": ..., "acquired_at": ...}
 
-        On unexpected error::
+def _holder_info(cluster_id: str, item: Dict) -> Dict:
+    """Describe the current holder of *cluster_id* from its lock item."""
+    expires = item.get("lease_expires_at", {}).get("N")
+    return {
+        "cluster_id": cluster_id,
+        "lock_holder": item.get("lock_holder", {}).get("S", "unknown"),
+        "acquired_at": item.get("acquired_at", {}).get("S", "unknown"),
+        "lease_expires_at": _iso(float(expires)) if expires else "unknown",
+    }
 
-            {"error": ..., "cluster_id": ..., "region": ...}
-    """
-    region = _resolve_region(region)
-    now = datetime.now(timezone.utc)
-    acquired_at = now.isoformat()
-    ttl_epoch = int(time.time()) + TTL_SECONDS
 
-    dynamodb = boto3.client("dynamodb", region_name=region)
+def _try_acquire(dynamodb, cluster_id: str, user_id: str, region: str, lease_seconds: int) -> Dict:
+    """One conditional-put acquisition attempt (see ``acquire_lock``)."""
+    now = time.time()
+    acquired_at = _iso(now)
+    lease_expires = now + lease_seconds
 
     try:
+        fencing_token = _next_fencing_token(dynamodb, cluster_id)
         dynamodb.put_item(
             TableName=LOCK_TABLE,
-            Item={
-                "cluster_id": {"S": cluster_id},
-                "lock_holder": {"S": user_id},
-                "acquired_at": {"S": acquired_at},
-                "ttl": {"N": str(ttl_epoch)},
-            },
-            ConditionExpression="attribute_not_exists(cluster_id)",
+            Item=_lock_item(cluster_id, user_id, acquired_at, fencing_token, lease_expires),
+            ConditionExpression="attribute_not_exists(cluster_id) OR lease_expires_at < :now",
+            ExpressionAttributeValues={":now": {"N": str(now)}},
         )
         return {
             "acquired": True,
             "cluster_id": cluster_id,
             "lock_holder": user_id,
             "acquired_at": acquired_at,
+            "fencing_token": fencing_token,
+            "lease_expires_at": _iso(lease_expires),
+            "lease_seconds": lease_seconds,
         }
     except ClientError as exc:
         if exc.response["Error"]["Code"] == "ConditionalCheckFailedException":
@@ -89,19 +136,14 @@ def acquire_lock(
                     TableName=LOCK_TABLE,
                     Key={"cluster_id": {"S": cluster_id}},
                 )
-                item = resp.get("Item", {})
-                return {
-                    "acquired": False,
-                    "cluster_id": cluster_id,
-                    "lock_holder": item.get("lock_holder", {}).get("S", "unknown"),
-                    "acquired_at": item.get("acquired_at", {}).get("S", "unknown"),
-                }
+                return {"acquired": False, **_holder_info(cluster_id, resp.get("Item", {}))}
             except Exception:
                 return {
                     "acquired": False,
                     "cluster_id": cluster_id,
                     "lock_holder": "unknown",
                     "acquired_at": "unknown",
+                    "lease_expires_at": "unknown",
                 }
         return {
             "error": str(exc),
@@ -116,6 +158,396 @@ def acquire_lock(
         }
 
 
+def _queue_key(cluster_id: str) -> Dict:
+    return {"cluster_id": {"S": cluster_id + QUEUE_SUFFIX}}
+
+
+def _read_waiters(dynamodb, cluster_id: str) -> List[Tuple[str, int]]:
+    """Return ``(user_id, lease_seconds)`` of live waiters, oldest first.
+
+    Waiters whose deadline has passed are ignored; they are removed when
+    their ``acquire_lock`` call returns, or overwritten when they wait again.
+    """
+    item = dynamodb.get_item(
+        TableName=LOCK_TABLE, Key=_queue_key(cluster_id), ConsistentRead=True,
+    ).get("Item") or {}
+    now = time.time()
+    waiters = []
+    for waiter, entry in item.get("waiters", {}).get("M", {}).items():
+        fields = entry["M"]
+        if float(fields["expires_at"]["N"]) >= now:
+            lease_seconds = int(fields.get("lease_seconds", {}).get("N", LEASE_SECONDS))
+            waiters.append((float(fields["enqueued_at"]["N"]), waiter, lease_seconds))
+    return [(waiter, lease_seconds) for _, waiter, lease_seconds in sorted(waiters)]
+
+
+def _read_queue(dynamodb, cluster_id: str) -> List[str]:
+    """Return the user IDs of live waiters, oldest first."""
+    return [waiter for waiter, _ in _read_waiters(dynamodb, cluster_id)]
+
+
+def _enqueue_waiter(dynamodb, cluster_id: str, user_id: str, expires_at: float, lease_seconds: int) -> None:
+    # A map attribute cannot be created and updated in one expression
+    dynamodb.update_item(
+        TableName=LOCK_TABLE,
+        Key=_queue_key(cluster_id),
+        UpdateExpression="SET waiters = if_not_exists(waiters, :empty)",
+        ExpressionAttributeValues={":empty": {"M": {}}},
+    )
+    dynamodb.update_item(
+        TableName=LOCK_TABLE,
+        Key=_queue_key(cluster_id),
+        UpdateExpression="SET waiters.#waiter = :entry",
+        ExpressionAttributeNames={"#waiter": user_id},
+        ExpressionAttributeValues={":entry": {"M": {
+            "enqueued_at": {"N": str(time.time())},
+            "expires_at": {"N": str(expires_at)},
+            "lease_seconds": {"N": str(int(lease_seconds))},
+        }}},
+    )
+
+
+def _dequeue_waiter(dynamodb, cluster_id: str, user_id: str) -> None:
+    try:
+        dynamodb.update_item(
+            TableName=LOCK_TABLE,
+            Key=_queue_key(cluster_id),
+            UpdateExpression="REMOVE waiters.#waiter",
+            ExpressionAttributeNames={"#waiter": user_id},
+        )
+    except Exception as exc:
+        # A stale entry is ignored once its deadline passes
+        print(f"[cluster_lock] Failed to leave wait queue for {cluster_id}: {exc}", file=sys.stderr)
+
+
+def _granted_lock(dynamodb, cluster_id: str, user_id: str, lease_seconds: int) -> Optional[Dict]:
+    """Return the lock if ``release_lock`` handed it to *user_id*."""
+    item = dynamodb.get_item(
+        TableName=LOCK_TABLE, Key={"cluster_id": {"S": cluster_id}}, ConsistentRead=True,
+    ).get("Item") or {}
+    expires = float(item.get("lease_expires_at", {}).get("N", "0"))
+    if item.get("lock_holder", {}).get("S") != user_id or expires < time.time():
+        return None
+    return {
+        "acquired": True,
+        "cluster_id": cluster_id,
+        "lock_holder": user_id,
+        "acquired_at": item["acquired_at"]["S"],
+        "fencing_token": int(item["fencing_token"]["N"]),
+        "lease_expires_at": _iso(expires),
+        "lease_seconds": lease_seconds,
+    }
+
+
+def _backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff delay for poll *attempt*."""
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+def acquire_lock(
+    cluster_id: str,
+    user_id: str,
+    region: str = "",
+    lease_seconds: int = LEASE_SECONDS,
+    wait_seconds: float = 0,
+) -> Dict:
+    """Attempt to acquire a cluster-level lock lease.
+
+    Uses a DynamoDB conditional put (no lock item, or its lease has expired)
+    so that exactly one caller wins when two requests race for the same
+    cluster.
+
+    With *wait_seconds* the caller joins the cluster's FIFO wait queue and
+    polls with jittered backoff until the lock is handed over by
+    ``release_lock``, the holder's lease expires, or the wait (capped at
+    ``CLUSTER_LOCK_WAIT_MAX_SECONDS``) runs out.  Only the waiter at the head
+    of the queue takes a free or expired lease, so waiters are served in
+    order; callers that do not wait are not queued and do not take the
+    lease while anyone is waiting.
+
+    Args:
+        cluster_id: Redshift cluster identifier (DynamoDB partition key).
+        user_id: Identity of the user requesting the lock.
+        region: AWS region where the DynamoDB lock table resides.
+        lease_seconds: How long the lock is held without a ``renew_lock``
+            heartbeat.
+        wait_seconds: How long to wait for a held lock; 0 returns at once.
+
+    Returns:
+        On success::
+
+            {"acquired": True, "cluster_id": ..., "lock_holder": ..., "acquired_at": ...,
+             "fencing_token": ..., "lease_expires_at": ..., "lease_seconds": ...}
+
+        On contention (cluster already locked)::
+
+            {"acquired": False, "cluster_id": ..., "lock_holder": ..., "acquired_at": ...,
+             "lease_expires_at": ..., "queue_length": ..., "queue_position": ...}
+
+        ``queue_position`` is the caller's 1-based place in the wait queue,
+        or None if it is not waiting.  Results of a wait also carry
+        ``waited_seconds``.
+
+        On unexpected error::
+
+            {"error": ..., "cluster_id": ..., "region": ...}
+    """
+    region = _resolve_region(region)
+    dynamodb = get_client("dynamodb", region)
+
+    # Waiters already in line go first
+    try:
+        queue = _read_queue(dynamodb, cluster_id)
+    except Exception:
+        queue = []
+    result = {"acquired": False, "cluster_id": cluster_id}
+    if not queue or queue[0] == user_id:
+        result = _try_acquire(dynamodb, cluster_id, user_id, region, lease_seconds)
+        if result.get("acquired") is not False:
+            return result
+
+    if wait_seconds <= 0:
+        if "lock_holder" in result:
+            return _with_queue_position(dynamodb, result, user_id)
+        try:
+            return _contention_result(dynamodb, cluster_id, user_id)
+        except Exception as exc:
+            return {"error": f"Unexpected: {str(exc)}", "cluster_id": cluster_id, "region": region}
+
+    started = time.monotonic()
+    wait_seconds = min(wait_seconds, WAIT_MAX_SECONDS)
+    try:
+        _enqueue_waiter(dynamodb, cluster_id, user_id, time.time() + wait_seconds, lease_seconds)
+        attempt = 0
+        while True:
+            remaining = wait_seconds - (time.monotonic() - started)
+            if remaining <= 0:
+                break
+            time.sleep(min(remaining, _backoff(attempt)))
+            attempt += 1
+            granted = _granted_lock(dynamodb, cluster_id, user_id, lease_seconds)
+            if granted:
+                result = granted
+                break
+            queue = _read_queue(dynamodb, cluster_id)
+            if not queue or queue[0] == user_id:
+                result = _try_acquire(dynamodb, cluster_id, user_id, region, lease_seconds)
+                if result.get("acquired") is not False:
+                    break
+    except Exception as exc:
+        result = {"error": f"Unexpected: {str(exc)}", "cluster_id": cluster_id, "region": region}
+    finally:
+        _dequeue_waiter(dynamodb, cluster_id, user_id)
+
+    if result.get("acquired") is False:
+        # A release may have handed us the lock just before we left the queue
+        try:
+            result = _granted_lock(dynamodb, cluster_id, user_id, lease_seconds) or _contention_result(
+                dynamodb, cluster_id, user_id,
+            )
+        except Exception:
+            pass
+    result["waited_seconds"] = round(time.monotonic() - started, 3)
+    return result
+
+
+def _with_queue_position(dynamodb, result: Dict, user_id: str) -> Dict:
+    """Add the wait queue length and *user_id*'s position to a contention result."""
+    try:
+        queue = _read_queue(dynamodb, result["cluster_id"])
+    except Exception:
+        return result
+    result["queue_length"] = len(queue)
+    result["queue_position"] = queue.index(user_id) + 1 if user_id in queue else None
+    return result
+
+
+def _contention_result(dynamodb, cluster_id: str, user_id: str) -> Dict:
+    item = dynamodb.get_item(
+        TableName=LOCK_TABLE, Key={"cluster_id": {"S": cluster_id}},
+    ).get("Item") or {}
+    return _with_queue_position(dynamodb, {"acquired": False, **_holder_info(cluster_id, item)}, user_id)
+
+
+def renew_lock(
+    cluster_id: str,
+    user_id: str,
+    fencing_token: int,
+    region: str = "",
+    lease_seconds: int = LEASE_SECONDS,
+) -> Dict:
+    """Extend a held lock's lease (heartbeat).
+
+    Succeeds only while *user_id* still holds the lock under *fencing_token*.
+    A lease that ran out but was not taken over can still be renewed, since
+    nobody else can have acted under a newer token.
+
+    Args:
+        cluster_id: Redshift cluster identifier.
+        user_id: Identity of the lock holder.
+        fencing_token: Token returned by ``acquire_lock``.
+        region: AWS region where the DynamoDB lock table resides.
+        lease_seconds: New lease length, counted from now.
+
+    Returns:
+        On success::
+
+            {"renewed": True, "cluster_id": ..., "fencing_token": ..., "lease_expires_at": ...}
+
+        When the lock was lost or on error::
+
+            {"renewed": False, "error": ..., "cluster_id": ...}
+    """
+    region = _resolve_region(region)
+    lease_expires = time.time() + lease_seconds
+    dynamodb = get_client("dynamodb", region)
+
+    try:
+        dynamodb.update_item(
+            TableName=LOCK_TABLE,
+            Key={"cluster_id": {"S": cluster_id}},
+            UpdateExpression="SET lease_expires_at = :expires, #ttl = :ttl",
+            ConditionExpression="lock_holder = :holder AND fencing_token = :token",
+            ExpressionAttributeNames={"#ttl": "ttl"},
+            ExpressionAttributeValues={
+                ":expires": {"N": str(lease_expires)},
+                ":ttl": {"N": str(int(lease_expires))},
+                ":holder": {"S": user_id},
+                ":token": {"N": str(int(fencing_token))},
+            },
+        )
+        return {
+            "renewed": True,
+            "cluster_id": cluster_id,
+            "fencing_token": int(fencing_token),
+            "lease_expires_at": _iso(lease_expires),
+        }
+    except ClientError as exc:
+        error = str(exc)
+        if exc.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            error = "Lock lost: it was released or taken over by another holder"
+        return {"renewed": False, "error": error, "cluster_id": cluster_id}
+    except Exception as exc:
+        return {"renewed": False, "error": f"Unexpected: {str(exc)}", "cluster_id": cluster_id}
+
+
+def check_fencing_token(
+    cluster_id: str,
+    fencing_token: int,
+    user_id: str = "",
+    region: str = "",
+) -> Dict:
+    """Verify that *fencing_token* is the current, unexpired lease on the cluster.
+
+    Execution tools call this before acting so a stale holder (expired lease,
+    or lock re-acquired since) is rejected.
+
+    Returns:
+        ``{"valid": True, ...}`` or ``{"valid": False, "error": ..., ...}``.
+    """
+    region = _resolve_region(region)
+    dynamodb = get_client("dynamodb", region)
+
+    try:
+        item = dynamodb.get_item(
+            TableName=LOCK_TABLE,
+            Key={"cluster_id": {"S": cluster_id}},
+            ConsistentRead=True,
+        ).get("Item")
+    except Exception as exc:
+        return {"valid": False, "error": f"Could not verify cluster lock: {exc}", "cluster_id": cluster_id}
+
+    if not item:
+        reason = "cluster is not locked"
+    elif item.get("fencing_token", {}).get("N") != str(int(fencing_token)):
+        reason = "lock was re-acquired with a newer fencing token"
+    elif user_id and item.get("lock_holder", {}).get("S") != user_id:
+        reason = "lock is held by another user"
+    elif float(item.get("lease_expires_at", {}).get("N", "0")) < time.time():
+        reason = "lease expired; renew or re-acquire the lock"
+    else:
+        return {"valid": True, "cluster_id": cluster_id, "fencing_token": int(fencing_token)}
+    return {
+        "valid": False,
+        "error": f"Stale cluster lock (fencing token {fencing_token}): {reason}",
+        "cluster_id": cluster_id,
+    }
+
+
+class LeaseHeartbeat:
+    """Background thread that renews a lock lease until stopped.
+
+    For long-running callers (orchestrator sessions, batch runners)::
+
+        lock = acquire_lock(cluster_id, user_id)
+        with LeaseHeartbeat(cluster_id, user_id, lock["fencing_token"]) as heartbeat:
+            ...  # check heartbeat.lost before each mutating step
+
+    Renewals happen every third of the lease, so two may fail in a row
+    before the lease runs out.  ``lost`` is set once a renewal reports the
+    lock gone.
+    """
+
+    def __init__(
+        self,
+        cluster_id: str,
+        user_id: str,
+        fencing_token: int,
+        region: str = "",
+        lease_seconds: int = LEASE_SECONDS,
+    ):
+        self.cluster_id = cluster_id
+        self.user_id = user_id
+        self.fencing_token = fencing_token
+        self.region = region
+        self.lease_seconds = lease_seconds
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.lease_seconds / 3):
+            result = renew_lock(
+                self.cluster_id, self.user_id, self.fencing_token, self.region, self.lease_seconds,
+            )
+            if not result["renewed"] and result["error"].startswith("Lock lost"):
+                self.lost.set()
+                return
+
+    def start(self) -> "LeaseHeartbeat":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def __enter__(self) -> "LeaseHeartbeat":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def _hand_over(dynamodb, cluster_id: str, user_id: str, waiter: str, lease_seconds: int) -> Dict:
+    """Replace *user_id*'s lock with a fresh lease of the waiter's *lease_seconds*.
+
+    A single conditional put, so no other caller can take the lock between
+    the release and the grant.
+    """
+    now = time.time()
+    fencing_token = _next_fencing_token(dynamodb, cluster_id)
+    dynamodb.put_item(
+        TableName=LOCK_TABLE,
+        Item=_lock_item(cluster_id, waiter, _iso(now), fencing_token, now + lease_seconds),
+        ConditionExpression="lock_holder = :holder",
+        ExpressionAttributeValues={":holder": {"S": user_id}},
+    )
+    _dequeue_waiter(dynamodb, cluster_id, waiter)
+    return {"released": True, "cluster_id": cluster_id, "granted_to": waiter}
+
+
 def release_lock(
     cluster_id: str,
     user_id: str,
@@ -124,8 +556,11 @@ def release_lock(
     """Release a cluster-level lock.
 
     Only the current lock holder can release the lock (enforced via a
-    condition expression).  On failure the error is logged to *stderr*
-    but never blocks — the 24-hour TTL acts as a safety net.
+    condition expression).  If other users are waiting for the cluster the
+    lock is handed to the oldest live waiter with a new fencing token
+    instead of being deleted.  On failure the error is logged to *stderr*
+    but never blocks — the lease runs out within minutes anyway.  The
+    fencing counter item is kept so tokens keep increasing.
 
     Args:
         cluster_id: Redshift cluster identifier.
@@ -135,16 +570,19 @@ def release_lock(
     Returns:
         On success::
 
-            {"released": True, "cluster_id": ...}
+            {"released": True, "cluster_id": ...}  # plus "granted_to" on hand-over
 
         On failure::
 
             {"released": False, "error": ..., "cluster_id": ...}
     """
     region = _resolve_region(region)
-    dynamodb = boto3.client("dynamodb", region_name=region)
+    dynamodb = get_client("dynamodb", region)
 
     try:
+        waiters = [w for w in _read_waiters(dynamodb, cluster_id) if w[0] != user_id]
+        if waiters:
+            return _hand_over(dynamodb, cluster_id, user_id, *waiters[0])
         dynamodb.delete_item(
             TableName=LOCK_TABLE,
             Key={"cluster_id": {"S": cluster_id}},
@@ -153,7 +591,7 @@ def release_lock(
         )
         return {"released": True, "cluster_id": cluster_id}
     except Exception as exc:
-        # Release failures must never block the workflow (TTL safety net)
+        # Release failures must never block the workflow (lease expiry safety net)
         print(
             f"[cluster_lock] Failed to release lock for {cluster_id}: {exc}",
             file=sys.stderr,
@@ -163,3 +601,230 @@ def release_lock(
             "error": str(exc),
             "cluster_id": cluster_id,
         }
+
+def _normalize_cluster_ids(cluster_ids: Union[str, Iterable[str]]) -> List[str]:
+    """Accept a list or a comma-separated string; dedupe and sort.
+
+    A fixed order keeps transactions for overlapping cluster sets touching
+    items in the same sequence.
+    """
+    if isinstance(cluster_ids, str):
+        cluster_ids = cluster_ids.split(",")
+    return sorted({c.strip() for c in cluster_ids if c and c.strip()})
+
+
+def _transact_lock_chunk(
+    dynamodb,
+    chunk: List[str],
+    user_id: str,
+    acquired_at: str,
+    now: float,
+    lease_expires: float,
+) -> Dict:
+    """Lock every cluster in *chunk* in one transaction.
+
+    Returns ``{"locks": [...]}`` on success or ``{"conflicts": [...]}`` when
+    the transaction was cancelled because some clusters are already held.
+    Other errors are raised.
+    """
+    tokens = {cluster_id: _next_fencing_token(dynamodb, cluster_id) for cluster_id in chunk}
+    try:
+        dynamodb.transact_write_items(TransactItems=[
+            {
+                "Put": {
+                    "TableName": LOCK_TABLE,
+                    "Item": _lock_item(cluster_id, user_id, acquired_at, tokens[cluster_id], lease_expires),
+                    "ConditionExpression": "attribute_not_exists(cluster_id) OR lease_expires_at < :now",
+                    "ExpressionAttributeValues": {":now": {"N": str(now)}},
+                    "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
+                }
+            }
+            for cluster_id in chunk
+        ])
+    except ClientError as exc:
+        if exc.response["Error"]["Code"] != "TransactionCanceledException":
+            raise
+        reasons = exc.response.get("CancellationReasons", [])
+        conflicts = [
+            _holder_info(cluster_id, reason.get("Item", {}))
+            for cluster_id, reason in zip(chunk, reasons)
+            if reason.get("Code") == "ConditionalCheckFailed"
+        ]
+        if not conflicts:
+            # Cancelled for another reason (e.g. a concurrent transaction)
+            raise
+        return {"conflicts": conflicts}
+    return {
+        "locks": [
+            {"cluster_id": cluster_id, "fencing_token": tokens[cluster_id]}
+            for cluster_id in chunk
+        ]
+    }
+
+
+def _queue_conflicts(dynamodb, cluster_ids: List[str], user_id: str) -> List[Dict]:
+    """Contention entries for clusters whose wait queue is headed by someone else.
+
+    Same rule as ``acquire_lock``: while users wait for a cluster, only the
+    head of its queue may take it.
+    """
+    conflicts = []
+    for cluster_id in cluster_ids:
+        try:
+            queue = _read_queue(dynamodb, cluster_id)
+        except Exception:
+            queue = []
+        if queue and queue[0] != user_id:
+            item = dynamodb.get_item(
+                TableName=LOCK_TABLE, Key={"cluster_id": {"S": cluster_id}},
+            ).get("Item") or {}
+            conflicts.append({
+                **_holder_info(cluster_id, item),
+                "queue_length": len(queue),
+                "queue_position": queue.index(user_id) + 1 if user_id in queue else None,
+            })
+    return conflicts
+
+
+def _rollback_locks(dynamodb, locks: List[Dict], user_id: str) -> None:
+    """Delete locks taken earlier in a failed multi-cluster acquisition."""
+    for lock in locks:
+        try:
+            dynamodb.delete_item(
+                TableName=LOCK_TABLE,
+                Key={"cluster_id": {"S": lock["cluster_id"]}},
+                ConditionExpression="lock_holder = :holder AND fencing_token = :token",
+                ExpressionAttributeValues={
+                    ":holder": {"S": user_id},
+                    ":token": {"N": str(lock["fencing_token"])},
+                },
+            )
+        except Exception as exc:
+            # The lease runs out on its own if the rollback delete fails
+            print(
+                f"[cluster_lock] Failed to roll back lock for {lock['cluster_id']}: {exc}",
+                file=sys.stderr,
+            )
+
+
+def acquire_locks(
+    cluster_ids: Union[str, Iterable[str]],
+    user_id: str,
+    region: str = "",
+    lease_seconds: int = LEASE_SECONDS,
+    all_or_nothing: bool = True,
+) -> Dict:
+    """Acquire lock leases on several clusters at once.
+
+    Up to ``MAX_TRANSACTION_ITEMS`` clusters are locked in a single
+    ``TransactWriteItems`` call with the same lease condition as
+    ``acquire_lock``, so the set is taken atomically.  Larger sets are split
+    into chunks in cluster-ID order; with *all_or_nothing* (the default) a
+    chunk that fails rolls back the chunks already taken, otherwise the
+    chunks that succeeded are kept and reported.
+
+    Clusters other users are queued for (``acquire_lock`` with
+    *wait_seconds*) are conflicts unless the caller heads the queue, so a
+    batch never jumps the line; with *all_or_nothing* they fail the whole
+    set before anything is locked.
+
+    Every lock gets its own fencing token, which execution tools check per
+    cluster as usual.
+
+    Args:
+        cluster_ids: Cluster identifiers, as a list or a comma-separated string.
+        user_id: Identity of the user requesting the locks.
+        region: AWS region where the DynamoDB lock table resides.
+        lease_seconds: Lease length for every lock.
+        all_or_nothing: Roll back earlier chunks when a later one fails.
+
+    Returns:
+        On success::
+
+            {"acquired": True, "cluster_ids": [...], "lock_holder": ..., "acquired_at": ...,
+             "locks": [{"cluster_id": ..., "fencing_token": ...}, ...],
+             "lease_expires_at": ..., "lease_seconds": ...}
+
+        On contention::
+
+            {"acquired": False, "cluster_ids": [...],
+             "conflicts": [{"cluster_id": ..., "lock_holder": ..., "acquired_at": ...,
+                            "lease_expires_at": ...}, ...],
+             "locks": [...]}  # locks kept when all_or_nothing is False
+
+        Conflicts caused by the wait queue add ``queue_length`` and
+        ``queue_position``.
+
+        On unexpected error::
+
+            {"error": ..., "cluster_ids": [...], "region": ...}
+    """
+    region = _resolve_region(region)
+    ids = _normalize_cluster_ids(cluster_ids)
+    if not ids:
+        return {"error": "No cluster_ids given", "cluster_ids": ids, "region": region}
+
+    now = time.time()
+    acquired_at = _iso(now)
+    lease_expires = now + lease_seconds
+    dynamodb = get_client("dynamodb", region)
+
+    locks: List[Dict] = []
+    conflicts: List[Dict] = []
+    try:
+        conflicts = _queue_conflicts(dynamodb, ids, user_id)
+        if conflicts and all_or_nothing:
+            return {"acquired": False, "cluster_ids": ids, "conflicts": conflicts, "locks": []}
+        queued = {conflict["cluster_id"] for conflict in conflicts}
+        free = [cluster_id for cluster_id in ids if cluster_id not in queued]
+        for start in range(0, len(free), MAX_TRANSACTION_ITEMS):
+            chunk = free[start:start + MAX_TRANSACTION_ITEMS]
+            outcome = _transact_lock_chunk(dynamodb, chunk, user_id, acquired_at, now, lease_expires)
+            if "conflicts" in outcome:
+                conflicts.extend(outcome["conflicts"])
+                if all_or_nothing:
+                    break
+            else:
+                locks.extend(outcome["locks"])
+    except Exception as exc:
+        _rollback_locks(dynamodb, locks, user_id)
+        return {"error": str(exc), "cluster_ids": ids, "region": region}
+
+    if conflicts:
+        if all_or_nothing:
+            _rollback_locks(dynamodb, locks, user_id)
+            locks = []
+        return {"acquired": False, "cluster_ids": ids, "conflicts": conflicts, "locks": locks}
+    return {
+        "acquired": True,
+        "cluster_ids": ids,
+        "lock_holder": user_id,
+        "acquired_at": acquired_at,
+        "locks": locks,
+        "lease_expires_at": _iso(lease_expires),
+        "lease_seconds": lease_seconds,
+    }
+
+
+def release_locks(
+    cluster_ids: Union[str, Iterable[str]],
+    user_id: str,
+    region: str = "",
+) -> Dict:
+    """Release several cluster locks held by *user_id*.
+
+    Each lock is released independently with ``release_lock``: one lock
+    that was already lost must not keep the others held.
+
+    Returns:
+        ``{"released": bool, "cluster_ids": [...], "results": [...]}`` where
+        ``released`` is True only if every lock was released and
+        ``results`` holds the per-cluster ``release_lock`` results.
+    """
+    ids = _normalize_cluster_ids(cluster_ids)
+    results = [release_lock(cluster_id, user_id, region) for cluster_id in ids]
+    return {
+        "released": bool(results) and all(r["released"] for r in results),
+        "cluster_ids": ids,
+        "results": results,
+    }
@@ -0,0 +1,196 @@
+"""
+Redshift Data API helpers shared by the tool functions.
+
+The Data API is asynchronous: ``execute_statement`` returns an ID that must
+be polled with ``describe_statement`` until the statement finishes.  The
+poller here starts with short intervals so fast queries return in tens of
+milliseconds, then backs off exponentially up to a cap so slow queries do
+not hammer the API.
+
+When the caller's time budget runs out before the statement finishes, the
+last ``describe_statement`` response is returned as-is so the tool can hand
+back a resumable statement handle instead of failing.
+
+Results are read lazily page by page (``get_statement_result`` pages are
+chained with ``NextToken``); the fetcher stops asking for pages once a row
+cap or byte budget is reached and reports whether the result was truncated.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import Dict, Iterator, List, Optional
+
+# Statuses after which describe_statement will never change again
+TERMINAL_STATUSES = frozenset({"FINISHED", "FAILED", "ABORTED"})
+
+DEFAULT_MAX_WAIT_SECONDS = float(os.getenv("DATA_API_MAX_WAIT_SECONDS", "30"))
+INITIAL_POLL_INTERVAL = 0.05  # seconds
+MAX_POLL_INTERVAL = 2.0  # seconds
+POLL_BACKOFF = 2.0
+
+# Bounds on rows returned to the agent by default (see fetch_statement_records)
+DEFAULT_MAX_ROWS = int(os.getenv("DATA_API_MAX_ROWS", "1000"))
+DEFAULT_MAX_RESULT_BYTES = int(os.getenv("DATA_API_MAX_RESULT_BYTES", "200000"))
+
+# Time kept back from the Lambda budget to serialize and return a response
+LAMBDA_RESERVE_SECONDS = 5.0
+
+
+def wait_for_statement(
+    client,
+    statement_id: str,
+    max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+    initial_interval: float = INITIAL_POLL_INTERVAL,
+    max_interval: float = MAX_POLL_INTERVAL,
+    backoff: float = POLL_BACKOFF,
+) -> Dict:
+    """Poll ``describe_statement`` until the statement is terminal or time runs out.
+
+    The first poll happens immediately; after that the interval grows by
+    *backoff* up to *max_interval* and never sleeps past the deadline.
+
+    Args:
+        client: ``redshift-data`` boto3 client.
+        statement_id: ID returned by ``execute_statement``.
+        max_wait_seconds: Deadline for the statement to reach a terminal status.
+        initial_interval: First sleep between polls, in seconds.
+        max_interval: Upper bound for the sleep between polls, in seconds.
+        backoff: Multiplier applied to the interval after every poll.
+
+    Returns:
+        The last ``describe_statement`` response.  Its ``Status`` is one of
+        ``TERMINAL_STATUSES`` unless the deadline was reached first.
+    """
+    deadline = time.monotonic() + max_wait_seconds
+    interval = initial_interval
+    while True:
+        desc = client.describe_statement(Id=statement_id)
+        if desc.get("Status") in TERMINAL_STATUSES:
+            return desc
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return desc
+        time.sleep(min(interval, remaining))
+        interval = min(interval * backoff, max_interval)
+
+
+def remaining_budget_seconds(
+    context: object,
+    requested: float = DEFAULT_MAX_WAIT_SECONDS,
+    reserve_seconds: float = LAMBDA_RESERVE_SECONDS,
+) -> float:
+    """Cap a wait of *requested* seconds to what the Lambda invocation can afford.
+
+    Args:
+        context: Lambda context object (``None`` outside Lambda).
+        requested: Wait the caller asked for, in seconds.
+        reserve_seconds: Time kept back to build and return the response.
+
+    Returns:
+        ``requested`` when there is no Lambda context, otherwise the smaller
+        of ``requested`` and the remaining invocation time minus the reserve
+        (never negative).
+    """
+    get_remaining = getattr(context, "get_remaining_time_in_millis", None)
+    if get_remaining is None:
+        return requested
+    available = get_remaining() / 1000.0 - reserve_seconds
+    return max(0.0, min(requested, available))
+
+
+def iter_result_pages(client, statement_id: str) -> Iterator[Dict]:
+    """Yield ``get_statement_result`` pages, following ``NextToken``.
+
+    Pages are requested lazily: closing the generator early means the
+    remaining pages are never fetched.
+    """
+    kwargs = {"Id": statement_id}
+    while True:
+        page = client.get_statement_result(**kwargs)
+        yield page
+        next_token = page.get("NextToken")
+        if not next_token:
+            return
+        kwargs["NextToken"] = next_token
+
+
+def iter_statement_records(client, statement_id: str) -> Iterator[List[Dict]]:
+    """Yield every result row of a finished statement across all pages."""
+    for page in iter_result_pages(client, statement_id):
+        yield from page.get("Records", [])
+
+
+def _record_size(record: List[Dict]) -> int:
+    """Approximate serialized size of one Data API row in bytes."""
+    return len(json.dumps(record, separators=(",", ":"), default=str))
+
+
+def fetch_statement_records(
+    client,
+    statement_id: str,
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> Dict:
+    """Read a finished statement's rows, stopping early at a row or byte cap.
+
+    Args:
+        client: ``redshift-data`` boto3 client.
+        statement_id: ID of a FINISHED statement with a result set.
+        max_rows: Stop after this many rows (``None`` for no limit).
+        max_bytes: Stop before the serialized rows exceed this many bytes
+            (``None`` for no limit).
+
+    Returns:
+        Dictionary with:
+        - ``records``: the rows read (Data API field lists)
+        - ``column_metadata``: ``ColumnMetadata`` from the first page
+        - ``total_rows``: row count reported by the Data API (``None`` if
+          unknown and the result was truncated)
+        - ``truncated``: ``True`` when rows were left unread
+    """
+    records: List[List[Dict]] = []
+    column_metadata: List[Dict] = []
+    total_rows: Optional[int] = None
+    size = 0
+    truncated = False
+
+    pages = iter_result_pages(client, statement_id)
+    try:
+        for page in pages:
+            if not column_metadata:
+                column_metadata = page.get("ColumnMetadata", [])
+            if total_rows is None:
+                total_rows = page.get("TotalNumRows")
+
+            for record in page.get("Records", []):
+                if max_rows is not None and len(records) >= max_rows:
+                    truncated = True
+                    break
+                if max_bytes is not None:
+                    record_size = _record_size(record)
+                    if size + record_size > max_bytes:
+                        truncated = True
+                        break
+                    size += record_size
+                records.append(record)
+
+            if truncated:
+                break
+            # Don't fetch another page only to find the row cap already hit
+            if max_rows is not None and len(records) >= max_rows and page.get("NextToken"):
+                truncated = True
+                break
+    finally:
+        pages.close()
+
+    if total_rows is None and not truncated:
+        total_rows = len(records)
+
+    return {
+        "records": records,
+        "column_metadata": column_metadata,
+        "total_rows": total_rows,
+        "truncated": truncated,
+    }
@@ -4,23 +4,71 @@ Redshift analysis and execution tools.
 Plain Python functions that perform AWS API calls for cluster analysis,
 serverless resource creation, data sharing, and query execution.
 Each function accepts ``region`` and ``user_id`` for cross-region support
-and identity propagation.
+and identity propagation.  AWS clients come from the shared pool in
+``tools.client_pool`` so warm invocations reuse connections.
 """
 from __future__ import annotations
 
 import os
+import re
 import time
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-
-import boto3
+from typing import Callable, Dict, List, Optional, Tuple
 
 try:
     from tools.audit_logger import emit_audit_event
+    from tools.client_pool import get_client
+    from tools.data_api import (
+        DEFAULT_MAX_RESULT_BYTES,
+        DEFAULT_MAX_ROWS,
+        DEFAULT_MAX_WAIT_SECONDS,
+        fetch_statement_records,
+        wait_for_statement,
+    )
+    from tools.result_cache import (
+        cache_key,
+        get_cached,
+        invalidate_cluster,
+        invalidate_namespace,
+        namespace_key,
+        put_cached,
+    )
+    from tools.result_decoder import RecordDecoder
 except ImportError:
     from .audit_logger import emit_audit_event
+    from .client_pool import get_client
+    from .data_api import (
+        DEFAULT_MAX_RESULT_BYTES,
+        DEFAULT_MAX_ROWS,
+        DEFAULT_MAX_WAIT_SECONDS,
+        fetch_statement_records,
+        wait_for_statement,
+    )
+    from .result_cache import (
+        cache_key,
+        get_cached,
+        invalidate_cluster,
+        invalidate_namespace,
+        namespace_key,
+        put_cached,
+    )
+    from .result_decoder import RecordDecoder
 
+try:
+    from models import AssessmentResult, ClusterSummary, WLMQueueMetrics
+except ImportError:
+    from ..models import AssessmentResult, ClusterSummary, WLMQueueMetrics
+
+# Upper bound on concurrent regions scanned by list_redshift_clusters(regions=...)
+INVENTORY_MAX_WORKERS = int(os.getenv("CLUSTER_INVENTORY_MAX_WORKERS", "8"))
+
+# Namespace ID resolution for setup_data_sharing: concurrent get_namespace
+# calls, or one list_namespaces pass above NAMESPACE_LIST_THRESHOLD names
+NAMESPACE_RESOLVE_MAX_WORKERS = int(os.getenv("NAMESPACE_RESOLVE_MAX_WORKERS", "8"))
+NAMESPACE_LIST_THRESHOLD = int(os.getenv("NAMESPACE_LIST_THRESHOLD", "10"))
 
 
 def _resolve_region(region: str) -> str:
@@ -47,7 +95,10 @@ def analyze_redshift_cluster(cluster_id: str, region: str = "", user_id: str = "
     """
     region = _resolve_region(region)
 
-    redshift = boto3.client('redshift', region_name=region)
+    redshift = get_client('redshift', region)
+
+    key = cache_key("analyze_redshift_cluster", cluster_id, region)
+    cached = get_cached(key)
     
     emit_audit_event(
         "tool_invocation",
@@ -55,8 +106,10 @@ def analyze_redshift_cluster(cluster_id: str, region: str = "", user_id: str = "
         initiated_by=user_id,
         cluster_id=cluster_id,
         region=region,
-        details={"tool": "analyze_redshift_cluster"},
+        details={"tool": "analyze_redshift_cluster", "cached": cached is not None},
     )
+    if cached is not None:
+        return cached
     
     try:
         response = redshift.describe_clusters(ClusterIdentifier=cluster_id)
@@ -102,6 +155,7 @@ def analyze_redshift_cluster(cluster_id: str, region: str = "", user_id: str = "
             "db_name": cluster.get('DBName'),
         }
         
+        put_cached("analyze_redshift_cluster", key, cluster_info)
         return cluster_info
         
     except Exception as e:
@@ -112,20 +166,84 @@ def analyze_redshift_cluster(cluster_id: str, region: str = "", user_id: str = "
         }
 
 
+# CloudWatch metrics and statistics retrieved by get_cluster_metrics
+CLUSTER_METRICS = [
+    'CPUUtilization',
+    'DatabaseConnections',
+    'NetworkReceiveThroughput',
+    'NetworkTransmitThroughput',
+    'PercentageDiskSpaceUsed',
+    'ReadLatency',
+    'WriteLatency',
+]
+METRIC_STATISTICS = ['Average', 'Maximum', 'Minimum', 'p50', 'p95', 'p99']
+
+
+def _metric_data_queries(cluster_id: str, period_seconds: int) -> Dict[str, tuple]:
+    """Build one GetMetricData query per (metric, statistic) pair.
+
+    Returns a mapping of query ``Id`` to ``(metric_name, statistic, query)``.
+    """
+    queries = {}
+    for m_idx, metric_name in enumerate(CLUSTER_METRICS):
+        for s_idx, stat in enumerate(METRIC_STATISTICS):
+            query_id = f"m{m_idx}s{s_idx}"
+            queries[query_id] = (metric_name, stat, {
+                'Id': query_id,
+                'MetricStat': {
+                    'Metric': {
+                        'Namespace': 'AWS/Redshift',
+                        'MetricName': metric_name,
+                        'Dimensions': [
+                            {
+                                'Name': 'ClusterIdentifier',
+                                'Value': cluster_id
+                            }
+                        ],
+                    },
+                    'Period': period_seconds,
+                    'Stat': stat,
+                },
+                'ReturnData': True,
+            })
+    return queries
+
+
+def _iter_metric_data_results(cloudwatch, **kwargs):
+    """Yield GetMetricData results across pages, following ``NextToken``."""
+    while True:
+        response = cloudwatch.get_metric_data(**kwargs)
+        yield from response.get('MetricDataResults', [])
+        next_token = response.get('NextToken')
+        if not next_token:
+            return
+        kwargs['NextToken'] = next_token
+
+
 def get_cluster_metrics(
     cluster_id: str,
     region: str = "",
     hours: int = 24,
     user_id: str = "",
+    period_seconds: int = 3600,
+    include_series: bool = True,
 ) -> Dict:
     """
     Get CloudWatch metrics for Redshift cluster performance analysis.
+
+    All metrics and statistics are fetched with a single batched
+    ``GetMetricData`` request (paginated when the series are long) instead
+    of one ``GetMetricStatistics`` call per metric.
     
     Args:
         cluster_id: Redshift cluster identifier
         region: AWS region where cluster is located
         hours: Number of hours of historical data to retrieve (default: 24)
         user_id: Identity of the person who initiated the request (for audit traceability)
+        period_seconds: Datapoint granularity in seconds, rounded down to a
+            multiple of 60 (default: 3600)
+        include_series: Return the raw per-period time series alongside the
+            summaries (default: True)
         
     Returns:
         Dictionary with performance metrics including:
@@ -134,10 +252,22 @@ def get_cluster_metrics(
         - Network throughput
         - Disk space usage
         - Query performance indicators
+
+        Each metric summary holds average, maximum and minimum over the
+        window plus p50/p95/p99 — the highest per-period percentile, i.e.
+        the worst period.  With ``include_series`` the ``series`` key maps
+        each metric to ascending ``timestamps`` and one value list per
+        statistic.
     """
     region = _resolve_region(region)
 
-    cloudwatch = boto3.client('cloudwatch', region_name=region)
+    cloudwatch = get_client('cloudwatch', region)
+
+    key = cache_key(
+        "get_cluster_metrics", cluster_id, region,
+        hours=hours, period_seconds=period_seconds, include_series=include_series,
+    )
+    cached = get_cached(key)
     
     emit_audit_event(
         "tool_invocation",
@@ -145,65 +275,83 @@ def get_cluster_metrics(
         initiated_by=user_id,
         cluster_id=cluster_id,
         region=region,
-        details={"tool": "get_cluster_metrics", "hours": hours},
+        details={
+            "tool": "get_cluster_metrics",
+            "hours": hours,
+            "period_seconds": period_seconds,
+            "cached": cached is not None,
+        },
     )
+    if cached is not None:
+        return cached
     
     end_time = datetime.utcnow()
     start_time = end_time - timedelta(hours=hours)
-    
-    metrics_to_fetch = [
-        'CPUUtilization',
-        'DatabaseConnections',
-        'NetworkReceiveThroughput',
-        'NetworkTransmitThroughput',
-        'PercentageDiskSpaceUsed',
-        'ReadLatency',
-        'WriteLatency',
-    ]
+    period_seconds = max(60, period_seconds - period_seconds % 60)
     
     metrics_data = {}
+    series = {}
     
     try:
-        for metric_name in metrics_to_fetch:
-            response = cloudwatch.get_metric_statistics(
-                Namespace='AWS/Redshift',
-                MetricName=metric_name,
-                Dimensions=[
-                    {
-                        'Name': 'ClusterIdentifier',
-                        'Value': cluster_id
-                    }
-                ],
-                StartTime=start_time,
-                EndTime=end_time,
-                Period=3600,  # 1 hour periods
-                Statistics=['Average', 'Maximum', 'Minimum']
-            )
-            
-            datapoints = response.get('Datapoints', [])
-            if datapoints:
+        queries = _metric_data_queries(cluster_id, period_seconds)
+
+        # Results for one query Id may be split across pages
+        values: Dict[str, Dict] = {}
+        for result in _iter_metric_data_results(
+            cloudwatch,
+            MetricDataQueries=[query for _, _, query in queries.values()],
+            StartTime=start_time,
+            EndTime=end_time,
+            ScanBy='TimestampAscending',
+        ):
+            points = values.setdefault(result['Id'], {})
+            points.update(zip(result.get('Timestamps', []), result.get('Values', [])))
+
+        for metric_name in CLUSTER_METRICS:
+            by_stat = {
+                stat: values.get(query_id, {})
+                for query_id, (name, stat, _) in queries.items()
+                if name == metric_name
+            }
+            averages = list(by_stat['Average'].values())
+            if averages:
                 # Calculate summary statistics
-                averages = [dp['Average'] for dp in datapoints]
-                metrics_data[metric_name] = {
-                    'average': sum(averages) / len(averages) if averages else 0,
-                    'maximum': max([dp['Maximum'] for dp in datapoints]),
-                    'minimum': min([dp['Minimum'] for dp in datapoints]),
-                    'datapoint_count': len(datapoints),
-                    'period_hours': hours,
+                summary = {
+                    'average': sum(averages) / len(averages),
+                    'maximum': max(by_stat['Maximum'].values(), default=0),
+                    'minimum': min(by_stat['Minimum'].values(), default=0),
                 }
+                for stat in ('p50', 'p95', 'p99'):
+                    summary[stat] = max(by_stat[stat].values(), default=None)
+                summary['datapoint_count'] = len(averages)
+                summary['period_hours'] = hours
+                summary['period_seconds'] = period_seconds
+                metrics_data[metric_name] = summary
             else:
                 metrics_data[metric_name] = {
                     'error': 'No data available',
                     'period_hours': hours,
                 }
+
+            if include_series:
+                timestamps = sorted(set().union(*(points.keys() for points in by_stat.values())))
+                metric_series = {"timestamps": [ts.isoformat() for ts in timestamps]}
+                for stat, points in by_stat.items():
+                    metric_series[stat.lower()] = [points.get(ts) for ts in timestamps]
+                series[metric_name] = metric_series
         
-        return {
+        result = {
             "cluster_id": cluster_id,
             "region": region,
             "time_range_hours": hours,
+            "period_seconds": period_seconds,
             "metrics": metrics_data,
             "timestamp": str(datetime.utcnow()),
         }
+        if include_series:
+            result["series"] = series
+        put_cached("get_cluster_metrics", key, result)
+        return result
         
     except Exception as e:
         return {
@@ -214,13 +362,61 @@ def get_cluster_metrics(
 
 
 
-def list_redshift_clusters(region: str = "", user_id: str = "") -> List[Dict] | Dict:
+def _describe_all_clusters(redshift) -> List[Dict]:
+    """Return every cluster visible to *redshift*, following ``Marker`` pages."""
+    clusters: List[Dict] = []
+    kwargs = {"MaxRecords": 100}
+    while True:
+        response = redshift.describe_clusters(**kwargs)
+        clusters.extend(response.get('Clusters', []))
+        marker = response.get('Marker')
+        if not marker:
+            return clusters
+        kwargs['Marker'] = marker
+
+
+def _cluster_summary(cluster: Dict) -> Dict:
+    return {
+        "cluster_identifier": cluster['ClusterIdentifier'],
+        "node_type": cluster['NodeType'],
+        "number_of_nodes": cluster['NumberOfNodes'],
+        "cluster_status": cluster['ClusterStatus'],
+        "cluster_create_time": str(cluster.get('ClusterCreateTime')),
+        "availability_zone": cluster.get('AvailabilityZone'),
+        "encrypted": cluster.get('Encrypted', False),
+        "publicly_accessible": cluster.get('PubliclyAccessible', False),
+    }
+
+
+def _enabled_regions(region: str) -> List[str]:
+    """Regions enabled for the account, discovered via EC2 from *region*."""
+    ec2 = get_client('ec2', region)
+    response = ec2.describe_regions()
+    return sorted(r['RegionName'] for r in response.get('Regions', []))
+
+
+def _scan_region(region: str) -> Dict:
+    """List clusters in one region, recording elapsed time and any error."""
+    started = time.perf_counter()
+    try:
+        clusters = _describe_all_clusters(get_client('redshift', region))
+        outcome = {"clusters": [dict(_cluster_summary(c), region=region) for c in clusters]}
+    except Exception as e:
+        outcome = {"clusters": [], "error": str(e)}
+    outcome["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return outcome
+
+
+def list_redshift_clusters(region: str = "", user_id: str = "", regions: str = "") -> List[Dict] | Dict:
     """
-    List all Redshift clusters in the specified region.
+    List all Redshift clusters in the specified region, or across several regions.
 
     Args:
         region: AWS region to list clusters from (defaults to AWS_REGION env var)
         user_id: Identity of the person who initiated the request (for audit traceability)
+        regions: Optional multi-region mode — ``"all"`` for every region enabled
+            in the account, or a comma-separated list of regions.  When set,
+            ``region`` is only used to discover the enabled regions.
 
     Returns:
         List of dictionaries with basic cluster information for each cluster:
@@ -228,79 +424,86 @@ def list_redshift_clusters(region: str = "", user_id: str = "") -> List[Dict] |
         - Node type and count
         - Status
         - Creation time
+
+        In multi-region mode, a dictionary with ``clusters`` (each tagged with
+        its ``region``), ``cluster_count`` and a per-region ``regions`` report
+        holding ``cluster_count``, ``elapsed_ms`` and ``error`` when that
+        region could not be listed.
     """
     region = _resolve_region(region)
 
-    redshift = boto3.client('redshift', region_name=region)
-
     emit_audit_event(
         "tool_invocation",
         "assessment",
         initiated_by=user_id,
         region=region,
-        details={"tool": "list_redshift_clusters"},
+        details={"tool": "list_redshift_clusters", "regions": regions or region},
     )
 
+    if regions:
+        return _list_clusters_multi_region(region, regions)
+
+    redshift = get_client('redshift', region)
+
     try:
-        response = redshift.describe_clusters()
-        clusters = response.get('Clusters', [])
-
-        cluster_list = []
-        for cluster in clusters:
-            cluster_list.append({
-                "cluster_identifier": cluster['ClusterIdentifier'],
-                "node_type": cluster['NodeType'],
-                "number_of_nodes": cluster['NumberOfNodes'],
-                "cluster_status": cluster['ClusterStatus'],
-                "cluster_create_time": str(cluster.get('ClusterCreateTime')),
-                "availability_zone": cluster.get('AvailabilityZone'),
-                "encrypted": cluster.get('Encrypted', False),
-                "publicly_accessible": cluster.get('PubliclyAccessible', False),
-            })
+        return [_cluster_summary(cluster) for cluster in _describe_all_clusters(redshift)]
 
-        return cluster_list
+    except Exception as e:
+        return {
+            "error": str(e),
+            "region": region
+        }
 
+
+def _list_clusters_multi_region(region: str, regions: str) -> Dict:
+    """Fan list_redshift_clusters out over *regions* in a bounded thread pool."""
+    try:
+        targets = _scan_targets(region, regions)
     except Exception as e:
         return {
             "error": str(e),
             "region": region
         }
 
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(INVENTORY_MAX_WORKERS, len(targets)))) as pool:
+        outcomes = dict(zip(targets, pool.map(_scan_region, targets)))
 
-def get_wlm_configuration(
-    cluster_id: str,
-    region: str = "",
-    user_id: str = "",
-) -> Dict:
-    """
-    Query WLM configuration and per-queue metrics via the Redshift Data API.
+    return _region_scan_report(outcomes, started)
 
-    Args:
-        cluster_id: Redshift cluster identifier
-        region: AWS region where cluster is located (defaults to AWS_REGION env var)
-        user_id: Identity of the person who initiated the request (for audit traceability)
 
-    Returns:
-        Dictionary with per-queue WLM metrics including:
-        - queue_name, service_class, concurrency
-        - queries_waiting, avg_wait_time_ms, avg_exec_time_ms
-        - wait_to_exec_ratio, queries_spilling_to_disk, disk_spill_mb
-        - saturation_pct
-    """
-    region = _resolve_region(region)
+def _scan_targets(region: str, regions: str) -> List[str]:
+    """Expand the ``regions`` argument (``"all"`` or a comma-separated list)."""
+    if regions.strip().lower() == "all":
+        return _enabled_regions(region)
+    return sorted({r.strip() for r in regions.split(",") if r.strip()})
 
-    redshift_data = boto3.client('redshift-data', region_name=region)
 
-    emit_audit_event(
-        "tool_invocation",
-        "assessment",
-        initiated_by=user_id,
-        cluster_id=cluster_id,
-        region=region,
-        details={"tool": "get_wlm_configuration"},
-    )
+def _region_scan_report(outcomes: Dict[str, Dict], started: float) -> Dict:
+    """Merge per-region ``_scan_region`` outcomes into the multi-region result."""
+    clusters: List[Dict] = []
+    report: Dict[str, Dict] = {}
+    for name, outcome in outcomes.items():
+        clusters.extend(outcome["clusters"])
+        report[name] = {
+            "cluster_count": len(outcome["clusters"]),
+            "elapsed_ms": outcome["elapsed_ms"],
+        }
+        if "error" in outcome:
+            report[name]["error"] = outcome["error"]
+
+    return {
+        "clusters": clusters,
+        "cluster_count": len(clusters),
+        "regions": report,
+        "failed_regions": sorted(n for n, r in report.items() if "error" in r),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "timestamp": str(datetime.utcnow()),
+    }
+
 
-    sql = """
+# Per-queue WLM configuration, live queue state, and historical wait/exec/spill
+WLM_QUERY = """
 SELECT
     trim(cfg.name) AS queue_name,
     cfg.service_class,
@@ -346,73 +549,506 @@ WHERE (cfg.service_class BETWEEN 6 AND 13 OR cfg.service_class BETWEEN 100 AND 1
 ORDER BY cfg.service_class
 """
 
+
+def get_wlm_configuration(
+    cluster_id: str,
+    region: str = "",
+    user_id: str = "",
+    max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+) -> Dict:
+    """
+    Query WLM configuration and per-queue metrics via the Redshift Data API.
+
+    Args:
+        cluster_id: Redshift cluster identifier
+        region: AWS region where cluster is located (defaults to AWS_REGION env var)
+        user_id: Identity of the person who initiated the request (for audit traceability)
+        max_wait_seconds: How long to wait for the query before returning a
+            resumable handle (see ``get_statement_result``)
+
+    Returns:
+        Dictionary with per-queue WLM metrics including:
+        - queue_name, service_class, concurrency
+        - queries_waiting, avg_wait_time_ms, avg_exec_time_ms
+        - wait_to_exec_ratio, queries_spilling_to_disk, disk_spill_mb
+        - saturation_pct
+
+        If the query is still running after ``max_wait_seconds``, a resumable
+        handle with ``statement_id`` and ``resumable: true`` is returned.
+    """
+    started, pending = _start_wlm_configuration(cluster_id, region, user_id)
+    if pending is None:
+        return started
+    return _run_pending(pending, max_wait_seconds, _finish_wlm_configuration)
+
+
+def _start_wlm_configuration(cluster_id: str, region: str, user_id: str) -> Tuple[Optional[Dict], Optional[Dict]]:
+    """Audit, cache lookup and WLM query submission for ``get_wlm_configuration``."""
+    region = _resolve_region(region)
+
+    redshift_data = get_client('redshift-data', region)
+
+    key = cache_key("get_wlm_configuration", cluster_id, region, user_id)
+    cached = get_cached(key)
+
+    emit_audit_event(
+        "tool_invocation",
+        "assessment",
+        initiated_by=user_id,
+        cluster_id=cluster_id,
+        region=region,
+        details={"tool": "get_wlm_configuration", "cached": cached is not None},
+    )
+    if cached is not None:
+        return cached, None
+
+    error_context = {"cluster_id": cluster_id, "region": region}
     try:
-        # Step 1: Execute the statement via Redshift Data API
         exec_resp = redshift_data.execute_statement(
             ClusterIdentifier=cluster_id,
             Database='dev',
             DbUser=user_id or None,
-            Sql=sql,
+            Sql=WLM_QUERY,
         )
-        statement_id = exec_resp['Id']
-
-        # Step 2: Poll until the statement finishes
-        max_wait_seconds = 30
-        elapsed = 0
-        while elapsed < max_wait_seconds:
-            desc = redshift_data.describe_statement(Id=statement_id)
-            status = desc['Status']
-            if status == 'FINISHED':
-                break
-            if status == 'FAILED':
-                return {
-                    "error": desc.get('Error', 'Query failed'),
-                    "cluster_id": cluster_id,
-                    "region": region,
-                }
-            time.sleep(1)
-            elapsed += 1
-
-        if elapsed >= max_wait_seconds:
-            return {
-                "error": "Query timed out waiting for completion",
-                "cluster_id": cluster_id,
-                "region": region,
-            }
+    except Exception as e:
+        return {"error": str(e), **error_context}, None
+    return None, _pending(redshift_data, exec_resp['Id'], "wlm_queues", cluster_id, region, error_context, key=key)
 
-        # Step 3: Fetch results
-        result_resp = redshift_data.get_statement_result(Id=statement_id)
-        records = result_resp.get('Records', [])
-
-        queues = []
-        for row in records:
-            queues.append({
-                "queue_name": row[0].get('stringValue', ''),
-                "service_class": int(row[1].get('longValue', row[1].get('stringValue', 0))),
-                "concurrency": int(row[2].get('longValue', row[2].get('stringValue', 0))),
-                "queries_waiting": int(row[3].get('longValue', row[3].get('stringValue', 0))),
-                "avg_wait_time_ms": float(row[4].get('longValue', row[4].get('doubleValue', row[4].get('stringValue', 0)))),
-                "avg_exec_time_ms": float(row[5].get('longValue', row[5].get('doubleValue', row[5].get('stringValue', 0)))),
-                "wait_to_exec_ratio": float(row[6].get('doubleValue', row[6].get('stringValue', 0.0))),
-                "queries_spilling_to_disk": int(row[7].get('longValue', row[7].get('stringValue', 0))),
-                "disk_spill_mb": float(row[8].get('doubleValue', row[8].get('stringValue', 0.0))),
-                "saturation_pct": float(row[9].get('doubleValue', row[9].get('stringValue', 0.0))),
-            })
 
+def _finish_wlm_configuration(pending: Dict, result: Dict) -> Dict:
+    put_cached("get_wlm_configuration", pending["key"], result)
+    return result
+
+
+# Result formats accepted by _collect_statement_result: raw Data API fields,
+# decoded rows, per-queue WLM metrics, or per-statement status of a batch
+RESULT_FORMATS = ("records", "tuples", "dicts", "wlm_queues", "statements")
+ROW_FORMATS = ("records", "tuples", "dicts")
+
+
+def _sub_statement_report(desc: Dict) -> List[Dict]:
+    """Per-statement status and duration from a batch ``describe_statement``."""
+    report = []
+    for sub in desc.get('SubStatements', []):
+        duration = sub.get('Duration')
+        entry = {
+            "sql": sub.get('QueryString', ''),
+            "statement_id": sub.get('Id', ''),
+            "status": sub.get('Status', ''),
+            # Duration is reported in nanoseconds (-1 until the statement ran)
+            "duration_ms": round(duration / 1e6, 3) if duration is not None and duration >= 0 else None,
+        }
+        if sub.get('Error'):
+            entry["error"] = sub['Error']
+        report.append(entry)
+    return report
+
+
+def _collect_statement_result(
+    redshift_data,
+    statement_id: str,
+    result_format: str,
+    cluster_id: str,
+    region: str,
+    max_wait_seconds: float,
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> Dict:
+    """Wait for a Data API statement and shape its result for the agent.
+
+    If the statement is still running when *max_wait_seconds* elapses, a
+    resumable handle is returned instead of an error so the agent can pick
+    the query back up with ``/getStatementResult``.
+
+    Args:
+        redshift_data: ``redshift-data`` boto3 client.
+        statement_id: ID returned by ``execute_statement``.
+        result_format: ``"records"`` for raw Data API rows, ``"tuples"`` or
+            ``"dicts"`` for rows decoded via ``ColumnMetadata`` (numeric
+            values as exact strings), ``"wlm_queues"`` for per-queue WLM
+            metrics, or ``"statements"`` for the per-statement status of a
+            ``batch_execute_statement``.
+        cluster_id: Redshift cluster identifier (echoed in the response).
+        region: AWS region (echoed in the response).
+        max_wait_seconds: How long to poll before returning a handle.
+        max_rows: Row cap for row results (``None`` for no limit).
+        max_bytes: Byte budget for row results (``None`` for no limit).
+
+    Returns:
+        The formatted result, a resumable handle, or an error dict.
+    """
+    desc = wait_for_statement(redshift_data, statement_id, max_wait_seconds)
+    return _shape_statement_result(
+        redshift_data, statement_id, desc, result_format, cluster_id, region, max_rows, max_bytes,
+    )
+
+
+def _shape_statement_result(
+    redshift_data,
+    statement_id: str,
+    desc: Dict,
+    result_format: str,
+    cluster_id: str,
+    region: str,
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> Dict:
+    """Shape the last ``describe_statement`` response *desc* for the agent.
+
+    Split from ``_collect_statement_result`` so the asyncio tools can await
+    the statement without holding a thread and reuse the same shaping.
+    """
+    status = desc.get('Status', '')
+
+    if status in ('FAILED', 'ABORTED'):
+        failure = {
+            "error": desc.get('Error', f"Query {status.lower()}"),
+            "cluster_id": cluster_id,
+            "region": region,
+        }
+        if desc.get('SubStatements'):
+            failure["statements"] = _sub_statement_report(desc)
+        return failure
+
+    if status != 'FINISHED':
         return {
+            "statement_id": statement_id,
+            "statement_status": status,
+            "resumable": True,
+            "resume_action": "/getStatementResult",
+            "result_format": result_format,
             "cluster_id": cluster_id,
             "region": region,
-            "wlm_queues": queues,
-            "timestamp": str(datetime.utcnow()),
+            "message": (
+                "Query is still running. Call getStatementResult with this "
+                "statement_id and result_format to collect the results."
+            ),
         }
 
-    except Exception as e:
+    if result_format == "statements":
         return {
-            "error": str(e),
             "cluster_id": cluster_id,
             "region": region,
+            "statement_id": statement_id,
+            "statement_status": status,
+            "statements": _sub_statement_report(desc),
         }
 
+    has_result_set = desc.get('HasResultSet', True)
+
+    if result_format == "wlm_queues":
+        fetched = {"records": [], "column_metadata": []}
+        if has_result_set:
+            fetched = fetch_statement_records(redshift_data, statement_id)
+        decoder = RecordDecoder(fetched["column_metadata"])
+        return {
+            "cluster_id": cluster_id,
+            "region": region,
+            "wlm_queues": [asdict(q) for q in decoder.models(fetched["records"], WLMQueueMetrics)],
+            "timestamp": str(datetime.utcnow()),
+        }
+
+    fetched = {"records": [], "column_metadata": [], "total_rows": 0, "truncated": False}
+    if has_result_set:
+        fetched = fetch_statement_records(redshift_data, statement_id, max_rows, max_bytes)
+
+    result = {
+        "cluster_id": cluster_id,
+        "region": region,
+        "statement_id": statement_id,
+        "records": fetched["records"],
+        "returned_rows": len(fetched["records"]),
+        "total_rows": fetched["total_rows"],
+        "truncated": fetched["truncated"],
+    }
+    if result_format in ("tuples", "dicts"):
+        decoder = RecordDecoder(fetched["column_metadata"], decimal_factory=str)
+        result["columns"] = decoder.columns
+        if result_format == "tuples":
+            result["records"] = [list(row) for row in decoder.tuples(fetched["records"])]
+        else:
+            result["records"] = decoder.dicts(fetched["records"])
+    return result
+
+
+# Each Data API tool is split into a blocking ``_start_*`` step (audit,
+# cache lookup, argument checks, submission), the statement wait and a
+# blocking ``_finish_*`` step (caching, invalidation).  A start step returns
+# ``(result, None)`` when the tool is already done, else ``(None, pending)``.
+# ``async_redshift_tools`` runs the same steps on its thread pool and only
+# replaces the wait.
+
+
+def _pending(
+    client,
+    statement_id: str,
+    result_format: str,
+    cluster_id: str,
+    region: str,
+    error_context: Dict,
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    **extra,
+) -> Dict:
+    """A submitted statement awaiting its wait and finish steps."""
+    return {
+        "client": client,
+        "statement_id": statement_id,
+        "result_format": result_format,
+        "cluster_id": cluster_id,
+        "region": region,
+        "error_context": error_context,
+        "max_rows": max_rows,
+        "max_bytes": max_bytes,
+        **extra,
+    }
+
+
+def _run_pending(pending: Dict, max_wait_seconds: float, finish: Callable[[Dict, Dict], Dict]) -> Dict:
+    """Wait for a started statement and finish its tool."""
+    try:
+        result = _collect_statement_result(
+            pending["client"],
+            pending["statement_id"],
+            pending["result_format"],
+            pending["cluster_id"],
+            pending["region"],
+            max_wait_seconds,
+            pending["max_rows"],
+            pending["max_bytes"],
+        )
+        return finish(pending, result)
+    except Exception as e:
+        return {"error": str(e), **pending["error_context"]}
+
+
+def get_statement_result(
+    statement_id: str,
+    cluster_id: str = "",
+    region: str = "",
+    result_format: str = "records",
+    user_id: str = "",
+    max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+    max_rows: int = DEFAULT_MAX_ROWS,
+    max_bytes: int = DEFAULT_MAX_RESULT_BYTES,
+) -> Dict:
+    """
+    Resume a Data API statement returned as a resumable handle.
+
+    ``get_wlm_configuration`` and ``execute_redshift_query`` return a handle
+    with ``resumable: true`` when the query outlives the invocation budget.
+    This tool waits again and returns the same shape the original tool would
+    have returned.
+
+    Args:
+        statement_id: Statement ID from the resumable handle
+        cluster_id: Redshift cluster identifier (echoed in the response)
+        region: AWS region where the statement was submitted (defaults to AWS_REGION env var)
+        result_format: ``records``, ``tuples`` or ``dicts`` (executeRedshiftQuery),
+            ``wlm_queues`` (getWlmConfiguration) or ``statements`` (setupDataSharing)
+        user_id: Identity of the person who initiated the request (for audit traceability)
+        max_wait_seconds: How long to wait before handing back a new handle
+        max_rows: Maximum rows returned for ``records`` results
+        max_bytes: Maximum serialized size of returned ``records`` rows
+
+    Returns:
+        Query results, another resumable handle, or an error dict.
+    """
+    started, pending = _start_statement_result(
+        statement_id, cluster_id, region, result_format, user_id, max_rows, max_bytes,
+    )
+    if pending is None:
+        return started
+    return _run_pending(pending, max_wait_seconds, _finish_statement_result)
+
+
+def _start_statement_result(
+    statement_id: str,
+    cluster_id: str,
+    region: str,
+    result_format: str,
+    user_id: str,
+    max_rows: int,
+    max_bytes: int,
+) -> Tuple[Optional[Dict], Optional[Dict]]:
+    """Audit and argument checks for ``get_statement_result``."""
+    region = _resolve_region(region)
+
+    redshift_data = get_client('redshift-data', region)
+
+    emit_audit_event(
+        "tool_invocation",
+        "assessment" if result_format == "wlm_queues" else "execution",
+        initiated_by=user_id,
+        cluster_id=cluster_id,
+        region=region,
+        details={"tool": "get_statement_result", "statement_id": statement_id},
+    )
+
+    if result_format not in RESULT_FORMATS:
+        return {
+            "error": f"Unknown result_format: {result_format}",
+            "statement_id": statement_id,
+            "region": region,
+        }, None
+
+    error_context = {"statement_id": statement_id, "cluster_id": cluster_id, "region": region}
+    return None, _pending(
+        redshift_data, statement_id, result_format, cluster_id, region, error_context,
+        max_rows=max_rows, max_bytes=max_bytes, user_id=user_id,
+    )
+
+
+def _finish_statement_result(pending: Dict, result: Dict) -> Dict:
+    cluster_id, region = pending["cluster_id"], pending["region"]
+    if cluster_id and not result.get("resumable"):
+        if pending["result_format"] == "wlm_queues":
+            key = cache_key("get_wlm_configuration", cluster_id, region, pending["user_id"])
+            put_cached("get_wlm_configuration", key, result)
+        else:
+            # The resumed query may have changed the cluster while it ran
+            invalidate_cluster(cluster_id, region)
+    return result
+
+
+def _cluster_summary_from_analysis(analysis: Dict) -> Dict:
+    """Project analyze_redshift_cluster output onto ``ClusterSummary``."""
+    return asdict(ClusterSummary(
+        cluster_id=analysis.get("cluster_identifier", ""),
+        node_type=analysis.get("node_type", ""),
+        number_of_nodes=analysis.get("number_of_nodes", 0),
+        status=analysis.get("cluster_status", ""),
+        region=analysis.get("region", ""),
+        encrypted=analysis.get("encrypted", False),
+        vpc_id=analysis.get("vpc_id") or "",
+        publicly_accessible=analysis.get("publicly_accessible", False),
+        enhanced_vpc_routing=analysis.get("enhanced_vpc_routing", False),
+        cluster_version=analysis.get("cluster_version") or "",
+    ))
+
+
+def _timed(fn, **kwargs) -> tuple:
+    """Call *fn* and return ``(result, elapsed_ms)``; exceptions become error dicts."""
+    started = time.perf_counter()
+    try:
+        result = fn(**kwargs)
+    except Exception as e:
+        result = {"error": str(e)}
+    return result, round((time.perf_counter() - started) * 1000, 1)
+
+
+def assess_cluster(
+    cluster_id: str,
+    region: str = "",
+    user_id: str = "",
+    hours: int = 24,
+    max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+) -> Dict:
+    """
+    Run the full cluster assessment in one call.
+
+    ``analyze_redshift_cluster``, ``get_cluster_metrics`` and
+    ``get_wlm_configuration`` run concurrently, so the agent needs one tool
+    round trip instead of three.  A failing section does not fail the
+    bundle: its error is reported under ``errors`` and the other sections
+    are still returned.
+
+    Args:
+        cluster_id: Redshift cluster identifier
+        region: AWS region where cluster is located (defaults to AWS_REGION env var)
+        user_id: Identity of the person who initiated the request (for audit traceability)
+        hours: Hours of CloudWatch history to summarize (default: 24)
+        max_wait_seconds: How long to wait for the WLM query before returning
+            a resumable handle for it (see ``get_statement_result``)
+
+    Returns:
+        Dictionary shaped like ``models.AssessmentResult`` (``cluster_summary``,
+        ``wlm_queue_analysis``, ``contention_narrative`` left empty for the
+        agent, ``cloudwatch_metrics``) plus:
+        - ``cluster_details``: full ``analyze_redshift_cluster`` output
+        - ``errors``: section name -> error message for failed sections
+        - ``wlm_statement``: resumable handle if the WLM query is still running
+        - ``timings_ms``: per-section and total elapsed time
+    """
+    region = _resolve_region(region)
+
+    emit_audit_event(
+        "tool_invocation",
+        "assessment",
+        initiated_by=user_id,
+        cluster_id=cluster_id,
+        region=region,
+        details={"tool": "assess_cluster", "hours": hours},
+    )
+
+    sections = _assessment_sections(cluster_id, region, user_id, hours, max_wait_seconds)
+    tools = {
+        "cluster_summary": analyze_redshift_cluster,
+        "cloudwatch_metrics": get_cluster_metrics,
+        "wlm_queue_analysis": get_wlm_configuration,
+    }
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(sections)) as pool:
+        futures = {name: pool.submit(_timed, tools[name], **kwargs) for name, kwargs in sections.items()}
+        outcomes = {name: future.result() for name, future in futures.items()}
+
+    return _bundle_assessment(cluster_id, region, outcomes, started)
+
+
+def _assessment_sections(
+    cluster_id: str, region: str, user_id: str, hours: int, max_wait_seconds: float,
+) -> Dict[str, Dict]:
+    """Tool arguments for each ``assess_cluster`` section."""
+    common = {"cluster_id": cluster_id, "region": region, "user_id": user_id}
+    return {
+        "cluster_summary": common,
+        "cloudwatch_metrics": dict(common, hours=hours, include_series=False),
+        "wlm_queue_analysis": dict(common, max_wait_seconds=max_wait_seconds),
+    }
+
+
+def _bundle_assessment(cluster_id: str, region: str, outcomes: Dict[str, tuple], started: float) -> Dict:
+    """Assemble ``assess_cluster`` output from ``(result, elapsed_ms)`` per section."""
+    errors: Dict[str, str] = {}
+    for name, (result, _) in outcomes.items():
+        if isinstance(result, dict) and "error" in result:
+            errors[name] = result["error"]
+
+    analysis = outcomes["cluster_summary"][0]
+    metrics = outcomes["cloudwatch_metrics"][0]
+    wlm = outcomes["wlm_queue_analysis"][0]
+
+    assessment = asdict(AssessmentResult(
+        cluster_summary=None,
+        wlm_queue_analysis=[],
+        contention_narrative="",
+        cloudwatch_metrics={},
+    ))
+    if "cluster_summary" not in errors:
+        assessment["cluster_summary"] = _cluster_summary_from_analysis(analysis)
+        assessment["cluster_details"] = analysis
+    if "cloudwatch_metrics" not in errors:
+        assessment["cloudwatch_metrics"] = metrics.get("metrics", {})
+    if "wlm_queue_analysis" not in errors:
+        if wlm.get("resumable"):
+            assessment["wlm_statement"] = wlm
+        else:
+            assessment["wlm_queue_analysis"] = wlm.get("wlm_queues", [])
+
+    timings = {name: elapsed for name, (_, elapsed) in outcomes.items()}
+    timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+
+    assessment.update({
+        "cluster_id": cluster_id,
+        "region": region,
+        "errors": errors,
+        "timings_ms": timings,
+        "timestamp": str(datetime.utcnow()),
+    })
+    return assessment
+
+
 def create_cluster_snapshot(
     cluster_id: str,
     snapshot_identifier: str = "",
@@ -433,7 +1069,7 @@ def create_cluster_snapshot(
     """
     region = _resolve_region(region)
 
-    redshift = boto3.client('redshift', region_name=region)
+    redshift = get_client('redshift', region)
 
     emit_audit_event(
         "tool_invocation",
@@ -497,7 +1133,7 @@ def create_serverless_namespace(
     """
     region = _resolve_region(region)
 
-    client = boto3.client('redshift-serverless', region_name=region)
+    client = get_client('redshift-serverless', region)
 
     emit_audit_event(
         "tool_invocation",
@@ -514,6 +1150,8 @@ def create_serverless_namespace(
             dbName=db_name,
             manageAdminPassword=True,
         )
+        # A recreated namespace gets a new ID
+        invalidate_namespace(namespace_name, region)
         namespace = response.get("namespace", {})
         return {
             "namespace_name": namespace.get("namespaceName"),
@@ -556,7 +1194,7 @@ def create_serverless_workgroup(
     """
     region = _resolve_region(region)
 
-    client = boto3.client('redshift-serverless', region_name=region)
+    client = get_client('redshift-serverless', region)
 
     emit_audit_event(
         "tool_invocation",
@@ -597,6 +1235,10 @@ def execute_redshift_query(
     query: str,
     region: str = "",
     user_id: str = "",
+    max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+    max_rows: int = DEFAULT_MAX_ROWS,
+    max_bytes: int = DEFAULT_MAX_RESULT_BYTES,
+    result_format: str = "records",
 ) -> Dict:
     """
     Execute a SQL query against a Redshift cluster via the Redshift Data API.
@@ -610,14 +1252,51 @@ def execute_redshift_query(
         query: SQL query to execute
         region: AWS region where cluster is located (defaults to AWS_REGION env var)
         user_id: Identity of the person who initiated the request (for audit traceability)
+        max_wait_seconds: How long to wait for the query before returning a
+            resumable handle (see ``get_statement_result``)
+        max_rows: Maximum rows returned; further pages are not fetched
+        max_bytes: Maximum serialized size of the returned rows
+        result_format: ``"records"`` for raw Data API fields, or ``"tuples"`` /
+            ``"dicts"`` for typed rows decoded from the column metadata
+            (adds a ``columns`` key; numeric values are exact strings)
 
     Returns:
-        Dictionary with ``records`` key containing the query results, or
-        ``error`` key on failure.
+        Dictionary with ``records`` key containing the query results
+        (with ``total_rows`` and a ``truncated`` flag when a cap was hit),
+        a resumable handle if the query is still running, or ``error`` key
+        on failure.
     """
+    started, pending = _start_redshift_query(cluster_id, query, region, user_id, max_rows, max_bytes, result_format)
+    if pending is None:
+        return started
+    return _run_pending(pending, max_wait_seconds, _finish_redshift_query)
+
+
+_SQL_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+# Statements that cannot change the cluster; SELECT ... INTO creates a table
+_READ_ONLY_SQL = re.compile(r"^(select|with|show|explain|describe)\b", re.IGNORECASE)
+_SELECT_INTO = re.compile(r"\binto\b", re.IGNORECASE)
+
+
+def _is_read_only_sql(query: str) -> bool:
+    """True if *query* is one read-only statement; anything else counts as mutating."""
+    sql = _SQL_COMMENTS.sub(" ", query).strip().rstrip(";").strip()
+    return ";" not in sql and bool(_READ_ONLY_SQL.match(sql)) and not _SELECT_INTO.search(sql)
+
+
+def _start_redshift_query(
+    cluster_id: str,
+    query: str,
+    region: str,
+    user_id: str,
+    max_rows: int,
+    max_bytes: int,
+    result_format: str,
+) -> Tuple[Optional[Dict], Optional[Dict]]:
+    """Audit, argument checks and submission for ``execute_redshift_query``."""
     region = _resolve_region(region)
 
-    redshift_data = boto3.client('redshift-data', region_name=region)
+    redshift_data = get_client('redshift-data', region)
 
     emit_audit_event(
         "tool_invocation",
@@ -628,56 +1307,131 @@ def execute_redshift_query(
         details={"tool": "execute_redshift_query", "query": query},
     )
 
+    error_context = {"cluster_id": cluster_id, "region": region}
+    if result_format not in ROW_FORMATS:
+        return {"error": f"Unknown result_format: {result_format}", **error_context}, None
+
     try:
-        # Step 1: Execute the statement via Redshift Data API
         exec_resp = redshift_data.execute_statement(
             ClusterIdentifier=cluster_id,
             Database='dev',
             DbUser=user_id or None,
             Sql=query,
         )
-        statement_id = exec_resp['Id']
-
-        # Step 2: Poll until the statement finishes
-        max_wait_seconds = 30
-        elapsed = 0
-        while elapsed < max_wait_seconds:
-            desc = redshift_data.describe_statement(Id=statement_id)
-            status = desc['Status']
-            if status == 'FINISHED':
-                break
-            if status == 'FAILED':
-                return {
-                    "error": desc.get('Error', 'Query failed'),
-                    "cluster_id": cluster_id,
-                    "region": region,
-                }
-            time.sleep(1)
-            elapsed += 1
-
-        if elapsed >= max_wait_seconds:
-            return {
-                "error": "Query timed out waiting for completion",
-                "cluster_id": cluster_id,
-                "region": region,
-            }
+        # Mutating SQL may change WLM or table layout — drop cached assessments
+        if not _is_read_only_sql(query):
+            invalidate_cluster(cluster_id, region)
+    except Exception as e:
+        return {"error": str(e), **error_context}, None
+    return None, _pending(
+        redshift_data, exec_resp['Id'], result_format, cluster_id, region, error_context,
+        max_rows=max_rows, max_bytes=max_bytes,
+    )
 
-        # Step 3: Fetch results
-        result_resp = redshift_data.get_statement_result(Id=statement_id)
-        records = result_resp.get('Records', [])
 
-        return {
-            "cluster_id": cluster_id,
-            "region": region,
-            "records": records,
-        }
+def _finish_redshift_query(pending: Dict, result: Dict) -> Dict:
+    return result
+
+
+def _list_namespace_ids(serverless_client) -> Dict[str, str]:
+    """Map every namespace name in the region to its ID, following ``nextToken``."""
+    ids: Dict[str, str] = {}
+    kwargs: Dict = {}
+    while True:
+        response = serverless_client.list_namespaces(**kwargs)
+        for ns in response.get("namespaces", []):
+            ids[ns.get("namespaceName", "")] = ns.get("namespaceId", "")
+        next_token = response.get("nextToken")
+        if not next_token:
+            return ids
+        kwargs["nextToken"] = next_token
+
+
+def _get_namespace_id(serverless_client, name: str) -> str:
+    response = serverless_client.get_namespace(namespaceName=name)
+    return response.get("namespace", {}).get("namespaceId", "")
+
+
+def _resolve_namespace_ids(serverless_client, names: List[str], region: str) -> Dict[str, str]:
+    """Resolve Serverless namespace names to IDs.
+
+    Cached IDs are reused.  The rest are looked up with concurrent
+    ``get_namespace`` calls (bounded by ``NAMESPACE_RESOLVE_MAX_WORKERS``),
+    or — above ``NAMESPACE_LIST_THRESHOLD`` names — with a single paginated
+    ``list_namespaces`` pass.
+
+    Raises:
+        Exception: The lookup failed, or a namespace does not exist.
+    """
+    ids: Dict[str, str] = {}
+    missing: List[str] = []
+    for name in dict.fromkeys(names):
+        cached = get_cached(namespace_key(name, region))
+        if cached is not None:
+            ids[name] = cached["namespace_id"]
+        else:
+            missing.append(name)
+
+    if len(missing) > NAMESPACE_LIST_THRESHOLD:
+        listed = _list_namespace_ids(serverless_client)
+        not_found = [name for name in missing if name not in listed]
+        if not_found:
+            raise ValueError(f"Namespace(s) not found: {', '.join(not_found)}")
+        resolved = {name: listed[name] for name in missing}
+    elif missing:
+        workers = max(1, min(NAMESPACE_RESOLVE_MAX_WORKERS, len(missing)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            resolved = dict(zip(missing, pool.map(lambda n: _get_namespace_id(serverless_client, n), missing)))
+    else:
+        resolved = {}
+
+    for name, namespace_id in resolved.items():
+        if namespace_id:
+            put_cached("namespace_id", namespace_key(name, region), {"namespace_id": namespace_id})
+    ids.update(resolved)
+    return ids
+
+
+def _datashare_statements(datashare_name: str, consumer_ns_ids: List[Dict]) -> List[str]:
+    """SQL that creates the datashare and grants it to each consumer namespace."""
+    sql_statements = [
+        f"CREATE DATASHARE {datashare_name}",
+        f"ALTER DATASHARE {datashare_name} ADD SCHEMA public",
+        f"ALTER DATASHARE {datashare_name} ADD ALL TABLES IN SCHEMA public",
+    ]
+    for consumer in consumer_ns_ids:
+        sql_statements.append(
+            f"GRANT USAGE ON DATASHARE {datashare_name} TO NAMESPACE '{consumer['namespace_id']}'"
+        )
+    return sql_statements
+
+
+def _data_sharing_result(
+    datashare_name: str,
+    producer_namespace: str,
+    producer_ns_id: str,
+    consumer_ns_ids: List[Dict],
+    region: str,
+    batch: Dict,
+) -> Dict:
+    result = {
+        "datashare_name": datashare_name,
+        "producer_namespace": producer_namespace,
+        "producer_namespace_id": producer_ns_id,
+        "consumer_namespaces": consumer_ns_ids,
+        "region": region,
+    }
+    # The batch is one transaction: a failed one executed nothing, and a
+    # running one has not finished yet
+    if "error" not in batch and not batch.get("resumable"):
+        result["statements_executed"] = sum(
+            1 for statement in batch.get("statements", []) if statement["status"] == "FINISHED"
+        )
+    # statement_id, statement_status and statements, plus error or the
+    # resumable handle fields when the batch did not finish cleanly
+    result.update({k: v for k, v in batch.items() if k not in ("cluster_id", "region")})
+    return result
 
-    except Exception as e:
-        return {
-            "error": str(e),
-            "cluster_id": cluster_id,
-            "region": region,
-        }
 
 def setup_data_sharing(
     producer_namespace: str,
@@ -685,12 +1439,15 @@ def setup_data_sharing(
     datashare_name: str = "default_share",
     region: str = "",
     user_id: str = "",
+    max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
 ) -> Dict:
     """
     Set up data sharing between a producer namespace and one or more consumer namespaces.
 
     Creates a datashare on the producer, adds the public schema and all its tables,
-    then grants usage to each consumer namespace.
+    then grants usage to each consumer namespace.  All statements are submitted
+    in one ``batch_execute_statement`` call, so they run in order in a single
+    transaction, and the batch is awaited with the shared poller.
 
     Args:
         producer_namespace: Name of the producer Serverless namespace
@@ -698,10 +1455,29 @@ def setup_data_sharing(
         datashare_name: Name for the datashare (default: default_share)
         region: AWS region (defaults to AWS_REGION env var)
         user_id: Identity of the person who initiated the request (for audit traceability)
+        max_wait_seconds: How long to wait for the batch before returning a
+            resumable handle (see ``get_statement_result`` with
+            ``result_format="statements"``)
 
     Returns:
-        Dictionary with datashare details on success, or an error dict on failure.
+        Dictionary with datashare details and ``statements`` (per-statement
+        ``status`` and ``duration_ms``) on success, the same plus ``error`` if
+        the transaction failed, or a resumable handle if it is still running.
     """
+    started, pending = _start_data_sharing(producer_namespace, consumer_namespaces, datashare_name, region, user_id)
+    if pending is None:
+        return started
+    return _run_pending(pending, max_wait_seconds, _finish_data_sharing)
+
+
+def _start_data_sharing(
+    producer_namespace: str,
+    consumer_namespaces: str,
+    datashare_name: str,
+    region: str,
+    user_id: str,
+) -> Tuple[Optional[Dict], Optional[Dict]]:
+    """Audit, namespace resolution and batch submission for ``setup_data_sharing``."""
     region = _resolve_region(region)
 
     emit_audit_event(
@@ -712,63 +1488,45 @@ def setup_data_sharing(
         details={"tool": "setup_data_sharing"},
     )
 
+    error_context = {"producer_namespace": producer_namespace, "region": region}
     try:
-        serverless_client = boto3.client('redshift-serverless', region_name=region)
-        redshift_data_client = boto3.client('redshift-data', region_name=region)
-
-        # Resolve producer namespace ID
-        producer_resp = serverless_client.get_namespace(namespaceName=producer_namespace)
-        producer_ns = producer_resp.get("namespace", {})
-        producer_ns_id = producer_ns.get("namespaceId", "")
+        serverless_client = get_client('redshift-serverless', region)
+        redshift_data_client = get_client('redshift-data', region)
 
-        # Resolve consumer namespace IDs
+        # Resolve producer and consumer namespace IDs in one pass
         consumer_names = [n.strip() for n in consumer_namespaces.split(",") if n.strip()]
-        consumer_ns_ids = []
-        for name in consumer_names:
-            resp = serverless_client.get_namespace(namespaceName=name)
-            ns = resp.get("namespace", {})
-            consumer_ns_ids.append({
-                "name": name,
-                "namespace_id": ns.get("namespaceId", ""),
-            })
+        namespace_ids = _resolve_namespace_ids(
+            serverless_client, [producer_namespace] + consumer_names, region,
+        )
+        producer_ns_id = namespace_ids[producer_namespace]
+        consumer_ns_ids = [
+            {"name": name, "namespace_id": namespace_ids[name]} for name in consumer_names
+        ]
 
         # Execute SQL statements to create datashare and grant access
-        sql_statements = [
-            f"CREATE DATASHARE {datashare_name}",
-            f"ALTER DATASHARE {datashare_name} ADD SCHEMA public",
-            f"ALTER DATASHARE {datashare_name} ADD ALL TABLES IN SCHEMA public",
-        ]
-        for consumer in consumer_ns_ids:
-            sql_statements.append(
-                f"GRANT USAGE ON DATASHARE {datashare_name} TO NAMESPACE '{consumer['namespace_id']}'"
-            )
-
-        executed_statements = []
-        for sql in sql_statements:
-            exec_resp = redshift_data_client.execute_statement(
-                WorkgroupName=producer_namespace,
-                Database='dev',
-                Sql=sql,
-            )
-            executed_statements.append({
-                "sql": sql,
-                "statement_id": exec_resp.get("Id", ""),
-            })
+        sql_statements = _datashare_statements(datashare_name, consumer_ns_ids)
 
-        return {
-            "datashare_name": datashare_name,
-            "producer_namespace": producer_namespace,
-            "producer_namespace_id": producer_ns_id,
-            "consumer_namespaces": consumer_ns_ids,
-            "statements_executed": len(executed_statements),
-            "region": region,
-        }
+        batch_resp = redshift_data_client.batch_execute_statement(
+            WorkgroupName=producer_namespace,
+            Database='dev',
+            Sqls=sql_statements,
+        )
     except Exception as e:
-        return {
-            "error": str(e),
-            "producer_namespace": producer_namespace,
-            "region": region,
-        }
+        return {"error": str(e), **error_context}, None
+    return None, _pending(
+        redshift_data_client, batch_resp['Id'], "statements", "", region, error_context,
+        datashare_name=datashare_name,
+        producer_namespace=producer_namespace,
+        producer_ns_id=producer_ns_id,
+        consumer_ns_ids=consumer_ns_ids,
+    )
+
+
+def _finish_data_sharing(pending: Dict, batch: Dict) -> Dict:
+    return _data_sharing_result(
+        pending["datashare_name"], pending["producer_namespace"], pending["producer_ns_id"],
+        pending["consumer_ns_ids"], pending["region"], batch,
+    )
 
 
 def restore_snapshot_to_serverless(
@@ -792,7 +1550,7 @@ def restore_snapshot_to_serverless(
         Dictionary with restore details on success, or an error dict on failure.
     """
     region = _resolve_region(region)
-    client = boto3.client('redshift-serverless', region_name=region)
+    client = get_client('redshift-serverless', region)
 
     emit_audit_event(
         "tool_invocation",
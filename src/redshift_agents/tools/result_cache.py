@@ -0,0 +1,372 @@
+"""
+TTL result cache for read-only assessment tools.
+
+Within one workflow the assessment, architecture and execution agents all
+re-run ``analyze_redshift_cluster``, ``get_wlm_configuration`` and
+``get_cluster_metrics`` for the same cluster.  Each repeat costs AWS API
+calls and, for WLM, a query on the customer's cluster.  Results are cached
+per ``(tool, region, cluster, arguments)`` with a per-tool TTL and dropped
+explicitly when an execution-phase tool changes the cluster.
+
+Backends are pluggable (``RESULT_CACHE_BACKEND``):
+
+- ``memory`` (default): in-process LRU, shared by warm Lambda invocations.
+  Invalidation only reaches the process that made it, so use a shared
+  tier whenever the execution and assessment tools run in separate
+  functions (the CDK stack deploys ``dynamodb``).
+- ``dynamodb``: the LRU in front of a DynamoDB table shared by every Lambda
+  (``RESULT_CACHE_TABLE``, partition key ``pk``, sort key ``sk``, TTL
+  attribute ``ttl``).
+- ``local``: the LRU in front of a SQLite file with the same layout as the
+  DynamoDB tier, for local development without AWS.
+- ``none``: caching disabled.
+
+Serverless namespace name → ID lookups used by data sharing setup are
+cached the same way (``namespace_key``), and dropped when a namespace is
+created under that name.  The orchestrator memoizes subagent responses in
+the cluster's partition too (``subagent_response``), so invalidating a
+cluster also drops them.
+
+With a shared tier, every cluster partition has a generation counter
+there (item ``sk = "#generation"``) that invalidation increments.  LRU
+entries are filed under the generation they were read or written at, so
+an invalidation made by any process retires every other process's
+in-memory copies as well.
+
+Error results and resumable statement handles are never cached.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+try:
+    from tools.client_pool import get_client
+except ImportError:
+    from .client_pool import get_client
+
+CACHE_BACKEND = os.getenv("RESULT_CACHE_BACKEND", "memory").lower()
+CACHE_TABLE = os.getenv("RESULT_CACHE_TABLE", "redshift_modernization_result_cache")
+CACHE_LOCAL_PATH = os.getenv("RESULT_CACHE_LOCAL_PATH", "/tmp/redshift_result_cache.sqlite")
+CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "256"))
+
+# Sort key of a partition's generation counter in the shared tiers
+GENERATION_SK = "#generation"
+
+# Seconds each tool's result stays fresh.  CloudWatch datapoints arrive every
+# few minutes; WLM queue state moves fastest.
+TOOL_TTLS: Dict[str, int] = {
+    "analyze_redshift_cluster": 900,
+    "get_cluster_metrics": 300,
+    "get_wlm_configuration": 120,
+    # A namespace keeps its ID until it is deleted; recreation invalidates
+    "namespace_id": 3600,
+    # Orchestrator memoization of subagent runs; off unless configured
+    "subagent_response": int(os.getenv("SUBAGENT_CACHE_TTL_SECONDS", "0")),
+}
+
+
+# Results that depend on who asks: the WLM query runs as the caller's
+# ``DbUser`` (their grants decide what it sees) and subagents run as the
+# user.  These are never shared between users.
+CALLER_SCOPED_TOOLS = frozenset({"get_wlm_configuration", "subagent_response"})
+
+
+def _resolve_region(region: str) -> str:
+    """Resolve region from parameter, env var, or default."""
+    return region or os.getenv("AWS_REGION", "us-east-2")
+
+
+def cache_key(tool: str, cluster_id: str, region: str = "", user_id: str = "", **arguments) -> Tuple[str, str]:
+    """Build the ``(partition, entry)`` key for one tool call.
+
+    The partition groups every cached result for a cluster so it can be
+    invalidated in one step; the entry identifies the tool and arguments,
+    plus *user_id* for ``CALLER_SCOPED_TOOLS``.
+    """
+    if tool in CALLER_SCOPED_TOOLS:
+        arguments["user_id"] = user_id
+    digest = hashlib.sha256(
+        json.dumps(arguments, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()[:16]
+    return f"{_resolve_region(region)}#{cluster_id}", f"{tool}#{digest}"
+
+
+class MemoryCache:
+    """Thread-safe in-process LRU with per-entry expiry.
+
+    Values are copied in and out, so callers mutating a result cannot
+    change what later callers get.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Optional[Tuple[float, Dict]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0], copy.deepcopy(entry[1])
+
+    def put(self, key: Tuple[str, str], value: Dict, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, partition: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == partition]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DynamoDBCache:
+    """Shared tier stored in DynamoDB, one item per cached result."""
+
+    def __init__(self, table: str = CACHE_TABLE, region: str = ""):
+        self.table = table
+        self.region = region
+
+    def get(self, key: Tuple[str, str]) -> Optional[Tuple[float, Dict]]:
+        response = get_client("dynamodb", self.region).get_item(
+            TableName=self.table,
+            Key={"pk": {"S": key[0]}, "sk": {"S": key[1]}},
+        )
+        item = response.get("Item")
+        if not item:
+            return None
+        # DynamoDB TTL deletion is lazy, so check expiry ourselves
+        expires_at = float(item["ttl"]["N"])
+        if expires_at <= time.time():
+            return None
+        return expires_at, json.loads(item["value"]["S"])
+
+    def put(self, key: Tuple[str, str], value: Dict, expires_at: float) -> None:
+        get_client("dynamodb", self.region).put_item(
+            TableName=self.table,
+            Item={
+                "pk": {"S": key[0]},
+                "sk": {"S": key[1]},
+                "value": {"S": json.dumps(value, default=str)},
+                "ttl": {"N": str(int(expires_at))},
+            },
+        )
+
+    def generation(self, partition: str) -> int:
+        response = get_client("dynamodb", self.region).get_item(
+            TableName=self.table,
+            Key={"pk": {"S": partition}, "sk": {"S": GENERATION_SK}},
+            ConsistentRead=True,
+        )
+        return int(response.get("Item", {}).get("generation", {}).get("N", "0"))
+
+    def invalidate(self, partition: str) -> None:
+        dynamodb = get_client("dynamodb", self.region)
+        # Bump first: in-memory copies elsewhere are retired even if the
+        # deletes below fail partway
+        dynamodb.update_item(
+            TableName=self.table,
+            Key={"pk": {"S": partition}, "sk": {"S": GENERATION_SK}},
+            UpdateExpression="ADD generation :one",
+            ExpressionAttributeValues={":one": {"N": "1"}},
+        )
+        kwargs = {
+            "TableName": self.table,
+            "KeyConditionExpression": "pk = :pk",
+            "ExpressionAttributeValues": {":pk": {"S": partition}},
+            "ProjectionExpression": "pk, sk",
+        }
+        while True:
+            response = dynamodb.query(**kwargs)
+            for item in response.get("Items", []):
+                if item["sk"]["S"] == GENERATION_SK:
+                    continue
+                dynamodb.delete_item(TableName=self.table, Key={"pk": item["pk"], "sk": item["sk"]})
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return
+            kwargs["ExclusiveStartKey"] = last_key
+
+
+class LocalSharedCache:
+    """SQLite stand-in for the DynamoDB tier, shared by local processes."""
+
+    def __init__(self, path: str = CACHE_LOCAL_PATH):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS result_cache ("
+                "pk TEXT, sk TEXT, value TEXT, ttl REAL, PRIMARY KEY (pk, sk))"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    def get(self, key: Tuple[str, str]) -> Optional[Tuple[float, Dict]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT ttl, value FROM result_cache WHERE pk = ? AND sk = ? AND ttl > ?",
+                (key[0], key[1], time.time()),
+            ).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def put(self, key: Tuple[str, str], value: Dict, expires_at: float) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO result_cache (pk, sk, value, ttl) VALUES (?, ?, ?, ?)",
+                (key[0], key[1], json.dumps(value, default=str), expires_at),
+            )
+
+    def generation(self, partition: str) -> int:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM result_cache WHERE pk = ? AND sk = ?", (partition, GENERATION_SK),
+            ).fetchone()
+        return int(row[0]) if row else 0
+
+    def invalidate(self, partition: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO result_cache (pk, sk, value, ttl) VALUES (?, ?, '1', ?) "
+                "ON CONFLICT (pk, sk) DO UPDATE SET value = CAST(value AS INTEGER) + 1",
+                (partition, GENERATION_SK, float("inf")),
+            )
+            conn.execute("DELETE FROM result_cache WHERE pk = ? AND sk != ?", (partition, GENERATION_SK))
+
+
+class TieredCache:
+    """In-process LRU in front of an optional shared tier.
+
+    With a shared tier, LRU hits are only served for the partition's
+    current generation (see the module docstring).  Shared-tier failures
+    are swallowed: the cache must never turn a working tool call into an
+    error.
+    """
+
+    def __init__(self, local: MemoryCache, shared=None):
+        self.local = local
+        self.shared = shared
+
+    def _local_key(self, key: Tuple[str, str]) -> Tuple[str, str]:
+        """*key* filed under the partition's current generation."""
+        if self.shared is None:
+            return key
+        try:
+            generation = self.shared.generation(key[0])
+        except Exception:
+            # Shared tier unreachable: keep a separate local-only generation
+            generation = -1
+        return key[0], f"{key[1]}@{generation}"
+
+    def get(self, key: Tuple[str, str]) -> Optional[Dict]:
+        local_key = self._local_key(key)
+        entry = self.local.get(local_key)
+        if entry is None and self.shared is not None:
+            try:
+                entry = self.shared.get(key)
+            except Exception:
+                entry = None
+            if entry is not None:
+                self.local.put(local_key, entry[1], entry[0])
+        return entry[1] if entry is not None else None
+
+    def put(self, key: Tuple[str, str], value: Dict, ttl_seconds: float) -> None:
+        expires_at = time.time() + ttl_seconds
+        self.local.put(self._local_key(key), value, expires_at)
+        if self.shared is not None:
+            try:
+                self.shared.put(key, value, expires_at)
+            except Exception:
+                pass
+
+    def invalidate(self, partition: str) -> None:
+        self.local.invalidate(partition)
+        if self.shared is not None:
+            try:
+                self.shared.invalidate(partition)
+            except Exception:
+                pass
+
+
+_cache: Optional[TieredCache] = None
+_cache_lock = threading.Lock()
+
+
+def _build_cache(backend: str) -> Optional[TieredCache]:
+    if backend in ("none", "off", "false", "0"):
+        return None
+    if backend == "dynamodb":
+        return TieredCache(MemoryCache(), DynamoDBCache())
+    if backend == "local":
+        return TieredCache(MemoryCache(), LocalSharedCache())
+    return TieredCache(MemoryCache())
+
+
+def get_cache() -> Optional[TieredCache]:
+    """Return the process-wide cache, or ``None`` when caching is disabled."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = _build_cache(CACHE_BACKEND)
+    return _cache
+
+
+def set_cache(cache: Optional[TieredCache]) -> None:
+    """Replace the process-wide cache (``None`` re-reads ``RESULT_CACHE_BACKEND``)."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
+
+
+def get_cached(key: Tuple[str, str]) -> Optional[Dict]:
+    """Return the fresh cached result for *key*, or ``None``."""
+    cache = get_cache()
+    return cache.get(key) if cache is not None else None
+
+
+def put_cached(tool: str, key: Tuple[str, str], result: Dict) -> None:
+    """Cache *result* for the tool's TTL unless it is an error or a handle."""
+    cache = get_cache()
+    ttl = TOOL_TTLS.get(tool, 0)
+    if cache is None or ttl <= 0 or not isinstance(result, dict):
+        return
+    if "error" in result or result.get("resumable"):
+        return
+    cache.put(key, result, ttl)
+
+
+def invalidate_cluster(cluster_id: str, region: str = "") -> None:
+    """Drop every cached result for *cluster_id* after it was changed."""
+    cache = get_cache()
+    if cache is not None:
+        cache.invalidate(f"{_resolve_region(region)}#{cluster_id}")
+
+
+def namespace_key(namespace_name: str, region: str = "") -> Tuple[str, str]:
+    """Cache key for a Serverless namespace's ID."""
+    return cache_key("namespace_id", f"namespace/{namespace_name}", region)
+
+
+def invalidate_namespace(namespace_name: str, region: str = "") -> None:
+    """Drop the cached ID of *namespace_name* after it was (re)created."""
+    invalidate_cluster(f"namespace/{namespace_name}", region)
@@ -0,0 +1,154 @@
+"""
+Typed decoding of Redshift Data API records.
+
+``get_statement_result`` returns each row as a list of ``Field`` dicts such
+as ``{"longValue": 7}``, ``{"stringValue": "12.50"}`` or ``{"isNull": True}``.
+``RecordDecoder`` reads ``ColumnMetadata`` once and builds one converter per
+column, so decoding a row is a single pass of pre-selected lookups instead
+of probing every value key on every field.
+
+Column types are mapped from the Redshift ``typeName``:
+
+- ``int2`` / ``int4`` / ``int8`` → ``int``
+- ``float4`` / ``float8`` → ``float``
+- ``numeric`` / ``decimal`` → ``decimal.Decimal`` (the Data API returns these
+  as strings, so no precision is lost)
+- ``bool`` → ``bool``
+- everything else → the raw value (``str`` for text, dates and timestamps)
+
+NULL fields decode to ``None``.  Without column metadata each field is
+decoded by whichever value key it carries.
+"""
+from __future__ import annotations
+
+import dataclasses
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, TypeVar
+
+T = TypeVar("T")
+
+# Field value keys in the order they are probed for untyped columns
+_VALUE_KEYS = ("stringValue", "longValue", "doubleValue", "booleanValue", "blobValue", "arrayValue")
+
+_INT_TYPES = frozenset({"int2", "int4", "int8", "smallint", "integer", "bigint", "oid"})
+_FLOAT_TYPES = frozenset({"float4", "float8", "real", "double precision", "float"})
+_DECIMAL_TYPES = frozenset({"numeric", "decimal"})
+_BOOL_TYPES = frozenset({"bool", "boolean"})
+
+# Coercions applied to dataclass fields by annotation (models use postponed
+# annotations, so these are the annotation strings)
+_FIELD_COERCIONS: Dict[str, Callable[[Any], Any]] = {
+    "int": lambda v: int(v) if v is not None else 0,
+    "float": lambda v: float(v) if v is not None else 0.0,
+    "str": lambda v: str(v) if v is not None else "",
+    "bool": lambda v: bool(v) if v is not None else False,
+}
+
+
+def _raw_value(field: Dict) -> Any:
+    """Return a field's value by whichever value key it carries."""
+    if field.get("isNull"):
+        return None
+    for key in _VALUE_KEYS:
+        if key in field:
+            return field[key]
+    return None
+
+
+def _converter(type_name: str, decimal_factory: Callable[[str], Any]) -> Callable[[Dict], Any]:
+    """Build the field converter for one column of Redshift type *type_name*."""
+    type_name = (type_name or "").lower()
+
+    if type_name in _INT_TYPES:
+        def convert(field: Dict) -> Optional[int]:
+            if "longValue" in field:
+                return field["longValue"]
+            value = _raw_value(field)
+            return None if value is None else int(value)
+    elif type_name in _FLOAT_TYPES:
+        def convert(field: Dict) -> Optional[float]:
+            if "doubleValue" in field:
+                return field["doubleValue"]
+            value = _raw_value(field)
+            return None if value is None else float(value)
+    elif type_name in _DECIMAL_TYPES:
+        def convert(field: Dict) -> Any:
+            value = _raw_value(field)
+            if value is None:
+                return None
+            # Go through str so binary floats are not widened into long decimals
+            return decimal_factory(str(value))
+    elif type_name in _BOOL_TYPES:
+        def convert(field: Dict) -> Optional[bool]:
+            if "booleanValue" in field:
+                return field["booleanValue"]
+            value = _raw_value(field)
+            if isinstance(value, str):
+                return value.lower() in ("t", "true", "1")
+            return None if value is None else bool(value)
+    else:
+        convert = _raw_value
+    return convert
+
+
+class RecordDecoder:
+    """Decode Data API records into tuples, dicts or dataclass instances.
+
+    Args:
+        column_metadata: ``ColumnMetadata`` from ``get_statement_result``.
+            May be empty, in which case fields are decoded untyped and dict
+            keys / model fields are matched by position.
+        decimal_factory: Callable applied to the string form of ``numeric``
+            values.  Defaults to ``Decimal``; pass ``str`` when the result
+            must be JSON-serializable without losing precision.
+    """
+
+    def __init__(
+        self,
+        column_metadata: Optional[List[Dict]] = None,
+        decimal_factory: Callable[[str], Any] = Decimal,
+    ):
+        self.column_metadata = list(column_metadata or [])
+        self.columns = [c.get("label") or c.get("name", "") for c in self.column_metadata]
+        self._converters = [
+            _converter(c.get("typeName", ""), decimal_factory) for c in self.column_metadata
+        ]
+
+    def to_tuple(self, record: List[Dict]) -> Tuple:
+        """Decode one record into a tuple of Python values."""
+        if not self._converters:
+            return tuple(_raw_value(field) for field in record)
+        return tuple(convert(field) for convert, field in zip(self._converters, record))
+
+    def to_dict(self, record: List[Dict]) -> Dict[str, Any]:
+        """Decode one record into a ``{column name: value}`` dict."""
+        columns = self.columns or [f"col{i}" for i in range(len(record))]
+        return dict(zip(columns, self.to_tuple(record)))
+
+    def tuples(self, records: Iterable[List[Dict]]) -> List[Tuple]:
+        return [self.to_tuple(record) for record in records]
+
+    def dicts(self, records: Iterable[List[Dict]]) -> List[Dict[str, Any]]:
+        return [self.to_dict(record) for record in records]
+
+    def models(self, records: Iterable[List[Dict]], model: Type[T]) -> List[T]:
+        """Decode records into instances of the dataclass *model*.
+
+        Columns are matched to fields by name when column metadata is
+        available, otherwise by position.  Values are coerced to the
+        field's annotated type; NULLs become that type's zero value.
+        """
+        fields = dataclasses.fields(model)
+        if self.columns:
+            index = {name: i for i, name in enumerate(self.columns)}
+            positions = [index[f.name] for f in fields]
+        else:
+            positions = list(range(len(fields)))
+        coercions = [_FIELD_COERCIONS.get(str(f.type), lambda v: v) for f in fields]
+        plan = list(zip([f.name for f in fields], positions, coercions))
+
+        instances = []
+        for record in records:
+            values = self.to_tuple(record)
+            instances.append(model(**{name: coerce(values[pos]) for name, pos, coerce in plan}))
+        return instances
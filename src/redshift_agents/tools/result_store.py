@@ -0,0 +1,349 @@
+"""
+Large-result offload for action group responses.
+
+Bedrock Agents cap the size of an action group response, and a large
+response that does fit still floods the model context.  When a tool result
+serializes to more than ``RESPONSE_MAX_BYTES`` (see ``lambdas/router.py``)
+the Lambda router stores the full result and returns a compact summary
+instead: the scalar fields, a short preview of the largest list
+(``records`` for query results) and a ``result_id``.  The agent reads the
+rest page by page with ``/fetchResultPage``.  A result is stored with the
+``user_id`` of the request that produced it, and only that user can page
+through it.
+
+Stores (``RESULT_STORE_BACKEND``):
+
+- ``s3``: one JSON object per result under
+  ``s3://RESULT_STORE_BUCKET/RESULT_STORE_PREFIX/<result_id>.json``; expire
+  them with a bucket lifecycle rule.
+- ``local``: the same layout under ``RESULT_STORE_LOCAL_DIR``, for local
+  development without AWS.
+
+The default is ``s3`` when ``RESULT_STORE_BUCKET`` is set, else ``local``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+import threading
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from tools.audit_logger import emit_audit_event
+    from tools.client_pool import get_client
+except ImportError:
+    from .audit_logger import emit_audit_event
+    from .client_pool import get_client
+
+RESPONSE_PAGE_BYTES = int(os.getenv("RESPONSE_PAGE_BYTES", "16000"))
+SUMMARY_PREVIEW_BYTES = int(os.getenv("RESPONSE_PREVIEW_BYTES", "4000"))
+# Non-paged fields larger than this are cut (strings) or left out of the summary
+SUMMARY_FIELD_MAX_BYTES = 1024
+
+RESULT_STORE_BUCKET = os.getenv("RESULT_STORE_BUCKET", "")
+RESULT_STORE_PREFIX = os.getenv("RESULT_STORE_PREFIX", "action-results")
+RESULT_STORE_LOCAL_DIR = os.getenv("RESULT_STORE_LOCAL_DIR", "/tmp/redshift_action_results")
+RESULT_STORE_BACKEND = os.getenv("RESULT_STORE_BACKEND", "s3" if RESULT_STORE_BUCKET else "local").lower()
+
+_RESULT_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+def _size(value: Any) -> int:
+    return len(json.dumps(value, default=str).encode("utf-8"))
+
+
+class S3ResultStore:
+    """Stores offloaded results as JSON objects in S3."""
+
+    def __init__(self, bucket: str = RESULT_STORE_BUCKET, prefix: str = RESULT_STORE_PREFIX, region: str = ""):
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.region = region
+
+    def _key(self, result_id: str) -> str:
+        return f"{self.prefix}/{result_id}.json" if self.prefix else f"{result_id}.json"
+
+    def location(self, result_id: str) -> str:
+        return f"s3://{self.bucket}/{self._key(result_id)}"
+
+    def put(self, result_id: str, body: bytes, owner: str = "") -> None:
+        get_client("s3", self.region).put_object(
+            Bucket=self.bucket, Key=self._key(result_id), Body=body, ContentType="application/json",
+            Metadata={"owner": owner},
+        )
+
+    def get(self, result_id: str) -> Optional[Tuple[bytes, str]]:
+        """Return ``(body, owner)``, or ``None`` if there is no such result."""
+        s3 = get_client("s3", self.region)
+        try:
+            obj = s3.get_object(Bucket=self.bucket, Key=self._key(result_id))
+        except s3.exceptions.NoSuchKey:
+            return None
+        return obj["Body"].read(), obj.get("Metadata", {}).get("owner", "")
+
+
+class LocalResultStore:
+    """Filesystem stand-in for the S3 store."""
+
+    def __init__(self, directory: str = RESULT_STORE_LOCAL_DIR):
+        self.directory = directory
+
+    def _path(self, result_id: str) -> str:
+        return os.path.join(self.directory, f"{result_id}.json")
+
+    def location(self, result_id: str) -> str:
+        return self._path(result_id)
+
+    def _owner_path(self, result_id: str) -> str:
+        return os.path.join(self.directory, f"{result_id}.owner")
+
+    def put(self, result_id: str, body: bytes, owner: str = "") -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._owner_path(result_id), "w", encoding="utf-8") as f:
+            f.write(owner)
+        with open(self._path(result_id), "wb") as f:
+            f.write(body)
+
+    def get(self, result_id: str) -> Optional[Tuple[bytes, str]]:
+        """Return ``(body, owner)``, or ``None`` if there is no such result."""
+        try:
+            with open(self._path(result_id), "rb") as f:
+                body = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            with open(self._owner_path(result_id), encoding="utf-8") as f:
+                return body, f.read()
+        except FileNotFoundError:
+            return body, ""
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return the process-wide result store."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = S3ResultStore() if RESULT_STORE_BACKEND == "s3" else LocalResultStore()
+    return _store
+
+
+def set_store(store) -> None:
+    """Replace the process-wide store (``None`` re-reads ``RESULT_STORE_BACKEND``)."""
+    global _store
+    with _store_lock:
+        _store = store
+
+
+def _paged_items(result: Any) -> Tuple[Optional[str], Optional[List]]:
+    """Return ``(field, items)`` for the list pages are cut from.
+
+    A top-level list is paged itself (field ``None``); for a dict the
+    largest list-valued field is paged.  ``(None, None)`` if there is none.
+    """
+    if isinstance(result, list):
+        return None, result
+    if isinstance(result, dict):
+        lists = [(k, v) for k, v in result.items() if isinstance(v, list)]
+        if lists:
+            field, items = max(lists, key=lambda kv: _size(kv[1]))
+            return field, items
+    return None, None
+
+
+def _page_bounds(items: List, page_bytes: int) -> List[Tuple[int, int]]:
+    """Cut *items* into ``[start, end)`` runs of at most *page_bytes* each.
+
+    An item larger than the budget gets a page to itself.
+    """
+    bounds: List[Tuple[int, int]] = []
+    start, used = 0, 0
+    for i, item in enumerate(items):
+        size = _size(item) + 1
+        if i > start and used + size > page_bytes:
+            bounds.append((start, i))
+            start, used = i, 0
+        used += size
+    if start < len(items) or not bounds:
+        bounds.append((start, len(items)))
+    return bounds
+
+
+def _text_pages(body: str, page_bytes: int) -> List[str]:
+    return [body[i:i + page_bytes] for i in range(0, len(body), page_bytes)] or [""]
+
+
+def _truncate(text: str, max_bytes: int) -> str:
+    """Leading part of *text* within *max_bytes* of UTF-8, cut on a character boundary."""
+    return text.encode("utf-8")[:max_bytes].decode("utf-8", "ignore")
+
+
+def summarize_result(
+    result: Any,
+    result_id: str,
+    total_bytes: int,
+    location: str,
+    max_bytes: Optional[int] = None,
+) -> Dict:
+    """Compact stand-in for an offloaded *result*.
+
+    Strings over ``SUMMARY_FIELD_MAX_BYTES`` are cut (``truncated_fields``)
+    and other large fields left out (``omitted_fields``).  A summary that
+    still serializes to more than *max_bytes* is reduced to the fields
+    needed to page through the result.
+    """
+    field, items = _paged_items(result)
+    summary: Dict[str, Any] = {
+        "offloaded": True,
+        "result_id": result_id,
+        "location": location,
+        "total_bytes": total_bytes,
+    }
+    if isinstance(result, dict):
+        omitted, truncated = [], []
+        for key, value in result.items():
+            if key == field:
+                continue
+            if _size(value) <= SUMMARY_FIELD_MAX_BYTES:
+                summary[key] = value
+            elif isinstance(value, str):
+                summary[key] = _truncate(value, SUMMARY_FIELD_MAX_BYTES)
+                truncated.append(key)
+            else:
+                omitted.append(key)
+        if truncated:
+            summary["truncated_fields"] = truncated
+        if omitted:
+            summary["omitted_fields"] = omitted
+
+    if items is not None:
+        preview_end = _page_bounds(items, SUMMARY_PREVIEW_BYTES)[0][1]
+        if preview_end == 1 and _size(items[0]) > SUMMARY_PREVIEW_BYTES:
+            preview_end = 0
+        summary.update({
+            "paged_field": field,
+            "total_items": len(items),
+            "page_count": len(_page_bounds(items, RESPONSE_PAGE_BYTES)),
+            "preview": items[:preview_end],
+        })
+    else:
+        summary["page_count"] = len(_text_pages(json.dumps(result, default=str), RESPONSE_PAGE_BYTES))
+    summary["message"] = (
+        f"Result is {total_bytes} bytes, too large to return at once. The summary shows "
+        f"{'a preview of ' + (field or 'the items') if items is not None else 'the scalar fields'}; "
+        f"call fetchResultPage with result_id and page=1..{summary['page_count']} for the full data."
+    )
+    if max_bytes is not None and _size(summary) > max_bytes:
+        summary = {
+            key: summary[key]
+            for key in ("offloaded", "result_id", "location", "total_bytes", "page_count")
+        }
+        summary["message"] = (
+            f"Result is {total_bytes} bytes, too large to return or summarize; call "
+            f"fetchResultPage with result_id and page=1..{summary['page_count']} to read it."
+        )
+    return summary
+
+
+def offload_result(result: Any, body: bytes, owner: str = "", max_bytes: Optional[int] = None) -> Any:
+    """Store *result* (serialized as *body*) for *owner* and return its summary.
+
+    The summary is kept within *max_bytes*.  If the store fails the
+    original result is returned, so an offload problem never turns a
+    working tool call into an error.
+    """
+    result_id = uuid.uuid4().hex
+    store = get_store()
+    try:
+        store.put(result_id, body, owner)
+    except Exception as exc:
+        print(f"[result_store] Failed to offload {len(body)}-byte result: {exc}", file=sys.stderr)
+        return result
+    return summarize_result(result, result_id, len(body), store.location(result_id), max_bytes)
+
+
+def fetch_result_page(
+    result_id: str,
+    page: int = 1,
+    user_id: str = "",
+) -> Dict:
+    """Return one page of an offloaded result.
+
+    Args:
+        result_id: ID from the offload summary.
+        page: 1-based page number.
+        user_id: Identity of the person who initiated the request; must match
+            the user the result was stored for.
+
+    Returns:
+        ``{"result_id", "page", "page_count", "paged_field", "items",
+        "item_offset", "total_items", "next_page"}``.  ``"text"`` replaces
+        ``"items"`` when the result has no list to page, or (with
+        ``"item_truncated": True``) when one item alone exceeds the page.
+        ``next_page`` is ``None`` on the last page.
+    """
+    if not _RESULT_ID.match(result_id or ""):
+        return {"error": f"Invalid result_id: {result_id}"}
+    try:
+        stored = get_store().get(result_id)
+    except Exception as exc:
+        return {"error": f"Could not read result {result_id}: {exc}", "result_id": result_id}
+    if stored is None:
+        return {"error": f"Result {result_id} not found or expired", "result_id": result_id}
+
+    body, owner = stored
+    if owner and owner != user_id:
+        emit_audit_event(
+            "error",
+            "result_store",
+            initiated_by=user_id,
+            details={"tool": "fetch_result_page", "result_id": result_id, "error": "owner mismatch"},
+        )
+        return {"error": f"Result {result_id} belongs to another user", "result_id": result_id}
+    emit_audit_event(
+        "tool_invocation",
+        "result_store",
+        initiated_by=user_id,
+        details={"tool": "fetch_result_page", "result_id": result_id, "page": page},
+    )
+
+    page_bytes = RESPONSE_PAGE_BYTES
+    result = json.loads(body)
+    field, items = _paged_items(result)
+    if items is not None:
+        bounds = _page_bounds(items, page_bytes)
+    else:
+        texts = _text_pages(body.decode("utf-8"), page_bytes)
+        bounds = [(i, i + 1) for i in range(len(texts))]
+    if not 1 <= page <= len(bounds):
+        return {"error": f"page must be between 1 and {len(bounds)}", "result_id": result_id}
+
+    start, end = bounds[page - 1]
+    response: Dict[str, Any] = {
+        "result_id": result_id,
+        "page": page,
+        "page_count": len(bounds),
+        "next_page": page + 1 if page < len(bounds) else None,
+    }
+    if items is not None:
+        response.update({
+            "paged_field": field,
+            "items": items[start:end],
+            "item_offset": start,
+            "total_items": len(items),
+        })
+        if end - start == 1 and _size(items[start]) > page_bytes:
+            # One item bigger than a page: return its leading text only
+            del response["items"]
+            response["text"] = json.dumps(items[start], default=str)[:page_bytes]
+            response["item_truncated"] = True
+    else:
+        response["text"] = texts[start]
+    return response
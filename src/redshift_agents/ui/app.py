@@ -12,9 +12,12 @@ Run with:
 """
 from __future__ import annotations
 
+import codecs
 import json
 import os
+import time
 import uuid
+from typing import Callable
 
 from dotenv import load_dotenv
 
@@ -23,12 +26,13 @@ load_dotenv()
 
 import boto3
 import streamlit as st
+from botocore.config import Config
+from botocore.exceptions import ClientError
 
 from auth import (
+    IdentityPoolSession,
     cognito_sign_in,
-    create_authenticated_session,
     extract_user_id,
-    refresh_tokens,
 )
 
 # ---------------------------------------------------------------------------
@@ -45,6 +49,12 @@ ASSESSMENT_AGENT_ID = os.getenv("ASSESSMENT_AGENT_ID", "")
 ARCHITECTURE_AGENT_ID = os.getenv("ARCHITECTURE_AGENT_ID", "")
 EXECUTION_AGENT_ID = os.getenv("EXECUTION_AGENT_ID", "")
 AWS_REGION = os.getenv("AWS_REGION", "us-east-2")
+# Without this Bedrock sends the final answer as one chunk once it is complete
+STREAM_FINAL_RESPONSE = os.getenv("ORCHESTRATOR_STREAM_FINAL_RESPONSE", "true").lower() == "true"
+
+AGENT_RUNTIME_CONFIG = Config(read_timeout=300, connect_timeout=10, retries={"max_attempts": 2})
+# Error codes meaning the Identity Pool credentials have lapsed
+_EXPIRED_CREDENTIAL_CODES = {"ExpiredTokenException", "ExpiredToken", "RequestExpired"}
 
 # ---------------------------------------------------------------------------
 # Page config
@@ -111,8 +121,8 @@ if "refresh_token" not in st.session_state:
     st.session_state.refresh_token = None
 if "authenticated" not in st.session_state:
     st.session_state.authenticated = False
-if "boto3_session" not in st.session_state:
-    st.session_state.boto3_session = None
+if "aws_identity" not in st.session_state:
+    st.session_state.aws_identity = None
 if "password_challenge" not in st.session_state:
     st.session_state.password_challenge = None
 if "challenge_username" not in st.session_state:
@@ -145,28 +155,35 @@ def _do_sign_in(username: str, password: str, new_password: str | None = None) -
         st.session_state.user_id = extract_user_id(tokens["id_token"])
         st.session_state.authenticated = True
 
-        # Exchange JWT for temporary AWS credentials
-        session = create_authenticated_session(tokens["id_token"])
-        st.session_state.boto3_session = session
+        # Exchange JWT for temporary AWS credentials, refreshed before they expire
+        st.session_state.aws_identity = IdentityPoolSession(
+            tokens["id_token"],
+            refresh_token=tokens["refresh_token"],
+            access_token=tokens["access_token"],
+        )
         return True
     except Exception as e:
         st.error(f"Sign-in failed: {e}")
         return False
 
 
+def _sync_tokens() -> None:
+    """Copy tokens renewed by the background credential refresh into session state."""
+    identity = st.session_state.aws_identity
+    if identity is not None and identity.id_token != st.session_state.id_token:
+        st.session_state.id_token = identity.id_token
+        st.session_state.access_token = identity.access_token
+        st.session_state.user_id = extract_user_id(identity.id_token)
+
+
 def _do_token_refresh() -> bool:
-    """Attempt to refresh tokens. Returns True on success, False on failure."""
-    if not st.session_state.refresh_token:
+    """Force a token and credential refresh. Returns True on success, False on failure."""
+    identity = st.session_state.aws_identity
+    if identity is None or not st.session_state.refresh_token:
         return False
     try:
-        new_tokens = refresh_tokens(st.session_state.refresh_token)
-        st.session_state.id_token = new_tokens["id_token"]
-        st.session_state.access_token = new_tokens["access_token"]
-        st.session_state.user_id = extract_user_id(new_tokens["id_token"])
-
-        # Refresh Identity Pool credentials too
-        session = create_authenticated_session(new_tokens["id_token"])
-        st.session_state.boto3_session = session
+        identity.refresh()
+        _sync_tokens()
         return True
     except Exception:
         # Refresh failed — force re-login
@@ -182,7 +199,9 @@ def _sign_out():
     st.session_state.user_id = ""
     st.session_state.active_cluster_id = ""
     st.session_state.authenticated = False
-    st.session_state.boto3_session = None
+    if st.session_state.aws_identity is not None:
+        st.session_state.aws_identity.stop()
+    st.session_state.aws_identity = None
     st.session_state.messages = []
     st.session_state.session_id = str(uuid.uuid4())
 
@@ -192,10 +211,23 @@ def _sign_out():
 # ---------------------------------------------------------------------------
 
 
+@st.cache_resource(max_entries=256, show_spinner=False)
+def _cached_agent_runtime_client(identity_key: str, _identity: IdentityPoolSession | None):
+    """One client per signed-in identity; its credentials refresh in place."""
+    session = _identity.session if _identity is not None else boto3
+    return session.client("bedrock-agent-runtime", region_name=AWS_REGION, config=AGENT_RUNTIME_CONFIG)
+
+
+def _agent_runtime_client():
+    """The ``bedrock-agent-runtime`` client for this browser session."""
+    identity = st.session_state.aws_identity
+    key = identity.key if identity is not None else "default"
+    return _cached_agent_runtime_client(key, identity)
+
+
 def forget_cluster_memory(cluster_id: str) -> str:
     """Delete SESSION_SUMMARY memory for a cluster across all 4 agents."""
-    session = st.session_state.boto3_session or boto3
-    client = session.client("bedrock-agent-runtime", region_name=AWS_REGION)
+    client = _agent_runtime_client()
 
     agent_ids = [
         aid for aid in [
@@ -292,18 +324,38 @@ def _extract_trace_steps(trace_event: dict) -> list[dict]:
     return steps
 
 
-def invoke_orchestrator(message: str, user_id: str) -> tuple[str, list[dict]]:
-    """Send a message to the orchestrator and return (response_text, trace_steps)."""
-    session = st.session_state.boto3_session or boto3
-    from botocore.config import Config
-    client = session.client(
-        "bedrock-agent-runtime",
-        region_name=AWS_REGION,
-        config=Config(read_timeout=300, connect_timeout=10, retries={"max_attempts": 2}),
-    )
+def invoke_orchestrator(
+    message: str,
+    user_id: str,
+    on_chunk: Callable[[str], None] | None = None,
+    on_trace_step: Callable[[dict], None] | None = None,
+    retry_expired: bool = True,
+) -> tuple[str, list[dict], dict]:
+    """Send a message to the orchestrator and return (response_text, trace_steps, timing).
+
+    The completion stream is consumed as it arrives: *on_chunk* receives
+    each piece of response text and *on_trace_step* each reasoning step, so
+    the caller can render them live.  *timing* holds ``time_to_first_token_ms``,
+    ``time_to_first_step_ms`` and ``duration_ms`` for the turn.
+
+    Credentials are refreshed before they expire; if a call still fails
+    with an expired-credential error they are refreshed and, as long as
+    nothing has been streamed to the callbacks yet, the turn is retried
+    once.  A turn that fails mid-stream is not retried: the agent may
+    already have acted on it, and the callbacks would render it twice.
+    """
+    client = _agent_runtime_client()
 
     input_text = json.dumps({"message": message, "user_id": user_id})
     memory_id = st.session_state.get("active_cluster_id") or "general"
+    extra = {"streamingConfigurations": {"streamFinalResponse": True}} if STREAM_FINAL_RESPONSE else {}
+
+    started = time.perf_counter()
+    timing = {"time_to_first_token_ms": None, "time_to_first_step_ms": None, "duration_ms": None}
+    streamed = False
+
+    def elapsed_ms() -> float:
+        return round((time.perf_counter() - started) * 1000, 1)
 
     try:
         response = client.invoke_agent(
@@ -313,33 +365,58 @@ def invoke_orchestrator(message: str, user_id: str) -> tuple[str, list[dict]]:
             inputText=input_text,
             memoryId=memory_id,
             enableTrace=True,
+            **extra,
         )
 
-        result_text = ""
+        # Incremental decoding keeps a multi-byte character split across
+        # two chunks intact
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        parts = []
         trace_steps = []
 
-        if "completion" in response:
-            for event in response["completion"]:
-                if "chunk" in event:
-                    chunk_bytes = event["chunk"].get("bytes", b"")
-                    result_text += chunk_bytes.decode("utf-8", errors="replace")
-                if "trace" in event:
-                    trace_steps.extend(_extract_trace_steps(event))
-
-        return result_text or "No response from orchestrator.", trace_steps
+        for event in response.get("completion", ()):
+            if "chunk" in event:
+                text = decoder.decode(event["chunk"].get("bytes", b""))
+                if text:
+                    if timing["time_to_first_token_ms"] is None:
+                        timing["time_to_first_token_ms"] = elapsed_ms()
+                    parts.append(text)
+                    if on_chunk is not None:
+                        streamed = True
+                        on_chunk(text)
+            if "trace" in event:
+                for step in _extract_trace_steps(event):
+                    if timing["time_to_first_step_ms"] is None:
+                        timing["time_to_first_step_ms"] = elapsed_ms()
+                    trace_steps.append(step)
+                    if on_trace_step is not None:
+                        streamed = True
+                        on_trace_step(step)
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            parts.append(tail)
+            if on_chunk is not None:
+                on_chunk(tail)
+
+        timing["duration_ms"] = elapsed_ms()
+        return "".join(parts) or "No response from orchestrator.", trace_steps, timing
 
     except client.exceptions.ResourceNotFoundException:
         return (
             "⚠️ Orchestrator agent not found. Make sure you've deployed the agents "
             "with `cdk deploy` and set the `ORCHESTRATOR_AGENT_ID` environment variable.",
             [],
+            timing,
         )
+    except ClientError as e:
+        code = e.response.get("Error", {}).get("Code", "")
+        if retry_expired and code in _EXPIRED_CREDENTIAL_CODES and _do_token_refresh() and not streamed:
+            return invoke_orchestrator(message, user_id, on_chunk, on_trace_step, retry_expired=False)
+        timing["duration_ms"] = elapsed_ms()
+        return f"⚠️ Error communicating with orchestrator: {e}", [], timing
     except Exception as e:
-        error_msg = str(e)
-        if "expired" in error_msg.lower() or "token" in error_msg.lower():
-            if _do_token_refresh():
-                return invoke_orchestrator(message, user_id)
-        return f"⚠️ Error communicating with orchestrator: {error_msg}", []
+        timing["duration_ms"] = elapsed_ms()
+        return f"⚠️ Error communicating with orchestrator: {e}", [], timing
 
 
 # ---------------------------------------------------------------------------
@@ -390,6 +467,8 @@ if not st.session_state.authenticated:
     st.stop()
 
 
+_sync_tokens()
+
 # ---------------------------------------------------------------------------
 # Sidebar — configuration (authenticated)
 # ---------------------------------------------------------------------------
@@ -454,54 +533,105 @@ _TRACE_ICONS = {
 }
 
 
+def _render_step(step: dict, i: int) -> None:
+    """Render one agent trace step (numbered *i*)."""
+    stype = step.get("type", "")
+    icon = _TRACE_ICONS.get(stype, "•")
+
+    if stype == "reasoning":
+        st.markdown(f"**{icon} Step {i} — Reasoning**")
+        st.markdown(step["text"])
+
+    elif stype == "tool_call":
+        st.markdown(f"**{icon} Step {i} — Tool call:** `{step['tool']}`")
+        if step.get("input"):
+            st.code(step["input"], language="json")
+
+    elif stype == "tool_result":
+        st.markdown(f"**{icon} Step {i} — Tool result**")
+        output = step.get("output", "")
+        # Try to pretty-print JSON, fall back to plain text
+        try:
+            st.code(json.dumps(json.loads(output), indent=2), language="json")
+        except Exception:
+            st.text(output[:2000])  # cap very long outputs
+
+    elif stype == "agent_call":
+        st.markdown(f"**{icon} Step {i} — Delegating to:** `{step['tool']}`")
+        if step.get("input"):
+            st.markdown(f"> {step['input']}")
+
+    elif stype == "agent_result":
+        st.markdown(f"**{icon} Step {i} — Response from:** `{step['tool']}`")
+        output = step.get("output", "")
+        if output:
+            st.markdown(output[:3000])
+
+    elif stype == "kb_lookup":
+        st.markdown(f"**{icon} Step {i} — Knowledge base lookup**")
+        st.markdown(f"> {step.get('text', '')}")
+
+    elif stype == "kb_result":
+        st.markdown(f"**{icon} Step {i} — Knowledge base results**")
+        st.markdown(step.get("output", ""))
+
+
 def _render_trace(steps: list[dict]) -> None:
     """Render agent trace steps inside a collapsible expander."""
     if not steps:
         return
     with st.expander(f"🔍 Agent reasoning ({len(steps)} steps)", expanded=False):
         for i, step in enumerate(steps, 1):
-            stype = step.get("type", "")
-            icon = _TRACE_ICONS.get(stype, "•")
-
-            if stype == "reasoning":
-                st.markdown(f"**{icon} Step {i} — Reasoning**")
-                st.markdown(step["text"])
-
-            elif stype == "tool_call":
-                st.markdown(f"**{icon} Step {i} — Tool call:** `{step['tool']}`")
-                if step.get("input"):
-                    st.code(step["input"], language="json")
-
-            elif stype == "tool_result":
-                st.markdown(f"**{icon} Step {i} — Tool result**")
-                output = step.get("output", "")
-                # Try to pretty-print JSON, fall back to plain text
-                try:
-                    st.code(json.dumps(json.loads(output), indent=2), language="json")
-                except Exception:
-                    st.text(output[:2000])  # cap very long outputs
-
-            elif stype == "agent_call":
-                st.markdown(f"**{icon} Step {i} — Delegating to:** `{step['tool']}`")
-                if step.get("input"):
-                    st.markdown(f"> {step['input']}")
-
-            elif stype == "agent_result":
-                st.markdown(f"**{icon} Step {i} — Response from:** `{step['tool']}`")
-                output = step.get("output", "")
-                if output:
-                    st.markdown(output[:3000])
-
-            elif stype == "kb_lookup":
-                st.markdown(f"**{icon} Step {i} — Knowledge base lookup**")
-                st.markdown(f"> {step.get('text', '')}")
-
-            elif stype == "kb_result":
-                st.markdown(f"**{icon} Step {i} — Knowledge base results**")
-                st.markdown(step.get("output", ""))
-
-            if i < len(steps):
+            if i > 1:
+                st.divider()
+            _render_step(step, i)
+
+
+def _render_timing(timing: dict | None) -> None:
+    """Caption with the turn's time to first token and total duration."""
+    if not timing or timing.get("duration_ms") is None:
+        return
+    parts = []
+    if timing.get("time_to_first_token_ms") is not None:
+        parts.append(f"first token {timing['time_to_first_token_ms'] / 1000:.1f}s")
+    parts.append(f"total {timing['duration_ms'] / 1000:.1f}s")
+    st.caption("⏱️ " + " · ".join(parts))
+
+
+class _LiveTurn:
+    """Renders one orchestrator turn while its completion stream arrives.
+
+    Reasoning steps are appended to a ``st.status`` expander as they come in
+    and response text to a markdown placeholder below it.
+    """
+
+    def __init__(self):
+        self.status = st.status("🔍 Agent reasoning", expanded=True)
+        # Entering the status itself would mark it complete on exit
+        self.steps = self.status.container()
+        self.answer = st.empty()
+        self.parts: list[str] = []
+        self.step_count = 0
+
+    def on_trace_step(self, step: dict) -> None:
+        self.step_count += 1
+        with self.steps:
+            if self.step_count > 1:
                 st.divider()
+            _render_step(step, self.step_count)
+        self.status.update(label=f"🔍 Agent reasoning ({self.step_count} steps)…")
+
+    def on_chunk(self, text: str) -> None:
+        self.parts.append(text)
+        self.answer.markdown("".join(self.parts) + "▌")
+
+    def finish(self, response: str) -> None:
+        self.status.update(
+            label=f"🔍 Agent reasoning ({self.step_count} steps)",
+            state="complete",
+            expanded=False,
+        )
+        self.answer.markdown(response)
 
 
 # ---------------------------------------------------------------------------
@@ -517,6 +647,8 @@ for msg in st.session_state.messages:
         if msg["role"] == "assistant" and msg.get("trace"):
             _render_trace(msg["trace"])
         st.markdown(msg["content"])
+        if msg["role"] == "assistant":
+            _render_timing(msg.get("timing"))
 
 # Chat input
 if prompt := st.chat_input("Describe your modernization request..."):
@@ -548,8 +680,12 @@ if prompt := st.chat_input("Describe your modernization request..."):
 
     # Get orchestrator response
     with st.chat_message("assistant"):
-        with st.spinner("Thinking..."):
-            response, trace_steps = invoke_orchestrator(prompt, user_id)
+        live = _LiveTurn()
+        response, trace_steps, timing = invoke_orchestrator(
+            prompt, user_id, on_chunk=live.on_chunk, on_trace_step=live.on_trace_step,
+        )
+        live.finish(response)
+        _render_timing(timing)
 
         # Also try to detect cluster from agent response if not already set
         if not st.session_state.active_cluster_id:
@@ -557,11 +693,10 @@ if prompt := st.chat_input("Describe your modernization request..."):
             if detected_in_response:
                 st.session_state.active_cluster_id = detected_in_response
 
-        _render_trace(trace_steps)
-        st.markdown(response)
-
-    # Store trace for history replay
-    st.session_state.messages.append({"role": "assistant", "content": response, "trace": trace_steps})
+    # Store trace and timing for history replay
+    st.session_state.messages.append(
+        {"role": "assistant", "content": response, "trace": trace_steps, "timing": timing}
+    )
 
     # Rerun so sidebar reflects updated cluster_id immediately
     st.rerun()
@@ -6,15 +6,25 @@ Provides:
 - JWT user_id extraction (cognito:username → email fallback)
 - Identity Pool credential exchange (JWT → temp AWS creds)
 - Token refresh
+- Expiry-aware Identity Pool sessions refreshed in the background
 """
 from __future__ import annotations
 
 import base64
 import json
+import logging
 import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
 from typing import Any
 
 import boto3
+import botocore.session
+from botocore.credentials import CredentialProvider, CredentialResolver, RefreshableCredentials
+
+logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # Environment
@@ -25,6 +35,17 @@ COGNITO_APP_CLIENT_ID = os.getenv("COGNITO_APP_CLIENT_ID", "")
 COGNITO_IDENTITY_POOL_ID = os.getenv("COGNITO_IDENTITY_POOL_ID", "")
 AWS_REGION = os.getenv("AWS_REGION", "us-east-2")
 
+# Identity Pool credentials last an hour; refresh them this long before
+# they lapse.  Calls made inside the last MANDATORY seconds block on refresh.
+CREDENTIAL_REFRESH_LEAD_SECONDS = int(os.getenv("UI_CREDENTIAL_REFRESH_LEAD_SECONDS", "600"))
+CREDENTIAL_MANDATORY_REFRESH_SECONDS = 120
+# Refresh the Cognito ID token first if it expires within this margin
+ID_TOKEN_REFRESH_MARGIN_SECONDS = 300
+REFRESH_RETRY_SECONDS = 30
+# Stop the refresh thread after this many refresh cycles with no signed
+# request; the next request restarts it
+CREDENTIAL_IDLE_REFRESH_CYCLES = int(os.getenv("UI_CREDENTIAL_IDLE_REFRESH_CYCLES", "3"))
+
 
 # ---------------------------------------------------------------------------
 # JWT helpers
@@ -163,7 +184,8 @@ def get_identity_pool_credentials(id_token: str) -> dict[str, str]:
     """Exchange a Cognito ID token for temporary AWS credentials via the
     Identity Pool.
 
-    Returns a dict with ``AccessKeyId``, ``SecretKey``, ``SessionToken``.
+    Returns a dict with ``AccessKeyId``, ``SecretKey``, ``SessionToken`` and
+    ``Expiration`` (a timezone-aware ``datetime``).
     """
     provider_key = (
         f"cognito-idp.{AWS_REGION}.amazonaws.com/{COGNITO_USER_POOL_ID}"
@@ -188,6 +210,7 @@ def get_identity_pool_credentials(id_token: str) -> dict[str, str]:
         "AccessKeyId": creds["AccessKeyId"],
         "SecretKey": creds["SecretKey"],
         "SessionToken": creds["SessionToken"],
+        "Expiration": creds["Expiration"],
     }
 
 
@@ -201,3 +224,162 @@ def create_authenticated_session(id_token: str) -> boto3.Session:
         aws_session_token=creds["SessionToken"],
         region_name=AWS_REGION,
     )
+
+
+# ---------------------------------------------------------------------------
+# Expiry-aware sessions
+# ---------------------------------------------------------------------------
+
+
+class _IdentityPoolCredentials(RefreshableCredentials):
+    """``RefreshableCredentials`` that count their uses and can be forced stale.
+
+    Every signed request calls ``get_frozen_credentials``, so ``uses`` tracks
+    activity and ``on_use`` lets the owning session restart its refresh
+    thread.  While ``is_stale()`` is true, ``refresh_needed`` reports a
+    mandatory refresh.
+    """
+
+    uses = 0
+    on_use = None
+    is_stale = None
+
+    def refresh_needed(self, refresh_in=None):
+        if self.is_stale is not None and self.is_stale():
+            return True
+        return super().refresh_needed(refresh_in)
+
+    def get_frozen_credentials(self):
+        self.uses += 1
+        if self.on_use is not None:
+            self.on_use()
+        return super().get_frozen_credentials()
+
+
+class _IdentityPoolProvider(CredentialProvider):
+    """Credential provider that hands botocore one session's credentials."""
+
+    METHOD = "cognito-identity-pool"
+
+    def __init__(self, credentials: RefreshableCredentials):
+        super().__init__()
+        self.credentials = credentials
+
+    def load(self) -> RefreshableCredentials:
+        return self.credentials
+
+
+class IdentityPoolSession:
+    """Identity Pool credentials for one signed-in user, kept fresh.
+
+    ``session`` is a boto3 Session whose only credential provider returns
+    botocore ``RefreshableCredentials``, so clients created from it once
+    keep working across refreshes.  A daemon thread refreshes the
+    credentials ``CREDENTIAL_REFRESH_LEAD_SECONDS`` before they expire,
+    first renewing the Cognito ID token with the refresh token when that is
+    about to expire too.  The thread exits after
+    ``CREDENTIAL_IDLE_REFRESH_CYCLES`` cycles in which no request was signed
+    (e.g. the browser tab was closed) and is restarted by the next request;
+    until then botocore refreshes lazily when the credentials are used.
+    ``refresh()`` forces a refresh, e.g. after an ``ExpiredTokenException``.
+
+    The current tokens are exposed as ``id_token`` / ``access_token``
+    because the refresh thread cannot write Streamlit session state; ``key``
+    identifies the instance for client caches.
+    """
+
+    def __init__(self, id_token: str, refresh_token: str | None = None, access_token: str | None = None):
+        self.id_token = id_token
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.key = uuid.uuid4().hex
+        self.expiry: datetime | None = None  # set by _fetch
+        self._lock = threading.Lock()
+        self._force_refresh = False
+        self._thread_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.credentials = _IdentityPoolCredentials.create_from_metadata(
+            metadata=self._fetch(),
+            refresh_using=self._fetch,
+            method=_IdentityPoolProvider.METHOD,
+            advisory_timeout=CREDENTIAL_REFRESH_LEAD_SECONDS,
+            mandatory_timeout=CREDENTIAL_MANDATORY_REFRESH_SECONDS,
+        )
+        core = botocore.session.Session()
+        core.register_component(
+            "credential_provider", CredentialResolver([_IdentityPoolProvider(self.credentials)]),
+        )
+        self.session = boto3.Session(botocore_session=core, region_name=AWS_REGION)
+        self.credentials.on_use = self._ensure_refresh_thread
+        self.credentials.is_stale = lambda: self._force_refresh
+        self._ensure_refresh_thread()
+
+    def seconds_until_expiry(self) -> float:
+        return (self.expiry - datetime.now(timezone.utc)).total_seconds()
+
+    def _id_token_expires_soon(self) -> bool:
+        try:
+            exp = float(decode_jwt_payload(self.id_token).get("exp", 0))
+        except Exception:
+            return True
+        return exp - time.time() < ID_TOKEN_REFRESH_MARGIN_SECONDS
+
+    def _fetch(self) -> dict[str, str]:
+        """``refresh_using`` callback: new credentials in botocore metadata form."""
+        with self._lock:
+            if self.refresh_token and self._id_token_expires_soon():
+                tokens = refresh_tokens(self.refresh_token)
+                self.id_token = tokens["id_token"]
+                self.access_token = tokens["access_token"]
+            creds = get_identity_pool_credentials(self.id_token)
+            self.expiry = creds["Expiration"]
+            self._force_refresh = False
+        return {
+            "access_key": creds["AccessKeyId"],
+            "secret_key": creds["SecretKey"],
+            "token": creds["SessionToken"],
+            "expiry_time": creds["Expiration"].isoformat(),
+        }
+
+    def refresh(self) -> None:
+        """Replace the credentials (and ID token, if possible) now."""
+        with self._lock:
+            if self.refresh_token:
+                tokens = refresh_tokens(self.refresh_token)
+                self.id_token = tokens["id_token"]
+                self.access_token = tokens["access_token"]
+            self._force_refresh = True
+        try:
+            self.credentials.get_frozen_credentials()
+        finally:
+            self._force_refresh = False
+
+    def _ensure_refresh_thread(self) -> None:
+        with self._thread_lock:
+            if self._stopped.is_set() or (self._thread is not None and self._thread.is_alive()):
+                return
+            self._thread = threading.Thread(target=self._refresh_loop, name="identity-pool-refresh", daemon=True)
+            self._thread.start()
+
+    def _refresh_loop(self) -> None:
+        seen = self.credentials.uses
+        idle = 0
+        # Wake just inside the advisory window, where botocore refreshes
+        while not self._stopped.wait(max(1.0, self.seconds_until_expiry() - CREDENTIAL_REFRESH_LEAD_SECONDS + 1)):
+            idle = idle + 1 if self.credentials.uses == seen else 0
+            if idle >= CREDENTIAL_IDLE_REFRESH_CYCLES:
+                logger.info("Stopping idle credential refresh for session %s", self.key)
+                return
+            before = self.expiry
+            try:
+                self.credentials.get_frozen_credentials()
+            except Exception as exc:
+                logger.warning("Background credential refresh failed: %s", exc)
+            seen = self.credentials.uses
+            if self.expiry == before and self._stopped.wait(REFRESH_RETRY_SECONDS):
+                return
+
+    def stop(self) -> None:
+        """Stop the refresh thread (on sign-out)."""
+        self._stopped.set()